@@ -0,0 +1,5 @@
+"""
+Benchmark suite for the AgentMail wrappers.
+
+Run with `make bench` or `python -m benchmarks.run`; see `benchmarks/run.py`.
+"""
@@ -0,0 +1,178 @@
+"""
+Benchmark cases.
+
+Each case takes a `Context` describing the backend data and returns a
+`Measurement`: the number of operations performed, the latency of every
+timed unit and the wall-clock time of the whole run. Cases only use the
+public wrapper functions, so they work against the fake server and against
+a replayed cassette alike.
+"""
+
+import io
+import os
+import subprocess
+import sys
+import time
+from concurrent.futures import ThreadPoolExecutor
+from dataclasses import dataclass, field
+from pathlib import Path
+from typing import Callable, Dict, List
+
+from src.agentmail.attachments import download_attachment
+from src.agentmail.bulk import send_bulk
+from src.agentmail.client import close_clients, get_client
+from src.agentmail.fake_server import FakeAgentMail
+from src.agentmail.messages import send_message
+from src.agentmail.threads import get_thread, iter_threads
+
+
+@dataclass
+class Context:
+    """Backend data the cases operate on."""
+
+    inbox_id: str
+    recipient: str
+    thread_ids: List[str]
+    attachment: tuple
+    scale: float = 1.0
+    concurrency: int = 16
+
+    def count(self, base: int) -> int:
+        """Scale a default operation count."""
+        return max(1, int(base * self.scale))
+
+
+@dataclass
+class Measurement:
+    """Raw result of one benchmark case."""
+
+    ops: int
+    elapsed: float
+    latencies: List[float] = field(default_factory=list)
+    unit: str = "op"
+
+
+def bench_client_construction(ctx: Context) -> Measurement:
+    """
+    Build a pooled client from scratch: one op per construction.
+
+    Against the fake server no TLS context is created, so this measures the
+    wrapper and SDK share of construction cost.
+    """
+    latencies = []
+    started = time.perf_counter()
+    for _ in range(ctx.count(200)):
+        close_clients()
+        t0 = time.perf_counter()
+        get_client()
+        latencies.append(time.perf_counter() - t0)
+    return Measurement(len(latencies), time.perf_counter() - started, latencies, "client")
+
+
+def bench_send_single(ctx: Context) -> Measurement:
+    """Send messages one after another: one op per message."""
+    latencies = []
+    started = time.perf_counter()
+    for n in range(ctx.count(500)):
+        t0 = time.perf_counter()
+        send_message(ctx.inbox_id, to=[ctx.recipient], subject=f"Bench {n}", text="Benchmark message")
+        latencies.append(time.perf_counter() - t0)
+    return Measurement(len(latencies), time.perf_counter() - started, latencies, "message")
+
+
+def bench_send_bulk(ctx: Context) -> Measurement:
+    """Send messages through `send_bulk`: one op per message."""
+    specs = (
+        {"inbox_id": ctx.inbox_id, "to": [ctx.recipient], "subject": f"Bulk {n}", "text": "Benchmark message"}
+        for n in range(ctx.count(2000))
+    )
+    report = send_bulk(specs, concurrency=ctx.concurrency, keep_results=False)
+    stats = report.stats
+    if stats.failed:
+        raise RuntimeError(f"send_bulk failed: {stats.summary()}")
+    return Measurement(stats.total, stats.elapsed, stats.latencies, "message")
+
+
+def bench_list_threads_scan(ctx: Context) -> Measurement:
+    """Scan every thread with `iter_threads`: one op per thread, one latency per page."""
+    latencies = []
+    items = 0
+    started = time.perf_counter()
+    for _ in range(ctx.count(3)):
+        index = 0
+        t0 = time.perf_counter()
+        # Time each page: the gap between consecutive page boundaries
+        for index, _thread in enumerate(iter_threads(page_size=100), 1):
+            if index % 100 == 0:
+                now = time.perf_counter()
+                latencies.append(now - t0)
+                t0 = now
+        items += index
+    return Measurement(items, time.perf_counter() - started, latencies, "thread")
+
+
+def bench_get_thread_fanout(ctx: Context) -> Measurement:
+    """Fetch many threads concurrently with `get_thread`: one op per thread."""
+    thread_ids = [ctx.thread_ids[n % len(ctx.thread_ids)] for n in range(ctx.count(1000))]
+
+    def fetch(thread_id: str) -> float:
+        t0 = time.perf_counter()
+        get_thread(thread_id)
+        return time.perf_counter() - t0
+
+    started = time.perf_counter()
+    with ThreadPoolExecutor(max_workers=ctx.concurrency) as executor:
+        latencies = list(executor.map(fetch, thread_ids))
+    return Measurement(len(latencies), time.perf_counter() - started, latencies, "thread")
+
+
+def bench_attachment_download(ctx: Context) -> Measurement:
+    """Stream an attachment into memory: one op per download."""
+    thread_id, attachment_id = ctx.attachment
+    latencies = []
+    started = time.perf_counter()
+    for _ in range(ctx.count(50)):
+        buffer = io.BytesIO()
+        t0 = time.perf_counter()
+        download_attachment(thread_id, attachment_id, buffer)
+        latencies.append(time.perf_counter() - t0)
+    return Measurement(len(latencies), time.perf_counter() - started, latencies, "download")
+
+
+COLD_START_SCRIPT = "from src.agentmail.inboxes import list_inboxes; list_inboxes()"
+
+
+def bench_cold_start(ctx: Context) -> Measurement:
+    """
+    Start a fresh interpreter that imports a wrapper and makes one request.
+
+    One op per process; the latency is the whole process lifetime, as paid by
+    cron jobs and agent tool calls. Requests go to a fake served over local
+    HTTP.
+    """
+    fake = FakeAgentMail()
+    fake.seed(inboxes=1, threads_per_inbox=0)
+    server = fake.serve()
+    env = dict(os.environ, AGENTMAIL_BASE_URL=server.url, AGENTMAIL_API_KEY="bench")
+    root = Path(__file__).resolve().parent.parent
+    latencies = []
+    started = time.perf_counter()
+    try:
+        for _ in range(ctx.count(20)):
+            t0 = time.perf_counter()
+            subprocess.run([sys.executable, "-c", COLD_START_SCRIPT], cwd=root, env=env, check=True)
+            latencies.append(time.perf_counter() - t0)
+    finally:
+        server.shutdown()
+    return Measurement(len(latencies), time.perf_counter() - started, latencies, "process")
+
+
+CASES: Dict[str, Callable[[Context], Measurement]] = {
+    "client_construction": bench_client_construction,
+    "send_single": bench_send_single,
+    "send_bulk": bench_send_bulk,
+    "list_threads_scan": bench_list_threads_scan,
+    "get_thread_fanout": bench_get_thread_fanout,
+    "attachment_download": bench_attachment_download,
+    "cold_start": bench_cold_start
+}
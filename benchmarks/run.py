@@ -0,0 +1,241 @@
+"""
+Benchmark runner.
+
+Runs every case in `benchmarks/cases.py` in its own interpreter (so peak RSS
+is per case), writes machine-readable results and compares them to a stored
+baseline. Exits with status 1 when a case regresses beyond the tolerance.
+
+Usage:
+    python -m benchmarks.run                       # fake backend, compare to baseline
+    python -m benchmarks.run --only send_bulk --latency 0.05
+    python -m benchmarks.run --cassette bench.jsonl.gz   # replay a recording
+    python -m benchmarks.run --save-baseline       # accept current numbers
+
+Baselines are machine-specific; regenerate them on the machine that runs the
+comparison.
+"""
+
+import argparse
+import json
+import platform
+import resource
+import subprocess
+import sys
+import time
+from pathlib import Path
+from typing import Any, Dict, List, Optional
+
+ROOT = Path(__file__).resolve().parent.parent
+if str(ROOT) not in sys.path:
+    sys.path.insert(0, str(ROOT))
+
+DEFAULT_BASELINE = Path(__file__).resolve().parent / "baseline.json"
+DEFAULT_OUTPUT = Path(__file__).resolve().parent / "results.json"
+DEFAULT_TOLERANCE = 0.25
+
+# Differences below these are treated as noise whatever the relative change
+LATENCY_FLOOR_MS = 0.5
+RSS_FLOOR_MB = 5.0
+
+FAKE_THREADS = 2000
+ATTACHMENT_SIZE = 1024 * 1024
+
+
+def main(argv: Optional[List[str]] = None) -> int:
+    """Run the suite and return the process exit status."""
+    from benchmarks.cases import CASES
+
+    parser = argparse.ArgumentParser(description="Run the AgentMail benchmark suite")
+    parser.add_argument("--only", help="Comma-separated case names to run")
+    parser.add_argument("--scale", type=float, default=1.0, help="Multiplier for operation counts")
+    parser.add_argument("--concurrency", type=int, default=16, help="Workers for concurrent cases")
+    parser.add_argument("--latency", type=float, default=0.0, help="Simulated fake server latency in seconds")
+    parser.add_argument("--cassette", help="Replay this cassette instead of using the fake server")
+    parser.add_argument("--record", action="store_true", help="Record the cassette against the live API")
+    parser.add_argument("--rate-limit", action="store_true", help="Keep the client-side rate limiter enabled")
+    parser.add_argument("--output", default=str(DEFAULT_OUTPUT), help="Where to write results JSON")
+    parser.add_argument("--baseline", default=str(DEFAULT_BASELINE), help="Baseline JSON to compare against")
+    parser.add_argument("--save-baseline", action="store_true", help="Write the results as the new baseline")
+    parser.add_argument("--tolerance", type=float, default=DEFAULT_TOLERANCE, help="Allowed relative regression")
+    parser.add_argument("--child", help=argparse.SUPPRESS)
+    args = parser.parse_args(argv)
+
+    if args.child:
+        print(json.dumps(_run_case(args.child, args)))
+        return 0
+
+    names = args.only.split(",") if args.only else list(CASES)
+    unknown = [name for name in names if name not in CASES]
+    if unknown:
+        parser.error(f"unknown case(s): {', '.join(unknown)}")
+
+    passthrough = list(argv if argv is not None else sys.argv[1:])
+    results = {}
+    for name in names:
+        print(f"Running {name}...", file=sys.stderr)
+        results[name] = _run_child(name, passthrough)
+
+    report = {
+        "meta": {
+            "timestamp": time.strftime("%Y-%m-%dT%H:%M:%SZ", time.gmtime()),
+            "python": platform.python_version(),
+            "platform": platform.platform(),
+            "backend": "cassette" if args.cassette else "fake",
+            "scale": args.scale,
+            "concurrency": args.concurrency,
+            "latency": args.latency
+        },
+        "results": results
+    }
+    Path(args.output).write_text(json.dumps(report, indent=2) + "\n")
+    _print_table(results)
+
+    if args.save_baseline:
+        Path(args.baseline).write_text(json.dumps(report, indent=2) + "\n")
+        print(f"Saved baseline to {args.baseline}")
+        return 0
+
+    baseline_path = Path(args.baseline)
+    if not baseline_path.exists():
+        print(f"No baseline at {baseline_path}; run with --save-baseline to create one")
+        return 0
+    baseline = json.loads(baseline_path.read_text())
+    for key in ("backend", "scale", "concurrency", "latency"):
+        if baseline.get("meta", {}).get(key) != report["meta"][key]:
+            print(f"Warning: baseline was run with {key}={baseline.get('meta', {}).get(key)}")
+    regressions = compare(baseline.get("results", {}), results, args.tolerance)
+    for line in regressions:
+        print(f"REGRESSION {line}")
+    if not regressions:
+        print(f"No regressions against {baseline_path} (tolerance {args.tolerance:.0%})")
+    return 1 if regressions else 0
+
+
+def compare(baseline: Dict[str, Any], results: Dict[str, Any], tolerance: float) -> List[str]:
+    """
+    Compare results to a baseline.
+
+    Args:
+        baseline: Baseline results keyed by case name
+        results: Current results keyed by case name
+        tolerance: Allowed relative regression, e.g. 0.25 for 25%
+
+    Returns:
+        One description per regressed metric; empty when nothing regressed
+    """
+    regressions = []
+    for name, current in results.items():
+        base = baseline.get(name)
+        if base is None:
+            continue
+        if current["ops_per_s"] < base["ops_per_s"] * (1 - tolerance):
+            regressions.append(
+                f"{name}: ops/s {current['ops_per_s']:.1f} < baseline {base['ops_per_s']:.1f}"
+            )
+        for metric in ("p50_ms", "p95_ms", "p99_ms"):
+            limit = max(base[metric] * (1 + tolerance), base[metric] + LATENCY_FLOOR_MS)
+            if current[metric] > limit:
+                regressions.append(
+                    f"{name}: {metric} {current[metric]:.2f} > baseline {base[metric]:.2f}"
+                )
+        limit = max(base["peak_rss_mb"] * (1 + tolerance), base["peak_rss_mb"] + RSS_FLOOR_MB)
+        if current["peak_rss_mb"] > limit:
+            regressions.append(
+                f"{name}: peak RSS {current['peak_rss_mb']:.1f}MB > baseline {base['peak_rss_mb']:.1f}MB"
+            )
+    return regressions
+
+
+def _run_child(name: str, passthrough: List[str]) -> Dict[str, Any]:
+    """Run one case in a fresh interpreter and return its summary."""
+    command = [sys.executable, "-m", "benchmarks.run", *passthrough, "--child", name]
+    completed = subprocess.run(command, cwd=ROOT, stdout=subprocess.PIPE, check=True)
+    return json.loads(completed.stdout.decode().strip().splitlines()[-1])
+
+
+def _run_case(name: str, args: argparse.Namespace) -> Dict[str, Any]:
+    """Set up the backend, run one case and summarize it."""
+    from benchmarks.cases import CASES
+    from src.agentmail.ratelimit import set_rate_limiter
+
+    if not args.rate_limit:
+        set_rate_limiter(None)
+    ctx = _setup(args)
+    measurement = CASES[name](ctx)
+    latencies = sorted(measurement.latencies)
+    return {
+        "ops": measurement.ops,
+        "unit": measurement.unit,
+        "elapsed_s": round(measurement.elapsed, 4),
+        "ops_per_s": round(measurement.ops / measurement.elapsed, 1) if measurement.elapsed else 0.0,
+        "p50_ms": round(_percentile(latencies, 50) * 1000, 3),
+        "p95_ms": round(_percentile(latencies, 95) * 1000, 3),
+        "p99_ms": round(_percentile(latencies, 99) * 1000, 3),
+        "peak_rss_mb": round(_peak_rss_mb(), 1)
+    }
+
+
+def _setup(args: argparse.Namespace):
+    """Point the wrappers at the chosen backend and discover the data to use."""
+    from benchmarks.cases import Context
+    from src.agentmail.client import use_cassette
+    from src.agentmail.inboxes import create_inbox, list_inboxes
+    from src.agentmail.threads import iter_threads
+
+    if args.cassette:
+        use_cassette(args.cassette, mode="record" if args.record else "replay", match_body=False)
+    else:
+        from src.agentmail.fake_server import FakeAgentMail
+
+        fake = FakeAgentMail(latency={"*": args.latency} if args.latency else None)
+        fake.seed(inboxes=2, threads_per_inbox=FAKE_THREADS // 2)
+        fake.seed(inboxes=1, threads_per_inbox=1, attachment_size=ATTACHMENT_SIZE)
+        fake.install()
+
+    inboxes = list_inboxes().inboxes
+    if len(inboxes) < 2:
+        inboxes.append(create_inbox())
+    thread_ids = []
+    attachment = None
+    for thread in iter_threads(page_size=100):
+        thread_ids.append(thread.thread_id)
+        if attachment is None and thread.attachments:
+            attachment = (thread.thread_id, thread.attachments[0].attachment_id)
+        if len(thread_ids) >= 500 and attachment is not None:
+            break
+    return Context(
+        inbox_id=inboxes[0].inbox_id,
+        recipient=inboxes[1].email,
+        thread_ids=thread_ids,
+        attachment=attachment,
+        scale=args.scale,
+        concurrency=args.concurrency
+    )
+
+
+def _percentile(values: List[float], percent: float) -> float:
+    """Return the nearest-rank percentile of sorted values."""
+    if not values:
+        return 0.0
+    index = min(len(values) - 1, max(0, int(round(percent / 100 * len(values))) - 1))
+    return values[index]
+
+
+def _peak_rss_mb() -> float:
+    """Return the peak resident set size of this process in MiB."""
+    peak = resource.getrusage(resource.RUSAGE_SELF).ru_maxrss
+    # Linux reports KiB, macOS bytes
+    return peak / (1024 * 1024) if sys.platform == "darwin" else peak / 1024
+
+
+def _print_table(results: Dict[str, Any]) -> None:
+    print(f"{'case':<22} {'ops/s':>10} {'p50 ms':>9} {'p95 ms':>9} {'p99 ms':>9} {'RSS MB':>8}")
+    for name, r in results.items():
+        print(
+            f"{name:<22} {r['ops_per_s']:>10.1f} {r['p50_ms']:>9.2f} "
+            f"{r['p95_ms']:>9.2f} {r['p99_ms']:>9.2f} {r['peak_rss_mb']:>8.1f}"
+        )
+
+
+if __name__ == "__main__":
+    sys.exit(main())
@@ -10,19 +10,19 @@ from pathlib import Path
 # Add parent directory to path to import from src
 sys.path.insert(0, str(Path(__file__).parent.parent.parent))
 
-from src.agentmail.inboxes import list_inboxes
+from src.agentmail.inboxes import iter_inboxes
 
 
 def main():
     """List all inboxes."""
     print("Listing inboxes...")
     try:
-        resp = list_inboxes()
-        inboxes = resp.inboxes if hasattr(resp, 'inboxes') else (resp if isinstance(resp, list) else [])
+        print()
+        count = 0
         
-        print(f"\nFound {len(inboxes)} inbox(es):\n")
-        
-        for i, inbox in enumerate(inboxes, 1):
+        # Follows pagination so every inbox is listed, not just the first page
+        for i, inbox in enumerate(iter_inboxes(prefetch=True), 1):
+            count = i
             inbox_id = getattr(inbox, 'inbox_id', getattr(inbox, 'id', 'N/A'))
             email = getattr(inbox, 'email', 'N/A')
             print(f"{i}. Inbox ID: {inbox_id}")
@@ -35,6 +35,8 @@ def main():
                     if key not in ['inbox_id', 'id', 'email']:
                         print(f"   {key}: {value}")
             print()
+        
+        print(f"Found {count} inbox(es)")
             
     except Exception as e:
         print(f"Error listing inboxes: {e}")
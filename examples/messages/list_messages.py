@@ -10,19 +10,19 @@ from pathlib import Path
 # Add parent directory to path to import from src
 sys.path.insert(0, str(Path(__file__).parent.parent.parent))
 
-from src.agentmail.threads import list_threads
+from src.agentmail.threads import iter_threads
 
 
 def main():
     """List all messages/threads."""
     print("Listing messages/threads...")
     try:
-        resp = list_threads()
-        threads = resp.threads if hasattr(resp, 'threads') else (resp if isinstance(resp, list) else [])
+        print()
+        count = 0
         
-        print(f"\nFound {len(threads)} thread(s):\n")
-        
-        for i, thread in enumerate(threads, 1):
+        # Follows pagination so every thread is listed, not just the first page
+        for i, thread in enumerate(iter_threads(prefetch=True), 1):
+            count = i
             thread_id = getattr(thread, 'thread_id', getattr(thread, 'id', 'N/A'))
             subject = getattr(thread, 'subject', 'N/A')
             inbox_id = getattr(thread, 'inbox_id', 'N/A')
@@ -38,6 +38,8 @@ def main():
                     if key not in ['thread_id', 'id', 'subject', 'inbox_id']:
                         print(f"   {key}: {value}")
             print()
+        
+        print(f"Found {count} thread(s)")
             
     except Exception as e:
         print(f"Error listing messages: {e}")
@@ -10,53 +10,29 @@ from pathlib import Path
 # Add parent directory to path to import from src
 sys.path.insert(0, str(Path(__file__).parent.parent.parent))
 
-from src.agentmail.inboxes import create_inbox, list_inboxes
+from src.agentmail.inbox_pool import InboxPool
 from src.agentmail.messages import send_message
+from src.agentmail.ratelimit import is_limit_error
 
 
 def main():
     """Send a new message."""
     print("Sending message...")
     try:
-        # First, ensure we have at least 2 inboxes
+        # Lease 2 inboxes from a warm pool; existing inboxes are reused and
+        # missing ones are created in the background
         print("Getting inboxes...")
-        resp = list_inboxes()
-        if hasattr(resp, 'inboxes'):
-            inboxes = resp.inboxes
-        elif isinstance(resp, list):
-            inboxes = resp
-        else:
-            inboxes = []
-        
-        # Calculate how many inboxes we need to create (max 2 total)
-        inboxes_needed = max(0, 2 - len(inboxes))
-        
-        # Store newly created inboxes
-        newly_created = []
-        
-        if inboxes_needed > 0:
-            print(f"Found {len(inboxes)} inbox(es). Creating {inboxes_needed} more inbox(es)...")
-            for i in range(inboxes_needed):
-                try:
-                    new_inbox = create_inbox()
-                    newly_created.append(new_inbox)
-                    new_inbox_id = getattr(new_inbox, 'inbox_id', getattr(new_inbox, 'id', None))
-                    new_inbox_email = getattr(new_inbox, 'email', None) or new_inbox_id
-                    print(f"Created inbox {i+1}: {new_inbox_email} (ID: {new_inbox_id})")
-                except Exception as e:
-                    error_msg = str(e)
-                    if 'LimitExceededError' in error_msg or 'limit' in error_msg.lower():
-                        print(f"Warning: Could not create inbox {i+1}: Inbox limit reached")
-                    else:
-                        print(f"Warning: Could not create inbox {i+1}: {e}")
-        
-        # Combine existing and newly created inboxes
-        # Use newly created ones first, then existing ones
-        all_inboxes = newly_created + inboxes
-        
-        if len(all_inboxes) < 2:
-            print(f"Error: Need at least 2 inboxes, but only have {len(all_inboxes)}")
+        pool = InboxPool(size=2).start()
+        try:
+            all_inboxes = [pool.lease(timeout=30), pool.lease(timeout=30)]
+        except TimeoutError as e:
+            if pool.last_error is not None and is_limit_error(pool.last_error):
+                print("Error: Need at least 2 inboxes, but the inbox limit is reached")
+            else:
+                print(f"Error: Could not get 2 inboxes: {e}")
             return
+        finally:
+            pool.close()
         
         # Get first and second inbox
         first_inbox = all_inboxes[0]
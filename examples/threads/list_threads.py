@@ -10,34 +10,32 @@ from pathlib import Path
 # Add parent directory to path to import from src
 sys.path.insert(0, str(Path(__file__).parent.parent.parent))
 
-from src.agentmail.threads import list_threads
+from src.agentmail.threads import iter_threads
+
+# Only these fields are kept for each thread, as a compact record
+FIELDS = ("thread_id", "subject", "inbox_id", "senders", "message_count", "labels", "timestamp")
 
 
 def main():
     """List all threads."""
     print("Listing threads...")
     try:
-        resp = list_threads()
-        threads = resp.threads if hasattr(resp, 'threads') else (resp if isinstance(resp, list) else [])
-        
-        print(f"\nFound {len(threads)} thread(s):\n")
+        print()
+        count = 0
         
-        for i, thread in enumerate(threads, 1):
-            thread_id = getattr(thread, 'thread_id', getattr(thread, 'id', 'N/A'))
-            subject = getattr(thread, 'subject', 'N/A')
-            inbox_id = getattr(thread, 'inbox_id', 'N/A')
-            
-            print(f"{i}. Thread ID: {thread_id}")
-            print(f"   Subject: {subject}")
-            print(f"   Inbox ID: {inbox_id}")
-            
-            # Show additional details if available
-            if hasattr(thread, 'model_dump'):
-                details = thread.model_dump()
-                for key, value in details.items():
-                    if key not in ['thread_id', 'id', 'subject', 'inbox_id']:
-                        print(f"   {key}: {value}")
+        # Follows pagination so every thread is listed, not just the first page
+        for i, thread in enumerate(iter_threads(prefetch=True, fields=FIELDS), 1):
+            count = i
+            print(f"{i}. Thread ID: {thread.thread_id}")
+            print(f"   Subject: {thread.subject}")
+            print(f"   Inbox ID: {thread.inbox_id}")
+            print(f"   Senders: {', '.join(thread.senders)}")
+            print(f"   Messages: {thread.message_count}")
+            print(f"   Labels: {', '.join(thread.labels)}")
+            print(f"   Last activity: {thread.timestamp}")
             print()
+        
+        print(f"Found {count} thread(s)")
             
     except Exception as e:
         print(f"Error listing threads: {e}")
@@ -45,4 +43,3 @@ def main():
 
 if __name__ == "__main__":
     main()
-
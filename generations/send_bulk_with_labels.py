@@ -11,16 +11,27 @@ from pathlib import Path
 sys.path.insert(0, str(Path(__file__).parent.parent))
 
 from src.agentmail.inboxes import create_inbox, list_inboxes
-from src.agentmail.messages import send_message
+from src.agentmail.mailmerge import MailMerge, read_rows
+from src.agentmail.outbox import Outbox
 
 # Configuration
 NUM_EMAILS = 1000  # Number of emails to send
 RECIPIENT = "winton@intern.amail.dev"
+RECIPIENTS_FILE = None  # Optional CSV/JSONL with an "email" column; overrides the two settings above
+SUBJECT = "Bulk Test Email #{n}"
+TEXT = "This is bulk test email number {n}"
+HTML = "<p>This is bulk test email number <strong>{n}</strong></p>"
+CONCURRENCY = 16  # Number of emails in flight at once
+PROGRESS_INTERVAL = 5.0  # Seconds between progress reports
+OUTBOX_PATH = None  # Optional SQLite outbox; a rerun resumes an interrupted run instead of starting over
 
 
 def main():
     """Send bulk emails."""
-    print(f"Sending {NUM_EMAILS} emails to {RECIPIENT}...")
+    if RECIPIENTS_FILE:
+        print(f"Sending emails to recipients in {RECIPIENTS_FILE}...")
+    else:
+        print(f"Sending {NUM_EMAILS} emails to {RECIPIENT}...")
     
     try:
         # Get or create an inbox to send from
@@ -53,31 +64,41 @@ def main():
         
         print(f"Using sender inbox: {sender_inbox_email} (ID: {sender_inbox_id})\n")
         
-        successful = 0
-        failed = 0
+        if RECIPIENTS_FILE:
+            rows = ({"n": i + 1, **row} for i, row in enumerate(read_rows(RECIPIENTS_FILE)))
+        else:
+            rows = ({"email": RECIPIENT, "n": i + 1} for i in range(NUM_EMAILS))
+        # Repeated sends to one test recipient are intentional without a file
+        merge = MailMerge(sender_inbox_id, SUBJECT, text=TEXT, html=HTML, dedupe=bool(RECIPIENTS_FILE))
         
         # Send emails
-        for i in range(NUM_EMAILS):
-            try:
-                print(f"Sending email {i+1}/{NUM_EMAILS}...")
-                
-                send_message(
-                    inbox_id=sender_inbox_id,
-                    to=RECIPIENT,
-                    subject=f"Bulk Test Email #{i+1}",
-                    text=f"This is bulk test email number {i+1}",
-                    html=f"<p>This is bulk test email number <strong>{i+1}</strong></p>"
+        if OUTBOX_PATH:
+            with Outbox(OUTBOX_PATH) as outbox:
+                added = outbox.enqueue_many(merge.specs(rows), key=lambda spec: f"{spec['to']}|{spec['subject']}")
+                print(f"Queued {added} new emails in {OUTBOX_PATH}: {outbox.counts()}")
+                report = outbox.drain(
+                    concurrency=CONCURRENCY,
+                    keep_results=False,
+                    progress_interval=PROGRESS_INTERVAL
                 )
-                successful += 1
-                print(f"✓ Sent email {i+1}/{NUM_EMAILS}")
-            except Exception as e:
-                failed += 1
-                print(f"Error sending email {i+1}: {e}")
+        else:
+            report = merge.send(
+                rows,
+                concurrency=CONCURRENCY,
+                keep_results=False,
+                progress_interval=PROGRESS_INTERVAL
+            )
+        stats = report.stats
         
         # Print summary
         print("\n✓ Completed!")
-        print(f"  Successful: {successful}")
-        print(f"  Failed: {failed}")
+        print(f"  Successful: {stats.sent}")
+        print(f"  Failed: {stats.failed}")
+        print(f"  Skipped: {merge.stats.invalid} invalid, {merge.stats.duplicates} duplicate")
+        print(f"  Throughput: {stats.throughput:.1f} emails/s")
+        print(f"  Latency p50/p99: {stats.p50 * 1000:.0f}ms / {stats.p99 * 1000:.0f}ms")
+        for error_type, count in stats.errors.most_common():
+            print(f"  {error_type}: {count}")
         
     except Exception as e:
         print(f"Error: {e}")
@@ -3,10 +3,38 @@ AgentMail Python SDK Wrapper
 
 A professional wrapper around the AgentMail SDK providing organized
 access to all API resources.
+
+Resource modules (`inboxes`, `threads`, ...) and the client functions are
+loaded on first attribute access, so `import src.agentmail` stays cheap.
 """
 
-from .client import get_client
+import importlib
 
 __version__ = "1.0.0"
-__all__ = ["get_client"]
+__all__ = ["get_client", "close_clients", "reset_clients"]
+
+# Attributes provided lazily, mapped to the submodule defining them
+_LAZY_ATTRIBUTES = {
+    "get_client": "client",
+    "close_clients": "client",
+    "reset_clients": "client",
+}
+
+
+def __getattr__(name):
+    module = _LAZY_ATTRIBUTES.get(name)
+    if module is not None:
+        value = getattr(importlib.import_module(f".{module}", __name__), name)
+    else:
+        try:
+            value = importlib.import_module(f".{name}", __name__)
+        except ModuleNotFoundError as e:
+            if e.name != f"{__name__}.{name}":
+                raise
+            raise AttributeError(f"module {__name__!r} has no attribute {name!r}") from None
+    globals()[name] = value
+    return value
+
 
+def __dir__():
+    return sorted(set(globals()) | set(__all__))
@@ -0,0 +1,7 @@
+"""Run the batch command line: `python -m src.agentmail`."""
+
+import sys
+
+from .cli import main
+
+sys.exit(main())
@@ -0,0 +1,30 @@
+"""
+AgentMail asyncio wrapper.
+
+Async equivalents of every wrapper function in the `agentmail` package,
+organized by resource module (`aio.inboxes`, `aio.threads`, ...). All
+functions share one pooled async client per event loop. As in the parent
+package, modules load on first attribute access.
+"""
+
+import importlib
+
+__all__ = ["get_async_client", "close_async_clients"]
+
+
+def __getattr__(name):
+    if name in __all__:
+        value = getattr(importlib.import_module(".client", __name__), name)
+    else:
+        try:
+            value = importlib.import_module(f".{name}", __name__)
+        except ModuleNotFoundError as e:
+            if e.name != f"{__name__}.{name}":
+                raise
+            raise AttributeError(f"module {__name__!r} has no attribute {name!r}") from None
+    globals()[name] = value
+    return value
+
+
+def __dir__():
+    return sorted(set(globals()) | set(__all__))
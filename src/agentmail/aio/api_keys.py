@@ -0,0 +1,85 @@
+"""
+Async API keys management module.
+
+Provides async functions to manage API keys for authentication and access control.
+"""
+
+from typing import List, Dict, Any, AsyncIterator, Optional
+from .client import get_async_client
+from ..pagination import apaginate
+from ..telemetry import instrumented
+
+
+@instrumented
+async def list_api_keys(api_key: str = None) -> List[Dict[str, Any]]:
+    """
+    List all API keys.
+    
+    Args:
+        api_key: Optional API key. If not provided, will load from environment.
+    
+    Returns:
+        List of API key objects
+    """
+    client = get_async_client(api_key)
+    return await client.api_keys.list()
+
+
+@instrumented
+def iter_api_keys(
+    page_size: Optional[int] = None,
+    prefetch: bool = False,
+    api_key: str = None
+) -> AsyncIterator[Any]:
+    """
+    Iterate over all API keys, following pagination automatically.
+    
+    Items are yielded one at a time (use with `async for`), so memory use stays
+    constant regardless of how many API keys exist.
+    
+    Args:
+        page_size: Optional number of API keys to request per page
+        prefetch: Whether to fetch the next page in the background while
+                  the current page is being consumed
+        api_key: Optional API key. If not provided, will load from environment.
+    
+    Yields:
+        API key objects
+    """
+    client = get_async_client(api_key)
+    return apaginate(
+        client.api_keys.list, "api_keys", page_size=page_size, prefetch=prefetch
+    )
+
+
+@instrumented
+async def create_api_key(api_key: str = None, **kwargs) -> Dict[str, Any]:
+    """
+    Create a new API key.
+    
+    Args:
+        api_key: Optional API key. If not provided, will load from environment.
+        **kwargs: Additional parameters for API key creation
+    
+    Returns:
+        Created API key object
+    """
+    client = get_async_client(api_key)
+    return await client.api_keys.create(**kwargs)
+
+
+@instrumented
+async def delete_api_key(api_key_id: str, api_key: str = None) -> Dict[str, Any]:
+    """
+    Delete an API key by ID.
+    
+    Args:
+        api_key_id: The ID of the API key to delete
+        api_key: Optional API key. If not provided, will load from environment.
+    
+    Returns:
+        Deletion result
+    """
+    client = get_async_client(api_key)
+    return await client.api_keys.delete(api_key_id=api_key_id)
+
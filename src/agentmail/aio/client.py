@@ -0,0 +1,165 @@
+"""
+Async client configuration and initialization module.
+
+Provides a centralized way to initialize and configure the asynchronous
+AgentMail client. Like the synchronous `get_client()`, async clients are
+pooled: every coroutine running on the same event loop with the same API key
+and connection options shares one client and one HTTP connection pool.
+As in `client`, httpx and the SDK are imported on first use.
+
+A loop's clients are closed when the loop shuts down its async generators,
+which `asyncio.run()` does before closing the loop. Code that runs and closes
+a loop by hand should call `loop.shutdown_asyncgens()` first, or await
+`close_async_clients()` before the loop ends; otherwise the connections are
+left for the garbage collector.
+"""
+
+import asyncio
+import threading
+import weakref
+from typing import TYPE_CHECKING, AsyncGenerator, Dict, Optional
+
+from ..client import ClientOptions, _active_cassette, _build_options, _environment, resolve_api_key
+
+if TYPE_CHECKING:
+    import httpx
+    from agentmail import AsyncAgentMail
+
+_lock = threading.Lock()
+# Connection pools are bound to the event loop that created them, so clients
+# are registered per loop and dropped automatically when the loop goes away.
+_clients: "weakref.WeakKeyDictionary[asyncio.AbstractEventLoop, Dict[tuple, AsyncAgentMail]]" = (
+    weakref.WeakKeyDictionary()
+)
+_http_clients: "weakref.WeakKeyDictionary[asyncio.AbstractEventLoop, Dict[tuple, httpx.AsyncClient]]" = (
+    weakref.WeakKeyDictionary()
+)
+# One suspended async generator per loop; the loop finalizes it on shutdown,
+# which closes that loop's clients
+_closers: "weakref.WeakKeyDictionary[asyncio.AbstractEventLoop, AsyncGenerator[None, None]]" = (
+    weakref.WeakKeyDictionary()
+)
+
+
+def get_async_client(
+    api_key: Optional[str] = None,
+    max_connections: Optional[int] = None,
+    max_keepalive_connections: Optional[int] = None,
+    keepalive_expiry: Optional[float] = None,
+    timeout: Optional[float] = None,
+    base_url: Optional[str] = None,
+    transport: Optional["httpx.AsyncBaseTransport"] = None
+) -> "AsyncAgentMail":
+    """
+    Return a pooled AsyncAgentMail client for the running event loop.
+    
+    Args:
+        api_key: Optional API key. If not provided, will attempt to load
+                 from environment variable AGENTMAIL_API_KEY or .env file.
+        max_connections: Optional maximum number of concurrent connections
+        max_keepalive_connections: Optional maximum number of idle connections
+                                   kept alive in the pool
+        keepalive_expiry: Optional number of seconds an idle connection is kept
+        timeout: Optional request timeout in seconds
+        base_url: Optional API base URL (see `get_client()`)
+        transport: Optional async httpx transport requests are sent through
+                   instead of the network
+    
+    Returns:
+        AsyncAgentMail: Initialized async client instance
+    
+    Raises:
+        ValueError: If no API key is provided and none is found in environment
+        RuntimeError: If called outside of a running event loop
+    """
+    api_key = resolve_api_key(api_key)
+    options = _build_options(
+        max_connections, max_keepalive_connections, keepalive_expiry, timeout, base_url, transport
+    )
+    key = (api_key, options)
+    loop = asyncio.get_running_loop()
+
+    with _lock:
+        loop_clients = _clients.setdefault(loop, {})
+        client = loop_clients.get(key)
+        if client is None:
+            from agentmail import AsyncAgentMail
+            http_client = _build_async_http_client(options)
+            client = AsyncAgentMail(
+                api_key=api_key,
+                httpx_client=http_client,
+                timeout=options.timeout,
+                **_environment(options)
+            )
+            _http_clients.setdefault(loop, {})[key] = http_client
+            loop_clients[key] = client
+            if loop not in _closers:
+                _closers[loop] = _start_closer()
+    return client
+
+
+async def close_async_clients() -> None:
+    """
+    Close every pooled async client belonging to the running event loop.
+    
+    Subsequent calls to `get_async_client()` on this loop build fresh clients.
+    """
+    loop = asyncio.get_running_loop()
+    with _lock:
+        http_clients = list(_http_clients.pop(loop, {}).values())
+        _clients.pop(loop, None)
+
+    for http_client in http_clients:
+        await http_client.aclose()
+
+
+async def _close_on_shutdown() -> AsyncGenerator[None, None]:
+    """Close the loop's clients when the loop finalizes this generator."""
+    try:
+        yield
+    finally:
+        await close_async_clients()
+
+
+def _start_closer() -> AsyncGenerator[None, None]:
+    """
+    Start a closer generator on the running loop.
+
+    Advancing it to its first yield registers it with the loop's async
+    generator hooks, so `loop.shutdown_asyncgens()` finalizes it.
+    """
+    closer = _close_on_shutdown()
+    step = closer.__anext__()
+    try:
+        step.send(None)
+    except StopIteration:
+        pass
+    return closer
+
+
+def _build_async_http_client(options: ClientOptions) -> "httpx.AsyncClient":
+    """Build the pooled async HTTP client backing an AsyncAgentMail client."""
+    import httpx
+    from ..ratelimit import AsyncRateLimitedTransport
+
+    limits = httpx.Limits(
+        max_connections=options.max_connections,
+        max_keepalive_connections=options.max_keepalive_connections,
+        keepalive_expiry=options.keepalive_expiry
+    )
+    transport = options.transport
+    if transport is None:
+        transport = httpx.AsyncHTTPTransport(limits=limits)
+        cassette = _active_cassette()
+        if cassette is not None:
+            from ..cassette import REPLAY, AsyncRecordingTransport, ReplayTransport
+            transport = (
+                ReplayTransport(cassette) if cassette.mode == REPLAY
+                else AsyncRecordingTransport(transport, cassette)
+            )
+    transport = AsyncRateLimitedTransport(transport)
+    return httpx.AsyncClient(
+        transport=transport,
+        timeout=options.timeout,
+        follow_redirects=True
+    )
@@ -0,0 +1,141 @@
+"""
+Async domain management module.
+
+Provides async functions to manage custom domains for email inboxes.
+"""
+
+from typing import List, Dict, Any, Optional, AsyncIterator
+from ..cache import cached, invalidates
+from .client import get_async_client
+from ..pagination import apaginate
+from ..singleflight import coalesced
+from ..telemetry import instrumented
+
+
+@instrumented
+async def list_domains(api_key: str = None) -> List[Dict[str, Any]]:
+    """
+    List all domains.
+    
+    Args:
+        api_key: Optional API key. If not provided, will load from environment.
+    
+    Returns:
+        List of domain objects
+    """
+    client = get_async_client(api_key)
+    return await client.domains.list()
+
+
+@instrumented
+def iter_domains(
+    page_size: Optional[int] = None,
+    prefetch: bool = False,
+    api_key: str = None
+) -> AsyncIterator[Any]:
+    """
+    Iterate over all domains, following pagination automatically.
+    
+    Items are yielded one at a time (use with `async for`), so memory use stays
+    constant regardless of how many domains exist.
+    
+    Args:
+        page_size: Optional number of domains to request per page
+        prefetch: Whether to fetch the next page in the background while
+                  the current page is being consumed
+        api_key: Optional API key. If not provided, will load from environment.
+    
+    Yields:
+        Domain objects
+    """
+    client = get_async_client(api_key)
+    return apaginate(
+        client.domains.list, "domains", page_size=page_size, prefetch=prefetch
+    )
+
+
+@instrumented
+@cached("domain", "domain_id")
+@coalesced
+async def get_domain(domain_id: str, api_key: str = None) -> Dict[str, Any]:
+    """
+    Get a specific domain by ID.
+    
+    Args:
+        domain_id: The ID of the domain to retrieve
+        api_key: Optional API key. If not provided, will load from environment.
+    
+    Returns:
+        Domain object
+    """
+    client = get_async_client(api_key)
+    return await client.domains.get(domain_id=domain_id)
+
+
+@instrumented
+async def create_domain(domain: str, api_key: str = None, **kwargs) -> Dict[str, Any]:
+    """
+    Create a new domain.
+    
+    Args:
+        domain: The domain name to create
+        api_key: Optional API key. If not provided, will load from environment.
+        **kwargs: Additional parameters for domain creation
+    
+    Returns:
+        Created domain object
+    """
+    client = get_async_client(api_key)
+    return await client.domains.create(domain=domain, **kwargs)
+
+
+@instrumented
+@invalidates("domain", "domain_id")
+async def delete_domain(domain_id: str, api_key: str = None) -> Dict[str, Any]:
+    """
+    Delete a domain by ID.
+    
+    Args:
+        domain_id: The ID of the domain to delete
+        api_key: Optional API key. If not provided, will load from environment.
+    
+    Returns:
+        Deletion result
+    """
+    client = get_async_client(api_key)
+    return await client.domains.delete(domain_id=domain_id)
+
+
+@instrumented
+@invalidates("domain", "domain_id")
+async def verify_domain(domain_id: str, api_key: str = None) -> Dict[str, Any]:
+    """
+    Verify a domain.
+    
+    Args:
+        domain_id: The ID of the domain to verify
+        api_key: Optional API key. If not provided, will load from environment.
+    
+    Returns:
+        Verification result
+    """
+    client = get_async_client(api_key)
+    return await client.domains.verify(domain_id=domain_id)
+
+
+@instrumented
+@coalesced
+async def get_zone_file(domain_id: str, api_key: str = None) -> Dict[str, Any]:
+    """
+    Get the zone file for a domain.
+    
+    Args:
+        domain_id: The ID of the domain
+        api_key: Optional API key. If not provided, will load from environment.
+    
+    Returns:
+        Zone file configuration
+    """
+    client = get_async_client(api_key)
+    return await client.domains.get_zone_file(domain_id=domain_id)
+
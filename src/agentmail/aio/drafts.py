@@ -0,0 +1,71 @@
+"""
+Async draft messages module.
+
+Provides async functions to access and manage draft email messages.
+"""
+
+from typing import List, Dict, Any, AsyncIterator, Optional
+from .client import get_async_client
+from ..pagination import apaginate
+from ..singleflight import coalesced
+from ..telemetry import instrumented
+
+
+@instrumented
+async def list_drafts(api_key: str = None) -> List[Dict[str, Any]]:
+    """
+    List all drafts.
+    
+    Args:
+        api_key: Optional API key. If not provided, will load from environment.
+    
+    Returns:
+        List of draft objects
+    """
+    client = get_async_client(api_key)
+    return await client.drafts.list()
+
+
+@instrumented
+def iter_drafts(
+    page_size: Optional[int] = None,
+    prefetch: bool = False,
+    api_key: str = None
+) -> AsyncIterator[Any]:
+    """
+    Iterate over all drafts, following pagination automatically.
+    
+    Items are yielded one at a time (use with `async for`), so memory use stays
+    constant regardless of how many drafts exist.
+    
+    Args:
+        page_size: Optional number of drafts to request per page
+        prefetch: Whether to fetch the next page in the background while
+                  the current page is being consumed
+        api_key: Optional API key. If not provided, will load from environment.
+    
+    Yields:
+        Draft objects
+    """
+    client = get_async_client(api_key)
+    return apaginate(
+        client.drafts.list, "drafts", page_size=page_size, prefetch=prefetch
+    )
+
+
+@instrumented
+@coalesced
+async def get_draft(draft_id: str, api_key: str = None) -> Dict[str, Any]:
+    """
+    Get a specific draft by ID.
+    
+    Args:
+        draft_id: The ID of the draft to retrieve
+        api_key: Optional API key. If not provided, will load from environment.
+    
+    Returns:
+        Draft object
+    """
+    client = get_async_client(api_key)
+    return await client.drafts.get(draft_id=draft_id)
+
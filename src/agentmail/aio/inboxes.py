@@ -0,0 +1,133 @@
+"""
+Async inbox management module.
+
+Provides async functions to create and manage email inboxes.
+"""
+
+from typing import List, Dict, Any, Optional, AsyncIterator, Iterable
+from ..cache import cached, invalidates
+from .client import get_async_client
+from ..pagination import apaginate
+from ..records import projector
+from ..singleflight import coalesced
+from ..telemetry import instrumented
+
+
+@instrumented
+async def list_inboxes(api_key: str = None) -> List[Dict[str, Any]]:
+    """
+    List all inboxes.
+    
+    Args:
+        api_key: Optional API key. If not provided, will load from environment.
+    
+    Returns:
+        List of inbox objects
+    """
+    client = get_async_client(api_key)
+    return await client.inboxes.list()
+
+
+@instrumented
+def iter_inboxes(
+    page_size: Optional[int] = None,
+    prefetch: bool = False,
+    fields: Optional[Iterable[str]] = None,
+    api_key: str = None
+) -> AsyncIterator[Any]:
+    """
+    Iterate over all inboxes, following pagination automatically.
+    
+    Items are yielded one at a time (use with `async for`), so memory use stays
+    constant regardless of how many inboxes exist.
+    
+    Args:
+        page_size: Optional number of inboxes to request per page
+        prefetch: Whether to fetch the next page in the background while
+                  the current page is being consumed
+        fields: Optional inbox fields to keep, e.g. ("inbox_id", "created_at").
+                If provided, compact tuple-backed records holding only these
+                fields are yielded instead of full models.
+        api_key: Optional API key. If not provided, will load from environment.
+    
+    Yields:
+        Inbox objects, or records with the selected fields
+    """
+    client = get_async_client(api_key)
+    return apaginate(
+        client.inboxes.list, "inboxes", page_size=page_size, prefetch=prefetch,
+        transform=projector("inbox", fields)
+    )
+
+
+@instrumented
+@cached("inbox", "inbox_id")
+@coalesced
+async def get_inbox(inbox_id: str, api_key: str = None) -> Dict[str, Any]:
+    """
+    Get a specific inbox by ID.
+    
+    Args:
+        inbox_id: The ID of the inbox to retrieve
+        api_key: Optional API key. If not provided, will load from environment.
+    
+    Returns:
+        Inbox object
+    """
+    client = get_async_client(api_key)
+    return await client.inboxes.get(inbox_id=inbox_id)
+
+
+@instrumented
+async def create_inbox(domain: Optional[str] = None, api_key: str = None, **kwargs) -> Dict[str, Any]:
+    """
+    Create a new inbox.
+    
+    Args:
+        domain: Optional domain name for the inbox
+        api_key: Optional API key. If not provided, will load from environment.
+        **kwargs: Additional parameters for inbox creation
+    
+    Returns:
+        Created inbox object
+    """
+    client = get_async_client(api_key)
+    if domain:
+        return await client.inboxes.create(domain=domain, **kwargs)
+    return await client.inboxes.create(**kwargs)
+
+
+@instrumented
+@invalidates("inbox", "inbox_id")
+async def update_inbox(inbox_id: str, api_key: str = None, **kwargs) -> Dict[str, Any]:
+    """
+    Update an inbox by ID.
+    
+    Args:
+        inbox_id: The ID of the inbox to update
+        api_key: Optional API key. If not provided, will load from environment.
+        **kwargs: Fields to update
+    
+    Returns:
+        Updated inbox object
+    """
+    client = get_async_client(api_key)
+    return await client.inboxes.update(inbox_id=inbox_id, **kwargs)
+
+
+@instrumented
+@invalidates("inbox", "inbox_id", owns=("thread", "inbox_id"))
+async def delete_inbox(inbox_id: str, api_key: str = None) -> Dict[str, Any]:
+    """
+    Delete an inbox by ID.
+    
+    Args:
+        inbox_id: The ID of the inbox to delete
+        api_key: Optional API key. If not provided, will load from environment.
+    
+    Returns:
+        Deletion result
+    """
+    client = get_async_client(api_key)
+    return await client.inboxes.delete(inbox_id=inbox_id)
+
@@ -0,0 +1,113 @@
+"""
+Async message management module.
+
+Provides async functions to send, reply to and list email messages.
+"""
+
+from typing import List, Dict, Any, Optional, Union, AsyncIterator, Iterable
+from .client import get_async_client
+from ..cache import invalidates_thread
+from ..messages import _build_send_body, _build_reply_params
+from ..pagination import apaginate
+from ..records import projector
+from ..telemetry import instrumented
+
+
+@instrumented
+@invalidates_thread()
+async def send_message(
+    inbox_id: str,
+    to: Union[str, List[str]],
+    subject: str,
+    text: Optional[str] = None,
+    html: Optional[str] = None,
+    labels: Optional[List[str]] = None,
+    api_key: str = None,
+    **kwargs
+) -> Dict[str, Any]:
+    """
+    Send a new email message.
+    
+    Args:
+        inbox_id: The ID of the inbox to send from
+        to: Recipient email address(es) - can be a string or list of strings
+        subject: Email subject line
+        text: Optional plain text body of the email
+        html: Optional HTML body of the email
+        labels: Optional list of label strings to apply to the message
+        api_key: Optional API key. If not provided, will load from environment.
+        **kwargs: Additional parameters for message sending
+    
+    Returns:
+        Sent message object
+    """
+    client = get_async_client(api_key)
+    request_body = _build_send_body(to, subject, text, html, labels, kwargs)
+    
+    # Pass inbox_id as path parameter and request_body as body
+    return await client.inboxes.messages.send(inbox_id=inbox_id, **request_body)
+
+
+@instrumented
+@invalidates_thread("message_id")
+async def reply_message(
+    inbox_id: str,
+    message_id: str,
+    text: Optional[str] = None,
+    html: Optional[str] = None,
+    api_key: str = None,
+    **kwargs
+) -> Dict[str, Any]:
+    """
+    Reply to an existing email message.
+    
+    Args:
+        inbox_id: The ID of the inbox to reply from
+        message_id: The ID of the message to reply to
+        text: Optional plain text body of the reply
+        html: Optional HTML body of the reply
+        api_key: Optional API key. If not provided, will load from environment.
+        **kwargs: Additional parameters for the reply
+    
+    Returns:
+        Reply message object
+    """
+    client = get_async_client(api_key)
+    params = _build_reply_params(inbox_id, message_id, text, html, kwargs)
+    return await client.inboxes.messages.reply(**params)
+
+
+@instrumented
+def iter_messages(
+    inbox_id: str,
+    page_size: Optional[int] = None,
+    prefetch: bool = False,
+    fields: Optional[Iterable[str]] = None,
+    api_key: str = None,
+    **kwargs
+) -> AsyncIterator[Any]:
+    """
+    Iterate over all messages of an inbox, following pagination automatically.
+    
+    Items are yielded one at a time (use with `async for`), so memory use stays
+    constant regardless of how many messages exist.
+    
+    Args:
+        inbox_id: The ID of the inbox to list messages of
+        page_size: Optional number of messages to request per page
+        prefetch: Whether to fetch the next page in the background while
+                  the current page is being consumed
+        fields: Optional message fields to keep, e.g. ("message_id", "from", "subject").
+                If provided, compact tuple-backed records holding only these
+                fields are yielded instead of full models.
+        api_key: Optional API key. If not provided, will load from environment.
+        **kwargs: Additional parameters for filtering messages
+    
+    Yields:
+        Message objects (without bodies), or records with the selected fields
+    """
+    client = get_async_client(api_key)
+    return apaginate(
+        client.inboxes.messages.list, "messages", page_size=page_size, prefetch=prefetch,
+        transform=projector("message", fields), inbox_id=inbox_id, **kwargs
+    )
@@ -0,0 +1,66 @@
+"""
+Async metrics and analytics module.
+
+Provides async functions to access usage and performance metrics.
+"""
+
+from datetime import datetime
+from typing import List, Dict, Any, Optional
+from .client import get_async_client
+from ..telemetry import instrumented
+
+
+@instrumented
+async def list_metrics(api_key: str = None, **kwargs) -> List[Dict[str, Any]]:
+    """
+    List metrics.
+    
+    Args:
+        api_key: Optional API key. If not provided, will load from environment.
+        **kwargs: Additional parameters for filtering metrics
+    
+    Returns:
+        List of metric objects
+    """
+    client = get_async_client(api_key)
+    return await client.metrics.list(**kwargs)
+
+
+@instrumented
+async def query_events(
+    event_types: Optional[List[str]] = None,
+    start: Optional[datetime] = None,
+    end: Optional[datetime] = None,
+    period: Optional[int] = None,
+    limit: Optional[int] = None,
+    descending: Optional[bool] = None,
+    inbox_id: Optional[str] = None,
+    api_key: str = None
+) -> Dict[str, List[Any]]:
+    """
+    Count email events (sent, delivered, bounced, ...) over time.
+    
+    Args:
+        event_types: Optional event types to count, e.g. ["message.sent"]
+        start: Optional start of the window; must be within the last 90 days.
+               Defaults to 24 hours ago.
+        end: Optional end of the window; a future end is clamped to now
+        period: Optional bucket length in seconds. If not provided, every
+                event is returned individually.
+        limit: Optional maximum number of buckets per event type
+        descending: Whether to return the newest buckets first
+        inbox_id: Optional inbox to count events for. If not provided,
+                  counts cover the whole organization.
+        api_key: Optional API key. If not provided, will load from environment.
+    
+    Returns:
+        Dictionary mapping each event type to its buckets (timestamp, count)
+    """
+    client = get_async_client(api_key)
+    params = dict(
+        event_types=event_types, start=start, end=end, period=period,
+        limit=limit, descending=descending
+    )
+    if inbox_id is not None:
+        return await client.inboxes.metrics.query_events(inbox_id=inbox_id, **params)
+    return await client.metrics.query_events(**params)
@@ -0,0 +1,103 @@
+"""
+Async pod management module.
+
+Provides async functions to manage pods (containerized email processing units).
+"""
+
+from typing import List, Dict, Any, AsyncIterator, Optional
+from .client import get_async_client
+from ..pagination import apaginate
+from ..singleflight import coalesced
+from ..telemetry import instrumented
+
+
+@instrumented
+async def list_pods(api_key: str = None) -> List[Dict[str, Any]]:
+    """
+    List all pods.
+    
+    Args:
+        api_key: Optional API key. If not provided, will load from environment.
+    
+    Returns:
+        List of pod objects
+    """
+    client = get_async_client(api_key)
+    return await client.pods.list()
+
+
+@instrumented
+def iter_pods(
+    page_size: Optional[int] = None,
+    prefetch: bool = False,
+    api_key: str = None
+) -> AsyncIterator[Any]:
+    """
+    Iterate over all pods, following pagination automatically.
+    
+    Items are yielded one at a time (use with `async for`), so memory use stays
+    constant regardless of how many pods exist.
+    
+    Args:
+        page_size: Optional number of pods to request per page
+        prefetch: Whether to fetch the next page in the background while
+                  the current page is being consumed
+        api_key: Optional API key. If not provided, will load from environment.
+    
+    Yields:
+        Pod objects
+    """
+    client = get_async_client(api_key)
+    return apaginate(
+        client.pods.list, "pods", page_size=page_size, prefetch=prefetch
+    )
+
+
+@instrumented
+@coalesced
+async def get_pod(pod_id: str, api_key: str = None) -> Dict[str, Any]:
+    """
+    Get a specific pod by ID.
+    
+    Args:
+        pod_id: The ID of the pod to retrieve
+        api_key: Optional API key. If not provided, will load from environment.
+    
+    Returns:
+        Pod object
+    """
+    client = get_async_client(api_key)
+    return await client.pods.get(pod_id=pod_id)
+
+
+@instrumented
+async def create_pod(api_key: str = None, **kwargs) -> Dict[str, Any]:
+    """
+    Create a new pod.
+    
+    Args:
+        api_key: Optional API key. If not provided, will load from environment.
+        **kwargs: Additional parameters for pod creation
+    
+    Returns:
+        Created pod object
+    """
+    client = get_async_client(api_key)
+    return await client.pods.create(**kwargs)
+
+
+@instrumented
+async def delete_pod(pod_id: str, api_key: str = None) -> Dict[str, Any]:
+    """
+    Delete a pod by ID.
+    
+    Args:
+        pod_id: The ID of the pod to delete
+        api_key: Optional API key. If not provided, will load from environment.
+    
+    Returns:
+        Deletion result
+    """
+    client = get_async_client(api_key)
+    return await client.pods.delete(pod_id=pod_id)
+
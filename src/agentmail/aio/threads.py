@@ -0,0 +1,118 @@
+"""
+Async email thread management module.
+
+Provides async functions to access and manage email threads and conversations.
+"""
+
+from typing import List, Dict, Any, AsyncIterator, Optional, Iterable
+from ..cache import cached, invalidates
+from .client import get_async_client
+from ..pagination import apaginate
+from ..records import projector
+from ..singleflight import coalesced
+from ..telemetry import instrumented
+
+
+@instrumented
+async def list_threads(api_key: str = None, **kwargs) -> List[Dict[str, Any]]:
+    """
+    List all threads.
+    
+    Args:
+        api_key: Optional API key. If not provided, will load from environment.
+        **kwargs: Additional parameters for filtering threads
+    
+    Returns:
+        List of thread objects
+    """
+    client = get_async_client(api_key)
+    return await client.threads.list(**kwargs)
+
+
+@instrumented
+def iter_threads(
+    page_size: Optional[int] = None,
+    prefetch: bool = False,
+    fields: Optional[Iterable[str]] = None,
+    api_key: str = None,
+    **kwargs
+) -> AsyncIterator[Any]:
+    """
+    Iterate over all threads, following pagination automatically.
+    
+    Items are yielded one at a time (use with `async for`), so memory use stays
+    constant regardless of how many threads exist.
+    
+    Args:
+        page_size: Optional number of threads to request per page
+        prefetch: Whether to fetch the next page in the background while
+                  the current page is being consumed
+        fields: Optional thread fields to keep, e.g. ("thread_id", "created_at").
+                If provided, compact tuple-backed records holding only these
+                fields are yielded instead of full models.
+        api_key: Optional API key. If not provided, will load from environment.
+        **kwargs: Additional parameters for filtering threads
+    
+    Yields:
+        Thread objects, or records with the selected fields
+    """
+    client = get_async_client(api_key)
+    return apaginate(
+        client.threads.list, "threads", page_size=page_size, prefetch=prefetch,
+        transform=projector("thread", fields), **kwargs
+    )
+
+
+@instrumented
+@cached("thread", "thread_id")
+@coalesced
+async def get_thread(thread_id: str, api_key: str = None) -> Dict[str, Any]:
+    """
+    Get a specific thread by ID.
+    
+    Args:
+        thread_id: The ID of the thread to retrieve
+        api_key: Optional API key. If not provided, will load from environment.
+    
+    Returns:
+        Thread object with all messages
+    """
+    client = get_async_client(api_key)
+    return await client.threads.get(thread_id=thread_id)
+
+
+@instrumented
+@coalesced
+async def get_attachment(thread_id: str, attachment_id: str, api_key: str = None) -> bytes:
+    """
+    Get an attachment from a thread.
+    
+    Args:
+        thread_id: The ID of the thread
+        attachment_id: The ID of the attachment
+        api_key: Optional API key. If not provided, will load from environment.
+    
+    Returns:
+        Attachment file data
+    """
+    client = get_async_client(api_key)
+    return await client.threads.get_attachment(thread_id=thread_id, attachment_id=attachment_id)
+
+
+@instrumented
+@invalidates("thread", "thread_id")
+async def delete_thread(thread_id: str, inbox_id: str, api_key: str = None) -> Dict[str, Any]:
+    """
+    Delete a thread by ID.
+    
+    Args:
+        thread_id: The ID of the thread to delete
+        inbox_id: The ID of the inbox that owns the thread
+        api_key: Optional API key. If not provided, will load from environment.
+    
+    Returns:
+        Deletion result
+    """
+    client = get_async_client(api_key)
+    return await client.inboxes.threads.delete(inbox_id=inbox_id, thread_id=thread_id)
+
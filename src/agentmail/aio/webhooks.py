@@ -0,0 +1,174 @@
+"""
+Async webhook configuration module.
+
+Provides async functions to configure webhooks for real-time event notifications.
+
+Event Types:
+    - message.received: Triggered when a message is received (currently supported)
+    - message.sent: Triggered when a message is sent (future support)
+    - message.delivered: Triggered when a message is delivered (future support)
+    - message.bounced: Triggered when a message bounces (future support)
+    - message.complained: Triggered when a message receives a complaint (future support)
+    - message.rejected: Triggered when a message is rejected (future support)
+
+Note: Currently, AgentMail only supports the 'message.received' event type.
+When creating a webhook, event_types is optional and defaults to ['message.received'].
+
+Reference: https://docs.agentmail.to/api-reference/webhooks/list
+Reference: https://docs.agentmail.to/overview
+"""
+
+from typing import List, Dict, Any, Optional, Union, AsyncIterator, Iterable
+from ..cache import cached, invalidates
+from .client import get_async_client
+from ..pagination import apaginate
+from ..records import projector
+from ..singleflight import coalesced
+from ..telemetry import instrumented
+from ..webhooks import EventType, _build_webhook_params
+
+
+@instrumented
+async def list_webhooks(
+    limit: Optional[int] = None,
+    page_token: Optional[str] = None,
+    api_key: str = None
+) -> Dict[str, Any]:
+    """
+    List all webhooks with optional pagination.
+    
+    Args:
+        limit: Optional maximum number of webhooks to return
+        page_token: Optional token for pagination to retrieve next page
+        api_key: Optional API key. If not provided, will load from environment.
+    
+    Returns:
+        ListWebhooksResponse object containing:
+            - count: Number of webhooks returned
+            - webhooks: List of webhook objects
+            - limit: The limit applied
+            - next_page_token: Token for next page (if available)
+    
+    Reference: https://docs.agentmail.to/api-reference/webhooks/list
+    """
+    client = get_async_client(api_key)
+    return await client.webhooks.list(limit=limit, page_token=page_token)
+
+
+@instrumented
+def iter_webhooks(
+    page_size: Optional[int] = None,
+    prefetch: bool = False,
+    fields: Optional[Iterable[str]] = None,
+    api_key: str = None
+) -> AsyncIterator[Any]:
+    """
+    Iterate over all webhooks, following pagination automatically.
+    
+    Items are yielded one at a time (use with `async for`), so memory use stays
+    constant regardless of how many webhooks exist.
+    
+    Args:
+        page_size: Optional number of webhooks to request per page
+        prefetch: Whether to fetch the next page in the background while
+                  the current page is being consumed
+        fields: Optional webhook fields to keep, e.g. ("webhook_id", "created_at").
+                If provided, compact tuple-backed records holding only these
+                fields are yielded instead of full models.
+        api_key: Optional API key. If not provided, will load from environment.
+    
+    Yields:
+        Webhook objects, or records with the selected fields
+    """
+    client = get_async_client(api_key)
+    return apaginate(
+        client.webhooks.list, "webhooks", page_size=page_size, prefetch=prefetch,
+        transform=projector("webhook", fields)
+    )
+
+
+@instrumented
+@cached("webhook", "webhook_id")
+@coalesced
+async def get_webhook(webhook_id: str, api_key: str = None) -> Dict[str, Any]:
+    """
+    Get a specific webhook by ID.
+    
+    Args:
+        webhook_id: The ID of the webhook to retrieve
+        api_key: Optional API key. If not provided, will load from environment.
+    
+    Returns:
+        Webhook object containing:
+            - webhook_id: Unique identifier
+            - url: Webhook URL
+            - event_types: List of subscribed event types
+            - inbox_ids: List of associated inbox IDs
+            - secret: Secret for verifying webhook signatures
+            - enabled: Whether the webhook is enabled
+            - created_at: Creation timestamp
+            - updated_at: Last update timestamp
+            - client_id: Client identifier (if provided)
+    """
+    client = get_async_client(api_key)
+    return await client.webhooks.get(webhook_id=webhook_id)
+
+
+@instrumented
+async def create_webhook(
+    url: str,
+    event_types: Optional[List[Union[EventType, str]]] = None,
+    inbox_ids: Optional[List[str]] = None,
+    client_id: Optional[str] = None,
+    api_key: str = None
+) -> Dict[str, Any]:
+    """
+    Create a new webhook.
+    
+    Args:
+        url: The webhook URL to receive events (required)
+        event_types: Optional list of event types to subscribe to.
+                    Currently, AgentMail only supports 'message.received'.
+                    If not provided, defaults to ['message.received'].
+                    Valid values: 'message.received', 'message.sent',
+                    'message.delivered', 'message.bounced', 'message.complained',
+                    'message.rejected'
+        inbox_ids: Optional list of inbox IDs to filter events for specific inboxes
+        client_id: Optional client identifier
+        api_key: Optional API key. If not provided, will load from environment.
+    
+    Returns:
+        Created webhook object containing:
+            - webhook_id: Unique identifier
+            - url: Webhook URL
+            - event_types: List of subscribed event types
+            - inbox_ids: List of associated inbox IDs
+            - secret: Secret for verifying webhook signatures
+            - enabled: Whether the webhook is enabled
+            - created_at: Creation timestamp
+            - updated_at: Last update timestamp
+            - client_id: Client identifier (if provided)
+    
+    Reference: https://docs.agentmail.to/overview
+    """
+    client = get_async_client(api_key)
+    params = _build_webhook_params(url, event_types, inbox_ids, client_id)
+    return await client.webhooks.create(**params)
+
+
+@instrumented
+@invalidates("webhook", "webhook_id")
+async def delete_webhook(webhook_id: str, api_key: str = None) -> Dict[str, Any]:
+    """
+    Delete a webhook by ID.
+    
+    Args:
+        webhook_id: The ID of the webhook to delete
+        api_key: Optional API key. If not provided, will load from environment.
+    
+    Returns:
+        Deletion result
+    """
+    client = get_async_client(api_key)
+    return await client.webhooks.delete(webhook_id=webhook_id)
+
@@ -4,10 +4,13 @@ API Keys management module.
 Provides functions to manage API keys for authentication and access control.
 """
 
-from typing import List, Dict, Any
+from typing import List, Dict, Any, Iterator, Optional
 from .client import get_client
+from .pagination import paginate
+from .telemetry import instrumented
 
 
+@instrumented
 def list_api_keys(api_key: str = None) -> List[Dict[str, Any]]:
     """
     List all API keys.
@@ -22,6 +25,34 @@ def list_api_keys(api_key: str = None) -> List[Dict[str, Any]]:
     return client.api_keys.list()
 
 
+@instrumented
+def iter_api_keys(
+    page_size: Optional[int] = None,
+    prefetch: bool = False,
+    api_key: str = None
+) -> Iterator[Any]:
+    """
+    Iterate over all API keys, following pagination automatically.
+    
+    Items are yielded one at a time, so memory use stays constant
+    regardless of how many API keys exist.
+    
+    Args:
+        page_size: Optional number of API keys to request per page
+        prefetch: Whether to fetch the next page in the background while
+                  the current page is being consumed
+        api_key: Optional API key. If not provided, will load from environment.
+    
+    Yields:
+        API key objects
+    """
+    client = get_client(api_key)
+    return paginate(
+        client.api_keys.list, "api_keys", page_size=page_size, prefetch=prefetch
+    )
+
+
+@instrumented
 def create_api_key(api_key: str = None, **kwargs) -> Dict[str, Any]:
     """
     Create a new API key.
@@ -37,6 +68,7 @@ def create_api_key(api_key: str = None, **kwargs) -> Dict[str, Any]:
     return client.api_keys.create(**kwargs)
 
 
+@instrumented
 def delete_api_key(api_key_id: str, api_key: str = None) -> Dict[str, Any]:
     """
     Delete an API key by ID.
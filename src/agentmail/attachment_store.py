@@ -0,0 +1,280 @@
+"""
+Attachment store module.
+
+Provides a content-addressed on-disk cache for attachments. Files are stored
+once per SHA-256 digest and indexed by (thread_id, attachment_id), so the
+same logo or PDF forwarded across many threads occupies disk space once and
+repeat reads are served from disk (or mmap) instead of the network. The store
+is size-bounded and evicts the least recently used content first.
+"""
+
+import hashlib
+import mmap
+import os
+import sqlite3
+import tempfile
+import threading
+import time
+from typing import Any, BinaryIO, Dict, Iterator, Optional, Tuple
+
+from .attachments import download_attachment
+from .serialization import to_dict
+from .threads import get_thread
+
+DEFAULT_ROOT = "agentmail_attachments"
+DEFAULT_MAX_BYTES = 1024 * 1024 * 1024
+
+_SCHEMA = """
+CREATE TABLE IF NOT EXISTS objects (
+    digest TEXT PRIMARY KEY,
+    size INTEGER NOT NULL,
+    last_access REAL NOT NULL
+);
+CREATE INDEX IF NOT EXISTS objects_access ON objects (last_access);
+CREATE TABLE IF NOT EXISTS refs (
+    thread_id TEXT NOT NULL,
+    attachment_id TEXT NOT NULL,
+    digest TEXT NOT NULL,
+    PRIMARY KEY (thread_id, attachment_id)
+);
+CREATE INDEX IF NOT EXISTS refs_digest ON refs (digest);
+"""
+
+
+class AttachmentStore:
+    """Content-addressed, size-bounded local attachment cache."""
+
+    def __init__(
+        self,
+        root: str = DEFAULT_ROOT,
+        max_bytes: int = DEFAULT_MAX_BYTES,
+        api_key: str = None
+    ):
+        """
+        Open (or create) an attachment store.
+
+        Args:
+            root: Directory holding the store
+            max_bytes: Maximum total size of stored content; least recently
+                       used content is evicted beyond this
+            api_key: Optional API key. If not provided, will load from environment.
+        """
+        self.root = root
+        self.max_bytes = max_bytes
+        self.api_key = api_key
+        os.makedirs(os.path.join(root, "objects"), exist_ok=True)
+        os.makedirs(os.path.join(root, "tmp"), exist_ok=True)
+        self._lock = threading.Lock()
+        self._conn = sqlite3.connect(os.path.join(root, "index.db"), check_same_thread=False)
+        self._conn.execute("PRAGMA journal_mode=WAL")
+        self._conn.execute("PRAGMA synchronous=NORMAL")
+        self._conn.executescript(_SCHEMA)
+        self._hits = 0
+        self._misses = 0
+        self._dedup_hits = 0
+        self._evictions = 0
+
+    def close(self) -> None:
+        """Close the index database."""
+        with self._lock:
+            self._conn.close()
+
+    def __enter__(self) -> "AttachmentStore":
+        return self
+
+    def __exit__(self, *exc_info) -> None:
+        self.close()
+
+    def path(self, thread_id: str, attachment_id: str) -> str:
+        """
+        Return a local path holding the attachment, downloading it on a miss.
+
+        Args:
+            thread_id: The ID of the thread
+            attachment_id: The ID of the attachment
+
+        Returns:
+            Path to the stored content. Treat it as read-only; it may be
+            shared by other attachments with identical content, and storing
+            other attachments may evict it. Use `get_attachment()` or
+            `open_mmap()` to read content that must not disappear first.
+        """
+        return self._fetch(thread_id, attachment_id, open_file=False)[0]
+
+    def get_attachment(self, thread_id: str, attachment_id: str) -> bytes:
+        """
+        Get attachment content, served from disk after the first download.
+
+        Args:
+            thread_id: The ID of the thread
+            attachment_id: The ID of the attachment
+
+        Returns:
+            Attachment file data
+        """
+        with self._fetch(thread_id, attachment_id, open_file=True)[1] as f:
+            return f.read()
+
+    def open_mmap(self, thread_id: str, attachment_id: str) -> mmap.mmap:
+        """
+        Memory-map attachment content without copying it into memory.
+
+        Args:
+            thread_id: The ID of the thread
+            attachment_id: The ID of the attachment
+
+        Returns:
+            Read-only mmap of the content; close it when done. Empty
+            attachments cannot be mapped and raise ValueError.
+        """
+        with self._fetch(thread_id, attachment_id, open_file=True)[1] as f:
+            return mmap.mmap(f.fileno(), 0, access=mmap.ACCESS_READ)
+
+    def _fetch(self, thread_id: str, attachment_id: str, open_file: bool) -> Tuple[str, Optional[BinaryIO]]:
+        """
+        Return the path of stored content, downloading it on a miss.
+
+        With open_file, also return the content opened for reading. The file
+        is opened while holding the lock, so a concurrent eviction cannot
+        delete it between the lookup and the open; an open file stays
+        readable after it is unlinked.
+        """
+        found = self._lookup(thread_id, attachment_id, open_file)
+        if found is not None:
+            return found
+
+        with self._lock:
+            self._misses += 1
+        fd, tmp_path = tempfile.mkstemp(dir=os.path.join(self.root, "tmp"))
+        os.close(fd)
+        try:
+            download_attachment(thread_id, attachment_id, tmp_path, resume=False, api_key=self.api_key)
+            digest, size = _hash_file(tmp_path)
+            target = self._object_path(digest)
+            with self._lock:
+                if os.path.exists(target):
+                    self._dedup_hits += 1
+                    os.remove(tmp_path)
+                else:
+                    os.makedirs(os.path.dirname(target), exist_ok=True)
+                    os.replace(tmp_path, target)
+                self._conn.execute(
+                    "INSERT OR REPLACE INTO objects VALUES (?, ?, ?)", (digest, size, time.time())
+                )
+                self._conn.execute(
+                    "INSERT OR REPLACE INTO refs VALUES (?, ?, ?)", (thread_id, attachment_id, digest)
+                )
+                self._evict(keep=digest)
+                self._conn.commit()
+                f = open(target, "rb") if open_file else None
+        finally:
+            if os.path.exists(tmp_path):
+                os.remove(tmp_path)
+        return target, f
+
+    def thread_attachments(self, thread: Any) -> Iterator[Tuple[Dict[str, Any], str]]:
+        """
+        Iterate over every attachment of a thread, fetched through the store.
+
+        Args:
+            thread: Thread ID, or a thread object or dictionary as returned
+                    by `get_thread()`
+
+        Yields:
+            Tuples of (attachment metadata dictionary, local path)
+        """
+        if isinstance(thread, str):
+            thread = get_thread(thread, api_key=self.api_key)
+        thread = to_dict(thread)
+        seen = set()
+        for message in thread.get("messages") or [thread]:
+            for attachment in message.get("attachments") or []:
+                attachment_id = attachment["attachment_id"]
+                if attachment_id in seen:
+                    continue
+                seen.add(attachment_id)
+                yield attachment, self.path(thread["thread_id"], attachment_id)
+
+    def stats(self) -> Dict[str, Any]:
+        """
+        Return store counters.
+
+        Returns:
+            Dictionary with stored objects, references, total bytes, hits,
+            misses, dedup hits (downloads whose content was already stored)
+            and evictions
+        """
+        with self._lock:
+            objects, total = self._conn.execute(
+                "SELECT COUNT(*), COALESCE(SUM(size), 0) FROM objects"
+            ).fetchone()
+            refs = self._conn.execute("SELECT COUNT(*) FROM refs").fetchone()[0]
+            return {
+                "objects": objects,
+                "refs": refs,
+                "bytes": total,
+                "max_bytes": self.max_bytes,
+                "hits": self._hits,
+                "misses": self._misses,
+                "dedup_hits": self._dedup_hits,
+                "evictions": self._evictions
+            }
+
+    def _lookup(
+        self, thread_id: str, attachment_id: str, open_file: bool
+    ) -> Optional[Tuple[str, Optional[BinaryIO]]]:
+        """Return the path (and optionally an open file) of a stored attachment and mark it used."""
+        with self._lock:
+            row = self._conn.execute(
+                "SELECT digest FROM refs WHERE thread_id = ? AND attachment_id = ?",
+                (thread_id, attachment_id)
+            ).fetchone()
+            if row is None:
+                return None
+            target = self._object_path(row[0])
+            try:
+                f = open(target, "rb") if open_file else None
+            except FileNotFoundError:
+                return None
+            if f is None and not os.path.exists(target):
+                return None
+            self._conn.execute(
+                "UPDATE objects SET last_access = ? WHERE digest = ?", (time.time(), row[0])
+            )
+            self._conn.commit()
+            self._hits += 1
+            return target, f
+
+    def _evict(self, keep: str) -> None:
+        """Delete least recently used content beyond max_bytes. Caller holds the lock."""
+        total = self._conn.execute("SELECT COALESCE(SUM(size), 0) FROM objects").fetchone()[0]
+        if total <= self.max_bytes:
+            return
+        rows = self._conn.execute(
+            "SELECT digest, size FROM objects WHERE digest != ? ORDER BY last_access", (keep,)
+        ).fetchall()
+        for digest, size in rows:
+            if total <= self.max_bytes:
+                break
+            try:
+                os.remove(self._object_path(digest))
+            except FileNotFoundError:
+                pass
+            self._conn.execute("DELETE FROM objects WHERE digest = ?", (digest,))
+            self._conn.execute("DELETE FROM refs WHERE digest = ?", (digest,))
+            total -= size
+            self._evictions += 1
+
+    def _object_path(self, digest: str) -> str:
+        return os.path.join(self.root, "objects", digest[:2], digest)
+
+
+def _hash_file(path: str, chunk_size: int = 1024 * 1024) -> Tuple[str, int]:
+    """Return the SHA-256 hex digest and size of a file."""
+    sha = hashlib.sha256()
+    size = 0
+    with open(path, "rb") as f:
+        for chunk in iter(lambda: f.read(chunk_size), b""):
+            sha.update(chunk)
+            size += len(chunk)
+    return sha.hexdigest(), size
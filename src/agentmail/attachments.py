@@ -0,0 +1,263 @@
+"""
+Attachment download module.
+
+Provides streaming downloads of thread attachments to a path or file object.
+Data is written in fixed-size chunks, interrupted downloads resume with HTTP
+range requests where the backend supports them, and the final size is
+verified against the attachment metadata.
+"""
+
+import hashlib
+import os
+from concurrent.futures import ThreadPoolExecutor
+from dataclasses import dataclass
+from typing import BinaryIO, Iterable, List, Optional, Sequence, Union
+
+from .client import get_http_client
+from .threads import get_attachment
+
+DEFAULT_CHUNK_SIZE = 64 * 1024
+DEFAULT_MAX_RETRIES = 3
+PARTIAL_SUFFIX = ".part"
+
+
+class DownloadError(IOError):
+    """Raised when an attachment download fails or is incomplete."""
+
+
+@dataclass
+class DownloadResult:
+    """Outcome of an attachment download."""
+
+    thread_id: str
+    attachment_id: str
+    path: Optional[str]
+    size: int
+    resumed: bool = False
+    error: Optional[BaseException] = None
+
+    @property
+    def ok(self) -> bool:
+        """Whether the download completed successfully."""
+        return self.error is None
+
+
+def download_attachment(
+    thread_id: str,
+    attachment_id: str,
+    dest: Union[str, os.PathLike, BinaryIO],
+    chunk_size: int = DEFAULT_CHUNK_SIZE,
+    resume: bool = True,
+    max_retries: int = DEFAULT_MAX_RETRIES,
+    api_key: str = None
+) -> DownloadResult:
+    """
+    Stream an attachment to a file.
+
+    When dest is a path, data is written to a partial file next to it,
+    named after the thread and attachment IDs, and renamed once complete.
+    With resume enabled, an existing partial file of the same attachment is
+    continued rather than restarted; it is discarded if it is larger than
+    the attachment or the backend does not serve the requested range.
+    Dropped connections are retried from the last byte written.
+
+    Args:
+        thread_id: The ID of the thread
+        attachment_id: The ID of the attachment
+        dest: Destination path or writable binary file object
+        chunk_size: Number of bytes read and written at a time
+        resume: Whether to continue an existing partial download
+        max_retries: Maximum number of reconnects after a dropped connection
+        api_key: Optional API key. If not provided, will load from environment.
+
+    Returns:
+        DownloadResult describing the written file
+
+    Raises:
+        DownloadError: If the download fails or the size does not match
+    """
+    if isinstance(dest, (str, os.PathLike)):
+        path = os.fspath(dest)
+        partial = _partial_path(path, thread_id, attachment_id)
+        offset = os.path.getsize(partial) if resume and os.path.exists(partial) else 0
+        with open(partial, "ab" if offset else "wb") as f:
+            size, resumed = _download(
+                thread_id, attachment_id, f, offset, chunk_size, max_retries, api_key
+            )
+        os.replace(partial, path)
+        return DownloadResult(thread_id, attachment_id, path, size, resumed)
+
+    size, resumed = _download(thread_id, attachment_id, dest, 0, chunk_size, max_retries, api_key)
+    return DownloadResult(thread_id, attachment_id, None, size, resumed)
+
+
+def download_attachments(
+    items: Iterable[Sequence[str]],
+    dest_dir: Union[str, os.PathLike],
+    concurrency: int = 4,
+    chunk_size: int = DEFAULT_CHUNK_SIZE,
+    resume: bool = True,
+    api_key: str = None
+) -> List[DownloadResult]:
+    """
+    Download many attachments concurrently.
+
+    Memory use is bounded by concurrency * chunk_size regardless of
+    attachment sizes. Failures are reported per attachment instead of
+    aborting the batch.
+
+    Args:
+        items: Iterable of (thread_id, attachment_id) or
+               (thread_id, attachment_id, filename) tuples. Without a
+               filename, the attachment ID is used. When several
+               attachments share a filename, each is saved as
+               "<name>-<attachment_id><ext>" instead.
+        dest_dir: Directory to write attachments into
+        concurrency: Maximum number of simultaneous downloads
+        chunk_size: Number of bytes read and written at a time
+        resume: Whether to continue existing partial downloads
+        api_key: Optional API key. If not provided, will load from environment.
+
+    Returns:
+        List of DownloadResult, in the order of items
+
+    Raises:
+        ValueError: If the same attachment is listed more than once
+    """
+    items = list(items)
+    seen = set()
+    for item in items:
+        if (item[0], item[1]) in seen:
+            raise ValueError(f"Attachment {item[1]} of thread {item[0]} is listed more than once")
+        seen.add((item[0], item[1]))
+    filenames = [_filename(item) for item in items]
+    shared = {name for name in filenames if filenames.count(name) > 1}
+    os.makedirs(dest_dir, exist_ok=True)
+
+    def download_one(item: Sequence[str], filename: str) -> DownloadResult:
+        thread_id, attachment_id = item[0], item[1]
+        if filename in shared:
+            stem, ext = os.path.splitext(filename)
+            filename = f"{stem}-{attachment_id}{ext}"
+        path = os.path.join(dest_dir, filename)
+        try:
+            return download_attachment(
+                thread_id, attachment_id, path,
+                chunk_size=chunk_size, resume=resume, api_key=api_key
+            )
+        except Exception as e:
+            return DownloadResult(thread_id, attachment_id, path, 0, error=e)
+
+    with ThreadPoolExecutor(max_workers=concurrency) as executor:
+        return list(executor.map(download_one, items, filenames))
+
+
+def _filename(item: Sequence[str]) -> str:
+    """Return the file name an item is saved under, without directories."""
+    filename = os.path.basename(item[2]) if len(item) > 2 and item[2] else ""
+    return filename if filename not in ("", ".", "..") else os.path.basename(item[1])
+
+
+def _partial_path(path: str, thread_id: str, attachment_id: str) -> str:
+    """Return the partial file of an attachment being downloaded to path."""
+    digest = hashlib.sha1(f"{thread_id}/{attachment_id}".encode()).hexdigest()[:16]
+    return f"{path}.{digest}{PARTIAL_SUFFIX}"
+
+
+def _download(
+    thread_id: str,
+    attachment_id: str,
+    f: BinaryIO,
+    offset: int,
+    chunk_size: int,
+    max_retries: int,
+    api_key: Optional[str]
+) -> tuple:
+    """Write an attachment to f starting at offset; return (size, resumed)."""
+    import httpx
+
+    attachment = get_attachment(thread_id, attachment_id, api_key=api_key)
+    if isinstance(attachment, (bytes, bytearray)):
+        # Older SDKs return the content itself; there is nothing to stream.
+        f.write(attachment[offset:])
+        return len(attachment), offset > 0
+
+    # Position in f where the attachment's first byte belongs
+    base = _tell(f) - offset
+    expected = getattr(attachment, "size", None)
+    if offset and expected is not None and offset > expected:
+        offset = 0
+        _truncate(f, base)
+    resumed = offset > 0
+    retries = 0
+    # Bytes of the attachment written so far, updated while streaming so a
+    # dropped connection resumes from the last byte actually written
+    progress = [offset]
+    while True:
+        try:
+            _stream(attachment.download_url, f, progress, chunk_size, base)
+            break
+        except httpx.TransportError as e:
+            retries += 1
+            if retries > max_retries:
+                raise DownloadError(f"Download of attachment {attachment_id} failed: {e}") from e
+            resumed = True
+        except httpx.HTTPStatusError as e:
+            # Signed URLs expire; fetch a fresh one once before giving up.
+            if e.response.status_code not in (401, 403) or retries > max_retries:
+                raise DownloadError(f"Download of attachment {attachment_id} failed: {e}") from e
+            retries += 1
+            attachment = get_attachment(thread_id, attachment_id, api_key=api_key)
+
+    offset = progress[0]
+    if expected is not None and offset != expected:
+        raise DownloadError(
+            f"Attachment {attachment_id} size mismatch: expected {expected} bytes, got {offset}"
+        )
+    return offset, resumed
+
+
+def _stream(url: str, f: BinaryIO, progress: List[int], chunk_size: int, base: int) -> None:
+    """Stream url into f, continuing from and advancing progress[0]."""
+    offset = progress[0]
+    headers = {"Range": f"bytes={offset}-"} if offset else {}
+    with get_http_client().stream("GET", url, headers=headers) as response:
+        if response.status_code == 416:
+            return
+        response.raise_for_status()
+        if offset and (response.status_code != 206 or _range_start(response) != offset):
+            # The backend ignored the range request; start over.
+            progress[0] = 0
+            _truncate(f, base)
+            if response.status_code == 206:
+                # A partial response starting elsewhere cannot be used; refetch it all
+                response.close()
+                return _stream(url, f, progress, chunk_size, base)
+        for chunk in response.iter_bytes(chunk_size):
+            f.write(chunk)
+            progress[0] += len(chunk)
+
+
+def _range_start(response) -> Optional[int]:
+    """Return the first byte position of a 206 response's Content-Range."""
+    try:
+        return int(response.headers["content-range"].split()[1].split("-")[0])
+    except (KeyError, IndexError, ValueError):
+        return None
+
+
+def _tell(f: BinaryIO) -> int:
+    """Return the current position of f, or 0 if it is not seekable."""
+    try:
+        return f.tell()
+    except (AttributeError, OSError):
+        return 0
+
+
+def _truncate(f: BinaryIO, position: int) -> None:
+    """Rewind a destination file so a download can restart."""
+    try:
+        f.seek(position)
+        f.truncate()
+    except (AttributeError, OSError) as e:
+        raise DownloadError("Cannot restart download on a non-seekable destination") from e
@@ -0,0 +1,236 @@
+"""
+Bulk sending module.
+
+Provides a concurrent engine for sending large numbers of email messages
+through `send_message()` with bounded concurrency, per-message results and
+aggregate statistics.
+"""
+
+import math
+import random
+import time
+from collections import Counter
+from concurrent.futures import FIRST_COMPLETED, ThreadPoolExecutor, wait
+from dataclasses import dataclass, field
+from typing import Any, Callable, Dict, Iterable, List, Optional
+
+from .messages import send_message
+
+DEFAULT_CONCURRENCY = 16
+# Latencies kept for percentiles; larger runs keep a uniform random sample
+LATENCY_SAMPLES = 4096
+
+
+@dataclass
+class SendResult:
+    """Outcome of a single message send."""
+
+    index: int
+    spec: Dict[str, Any]
+    message: Any = None
+    error: Optional[BaseException] = None
+    latency: float = 0.0
+
+    @property
+    def ok(self) -> bool:
+        """Whether the message was sent successfully."""
+        return self.error is None
+
+
+@dataclass
+class BulkStats:
+    """Aggregate statistics for a bulk send."""
+
+    sent: int = 0
+    failed: int = 0
+    skipped: int = 0
+    elapsed: float = 0.0
+    errors: Counter = field(default_factory=Counter)
+    # Reservoir sample of at most LATENCY_SAMPLES send latencies
+    latencies: List[float] = field(default_factory=list, repr=False)
+    _latency_count: int = field(default=0, repr=False)
+    _random: random.Random = field(default_factory=lambda: random.Random(0), repr=False)
+
+    @property
+    def total(self) -> int:
+        """Number of messages attempted."""
+        return self.sent + self.failed
+
+    @property
+    def throughput(self) -> float:
+        """Messages attempted per second."""
+        return self.total / self.elapsed if self.elapsed > 0 else 0.0
+
+    def add_latency(self, latency: float) -> None:
+        """
+        Record a send latency, keeping memory bounded.
+
+        The first LATENCY_SAMPLES latencies are kept; after that each new one
+        replaces a random kept one with decreasing probability, so
+        `latencies` stays a uniform sample of the whole run.
+        """
+        self._latency_count += 1
+        if len(self.latencies) < LATENCY_SAMPLES:
+            self.latencies.append(latency)
+            return
+        slot = self._random.randrange(self._latency_count)
+        if slot < LATENCY_SAMPLES:
+            self.latencies[slot] = latency
+
+    @property
+    def p50(self) -> float:
+        """Median send latency in seconds."""
+        return _percentile(self.latencies, 50)
+
+    @property
+    def p99(self) -> float:
+        """99th percentile send latency in seconds."""
+        return _percentile(self.latencies, 99)
+
+    def summary(self) -> str:
+        """Return a one-line human readable summary."""
+        line = (
+            f"{self.total} attempted, {self.sent} sent, {self.failed} failed "
+            f"in {self.elapsed:.1f}s ({self.throughput:.1f} msg/s, "
+            f"p50 {self.p50 * 1000:.0f}ms, p99 {self.p99 * 1000:.0f}ms)"
+        )
+        if self.skipped:
+            line += f", {self.skipped} skipped"
+        if self.errors:
+            breakdown = ", ".join(f"{name}: {count}" for name, count in self.errors.most_common())
+            line += f" errors: {breakdown}"
+        return line
+
+
+@dataclass
+class BulkReport:
+    """Per-message results and aggregate statistics of a bulk send."""
+
+    stats: BulkStats
+    results: List[SendResult] = field(default_factory=list)
+
+
+def send_bulk(
+    specs: Iterable[Dict[str, Any]],
+    concurrency: int = DEFAULT_CONCURRENCY,
+    api_key: str = None,
+    keep_results: bool = True,
+    on_result: Optional[Callable[[SendResult], None]] = None,
+    progress: Optional[Callable[[BulkStats], None]] = None,
+    progress_interval: Optional[float] = None,
+    before_send: Optional[Callable[[int, Dict[str, Any]], bool]] = None,
+    after_send: Optional[Callable[[SendResult], None]] = None
+) -> BulkReport:
+    """
+    Send many messages concurrently.
+
+    Specs are consumed lazily, so generators of any length can be passed
+    without materializing them; at most `2 * concurrency` messages are in
+    flight or queued at any time.
+
+    Args:
+        specs: Iterable of keyword-argument dicts for `send_message()`, e.g.
+               {"inbox_id": ..., "to": ..., "subject": ..., "text": ...}
+        concurrency: Maximum number of messages sent at the same time
+        api_key: Optional API key used for specs that do not set their own.
+                 If not provided, will load from environment.
+        keep_results: Whether to keep every SendResult in the report. Disable
+                      for very large runs and use on_result instead.
+        on_result: Optional callback invoked with each SendResult as it completes
+        progress: Optional callback invoked with the running BulkStats at most
+                  once per progress_interval. Defaults to printing a summary
+                  line when only progress_interval is set.
+        progress_interval: Optional number of seconds between progress reports.
+                           No progress is reported when not set.
+        before_send: Optional callback invoked in the worker thread with the
+                     index and spec of each message right before it is sent.
+                     Returning False skips the message; skipped messages
+                     are only counted in stats.skipped.
+        after_send: Optional callback invoked in the worker thread with each
+                    SendResult as soon as the send returns, e.g. to persist
+                    the outcome before the worker takes the next message.
+                    Unlike on_result it may run concurrently.
+
+    Returns:
+        BulkReport with per-message results and aggregate statistics
+    """
+    if concurrency < 1:
+        raise ValueError("concurrency must be at least 1")
+    if progress is None and progress_interval is not None:
+        progress = _print_progress
+
+    stats = BulkStats()
+    report = BulkReport(stats=stats)
+    started = time.perf_counter()
+    last_progress = started
+
+    def send_one(index: int, spec: Dict[str, Any]) -> Optional[SendResult]:
+        if before_send is not None and not before_send(index, spec):
+            return None
+        kwargs = dict(spec)
+        if api_key is not None:
+            kwargs.setdefault("api_key", api_key)
+        begin = time.perf_counter()
+        try:
+            result = SendResult(index, spec, message=send_message(**kwargs))
+        except Exception as e:
+            result = SendResult(index, spec, error=e)
+        result.latency = time.perf_counter() - begin
+        if after_send is not None:
+            after_send(result)
+        return result
+
+    def record(result: Optional[SendResult]) -> None:
+        nonlocal last_progress
+        if result is None:
+            stats.skipped += 1
+            return
+        stats.add_latency(result.latency)
+        if result.ok:
+            stats.sent += 1
+        else:
+            stats.failed += 1
+            stats.errors[type(result.error).__name__] += 1
+        if keep_results:
+            report.results.append(result)
+        if on_result is not None:
+            on_result(result)
+        now = time.perf_counter()
+        stats.elapsed = now - started
+        if progress_interval is not None and now - last_progress >= progress_interval:
+            last_progress = now
+            progress(stats)
+
+    with ThreadPoolExecutor(max_workers=concurrency) as executor:
+        pending = set()
+        for index, spec in enumerate(specs):
+            pending.add(executor.submit(send_one, index, spec))
+            if len(pending) >= 2 * concurrency:
+                done, pending = wait(pending, return_when=FIRST_COMPLETED)
+                for future in done:
+                    record(future.result())
+        while pending:
+            done, pending = wait(pending, return_when=FIRST_COMPLETED)
+            for future in done:
+                record(future.result())
+
+    stats.elapsed = time.perf_counter() - started
+    if keep_results:
+        report.results.sort(key=lambda result: result.index)
+    if progress is not None:
+        progress(stats)
+    return report
+
+
+def _percentile(values: List[float], percent: float) -> float:
+    """Return the nearest-rank percentile of values, or 0.0 if empty."""
+    if not values:
+        return 0.0
+    ordered = sorted(values)
+    rank = max(0, min(len(ordered) - 1, math.ceil(percent / 100 * len(ordered)) - 1))
+    return ordered[rank]
+
+
+def _print_progress(stats: BulkStats) -> None:
+    """Default progress reporter."""
+    print(stats.summary())
@@ -0,0 +1,411 @@
+"""
+Read-through cache module.
+
+Provides an opt-in TTL + LRU cache for single-resource reads (`get_inbox`,
+`get_thread`, `get_domain`, `get_webhook`). Writes made through this package
+invalidate the matching entries, so cached reads never serve data that is
+known to be stale. A read that was already in flight when a write invalidated
+its key does not store its (possibly pre-write) result.
+
+The cache is disabled by default; call `enable_cache()` to turn it on.
+"""
+
+import functools
+import inspect
+import threading
+import time
+from collections import Counter, OrderedDict
+from typing import Any, Callable, Dict, Hashable, Optional, Set, Tuple
+
+from .singleflight import expire_in_flight
+
+# Default time-to-live per resource type, in seconds
+DEFAULT_TTLS = {
+    "inbox": 60.0,
+    "thread": 30.0,
+    "domain": 300.0,
+    "webhook": 300.0
+}
+DEFAULT_MAXSIZE = 1024
+
+
+class PendingRead:
+    """A cache miss being fetched; marked stale if its key is invalidated meanwhile."""
+
+    __slots__ = ("resource", "key", "stale")
+
+    def __init__(self, resource: str, key: Hashable):
+        self.resource = resource
+        self.key = key
+        self.stale = False
+
+
+class TTLCache:
+    """Thread-safe LRU cache with per-resource time-to-live."""
+
+    def __init__(self, maxsize: int = DEFAULT_MAXSIZE, ttls: Optional[Dict[str, float]] = None):
+        """
+        Initialize the cache.
+
+        Args:
+            maxsize: Maximum number of entries kept; least recently used
+                     entries are evicted first
+            ttls: Optional per-resource TTLs in seconds, merged over DEFAULT_TTLS
+        """
+        self.maxsize = maxsize
+        self.ttls = dict(DEFAULT_TTLS)
+        if ttls:
+            self.ttls.update(ttls)
+        self._entries: "OrderedDict[Tuple[str, Hashable], Tuple[float, Any]]" = OrderedDict()
+        self._lock = threading.Lock()
+        self._hits: Counter = Counter()
+        self._misses: Counter = Counter()
+        self._evictions = 0
+        self._invalidations = 0
+        # Reads in flight by (resource, resource ID)
+        self._pending: Dict[Tuple[str, Any], Set[PendingRead]] = {}
+
+    def get(self, resource: str, key: Hashable) -> Tuple[bool, Any]:
+        """
+        Look up an entry.
+
+        Returns:
+            Tuple of (hit, value); value is None on a miss
+        """
+        with self._lock:
+            entry = self._entries.get((resource, key))
+            if entry is not None:
+                expires, value = entry
+                if expires > time.monotonic():
+                    self._entries.move_to_end((resource, key))
+                    self._hits[resource] += 1
+                    return True, value
+                del self._entries[(resource, key)]
+            self._misses[resource] += 1
+            return False, None
+
+    def begin_read(self, resource: str, key: Hashable) -> PendingRead:
+        """
+        Register a read about to fetch a missed entry.
+
+        Pass the returned token to `set()` with the fetched value and to
+        `end_read()` once the read finishes, successfully or not.
+        """
+        read = PendingRead(resource, key)
+        with self._lock:
+            self._pending.setdefault((resource, key[0]), set()).add(read)
+        return read
+
+    def end_read(self, read: PendingRead) -> None:
+        """Unregister a read started with `begin_read()`."""
+        with self._lock:
+            reads = self._pending.get((read.resource, read.key[0]))
+            if reads is not None:
+                reads.discard(read)
+                if not reads:
+                    del self._pending[(read.resource, read.key[0])]
+
+    def set(self, resource: str, key: Hashable, value: Any, read: Optional[PendingRead] = None) -> None:
+        """
+        Store an entry, evicting the least recently used one if full.
+
+        Args:
+            resource: Resource type
+            key: (resource ID, API key)
+            value: Value to cache
+            read: Token from `begin_read()`; the value is dropped if the key
+                  was invalidated after the read started
+        """
+        ttl = self.ttls.get(resource, 0.0)
+        if ttl <= 0:
+            return
+        with self._lock:
+            if read is not None and read.stale:
+                return
+            self._entries[(resource, key)] = (time.monotonic() + ttl, value)
+            self._entries.move_to_end((resource, key))
+            while len(self._entries) > self.maxsize:
+                self._entries.popitem(last=False)
+                self._evictions += 1
+
+    def invalidate(self, resource: str, resource_id: str) -> None:
+        """Drop every entry for a resource ID, regardless of API key."""
+        with self._lock:
+            stale = [k for k in self._entries if k[0] == resource and k[1][0] == resource_id]
+            for k in stale:
+                del self._entries[k]
+            self._invalidations += len(stale)
+            for read in self._pending.get((resource, resource_id), ()):
+                read.stale = True
+
+    def invalidate_where(self, resource: str, predicate: Callable[[Any], bool]) -> None:
+        """
+        Drop every entry of a resource type whose value matches predicate.
+
+        Reads of that resource type in flight have no value to match yet, so
+        all of them are marked stale.
+        """
+        with self._lock:
+            stale = [k for k, (_, v) in self._entries.items() if k[0] == resource and predicate(v)]
+            for k in stale:
+                del self._entries[k]
+            self._invalidations += len(stale)
+            for (pending_resource, _), reads in self._pending.items():
+                if pending_resource == resource:
+                    for read in reads:
+                        read.stale = True
+
+    def clear(self) -> None:
+        """Drop every entry."""
+        with self._lock:
+            self._entries.clear()
+            for reads in self._pending.values():
+                for read in reads:
+                    read.stale = True
+
+    def stats(self) -> Dict[str, Any]:
+        """
+        Return cache counters.
+
+        Returns:
+            Dictionary with size, hits, misses, hit_rate, evictions,
+            invalidations and per-resource hit/miss counts
+        """
+        with self._lock:
+            hits = sum(self._hits.values())
+            misses = sum(self._misses.values())
+            resources = set(self._hits) | set(self._misses)
+            return {
+                "size": len(self._entries),
+                "maxsize": self.maxsize,
+                "hits": hits,
+                "misses": misses,
+                "hit_rate": hits / (hits + misses) if hits + misses else 0.0,
+                "evictions": self._evictions,
+                "invalidations": self._invalidations,
+                "by_resource": {
+                    r: {"hits": self._hits[r], "misses": self._misses[r]} for r in sorted(resources)
+                }
+            }
+
+
+_cache: Optional[TTLCache] = None
+
+
+def enable_cache(maxsize: int = DEFAULT_MAXSIZE, ttls: Optional[Dict[str, float]] = None) -> TTLCache:
+    """
+    Enable the process-wide read-through cache.
+
+    Args:
+        maxsize: Maximum number of cached entries
+        ttls: Optional per-resource TTLs in seconds, e.g. {"thread": 10.0}.
+              A TTL of 0 disables caching for that resource.
+
+    Returns:
+        The new TTLCache
+    """
+    global _cache
+    _cache = TTLCache(maxsize=maxsize, ttls=ttls)
+    return _cache
+
+
+def disable_cache() -> None:
+    """Disable and drop the process-wide cache."""
+    global _cache
+    _cache = None
+
+
+def get_cache() -> Optional[TTLCache]:
+    """
+    Return the process-wide cache.
+
+    Returns:
+        The active TTLCache, or None if caching is disabled
+    """
+    return _cache
+
+
+def cache_stats() -> Dict[str, Any]:
+    """
+    Return counters of the process-wide cache.
+
+    Returns:
+        Cache statistics, or an empty dictionary if caching is disabled
+    """
+    return _cache.stats() if _cache is not None else {}
+
+
+def cached(resource: str, id_arg: str) -> Callable:
+    """
+    Decorate a single-resource read with the read-through cache.
+
+    Entries are keyed by resource ID and API key. A result is not stored if
+    a write invalidated its key while the read was in flight. Works for both
+    sync and async functions.
+
+    Args:
+        resource: Resource type, used to pick the TTL
+        id_arg: Name of the parameter holding the resource ID
+    """
+    def decorator(func: Callable) -> Callable:
+        key_of = _key_getter(func, id_arg)
+
+        if inspect.iscoroutinefunction(func):
+            @functools.wraps(func)
+            async def async_wrapper(*args, **kwargs):
+                cache = _cache
+                if cache is None:
+                    return await func(*args, **kwargs)
+                key = key_of(args, kwargs)
+                hit, value = cache.get(resource, key)
+                if hit:
+                    return value
+                read = cache.begin_read(resource, key)
+                try:
+                    value = await func(*args, **kwargs)
+                    cache.set(resource, key, value, read)
+                finally:
+                    cache.end_read(read)
+                return value
+            return async_wrapper
+
+        @functools.wraps(func)
+        def wrapper(*args, **kwargs):
+            cache = _cache
+            if cache is None:
+                return func(*args, **kwargs)
+            key = key_of(args, kwargs)
+            hit, value = cache.get(resource, key)
+            if hit:
+                return value
+            read = cache.begin_read(resource, key)
+            try:
+                value = func(*args, **kwargs)
+                cache.set(resource, key, value, read)
+            finally:
+                cache.end_read(read)
+            return value
+        return wrapper
+    return decorator
+
+
+def invalidates(resource: str, id_arg: str, owns: Optional[Tuple[str, str]] = None) -> Callable:
+    """
+    Decorate a write so it invalidates cached entries once it completes.
+
+    Args:
+        resource: Resource type modified by the write
+        id_arg: Name of the parameter holding the resource ID
+        owns: Optional (resource, field) pair naming cached resources owned by
+              this one, e.g. ("thread", "inbox_id") drops cached threads of a
+              deleted inbox
+    """
+    def decorator(func: Callable) -> Callable:
+        key_of = _key_getter(func, id_arg)
+
+        def invalidate(args: tuple, kwargs: dict) -> None:
+            # Reads issued from now on must not share a request started before the write
+            expire_in_flight()
+            cache = _cache
+            if cache is None:
+                return
+            resource_id = key_of(args, kwargs)[0]
+            cache.invalidate(resource, resource_id)
+            if owns is not None:
+                owned, field = owns
+                cache.invalidate_where(owned, lambda v: _field(v, field) == resource_id)
+
+        if inspect.iscoroutinefunction(func):
+            @functools.wraps(func)
+            async def async_wrapper(*args, **kwargs):
+                try:
+                    return await func(*args, **kwargs)
+                finally:
+                    invalidate(args, kwargs)
+            return async_wrapper
+
+        @functools.wraps(func)
+        def wrapper(*args, **kwargs):
+            try:
+                return func(*args, **kwargs)
+            finally:
+                invalidate(args, kwargs)
+        return wrapper
+    return decorator
+
+
+def invalidates_thread(message_arg: Optional[str] = None) -> Callable:
+    """
+    Decorate a message write (send or reply) so it invalidates the thread it changed.
+
+    The changed thread is named by the write's result ("thread_id"). For
+    replies, cached threads holding the replied-to message are invalidated
+    too, even if the write failed without a response.
+
+    Args:
+        message_arg: Optional name of the parameter holding the ID of the
+                     message replied to
+    """
+    def decorator(func: Callable) -> Callable:
+        message_of = _key_getter(func, message_arg) if message_arg is not None else None
+
+        def invalidate(args: tuple, kwargs: dict, result: Any) -> None:
+            expire_in_flight()
+            cache = _cache
+            if cache is None:
+                return
+            thread_id = _field(result, "thread_id")
+            if thread_id is not None:
+                cache.invalidate("thread", thread_id)
+            if message_of is not None:
+                message_id = message_of(args, kwargs)[0]
+                cache.invalidate_where("thread", lambda v: _holds_message(v, message_id))
+
+        if inspect.iscoroutinefunction(func):
+            @functools.wraps(func)
+            async def async_wrapper(*args, **kwargs):
+                result = None
+                try:
+                    result = await func(*args, **kwargs)
+                    return result
+                finally:
+                    invalidate(args, kwargs, result)
+            return async_wrapper
+
+        @functools.wraps(func)
+        def wrapper(*args, **kwargs):
+            result = None
+            try:
+                result = func(*args, **kwargs)
+                return result
+            finally:
+                invalidate(args, kwargs, result)
+        return wrapper
+    return decorator
+
+
+def _holds_message(thread: Any, message_id: str) -> bool:
+    """Whether a cached thread contains a message."""
+    if _field(thread, "last_message_id") == message_id:
+        return True
+    return any(_field(message, "message_id") == message_id for message in _field(thread, "messages") or ())
+
+
+def _key_getter(func: Callable, id_arg: str) -> Callable[[tuple, dict], Tuple[Any, Any]]:
+    """Build a function extracting (resource ID, API key) from call arguments."""
+    params = list(inspect.signature(func).parameters)
+    id_index = params.index(id_arg)
+    key_index = params.index("api_key")
+
+    def key_of(args: tuple, kwargs: dict) -> Tuple[Any, Any]:
+        resource_id = args[id_index] if len(args) > id_index else kwargs.get(id_arg)
+        api_key = args[key_index] if len(args) > key_index else kwargs.get("api_key")
+        return resource_id, api_key
+    return key_of
+
+
+def _field(value: Any, name: str) -> Any:
+    """Read a field from a model or dictionary."""
+    if isinstance(value, dict):
+        return value.get(name)
+    return getattr(value, name, None)
@@ -0,0 +1,323 @@
+"""
+HTTP record/replay module.
+
+Provides httpx transports that record real request/response pairs to a
+compact cassette file and replay them later without a network or API key,
+optionally with simulated latency. This lets throughput tests of the
+wrappers and of pipeline code built on them run deterministically offline.
+
+Cassettes are JSON Lines, one interaction per line (gzip-compressed when the
+path ends in .gz). Request headers are never stored, so API keys do not end
+up in cassettes; request bodies are stored as a short digest only.
+"""
+
+import asyncio
+import base64
+import gzip
+import hashlib
+import json
+import os
+import random
+import threading
+import time
+from collections import defaultdict, deque
+from typing import Any, Callable, Deque, Dict, List, Optional, Tuple, Union
+
+import httpx
+
+RECORD = "record"
+REPLAY = "replay"
+MODES = (RECORD, REPLAY)
+
+# Response headers worth keeping; everything else is dropped to keep cassettes small
+_KEPT_HEADERS = ("content-type", "retry-after", "content-range", "accept-ranges")
+
+Latency = Union[None, float, str, Callable[[], float]]
+
+
+class CassetteMissError(LookupError):
+    """Raised when a replayed request has no recorded response."""
+
+
+class Cassette:
+    """A file of recorded HTTP interactions."""
+
+    def __init__(
+        self,
+        path: str,
+        mode: str = REPLAY,
+        latency: Latency = None,
+        match_body: bool = True
+    ):
+        """
+        Open a cassette.
+
+        Args:
+            path: Path to the cassette file (.jsonl, or .jsonl.gz to compress)
+            mode: "record" to append live interactions, "replay" to serve
+                  recorded ones
+            latency: Optional simulated latency when replaying: seconds as a
+                     float, "recorded" to reproduce the recorded timings, or a
+                     callable returning seconds (e.g. a random distribution)
+            match_body: Whether replayed requests must match the recorded
+                        request body. Requests without an exact match fall
+                        back to any recording of the same method and path.
+
+        Raises:
+            ValueError: If mode is unknown
+            FileNotFoundError: If replaying a cassette that does not exist
+        """
+        if mode not in MODES:
+            raise ValueError(f"Unknown cassette mode: {mode}")
+        self.path = path
+        self.mode = mode
+        self.latency = latency
+        self.match_body = match_body
+        self._lock = threading.Lock()
+        self._exact: Dict[tuple, Deque[Dict[str, Any]]] = defaultdict(deque)
+        self._loose: Dict[tuple, Deque[Dict[str, Any]]] = defaultdict(deque)
+        self._last: Dict[tuple, Dict[str, Any]] = {}
+        self._stats = {"recorded": 0, "replayed": 0, "fallbacks": 0, "misses": 0}
+        if mode == REPLAY:
+            for entry in self._read():
+                self._exact[_exact_key(entry)].append(entry)
+                self._loose[_loose_key(entry)].append(entry)
+
+    def __len__(self) -> int:
+        return sum(len(entries) for entries in self._exact.values())
+
+    def stats(self) -> Dict[str, int]:
+        """
+        Return cassette counters.
+
+        Returns:
+            Dictionary with interactions recorded and replayed, replays
+            served by a method-and-path fallback, and misses
+        """
+        with self._lock:
+            return dict(self._stats)
+
+    def record(self, request: httpx.Request, response: httpx.Response, elapsed: float) -> None:
+        """
+        Append one interaction to the cassette file.
+
+        Args:
+            request: The sent request
+            response: The received response, with its content already read
+            elapsed: Seconds the request took
+        """
+        entry = {
+            "method": request.method,
+            "path": request.url.raw_path.decode("ascii"),
+            "body": _digest(request.content),
+            "status": response.status_code,
+            "headers": {
+                name: response.headers[name] for name in _KEPT_HEADERS if name in response.headers
+            },
+            "elapsed": round(elapsed, 4)
+        }
+        content = response.content
+        try:
+            entry["text"] = content.decode("utf-8")
+        except UnicodeDecodeError:
+            entry["base64"] = base64.b64encode(content).decode("ascii")
+        line = json.dumps(entry, separators=(",", ":"), ensure_ascii=False) + "\n"
+        with self._lock:
+            with _open(self.path, "at") as f:
+                f.write(line)
+            self._stats["recorded"] += 1
+
+    def lookup(self, request: httpx.Request) -> Dict[str, Any]:
+        """
+        Return the recorded interaction for a request.
+
+        Recordings of identical requests are replayed in order; once they are
+        used up, the last one is repeated.
+
+        Args:
+            request: The request to answer
+
+        Returns:
+            Recorded interaction dictionary
+
+        Raises:
+            CassetteMissError: If nothing was recorded for the request
+        """
+        method = request.method
+        path = request.url.raw_path.decode("ascii")
+        keys = [("exact", (method, path, _digest(request.content)))] if self.match_body else []
+        keys.append(("loose", (method, path.split("?", 1)[0])))
+        with self._lock:
+            for index, (kind, key) in enumerate(keys):
+                entries = (self._exact if kind == "exact" else self._loose).get(key)
+                entry = entries.popleft() if entries else self._last.get((kind, key))
+                if entry is not None:
+                    self._last[(kind, key)] = entry
+                    self._stats["replayed"] += 1
+                    self._stats["fallbacks"] += index > 0 or not self.match_body
+                    return entry
+            self._stats["misses"] += 1
+        raise CassetteMissError(f"No recorded response for {method} {path} in {self.path}")
+
+    def delay(self, entry: Dict[str, Any]) -> float:
+        """Return the simulated latency for a replayed interaction."""
+        if self.latency is None:
+            return 0.0
+        if self.latency == "recorded":
+            return entry.get("elapsed", 0.0)
+        if callable(self.latency):
+            return max(0.0, self.latency())
+        return float(self.latency)
+
+    def _read(self) -> List[Dict[str, Any]]:
+        """Load every recorded interaction."""
+        with _open(self.path, "rt") as f:
+            return [json.loads(line) for line in f if line.strip()]
+
+
+class RecordingTransport(httpx.BaseTransport):
+    """HTTP transport that records every interaction to a cassette."""
+
+    def __init__(self, transport: httpx.BaseTransport, cassette: Cassette):
+        self._transport = transport
+        self._cassette = cassette
+
+    def handle_request(self, request: httpx.Request) -> httpx.Response:
+        request.read()
+        started = time.perf_counter()
+        response = self._transport.handle_request(request)
+        try:
+            content = response.read()
+        finally:
+            response.close()
+        elapsed = time.perf_counter() - started
+        recorded = httpx.Response(
+            response.status_code, headers=_decoded_headers(response), content=content, request=request
+        )
+        self._cassette.record(request, recorded, elapsed)
+        return recorded
+
+    def close(self) -> None:
+        self._transport.close()
+
+
+class AsyncRecordingTransport(httpx.AsyncBaseTransport):
+    """Async HTTP transport that records every interaction to a cassette."""
+
+    def __init__(self, transport: httpx.AsyncBaseTransport, cassette: Cassette):
+        self._transport = transport
+        self._cassette = cassette
+
+    async def handle_async_request(self, request: httpx.Request) -> httpx.Response:
+        await request.aread()
+        started = time.perf_counter()
+        response = await self._transport.handle_async_request(request)
+        try:
+            content = await response.aread()
+        finally:
+            await response.aclose()
+        elapsed = time.perf_counter() - started
+        recorded = httpx.Response(
+            response.status_code, headers=_decoded_headers(response), content=content, request=request
+        )
+        self._cassette.record(request, recorded, elapsed)
+        return recorded
+
+    async def aclose(self) -> None:
+        await self._transport.aclose()
+
+
+class ReplayTransport(httpx.BaseTransport, httpx.AsyncBaseTransport):
+    """HTTP transport (sync and async) that answers from a cassette."""
+
+    def __init__(self, cassette: Cassette):
+        self._cassette = cassette
+
+    def handle_request(self, request: httpx.Request) -> httpx.Response:
+        request.read()
+        entry = self._cassette.lookup(request)
+        delay = self._cassette.delay(entry)
+        if delay:
+            time.sleep(delay)
+        return _response(entry, request)
+
+    async def handle_async_request(self, request: httpx.Request) -> httpx.Response:
+        await request.aread()
+        entry = self._cassette.lookup(request)
+        delay = self._cassette.delay(entry)
+        if delay:
+            await asyncio.sleep(delay)
+        return _response(entry, request)
+
+
+def jitter(mean: float, spread: float = 0.5, seed: Optional[int] = None) -> Callable[[], float]:
+    """
+    Build a latency distribution for replay.
+
+    Args:
+        mean: Mean latency in seconds
+        spread: Fraction of the mean latencies vary by, uniformly
+        seed: Optional random seed for repeatable runs
+
+    Returns:
+        Callable returning a latency in seconds, for `Cassette(latency=...)`
+    """
+    rng = random.Random(seed)
+    return lambda: mean * (1 + rng.uniform(-spread, spread))
+
+
+def cassette_from_env() -> Optional[Cassette]:
+    """
+    Open the cassette configured by environment variables, if any.
+
+    AGENTMAIL_CASSETTE names the file, AGENTMAIL_CASSETTE_MODE is "record"
+    or "replay" (the default) and AGENTMAIL_CASSETTE_LATENCY is a number of
+    seconds or "recorded".
+
+    Returns:
+        The configured Cassette, or None
+    """
+    path = os.getenv("AGENTMAIL_CASSETTE")
+    if not path:
+        return None
+    latency: Latency = os.getenv("AGENTMAIL_CASSETTE_LATENCY") or None
+    if latency is not None and latency != "recorded":
+        latency = float(latency)
+    return Cassette(path, mode=os.getenv("AGENTMAIL_CASSETTE_MODE", REPLAY), latency=latency)
+
+
+def _response(entry: Dict[str, Any], request: httpx.Request) -> httpx.Response:
+    """Build a response from a recorded interaction."""
+    if "base64" in entry:
+        content = base64.b64decode(entry["base64"])
+    else:
+        content = entry.get("text", "").encode("utf-8")
+    return httpx.Response(entry["status"], headers=entry["headers"], content=content, request=request)
+
+
+def _decoded_headers(response: httpx.Response) -> List[Tuple[str, str]]:
+    """Return response headers without those describing the raw (encoded) body."""
+    return [
+        (name, value) for name, value in response.headers.multi_items()
+        if name.lower() not in ("content-encoding", "content-length", "transfer-encoding")
+    ]
+
+
+def _exact_key(entry: Dict[str, Any]) -> Tuple[str, str, str]:
+    return entry["method"], entry["path"], entry["body"]
+
+
+def _loose_key(entry: Dict[str, Any]) -> Tuple[str, str]:
+    return entry["method"], entry["path"].split("?", 1)[0]
+
+
+def _digest(content: bytes) -> str:
+    """Return a short digest of a request body."""
+    return hashlib.sha256(content).hexdigest()[:16] if content else ""
+
+
+def _open(path: str, mode: str):
+    """Open a cassette file, compressed when the path ends in .gz."""
+    if path.endswith(".gz"):
+        return gzip.open(path, mode, encoding="utf-8")
+    return open(path, mode, encoding="utf-8")
@@ -0,0 +1,246 @@
+"""
+Batch command-line module.
+
+Runs a stream of wrapper calls read as JSON Lines from stdin through one
+pooled client and writes one NDJSON result per call to stdout, so shell
+pipelines can perform thousands of operations with a single interpreter and
+a single warm connection pool:
+
+    $ printf '%s\n' \\
+        '{"op": "inboxes.list_inboxes"}' \\
+        '{"id": "t1", "op": "get_thread", "args": {"thread_id": "..."}}' \\
+      | python -m src.agentmail --concurrency 16
+
+Each input line names an operation (`<module>.<function>` or just the
+function name, e.g. "send_message") and optional keyword arguments in
+"args". Results are written as calls complete:
+
+    {"id": "t1", "op": "threads.get_thread", "ok": true, "result": {...}}
+    {"id": 2, "op": "messages.send_message", "ok": false, "error": {"type": ..., "message": ...}}
+
+Operations returning an iterator (`iter_*`) write one line per item with an
+"item" index, followed by a final line holding the item "count". The id
+defaults to the input line number.
+"""
+
+import argparse
+import base64
+import importlib
+import inspect
+import json
+import sys
+import threading
+from concurrent.futures import FIRST_COMPLETED, ThreadPoolExecutor, wait
+from typing import Any, Callable, Dict, Iterable, Iterator, List, Optional, TextIO, Tuple
+
+from .serialization import to_dict
+
+# Modules whose public functions are available as operations
+OPERATION_MODULES = (
+    "api_keys", "attachments", "domains", "drafts", "inboxes", "messages",
+    "metrics", "pods", "threads", "webhooks"
+)
+DEFAULT_CONCURRENCY = 8
+
+_operations: Optional[Dict[str, Tuple[str, Callable]]] = None
+
+
+class OperationError(ValueError):
+    """Raised for an input line that does not describe a valid operation."""
+
+
+def operations() -> Dict[str, Tuple[str, Callable]]:
+    """
+    Return every available operation.
+
+    Returns:
+        Dictionary mapping both "<module>.<function>" and the bare function
+        name to (qualified name, function)
+    """
+    global _operations
+    if _operations is None:
+        table = {}
+        for module_name in OPERATION_MODULES:
+            module = importlib.import_module(f".{module_name}", __package__)
+            for name, func in inspect.getmembers(module, inspect.isfunction):
+                if name.startswith("_") or func.__module__ != module.__name__:
+                    continue
+                qualified = f"{module_name}.{name}"
+                table[qualified] = (qualified, func)
+                table.setdefault(name, (qualified, func))
+        _operations = table
+    return _operations
+
+
+def run_batch(
+    lines: Iterable[str],
+    output: TextIO,
+    concurrency: int = DEFAULT_CONCURRENCY,
+    api_key: Optional[str] = None,
+    fail_fast: bool = False
+) -> Dict[str, int]:
+    """
+    Run operations from JSON Lines and write NDJSON results.
+
+    At most 2 * concurrency operations are read ahead, so arbitrarily long
+    input streams run in constant memory.
+
+    Args:
+        lines: Input lines, one JSON operation per line; blank lines are skipped
+        output: Text stream results are written to
+        concurrency: Maximum number of operations running at the same time
+        api_key: Optional API key used for operations that do not set their own.
+                 If not provided, will load from environment.
+        fail_fast: Whether to stop reading input after the first failure
+
+    Returns:
+        Dictionary with the number of operations that succeeded and failed
+    """
+    if concurrency < 1:
+        raise ValueError("concurrency must be at least 1")
+    # Import the wrapper modules once, before the workers need them
+    operations()
+    write_lock = threading.Lock()
+    counts = {"ok": 0, "failed": 0}
+
+    def write(record: Dict[str, Any]) -> None:
+        line = json.dumps(record, default=_default, ensure_ascii=False)
+        with write_lock:
+            output.write(line + "\n")
+            output.flush()
+
+    def run_one(number: int, line: str) -> bool:
+        op_id: Any = number
+        name = None
+        try:
+            request = json.loads(line)
+            if not isinstance(request, dict):
+                raise OperationError("Each line must be a JSON object")
+            op_id = request.get("id", number)
+            name, func, kwargs = _resolve(request, api_key)
+            result = func(**kwargs)
+            if inspect.isgenerator(result) or _is_item_iterator(result):
+                count = 0
+                for count, item in enumerate(result, 1):
+                    write({"id": op_id, "op": name, "ok": True, "item": count - 1, "result": _jsonable(item)})
+                write({"id": op_id, "op": name, "ok": True, "count": count})
+            else:
+                write({"id": op_id, "op": name, "ok": True, "result": _jsonable(result)})
+            return True
+        except Exception as e:
+            write({"id": op_id, "op": name, "ok": False, "error": _error(e)})
+            return False
+
+    def record(done: Iterable) -> bool:
+        failed = False
+        for future in done:
+            if future.result():
+                counts["ok"] += 1
+            else:
+                counts["failed"] += 1
+                failed = True
+        return failed
+
+    with ThreadPoolExecutor(max_workers=concurrency) as executor:
+        pending = set()
+        for number, line in enumerate(lines, 1):
+            if not line.strip():
+                continue
+            pending.add(executor.submit(run_one, number, line))
+            if len(pending) >= 2 * concurrency:
+                done, pending = wait(pending, return_when=FIRST_COMPLETED)
+                if record(done) and fail_fast:
+                    break
+        while pending:
+            done, pending = wait(pending, return_when=FIRST_COMPLETED)
+            record(done)
+    return counts
+
+
+def main(argv: Optional[List[str]] = None) -> int:
+    """Entry point of `python -m src.agentmail`."""
+    parser = argparse.ArgumentParser(
+        prog="python -m src.agentmail",
+        description="Run AgentMail operations read as JSON Lines from stdin; write NDJSON results to stdout."
+    )
+    parser.add_argument("--concurrency", type=int, default=DEFAULT_CONCURRENCY,
+                        help="Maximum number of operations running at once")
+    parser.add_argument("--api-key", help="API key; defaults to AGENTMAIL_API_KEY or .env")
+    parser.add_argument("--fail-fast", action="store_true", help="Stop reading input after the first failure")
+    parser.add_argument("--list", action="store_true", help="List available operations and exit")
+    args = parser.parse_args(argv)
+
+    if args.list:
+        for name, (qualified, func) in sorted(operations().items()):
+            if name == qualified:
+                print(f"{name}{inspect.signature(func)}")
+        return 0
+
+    counts = run_batch(sys.stdin, sys.stdout, args.concurrency, args.api_key, args.fail_fast)
+    print(f"{counts['ok']} succeeded, {counts['failed']} failed", file=sys.stderr)
+    return 1 if counts["failed"] else 0
+
+
+def _resolve(request: Dict[str, Any], api_key: Optional[str]) -> Tuple[str, Callable, Dict[str, Any]]:
+    """Look up the function and keyword arguments of an input operation."""
+    op = request.get("op")
+    if not isinstance(op, str):
+        raise OperationError('Missing "op"')
+    entry = operations().get(op)
+    if entry is None:
+        raise OperationError(f"Unknown operation: {op}")
+    name, func = entry
+    kwargs = request.get("args") or {}
+    if not isinstance(kwargs, dict):
+        raise OperationError('"args" must be a JSON object')
+    kwargs = dict(kwargs)
+    if api_key is not None and "api_key" in inspect.signature(func).parameters:
+        kwargs.setdefault("api_key", api_key)
+    return name, func, kwargs
+
+
+def _is_item_iterator(result: Any) -> bool:
+    """Whether a result is a lazy iterator of items (e.g. from `iter_*`)."""
+    return isinstance(result, Iterator) and not hasattr(result, "model_dump")
+
+
+def _jsonable(value: Any) -> Any:
+    """Convert a wrapper result to JSON-compatible data."""
+    if value is None or isinstance(value, (str, int, float, bool)):
+        return value
+    if isinstance(value, (bytes, bytearray)):
+        try:
+            return bytes(value).decode("utf-8")
+        except UnicodeDecodeError:
+            return {"base64": base64.b64encode(value).decode("ascii")}
+    if isinstance(value, dict) or hasattr(value, "model_dump") or hasattr(value, "_asdict"):
+        return to_dict(value)
+    if isinstance(value, (list, tuple)):
+        return [_jsonable(item) for item in value]
+    return value
+
+
+def _default(value: Any) -> Any:
+    """JSON fallback for values nested inside results."""
+    if hasattr(value, "model_dump"):
+        return to_dict(value)
+    if hasattr(value, "__dict__"):
+        return vars(value)
+    return str(value)
+
+
+def _error(error: BaseException) -> Dict[str, Any]:
+    """Describe an exception for an error result line."""
+    described = {"type": type(error).__name__, "message": str(error)}
+    status = getattr(error, "status_code", None)
+    if status is not None:
+        # API errors: report the response body rather than the full repr
+        described["status"] = status
+        body = getattr(error, "body", None)
+        if isinstance(body, dict) and "message" in body:
+            described["message"] = body["message"]
+        elif getattr(body, "message", None):
+            described["message"] = body.message
+        elif body is not None:
+            described["message"] = str(body)
+    return described
@@ -2,37 +2,374 @@
 Client configuration and initialization module.
 
 Provides a centralized way to initialize and configure the AgentMail client.
+
+Clients are pooled process-wide: every wrapper function calls `get_client()`,
+which returns a shared, thread-safe client keyed by API key and connection
+options, so repeated calls reuse the same HTTP connection pool instead of
+paying for a new TCP/TLS handshake on every operation. Every request made by
+a pooled client passes through the shared rate limiter (see `ratelimit`).
+
+With a cassette configured (see `use_cassette()` and `cassette`), pooled
+clients record their traffic to it or replay it instead of using the network.
+`use_transport()` (or the `base_url`/`transport` options) points clients at
+another backend, such as the in-process fake in `fake_server`.
+
+Importing this module is cheap: httpx, python-dotenv and the AgentMail SDK
+are imported on the first call that needs them, so short-lived scripts only
+pay for them once they actually make a request.
 """
 
+import atexit
 import os
-from typing import Optional
-from dotenv import load_dotenv
-from agentmail import AgentMail
+import threading
+from typing import TYPE_CHECKING, Any, Dict, NamedTuple, Optional
+
+if TYPE_CHECKING:
+    import httpx
+    from agentmail import AgentMail
+    from agentmail.environment import AgentMailEnvironment
+
+    from .cassette import Cassette, Latency
+
+# Default connection pool settings for pooled clients
+DEFAULT_MAX_CONNECTIONS = 100
+DEFAULT_MAX_KEEPALIVE_CONNECTIONS = 20
+DEFAULT_KEEPALIVE_EXPIRY = 30.0
+DEFAULT_TIMEOUT = 60.0
+
+
+class ClientOptions(NamedTuple):
+    """Connection options that identify a pooled client."""
+
+    max_connections: int = DEFAULT_MAX_CONNECTIONS
+    max_keepalive_connections: int = DEFAULT_MAX_KEEPALIVE_CONNECTIONS
+    keepalive_expiry: float = DEFAULT_KEEPALIVE_EXPIRY
+    timeout: float = DEFAULT_TIMEOUT
+    base_url: Optional[str] = None
+    transport: Optional[Any] = None
+
+
+# Reentrant: building a client under the lock may configure the cassette
+_lock = threading.RLock()
+_clients: Dict[tuple, "AgentMail"] = {}
+_http_clients: Dict[tuple, "httpx.Client"] = {}
+_download_client: Optional["httpx.Client"] = None
+_env_loaded = False
+_cassette: Optional["Cassette"] = None
+_cassette_configured = False
+# Process-wide backend overrides set by use_transport()
+_default_base_url: Optional[str] = None
+_default_transport: Optional[Any] = None
+
 
+def _load_env() -> None:
+    """Load the .env file once per process."""
+    global _env_loaded
+    if _env_loaded:
+        return
+    with _lock:
+        if not _env_loaded:
+            from dotenv import load_dotenv
+            load_dotenv()
+            _env_loaded = True
 
-def get_client(api_key: Optional[str] = None) -> AgentMail:
+
+def resolve_api_key(api_key: Optional[str] = None) -> str:
     """
-    Initialize and return an AgentMail client instance.
-    
+    Resolve the API key to use for a request.
+
     Args:
         api_key: Optional API key. If not provided, will attempt to load
                  from environment variable AGENTMAIL_API_KEY or .env file.
-    
+
     Returns:
-        AgentMail: Initialized client instance
-    
+        The resolved API key
+
     Raises:
         ValueError: If no API key is provided and none is found in environment
     """
     if api_key is None:
-        load_dotenv()
+        _load_env()
         api_key = os.getenv("AGENTMAIL_API_KEY")
-    
+
+    if not api_key:
+        cassette = _active_cassette()
+        if _default_transport is not None or (cassette is not None and cassette.mode == "replay"):
+            # Traffic that never reaches the API needs no real key
+            api_key = "local"
+
     if not api_key:
         raise ValueError(
             "API key is required. Provide it as an argument or set "
             "AGENTMAIL_API_KEY environment variable."
         )
-    
-    return AgentMail(api_key=api_key)
 
+    return api_key
+
+
+def get_client(
+    api_key: Optional[str] = None,
+    max_connections: Optional[int] = None,
+    max_keepalive_connections: Optional[int] = None,
+    keepalive_expiry: Optional[float] = None,
+    timeout: Optional[float] = None,
+    base_url: Optional[str] = None,
+    transport: Optional["httpx.BaseTransport"] = None
+) -> "AgentMail":
+    """
+    Return a pooled AgentMail client instance.
+
+    Clients are cached per API key and connection options, so every call
+    with the same arguments returns the same client and shares its HTTP
+    connection pool. The returned client is safe to use from multiple threads.
+
+    Args:
+        api_key: Optional API key. If not provided, will attempt to load
+                 from environment variable AGENTMAIL_API_KEY or .env file.
+        max_connections: Optional maximum number of concurrent connections
+        max_keepalive_connections: Optional maximum number of idle connections
+                                   kept alive in the pool
+        keepalive_expiry: Optional number of seconds an idle connection is kept
+        timeout: Optional request timeout in seconds
+        base_url: Optional API base URL. Defaults to the one set by
+                  `use_transport()`, then AGENTMAIL_BASE_URL, then production.
+        transport: Optional httpx transport requests are sent through instead
+                   of the network, e.g. a `fake_server.FakeTransport`
+
+    Returns:
+        AgentMail: Initialized client instance
+
+    Raises:
+        ValueError: If no API key is provided and none is found in environment
+    """
+    api_key = resolve_api_key(api_key)
+    options = _build_options(
+        max_connections, max_keepalive_connections, keepalive_expiry, timeout, base_url, transport
+    )
+    key = (api_key, options)
+
+    client = _clients.get(key)
+    if client is not None:
+        return client
+
+    with _lock:
+        client = _clients.get(key)
+        if client is None:
+            from agentmail import AgentMail
+            http_client = _build_http_client(options)
+            client = AgentMail(
+                api_key=api_key,
+                httpx_client=http_client,
+                timeout=options.timeout,
+                **_environment(options)
+            )
+            _http_clients[key] = http_client
+            _clients[key] = client
+    return client
+
+
+def get_http_client() -> "httpx.Client":
+    """
+    Return the pooled HTTP client used for downloads outside the API.
+
+    Signed attachment URLs point at a CDN rather than the API, so they are
+    fetched through this shared client, which keeps its own connection pool
+    and bypasses the API rate limiter.
+
+    Returns:
+        httpx.Client: Shared HTTP client instance
+    """
+    global _download_client
+    with _lock:
+        if _download_client is None:
+            _download_client = _build_download_client(_build_options(None, None, None, None))
+        return _download_client
+
+
+def close_clients() -> None:
+    """
+    Close every pooled client and release its connections.
+
+    Subsequent calls to `get_client()` build fresh clients.
+    """
+    global _download_client
+    with _lock:
+        http_clients = list(_http_clients.values())
+        if _download_client is not None:
+            http_clients.append(_download_client)
+            _download_client = None
+        _http_clients.clear()
+        _clients.clear()
+
+    for http_client in http_clients:
+        http_client.close()
+
+
+def use_cassette(
+    path: Optional[str],
+    mode: str = "replay",
+    latency: "Latency" = None,
+    match_body: bool = True
+) -> Optional["Cassette"]:
+    """
+    Record or replay the traffic of every pooled client through a cassette.
+
+    Closes the existing pooled clients so new ones pick up the cassette.
+    Without a call to this function, the AGENTMAIL_CASSETTE environment
+    variables are used (see `cassette.cassette_from_env()`).
+
+    Args:
+        path: Path to the cassette file, or None to go back to the network
+        mode: "record" or "replay"
+        latency: Optional simulated replay latency: seconds, "recorded", or
+                 a callable returning seconds
+        match_body: Whether replayed requests must match recorded bodies
+
+    Returns:
+        The active Cassette, or None
+    """
+    from .cassette import Cassette
+
+    global _cassette, _cassette_configured
+    close_clients()
+    with _lock:
+        _cassette = Cassette(path, mode, latency, match_body) if path is not None else None
+        _cassette_configured = True
+        return _cassette
+
+
+def use_transport(transport: Optional["httpx.BaseTransport"], base_url: Optional[str] = None) -> None:
+    """
+    Send the requests of every pooled client through a transport.
+
+    Closes the existing pooled clients so new ones pick up the change. The
+    transport also serves attachment downloads; async clients need it to
+    support async requests as well.
+
+    Args:
+        transport: httpx transport to use, or None to go back to the network
+        base_url: Optional API base URL to use with the transport
+    """
+    global _default_transport, _default_base_url
+    close_clients()
+    with _lock:
+        _default_transport = transport
+        _default_base_url = base_url
+
+
+def reset_clients() -> None:
+    """
+    Close every pooled client and forget the loaded environment.
+
+    The next call to `get_client()` re-reads the .env file, which is useful
+    after rotating API keys or in tests.
+    """
+    global _env_loaded, _cassette, _cassette_configured, _default_transport, _default_base_url
+    close_clients()
+    with _lock:
+        _env_loaded = False
+        _cassette = None
+        _cassette_configured = False
+        _default_transport = None
+        _default_base_url = None
+
+
+def _active_cassette() -> Optional["Cassette"]:
+    """Return the configured cassette, reading the environment on first use."""
+    global _cassette, _cassette_configured
+    if not _cassette_configured:
+        _load_env()
+        with _lock:
+            if not _cassette_configured:
+                # Only import the cassette module when one is configured
+                if os.getenv("AGENTMAIL_CASSETTE"):
+                    from .cassette import cassette_from_env
+                    _cassette = cassette_from_env()
+                _cassette_configured = True
+    return _cassette
+
+
+def _wrap_transport(transport: "httpx.BaseTransport") -> "httpx.BaseTransport":
+    """Route a sync transport through the active cassette, if any."""
+    cassette = _active_cassette()
+    if cassette is None:
+        return transport
+    from .cassette import REPLAY, RecordingTransport, ReplayTransport
+    if cassette.mode == REPLAY:
+        return ReplayTransport(cassette)
+    return RecordingTransport(transport, cassette)
+
+
+def _build_options(
+    max_connections: Optional[int],
+    max_keepalive_connections: Optional[int],
+    keepalive_expiry: Optional[float],
+    timeout: Optional[float],
+    base_url: Optional[str] = None,
+    transport: Optional[Any] = None
+) -> ClientOptions:
+    """Fill unset connection options with their defaults."""
+    if base_url is None:
+        _load_env()
+        base_url = _default_base_url or os.getenv("AGENTMAIL_BASE_URL") or None
+    return ClientOptions(
+        max_connections=(
+            DEFAULT_MAX_CONNECTIONS if max_connections is None else max_connections
+        ),
+        max_keepalive_connections=(
+            DEFAULT_MAX_KEEPALIVE_CONNECTIONS
+            if max_keepalive_connections is None
+            else max_keepalive_connections
+        ),
+        keepalive_expiry=(
+            DEFAULT_KEEPALIVE_EXPIRY if keepalive_expiry is None else keepalive_expiry
+        ),
+        timeout=DEFAULT_TIMEOUT if timeout is None else timeout,
+        base_url=base_url.rstrip("/") if base_url else None,
+        transport=_default_transport if transport is None else transport
+    )
+
+
+def _environment(options: ClientOptions) -> Dict[str, "AgentMailEnvironment"]:
+    """Return the SDK environment argument for a custom base URL, if any."""
+    if options.base_url is None:
+        return {}
+    from agentmail.environment import AgentMailEnvironment
+
+    websockets = options.base_url.replace("https://", "wss://", 1).replace("http://", "ws://", 1)
+    return {"environment": AgentMailEnvironment(http=options.base_url, websockets=websockets)}
+
+
+def _build_http_client(options: ClientOptions) -> "httpx.Client":
+    """Build the pooled HTTP client backing an AgentMail client."""
+    import httpx
+    from .ratelimit import RateLimitedTransport
+
+    limits = httpx.Limits(
+        max_connections=options.max_connections,
+        max_keepalive_connections=options.max_keepalive_connections,
+        keepalive_expiry=options.keepalive_expiry
+    )
+    inner = options.transport or _wrap_transport(httpx.HTTPTransport(limits=limits))
+    transport = RateLimitedTransport(inner)
+    return httpx.Client(
+        transport=transport,
+        timeout=options.timeout,
+        follow_redirects=True
+    )
+
+
+def _build_download_client(options: ClientOptions) -> "httpx.Client":
+    """Build the pooled HTTP client used for downloads outside the API."""
+    import httpx
+
+    limits = httpx.Limits(
+        max_connections=options.max_connections,
+        max_keepalive_connections=options.max_keepalive_connections,
+        keepalive_expiry=options.keepalive_expiry
+    )
+    transport = options.transport or _wrap_transport(httpx.HTTPTransport(limits=limits))
+    return httpx.Client(transport=transport, timeout=options.timeout, follow_redirects=True)
+
+
+atexit.register(close_clients)
@@ -0,0 +1,559 @@
+"""
+Local daemon module.
+
+Provides a long-lived process that serves wrapper calls over a Unix socket,
+and a thin client for it. The daemon keeps the pooled client (and its warm
+connections), the read cache, the rate limiter state and a directory of
+inboxes across calls, so a short-lived tool invocation costs one socket round
+trip plus the API latency:
+
+    $ python -m src.agentmail.daemon serve &
+    $ python -m src.agentmail.daemon call get_inbox '{"inbox_id": "me@agentmail.to"}'
+
+Requests and responses use the same JSON line format as the batch command
+line (see `cli`). Besides the wrapper operations, the daemon answers
+"daemon.ping", "daemon.stats", "daemon.resolve_inbox" (find an inbox by ID,
+email, username or display name without listing inboxes on every call) and
+"daemon.shutdown".
+
+Importing this module only loads the standard library, so thin clients start
+quickly.
+"""
+
+import argparse
+import json
+import os
+import socket
+import socketserver
+import stat
+import sys
+import threading
+import time
+from typing import Any, Dict, Iterator, List, Optional, Set
+
+DEFAULT_CONCURRENCY = 32
+DEFAULT_INBOX_TTL = 60.0
+# Maximum number of unknown inbox names remembered between directory refreshes
+_MAX_UNKNOWN = 1024
+# Operations after which the inbox directory is reloaded on the next lookup
+_INBOX_WRITES = {"inboxes.create_inbox", "inboxes.update_inbox", "inboxes.delete_inbox"}
+
+
+def default_socket_path() -> str:
+    """
+    Return the socket path used when none is given.
+
+    Returns:
+        AGENTMAIL_DAEMON_SOCKET if set, otherwise "agentmail.sock" in
+        XDG_RUNTIME_DIR, or else in a per-user 0700 directory in the
+        temporary directory
+
+    Raises:
+        RuntimeError: If the per-user directory exists but is not a
+                      directory owned by the current user and closed to others
+    """
+    path = os.getenv("AGENTMAIL_DAEMON_SOCKET")
+    if path:
+        return path
+    runtime_dir = os.getenv("XDG_RUNTIME_DIR")
+    if runtime_dir and os.path.isdir(runtime_dir):
+        return os.path.join(runtime_dir, "agentmail.sock")
+
+    directory = os.path.join(os.getenv("TMPDIR", "/tmp"), f"agentmail-{os.getuid()}")
+    try:
+        os.mkdir(directory, 0o700)
+    except FileExistsError:
+        pass
+    # Another user may have created the name first; never follow a symlink
+    info = os.lstat(directory)
+    if (
+        not stat.S_ISDIR(info.st_mode)
+        or info.st_uid != os.getuid()
+        or stat.S_IMODE(info.st_mode) & 0o077
+    ):
+        raise RuntimeError(
+            f"Refusing to use {directory}: it must be a directory owned by the current user "
+            "with mode 0700; remove it or set AGENTMAIL_DAEMON_SOCKET"
+        )
+    return os.path.join(directory, "daemon.sock")
+
+
+class DaemonError(RuntimeError):
+    """Raised by DaemonClient when the daemon reports a failed operation."""
+
+    def __init__(self, message: str, type: Optional[str] = None, status: Optional[int] = None):
+        super().__init__(message)
+        self.type = type
+        self.status = status
+
+
+class AgentMailDaemon:
+    """Serves wrapper calls to local clients over a Unix socket."""
+
+    def __init__(
+        self,
+        path: Optional[str] = None,
+        concurrency: int = DEFAULT_CONCURRENCY,
+        api_key: Optional[str] = None,
+        cache: bool = True,
+        inbox_ttl: float = DEFAULT_INBOX_TTL
+    ):
+        """
+        Configure the daemon.
+
+        Args:
+            path: Optional socket path. Defaults to `default_socket_path()`.
+            concurrency: Maximum number of operations running at the same time
+            api_key: Optional API key used for requests that do not set their
+                     own. If not provided, will load from environment.
+            cache: Whether to enable the read cache (see `cache`)
+            inbox_ttl: Seconds the inbox directory is trusted before a lookup
+                       refreshes it, and seconds an unknown name keeps
+                       failing without refreshing it
+        """
+        self.path = path or default_socket_path()
+        self.concurrency = concurrency
+        self.api_key = api_key
+        self.cache = cache
+        self.inbox_ttl = inbox_ttl
+        self._slots = threading.BoundedSemaphore(concurrency)
+        self._lock = threading.Lock()
+        self._server: Optional[socketserver.ThreadingUnixStreamServer] = None
+        self._thread: Optional[threading.Thread] = None
+        self._started = 0.0
+        self._inboxes: Dict[str, Any] = {}
+        self._inboxes_loaded = 0.0
+        # Names that matched no inbox, with the time they may be looked up again
+        self._unknown: Dict[str, float] = {}
+        self._inbox_lock = threading.Lock()
+        self._connections: Set[socket.socket] = set()
+        self._shutdown_requested = threading.Event()
+        self._stats = {"connections": 0, "requests": 0, "failed": 0, "active": 0}
+
+    def start(self) -> "AgentMailDaemon":
+        """
+        Bind the socket, warm up the client and serve from a background thread.
+
+        Returns:
+            The daemon itself
+
+        Raises:
+            RuntimeError: If another daemon is already serving on the socket,
+                          or the socket path exists and is not a socket
+        """
+        from .cache import enable_cache
+        from .cli import operations
+        from .client import get_client
+
+        self._remove_stale_socket()
+        if self.cache:
+            enable_cache()
+        # Pay for imports, client construction and the operation table up front
+        operations()
+        get_client(self.api_key)
+
+        daemon = self
+        self._shutdown_requested.clear()
+
+        class Handler(socketserver.StreamRequestHandler):
+            def handle(self):
+                with daemon._lock:
+                    if daemon._server is None:
+                        # Accepted while stopping
+                        return
+                    daemon._connections.add(self.connection)
+                try:
+                    daemon._serve_connection(self.rfile, self.wfile)
+                finally:
+                    with daemon._lock:
+                        daemon._connections.discard(self.connection)
+
+        # Owner-only permissions on the socket file
+        umask = os.umask(0o177)
+        try:
+            self._server = socketserver.ThreadingUnixStreamServer(self.path, Handler)
+        finally:
+            os.umask(umask)
+        self._server.daemon_threads = True
+        self._started = time.monotonic()
+        self._thread = threading.Thread(
+            target=self._server.serve_forever, name="agentmail-daemon", daemon=True
+        )
+        self._thread.start()
+        return self
+
+    def serve_forever(self) -> None:
+        """Start the daemon and block until it is shut down."""
+        if self._server is None:
+            self.start()
+        self._thread.join()
+
+    def stop(self) -> None:
+        """Stop serving, close open connections and remove the socket file."""
+        with self._lock:
+            server, self._server = self._server, None
+            connections = list(self._connections)
+        if server is None:
+            return
+        # Refuse new clients first, then end existing connections: clients
+        # see end-of-file and operations still running fail on their next write
+        try:
+            os.unlink(self.path)
+        except FileNotFoundError:
+            pass
+        for connection in connections:
+            try:
+                connection.shutdown(socket.SHUT_RDWR)
+            except OSError:
+                pass
+        server.shutdown()
+        server.server_close()
+
+    def __enter__(self) -> "AgentMailDaemon":
+        return self.start()
+
+    def __exit__(self, *exc_info) -> None:
+        self.stop()
+
+    def stats(self) -> Dict[str, Any]:
+        """
+        Return daemon counters.
+
+        Returns:
+            Dictionary with connections, requests, failed and active
+            operations, uptime in seconds, inboxes known to the directory,
+            and the read cache and rate limiter statistics
+        """
+        from .cache import cache_stats
+        from .ratelimit import get_rate_limiter
+
+        with self._lock:
+            stats = dict(self._stats)
+        stats["uptime"] = round(time.monotonic() - self._started, 3) if self._started else 0.0
+        stats["inboxes"] = len({id(inbox) for inbox in self._inboxes.values()})
+        stats["cache"] = cache_stats()
+        limiter = get_rate_limiter()
+        stats["rate_limiter"] = limiter.stats() if limiter is not None else None
+        return stats
+
+    def resolve_inbox(self, name: str) -> Any:
+        """
+        Find an inbox by ID, email, username or display name.
+
+        Lookups are answered from a directory built by listing inboxes; the
+        directory is refreshed when it is older than inbox_ttl, or on a miss.
+        A name that still matches nothing fails without another refresh for
+        inbox_ttl seconds, unless an inbox is created, updated or deleted
+        through the daemon meanwhile.
+
+        Args:
+            name: Inbox ID, email address, username or display name
+                  (case-insensitive)
+
+        Returns:
+            The inbox
+
+        Raises:
+            LookupError: If no inbox matches
+        """
+        key = name.lower()
+        now = time.monotonic()
+        loaded = self._inboxes_loaded
+        fresh = now - loaded < self.inbox_ttl
+        inbox = self._inboxes.get(key) if fresh else None
+        if inbox is None:
+            if fresh and self._unknown.get(key, 0.0) > now:
+                raise LookupError(f"No inbox matches {name!r}")
+            with self._inbox_lock:
+                # Concurrent misses share one refresh: skip it if another
+                # lookup reloaded the directory while this one waited
+                if self._inboxes_loaded <= loaded:
+                    self._load_inboxes()
+                inbox = self._inboxes.get(key)
+        if inbox is None:
+            with self._inbox_lock:
+                if len(self._unknown) >= _MAX_UNKNOWN:
+                    self._unknown.clear()
+                self._unknown[key] = time.monotonic() + self.inbox_ttl
+            raise LookupError(f"No inbox matches {name!r}")
+        return inbox
+
+    def _forget_inboxes(self) -> None:
+        """Reload the inbox directory on the next lookup."""
+        with self._inbox_lock:
+            self._inboxes_loaded = 0.0
+            self._unknown.clear()
+
+    def _load_inboxes(self) -> None:
+        """Rebuild the inbox directory. The caller holds _inbox_lock."""
+        from .inboxes import iter_inboxes
+
+        directory = {}
+        for inbox in iter_inboxes(api_key=self.api_key):
+            for value in (
+                getattr(inbox, "inbox_id", None),
+                getattr(inbox, "email", None),
+                getattr(inbox, "display_name", None)
+            ):
+                if value:
+                    directory.setdefault(value.lower(), inbox)
+            email = getattr(inbox, "email", None) or ""
+            if "@" in email:
+                directory.setdefault(email.split("@", 1)[0].lower(), inbox)
+        self._inboxes = directory
+        self._inboxes_loaded = now = time.monotonic()
+        self._unknown = {key: until for key, until in self._unknown.items() if until > now}
+
+    def _serve_connection(self, rfile, wfile) -> None:
+        """Answer every request line of one connection, in order."""
+        with self._lock:
+            self._stats["connections"] += 1
+        for line in rfile:
+            if not line.strip():
+                continue
+            try:
+                ok = self._handle(line, wfile)
+            except (BrokenPipeError, ConnectionResetError):
+                return
+            with self._lock:
+                self._stats["requests"] += 1
+                self._stats["failed"] += not ok
+            if self._shutdown_requested.is_set():
+                # Stop only after the shutdown response was written
+                threading.Thread(target=self.stop, daemon=True).start()
+                return
+
+    def _handle(self, line: bytes, wfile) -> bool:
+        """Run one request and write its response lines."""
+        from .cli import OperationError, _error, _jsonable, _resolve
+
+        def write(record: Dict[str, Any]) -> None:
+            wfile.write(json.dumps(record, default=str, ensure_ascii=False).encode() + b"\n")
+            wfile.flush()
+
+        op_id = None
+        name = None
+        with self._slots:
+            with self._lock:
+                self._stats["active"] += 1
+            try:
+                request = json.loads(line)
+                if not isinstance(request, dict):
+                    raise OperationError("Each line must be a JSON object")
+                op_id = request.get("id")
+                name = request.get("op")
+                if isinstance(name, str) and name.startswith("daemon."):
+                    result = self._builtin(name, request.get("args") or {})
+                else:
+                    name, func, kwargs = _resolve(request, self.api_key)
+                    try:
+                        result = func(**kwargs)
+                    finally:
+                        if name in _INBOX_WRITES:
+                            self._forget_inboxes()
+                if isinstance(result, Iterator) and not hasattr(result, "model_dump"):
+                    count = 0
+                    for count, item in enumerate(result, 1):
+                        write({"id": op_id, "op": name, "ok": True, "item": count - 1, "result": _jsonable(item)})
+                    write({"id": op_id, "op": name, "ok": True, "count": count})
+                else:
+                    write({"id": op_id, "op": name, "ok": True, "result": _jsonable(result)})
+                return True
+            except (BrokenPipeError, ConnectionResetError):
+                raise
+            except Exception as e:
+                write({"id": op_id, "op": name, "ok": False, "error": _error(e)})
+                return False
+            finally:
+                with self._lock:
+                    self._stats["active"] -= 1
+
+    def _builtin(self, name: str, args: Dict[str, Any]) -> Any:
+        from .cli import OperationError
+
+        if name == "daemon.ping":
+            return "pong"
+        if name == "daemon.stats":
+            return self.stats()
+        if name == "daemon.resolve_inbox":
+            return self.resolve_inbox(args["name"])
+        if name == "daemon.shutdown":
+            self._shutdown_requested.set()
+            return "shutting down"
+        raise OperationError(f"Unknown operation: {name}")
+
+    def _remove_stale_socket(self) -> None:
+        """Remove a socket file left behind by a daemon that is gone."""
+        try:
+            info = os.lstat(self.path)
+        except FileNotFoundError:
+            return
+        # Connecting to a regular file is refused too; never unlink anything but a socket
+        if not stat.S_ISSOCK(info.st_mode):
+            raise RuntimeError(f"Refusing to replace {self.path}: it exists and is not a socket")
+        probe = socket.socket(socket.AF_UNIX, socket.SOCK_STREAM)
+        try:
+            probe.connect(self.path)
+        except FileNotFoundError:
+            return
+        except ConnectionRefusedError:
+            os.unlink(self.path)
+            return
+        finally:
+            probe.close()
+        raise RuntimeError(f"A daemon is already serving on {self.path}")
+
+
+class DaemonClient:
+    """Thin client sending calls to an AgentMailDaemon."""
+
+    def __init__(self, path: Optional[str] = None, timeout: Optional[float] = None):
+        """
+        Configure the client. The connection is opened on first use and reused.
+
+        Args:
+            path: Optional socket path. Defaults to `default_socket_path()`.
+            timeout: Optional socket timeout in seconds
+        """
+        self.path = path or default_socket_path()
+        self.timeout = timeout
+        self._sock: Optional[socket.socket] = None
+        self._file = None
+        self._lock = threading.Lock()
+
+    def call(self, op: str, args: Optional[Dict[str, Any]] = None, **kwargs) -> Any:
+        """
+        Run one operation on the daemon.
+
+        Args:
+            op: Operation name, e.g. "get_thread" or "daemon.stats"
+            args: Optional keyword arguments of the operation
+            **kwargs: More keyword arguments of the operation
+
+        Returns:
+            The JSON-decoded result; a list of items for `iter_*` operations
+
+        Raises:
+            DaemonError: If the operation failed
+            OSError: If the daemon cannot be reached
+        """
+        responses = self._request(op, {**(args or {}), **kwargs})
+        final = responses[-1]
+        if "count" in final:
+            return [response["result"] for response in responses[:-1]]
+        return final["result"]
+
+    def ping(self) -> bool:
+        """Whether a daemon is answering on the socket."""
+        try:
+            return self.call("daemon.ping") == "pong"
+        except OSError:
+            return False
+
+    def close(self) -> None:
+        """Close the connection to the daemon."""
+        with self._lock:
+            self._disconnect()
+
+    def __enter__(self) -> "DaemonClient":
+        return self
+
+    def __exit__(self, *exc_info) -> None:
+        self.close()
+
+    def _request(self, op: str, args: Dict[str, Any]) -> List[Dict[str, Any]]:
+        """Send a request and read its response lines."""
+        line = json.dumps({"op": op, "args": args}).encode() + b"\n"
+        with self._lock:
+            if self._sock is None:
+                self._connect()
+            try:
+                self._sock.sendall(line)
+                responses = []
+                while True:
+                    raw = self._file.readline()
+                    if not raw:
+                        raise ConnectionError("Daemon closed the connection")
+                    response = json.loads(raw)
+                    responses.append(response)
+                    if not response.get("ok") or "item" not in response:
+                        break
+            except (OSError, ValueError):
+                self._disconnect()
+                raise
+        final = responses[-1]
+        if not final.get("ok"):
+            error = final.get("error") or {}
+            raise DaemonError(error.get("message", "Operation failed"), error.get("type"), error.get("status"))
+        return responses
+
+    def _connect(self) -> None:
+        sock = socket.socket(socket.AF_UNIX, socket.SOCK_STREAM)
+        sock.settimeout(self.timeout)
+        try:
+            sock.connect(self.path)
+        except OSError:
+            sock.close()
+            raise
+        self._sock = sock
+        self._file = sock.makefile("rb")
+
+    def _disconnect(self) -> None:
+        if self._sock is not None:
+            self._file.close()
+            self._sock.close()
+            self._sock = None
+            self._file = None
+
+
+def main(argv: Optional[List[str]] = None) -> int:
+    """Entry point of `python -m src.agentmail.daemon`."""
+    parser = argparse.ArgumentParser(prog="python -m src.agentmail.daemon", description="AgentMail local daemon")
+    parser.add_argument("--socket", help="Socket path; defaults to AGENTMAIL_DAEMON_SOCKET or a per-user path")
+    commands = parser.add_subparsers(dest="command", required=True)
+    serve = commands.add_parser("serve", help="Run the daemon in the foreground")
+    serve.add_argument("--concurrency", type=int, default=DEFAULT_CONCURRENCY)
+    serve.add_argument("--no-cache", action="store_true", help="Do not enable the read cache")
+    serve.add_argument("--fake", action="store_true", help="Serve from an in-memory fake backend")
+    call = commands.add_parser("call", help="Run one operation and print its result as JSON")
+    call.add_argument("op")
+    call.add_argument("args", nargs="?", default="{}", help="JSON object of keyword arguments")
+    commands.add_parser("stats", help="Print daemon statistics")
+    commands.add_parser("stop", help="Shut the daemon down")
+    args = parser.parse_args(argv)
+
+    if args.command == "serve":
+        if args.fake:
+            from .fake_server import FakeAgentMail
+            FakeAgentMail().install()
+        daemon = AgentMailDaemon(args.socket, concurrency=args.concurrency, cache=not args.no_cache)
+        daemon.start()
+        print(f"Serving on {daemon.path}", file=sys.stderr)
+        try:
+            daemon.serve_forever()
+        except KeyboardInterrupt:
+            daemon.stop()
+        return 0
+
+    client = DaemonClient(args.socket)
+    op, op_args = {
+        "call": lambda: (args.op, json.loads(args.args)),
+        "stats": lambda: ("daemon.stats", {}),
+        "stop": lambda: ("daemon.shutdown", {})
+    }[args.command]()
+    try:
+        result = client.call(op, op_args)
+    except DaemonError as e:
+        print(json.dumps({"error": {"type": e.type, "message": str(e), "status": e.status}}), file=sys.stderr)
+        return 1
+    except OSError as e:
+        print(f"Cannot reach the daemon at {client.path}: {e}", file=sys.stderr)
+        return 2
+    finally:
+        client.close()
+    print(json.dumps(result, indent=2, ensure_ascii=False))
+    return 0
+
+
+if __name__ == "__main__":
+    sys.exit(main())
@@ -4,10 +4,15 @@ Domain management module.
 Provides functions to manage custom domains for email inboxes.
 """
 
-from typing import List, Dict, Any, Optional
+from typing import List, Dict, Any, Optional, Iterator
+from .cache import cached, invalidates
 from .client import get_client
+from .pagination import paginate
+from .singleflight import coalesced
+from .telemetry import instrumented
 
 
+@instrumented
 def list_domains(api_key: str = None) -> List[Dict[str, Any]]:
     """
     List all domains.
@@ -22,6 +27,36 @@ def list_domains(api_key: str = None) -> List[Dict[str, Any]]:
     return client.domains.list()
 
 
+@instrumented
+def iter_domains(
+    page_size: Optional[int] = None,
+    prefetch: bool = False,
+    api_key: str = None
+) -> Iterator[Any]:
+    """
+    Iterate over all domains, following pagination automatically.
+    
+    Items are yielded one at a time, so memory use stays constant
+    regardless of how many domains exist.
+    
+    Args:
+        page_size: Optional number of domains to request per page
+        prefetch: Whether to fetch the next page in the background while
+                  the current page is being consumed
+        api_key: Optional API key. If not provided, will load from environment.
+    
+    Yields:
+        Domain objects
+    """
+    client = get_client(api_key)
+    return paginate(
+        client.domains.list, "domains", page_size=page_size, prefetch=prefetch
+    )
+
+
+@instrumented
+@cached("domain", "domain_id")
+@coalesced
 def get_domain(domain_id: str, api_key: str = None) -> Dict[str, Any]:
     """
     Get a specific domain by ID.
@@ -37,6 +72,7 @@ def get_domain(domain_id: str, api_key: str = None) -> Dict[str, Any]:
     return client.domains.get(domain_id=domain_id)
 
 
+@instrumented
 def create_domain(domain: str, api_key: str = None, **kwargs) -> Dict[str, Any]:
     """
     Create a new domain.
@@ -53,6 +89,8 @@ def create_domain(domain: str, api_key: str = None, **kwargs) -> Dict[str, Any]:
     return client.domains.create(domain=domain, **kwargs)
 
 
+@instrumented
+@invalidates("domain", "domain_id")
 def delete_domain(domain_id: str, api_key: str = None) -> Dict[str, Any]:
     """
     Delete a domain by ID.
@@ -68,6 +106,8 @@ def delete_domain(domain_id: str, api_key: str = None) -> Dict[str, Any]:
     return client.domains.delete(domain_id=domain_id)
 
 
+@instrumented
+@invalidates("domain", "domain_id")
 def verify_domain(domain_id: str, api_key: str = None) -> Dict[str, Any]:
     """
     Verify a domain.
@@ -83,6 +123,8 @@ def verify_domain(domain_id: str, api_key: str = None) -> Dict[str, Any]:
     return client.domains.verify(domain_id=domain_id)
 
 
+@instrumented
+@coalesced
 def get_zone_file(domain_id: str, api_key: str = None) -> Dict[str, Any]:
     """
     Get the zone file for a domain.
@@ -4,10 +4,14 @@ Draft messages module.
 Provides functions to access and manage draft email messages.
 """
 
-from typing import List, Dict, Any
+from typing import List, Dict, Any, Iterator, Optional
 from .client import get_client
+from .pagination import paginate
+from .singleflight import coalesced
+from .telemetry import instrumented
 
 
+@instrumented
 def list_drafts(api_key: str = None) -> List[Dict[str, Any]]:
     """
     List all drafts.
@@ -22,6 +26,35 @@ def list_drafts(api_key: str = None) -> List[Dict[str, Any]]:
     return client.drafts.list()
 
 
+@instrumented
+def iter_drafts(
+    page_size: Optional[int] = None,
+    prefetch: bool = False,
+    api_key: str = None
+) -> Iterator[Any]:
+    """
+    Iterate over all drafts, following pagination automatically.
+    
+    Items are yielded one at a time, so memory use stays constant
+    regardless of how many drafts exist.
+    
+    Args:
+        page_size: Optional number of drafts to request per page
+        prefetch: Whether to fetch the next page in the background while
+                  the current page is being consumed
+        api_key: Optional API key. If not provided, will load from environment.
+    
+    Yields:
+        Draft objects
+    """
+    client = get_client(api_key)
+    return paginate(
+        client.drafts.list, "drafts", page_size=page_size, prefetch=prefetch
+    )
+
+
+@instrumented
+@coalesced
 def get_draft(draft_id: str, api_key: str = None) -> Dict[str, Any]:
     """
     Get a specific draft by ID.
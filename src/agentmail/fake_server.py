@@ -0,0 +1,855 @@
+"""
+Fake AgentMail server module.
+
+Provides an in-memory stand-in for the AgentMail API for load, scaling and
+offline testing. It implements the inbox, message, thread, attachment,
+webhook, domain and event metrics endpoints with cursor pagination, and can simulate
+per-endpoint latency distributions, injected 429/5xx errors and per-inbox
+send quotas.
+
+The fake runs in-process as an httpx transport (`FakeTransport`), which
+avoids sockets entirely and answers around 10k requests per second per core
+so the client stack stays the bottleneck, or behind a real local HTTP server (`FakeAgentMail.serve()`) for tools running
+in other processes:
+
+    fake = FakeAgentMail(latency={"messages.send": lognormal(0.08)})
+    fake.install()          # every pooled client now talks to the fake
+"""
+
+import asyncio
+import json
+import math
+import random
+import re
+import threading
+import time
+import uuid
+from bisect import bisect_left
+from collections import OrderedDict
+from datetime import datetime, timezone
+from http.server import BaseHTTPRequestHandler, ThreadingHTTPServer
+from typing import Any, Callable, Dict, Iterable, List, Optional, Tuple, Union
+from urllib.parse import unquote
+
+import httpx
+
+FAKE_BASE_URL = "http://agentmail.fake"
+DEFAULT_DOMAIN = "agentmail.fake"
+DEFAULT_PAGE_SIZE = 50
+MAX_PAGE_SIZE = 100
+DEFAULT_ERROR_STATUSES = (429, 500, 502, 503)
+# Metrics queries may only start this many seconds in the past
+METRICS_WINDOW = 90 * 86400
+
+Latency = Union[float, Callable[[], float]]
+
+
+def constant(seconds: float) -> Callable[[], float]:
+    """Latency distribution returning a fixed number of seconds."""
+    return lambda: seconds
+
+
+def uniform(low: float, high: float, seed: Optional[int] = None) -> Callable[[], float]:
+    """Latency distribution uniform between low and high seconds."""
+    rng = random.Random(seed)
+    return lambda: rng.uniform(low, high)
+
+
+def lognormal(median: float, sigma: float = 0.5, seed: Optional[int] = None) -> Callable[[], float]:
+    """Latency distribution with the given median and a long right tail, like real APIs."""
+    rng = random.Random(seed)
+    mu = math.log(median)
+    return lambda: rng.lognormvariate(mu, sigma)
+
+
+class FakeAgentMail:
+    """In-memory AgentMail backend."""
+
+    def __init__(
+        self,
+        latency: Optional[Dict[str, Latency]] = None,
+        error_rates: Optional[Dict[str, float]] = None,
+        error_statuses: Iterable[int] = DEFAULT_ERROR_STATUSES,
+        send_quota: Optional[int] = None,
+        quota_window: float = 60.0,
+        page_size: int = DEFAULT_PAGE_SIZE,
+        seed: Optional[int] = None
+    ):
+        """
+        Create an empty fake backend.
+
+        Endpoint names are "<resource>.<action>", e.g. "inboxes.list",
+        "threads.get", "messages.send", "attachments.get", "files.get" or
+        "webhooks.create"; "*" applies to every endpoint without its own entry.
+
+        Args:
+            latency: Optional per-endpoint latency, in seconds or as a
+                     distribution such as `lognormal(0.05)`
+            error_rates: Optional per-endpoint fraction of requests failed
+                         with a random status from error_statuses
+            error_statuses: Statuses used for injected errors; 429 and 503
+                            responses carry Retry-After
+            send_quota: Optional number of messages each inbox may send per
+                        quota_window before getting 429s
+            quota_window: Length of the send quota window in seconds
+            page_size: Default page size of list endpoints
+            seed: Optional random seed for repeatable error injection
+        """
+        self.latency = dict(latency or {})
+        self.error_rates = dict(error_rates or {})
+        self.error_statuses = tuple(error_statuses)
+        self.send_quota = send_quota
+        self.quota_window = quota_window
+        self.page_size = page_size
+        self._rng = random.Random(seed)
+        self._lock = threading.Lock()
+        self.inboxes: "OrderedDict[str, Dict[str, Any]]" = OrderedDict()
+        self.threads: "OrderedDict[str, Dict[str, Any]]" = OrderedDict()
+        self.messages: Dict[str, Dict[str, Any]] = {}
+        self.webhooks: "OrderedDict[str, Dict[str, Any]]" = OrderedDict()
+        self.domains: "OrderedDict[str, Dict[str, Any]]" = OrderedDict()
+        self.files: Dict[str, bytes] = {}
+        self._events: Dict[Tuple[str, str], List[float]] = {}
+        self._thread_messages: Dict[str, List[str]] = {}
+        self._quota: Dict[str, Tuple[float, int]] = {}
+        self._failures: List[Tuple[Optional[str], int]] = []
+        self._stats = {"requests": 0, "injected_errors": 0, "quota_rejections": 0}
+        self._endpoint_counts: Dict[str, int] = {}
+        self._routes = _build_routes(self)
+
+    # Setup
+
+    def install(self) -> "FakeAgentMail":
+        """
+        Point every pooled client (sync and async) at this fake.
+
+        Returns:
+            The fake itself
+        """
+        from .client import use_transport
+        use_transport(FakeTransport(self), base_url=FAKE_BASE_URL)
+        return self
+
+    def uninstall(self) -> None:
+        """Point pooled clients back at the network."""
+        from .client import use_transport
+        use_transport(None)
+
+    def __enter__(self) -> "FakeAgentMail":
+        return self.install()
+
+    def __exit__(self, *exc_info) -> None:
+        self.uninstall()
+
+    def seed(
+        self,
+        inboxes: int = 1,
+        threads_per_inbox: int = 10,
+        messages_per_thread: int = 1,
+        attachment_size: int = 0
+    ) -> List[str]:
+        """
+        Fill the fake with generated data.
+
+        Args:
+            inboxes: Number of inboxes to create
+            threads_per_inbox: Number of received threads per inbox
+            messages_per_thread: Number of messages per thread
+            attachment_size: Optional size in bytes of an attachment added
+                             to the first message of every thread
+
+        Returns:
+            IDs of the created inboxes
+        """
+        inbox_ids = []
+        for i in range(inboxes):
+            inbox = self._create_inbox({}, {"username": f"seed{len(self.inboxes)}-{i}"})
+            inbox_ids.append(inbox["inbox_id"])
+            for t in range(threads_per_inbox):
+                thread_id = None
+                for m in range(messages_per_thread):
+                    attachments = None
+                    if attachment_size and m == 0:
+                        attachments = [self.add_file(_payload(attachment_size), f"file{t}.bin")]
+                    message = self._store_message(
+                        inbox["inbox_id"], f"sender{t}@example.com", [inbox["email"]],
+                        f"Seeded thread {t}", f"Seeded message {m} of thread {t}", None,
+                        ["received"], thread_id, attachments
+                    )
+                    thread_id = message["thread_id"]
+        return inbox_ids
+
+    def add_file(self, content: bytes, filename: str = "attachment.bin") -> Dict[str, Any]:
+        """
+        Store attachment content.
+
+        Args:
+            content: Attachment bytes
+            filename: Attachment filename
+
+        Returns:
+            Attachment metadata dictionary for a message's "attachments"
+        """
+        attachment_id = _new_id("att")
+        with self._lock:
+            self.files[attachment_id] = content
+        return {
+            "attachment_id": attachment_id, "filename": filename, "size": len(content),
+            "content_type": "application/octet-stream"
+        }
+
+    def add_events(self, inbox_id: str, event_type: str, timestamps: Iterable[float]) -> None:
+        """
+        Record past events for the metrics endpoints.
+
+        Sent and received messages are recorded automatically; use this to
+        backfill history, e.g. 90 days of deliveries for dashboard tests.
+
+        Args:
+            inbox_id: Inbox the events belong to
+            event_type: Event type, e.g. "message.delivered"
+            timestamps: Event times as Unix timestamps
+        """
+        with self._lock:
+            times = self._events.setdefault((inbox_id, event_type), [])
+            times.extend(timestamps)
+            times.sort()
+
+    def fail_next(self, count: int = 1, status: int = 503, endpoint: Optional[str] = None) -> None:
+        """
+        Fail the next requests deterministically.
+
+        Args:
+            count: Number of requests to fail
+            status: HTTP status to answer with
+            endpoint: Optional endpoint name to restrict the failures to
+        """
+        with self._lock:
+            self._failures.extend([(endpoint, status)] * count)
+
+    def stats(self) -> Dict[str, Any]:
+        """
+        Return fake server counters.
+
+        Returns:
+            Dictionary with total requests, injected errors, quota rejections,
+            requests per endpoint and stored object counts
+        """
+        with self._lock:
+            return {
+                **self._stats,
+                "endpoints": dict(self._endpoint_counts),
+                "inboxes": len(self.inboxes),
+                "threads": len(self.threads),
+                "messages": len(self.messages)
+            }
+
+    # Request handling
+
+    def handle(self, method: str, path: str, query: Dict[str, List[str]], body: bytes) -> Tuple[int, Dict[str, str], bytes, float]:
+        """
+        Answer one request.
+
+        Args:
+            method: HTTP method
+            path: URL path
+            query: Query parameters, each with a list of values
+            body: Raw request body
+
+        Returns:
+            Tuple of (status, headers, body, simulated latency in seconds)
+        """
+        endpoint, handler, params = self._route(method, path)
+        with self._lock:
+            self._stats["requests"] += 1
+            self._endpoint_counts[endpoint] = self._endpoint_counts.get(endpoint, 0) + 1
+        delay = self._delay(endpoint)
+
+        injected = self._injected_status(endpoint)
+        if injected is not None:
+            return _error(injected, "Injected failure") + (delay,)
+        if handler is None:
+            return _error(404, f"No route for {method} {path}") + (delay,)
+        try:
+            try:
+                payload = json.loads(body) if body else {}
+            except ValueError:
+                raise _HTTPError(400, "Request body is not valid JSON", name="ValidationError") from None
+            result = handler(query=query, body=payload, **params)
+        except _HTTPError as e:
+            return _error(e.status, e.message, e.headers) + (delay,)
+        if isinstance(result, bytes):
+            return 200, {"content-type": "application/octet-stream"}, result, delay
+        if result is None:
+            return 204, {}, b"", delay
+        return 200, {"content-type": "application/json"}, json.dumps(result).encode(), delay
+
+    def _route(self, method: str, path: str) -> Tuple[str, Optional[Callable], Dict[str, str]]:
+        for route_method, pattern, endpoint, handler in self._routes:
+            if route_method == method:
+                match = pattern.match(path)
+                if match:
+                    return endpoint, handler, {k: unquote(v) for k, v in match.groupdict().items()}
+        return "unknown", None, {}
+
+    def _delay(self, endpoint: str) -> float:
+        latency = self.latency.get(endpoint, self.latency.get("*"))
+        if latency is None:
+            return 0.0
+        return max(0.0, latency() if callable(latency) else float(latency))
+
+    def _injected_status(self, endpoint: str) -> Optional[int]:
+        with self._lock:
+            for index, (target, status) in enumerate(self._failures):
+                if target is None or target == endpoint:
+                    del self._failures[index]
+                    self._stats["injected_errors"] += 1
+                    return status
+            rate = self.error_rates.get(endpoint, self.error_rates.get("*", 0.0))
+            if rate and self._rng.random() < rate:
+                self._stats["injected_errors"] += 1
+                return self._rng.choice(self.error_statuses)
+        return None
+
+    # Inboxes
+
+    def _list_inboxes(self, query, body):
+        with self._lock:
+            inboxes = list(self.inboxes.values())
+        return self._page("inboxes", inboxes, query)
+
+    def _create_inbox(self, query, body):
+        username = body.get("username") or _new_id("inbox")
+        email = f"{username}@{body.get('domain') or DEFAULT_DOMAIN}"
+        with self._lock:
+            if email in self.inboxes:
+                raise _HTTPError(409, f"Inbox {email} already exists")
+            now = _now()
+            inbox = {
+                "pod_id": "pod_fake", "inbox_id": email, "email": email,
+                "display_name": body.get("display_name"), "client_id": body.get("client_id"),
+                "updated_at": now, "created_at": now
+            }
+            self.inboxes[email] = inbox
+        return inbox
+
+    def _get_inbox(self, query, body, inbox_id):
+        return self._find(self.inboxes, inbox_id, "Inbox")
+
+    def _update_inbox(self, query, body, inbox_id):
+        inbox = self._find(self.inboxes, inbox_id, "Inbox")
+        with self._lock:
+            inbox.update({k: v for k, v in body.items() if k in ("display_name", "metadata")})
+            inbox["updated_at"] = _now()
+        return inbox
+
+    def _delete_inbox(self, query, body, inbox_id):
+        # Find and delete atomically, so concurrent deletes answer 404 once
+        with self._lock:
+            self._find(self.inboxes, inbox_id, "Inbox")
+            del self.inboxes[inbox_id]
+            for thread_id in [t for t, thread in self.threads.items() if thread["inbox_id"] == inbox_id]:
+                self._drop_thread(thread_id)
+        return None
+
+    # Messages
+
+    def _send_message(self, query, body, inbox_id):
+        inbox = self._find(self.inboxes, inbox_id, "Inbox")
+        self._check_quota(inbox_id)
+        to = body.get("to") or []
+        to = [to] if isinstance(to, str) else to
+        if not to:
+            raise _HTTPError(400, "At least one recipient is required", name="ValidationError")
+        message = self._store_message(
+            inbox_id, inbox["email"], to, body.get("subject"), body.get("text"), body.get("html"),
+            ["sent"] + list(body.get("labels") or []), None, None
+        )
+        self._deliver(message)
+        return {"message_id": message["message_id"], "thread_id": message["thread_id"]}
+
+    def _reply_message(self, query, body, inbox_id, message_id):
+        inbox = self._find(self.inboxes, inbox_id, "Inbox")
+        original = self._find(self.messages, message_id, "Message")
+        self._check_quota(inbox_id)
+        subject = original.get("subject") or ""
+        message = self._store_message(
+            inbox_id, inbox["email"], [original["from"]],
+            subject if subject.startswith("Re:") else f"Re: {subject}",
+            body.get("text"), body.get("html"), ["sent"] + list(body.get("labels") or []),
+            original["thread_id"], None
+        )
+        self._deliver(message)
+        return {"message_id": message["message_id"], "thread_id": message["thread_id"]}
+
+    def _list_messages(self, query, body, inbox_id):
+        self._find(self.inboxes, inbox_id, "Inbox")
+        with self._lock:
+            items = [_message_item(m) for m in self.messages.values() if m["inbox_id"] == inbox_id]
+        items.reverse()
+        return self._page("messages", items, query)
+
+    def _get_message(self, query, body, inbox_id, message_id):
+        return self._find(self.messages, message_id, "Message")
+
+    # Threads
+
+    def _list_threads(self, query, body, inbox_id=None):
+        with self._lock:
+            threads = list(reversed(self.threads.values()))
+        if inbox_id is not None:
+            threads = [t for t in threads if t["inbox_id"] == inbox_id]
+        labels = query.get("labels")
+        after = _first(query, "after")
+        before = _first(query, "before")
+        if labels or after or before:
+            threads = [
+                t for t in threads
+                if (not labels or set(labels) <= set(t["labels"]))
+                and (after is None or t["timestamp"] >= after)
+                and (before is None or t["timestamp"] < before)
+            ]
+        return self._page("threads", threads, query)
+
+    def _get_thread(self, query, body, thread_id, inbox_id=None):
+        thread = self._find(self.threads, thread_id, "Thread")
+        with self._lock:
+            messages = [self.messages[m] for m in self._thread_messages.get(thread_id, [])]
+        # Messages are paged like list endpoints, so clients must follow next_page_token
+        return {**thread, **self._page("messages", messages, query)}
+
+    def _delete_thread(self, query, body, thread_id, inbox_id=None):
+        with self._lock:
+            self._find(self.threads, thread_id, "Thread")
+            self._drop_thread(thread_id)
+        return None
+
+    def _get_attachment(self, query, body, thread_id, attachment_id, inbox_id=None):
+        self._find(self.threads, thread_id, "Thread")
+        content = self._find(self.files, attachment_id, "Attachment")
+        return {
+            "attachment_id": attachment_id, "size": len(content),
+            "download_url": f"{FAKE_BASE_URL}/_files/{attachment_id}",
+            "expires_at": _now(3600)
+        }
+
+    def _get_file(self, query, body, attachment_id):
+        return self._find(self.files, attachment_id, "Attachment")
+
+    # Metrics
+
+    def _query_events(self, query, body, inbox_id=None):
+        if inbox_id is not None:
+            self._find(self.inboxes, inbox_id, "Inbox")
+        now = time.time()
+        start = _time_param(query, "start", now - 86400)
+        end = min(_time_param(query, "end", now), now)
+        if start < now - METRICS_WINDOW:
+            raise _HTTPError(400, "start must be within the last 90 days", name="ValidationError")
+        period = _int_param(query, "period", 0)
+        limit = _int_param(query, "limit", 0)
+        event_types = [
+            name for value in query.get("event_types", [])
+            for name in (json.loads(value) if value.startswith("[") else [value])
+        ]
+        result = {}
+        with self._lock:
+            for (owner, event_type), times in self._events.items():
+                if (inbox_id is not None and owner != inbox_id) or (event_types and event_type not in event_types):
+                    continue
+                buckets = result.setdefault(event_type, {})
+                for moment in times[bisect_left(times, start):bisect_left(times, end)]:
+                    key = moment - moment % period if period else moment
+                    buckets[key] = buckets.get(key, 0) + 1
+        response = {}
+        for event_type, buckets in result.items():
+            keys = sorted(buckets, reverse=_first(query, "descending") == "true")
+            if limit:
+                keys = keys[:limit]
+            response[event_type] = [{"timestamp": _iso(key), "count": buckets[key]} for key in keys]
+        return response
+
+    # Webhooks
+
+    def _list_webhooks(self, query, body):
+        with self._lock:
+            webhooks = list(self.webhooks.values())
+        return self._page("webhooks", webhooks, query)
+
+    def _create_webhook(self, query, body):
+        now = _now()
+        webhook = {
+            "webhook_id": _new_id("wh"), "url": body.get("url"),
+            "event_types": body.get("event_types") or ["message.received"],
+            "inbox_ids": body.get("inbox_ids"), "client_id": body.get("client_id"),
+            "secret": "whsec_" + uuid.uuid4().hex, "enabled": True,
+            "updated_at": now, "created_at": now
+        }
+        with self._lock:
+            self.webhooks[webhook["webhook_id"]] = webhook
+        return webhook
+
+    def _get_webhook(self, query, body, webhook_id):
+        return self._find(self.webhooks, webhook_id, "Webhook")
+
+    def _delete_webhook(self, query, body, webhook_id):
+        with self._lock:
+            self._find(self.webhooks, webhook_id, "Webhook")
+            del self.webhooks[webhook_id]
+        return None
+
+    # Domains
+
+    def _list_domains(self, query, body):
+        with self._lock:
+            domains = list(self.domains.values())
+        return self._page("domains", domains, query)
+
+    def _create_domain(self, query, body):
+        name = body.get("domain")
+        if not name:
+            raise _HTTPError(400, "domain is required", name="ValidationError")
+        now = _now()
+        domain = {
+            "domain_id": name, "domain": name, "status": "PENDING",
+            "feedback_enabled": bool(body.get("feedback_enabled")),
+            "subdomains_enabled": bool(body.get("subdomains_enabled")),
+            "tracking_enabled": bool(body.get("tracking_enabled")),
+            "records": [
+                {"type": "TXT", "name": name, "value": "v=spf1 include:agentmail.fake ~all", "status": "MISSING"},
+                {"type": "MX", "name": name, "value": "mx.agentmail.fake", "status": "MISSING", "priority": 10}
+            ],
+            "updated_at": now, "created_at": now
+        }
+        with self._lock:
+            self.domains[name] = domain
+        return domain
+
+    def _get_domain(self, query, body, domain_id):
+        return self._find(self.domains, domain_id, "Domain")
+
+    def _delete_domain(self, query, body, domain_id):
+        with self._lock:
+            self._find(self.domains, domain_id, "Domain")
+            del self.domains[domain_id]
+        return None
+
+    def _verify_domain(self, query, body, domain_id):
+        domain = self._find(self.domains, domain_id, "Domain")
+        with self._lock:
+            domain["status"] = "VERIFIED"
+            for record in domain["records"]:
+                record["status"] = "VALID"
+            domain["updated_at"] = _now()
+        return None
+
+    def _get_zone_file(self, query, body, domain_id):
+        domain = self._find(self.domains, domain_id, "Domain")
+        lines = [f"{r['name']}. 3600 IN {r['type']} {r['value']}" for r in domain["records"]]
+        return ("\n".join(lines) + "\n").encode()
+
+    # Helpers
+
+    def _find(self, store: Dict[str, Any], key: str, kind: str) -> Any:
+        value = store.get(key)
+        if value is None:
+            raise _HTTPError(404, f"{kind} not found", name="NotFoundError")
+        return value
+
+    def _page(self, field: str, items: List[Any], query: Dict[str, List[str]]) -> Dict[str, Any]:
+        """Slice items into a page addressed by limit and page_token."""
+        limit = min(_int_param(query, "limit", self.page_size, minimum=1), MAX_PAGE_SIZE)
+        start = _int_param(query, "page_token", 0)
+        page = items[start:start + limit]
+        result = {"count": len(page), field: page}
+        if start + limit < len(items):
+            result["next_page_token"] = str(start + limit)
+        return result
+
+    def _check_quota(self, inbox_id: str) -> None:
+        if self.send_quota is None:
+            return
+        now = time.monotonic()
+        with self._lock:
+            started, used = self._quota.get(inbox_id, (now, 0))
+            if now - started >= self.quota_window:
+                started, used = now, 0
+            if used >= self.send_quota:
+                self._stats["quota_rejections"] += 1
+                retry_after = max(1, math.ceil(self.quota_window - (now - started)))
+                raise _HTTPError(
+                    429, f"Send quota of {self.send_quota} messages exceeded",
+                    headers={"retry-after": str(retry_after)}, name="TooManyRequestsError"
+                )
+            self._quota[inbox_id] = (started, used + 1)
+
+    def _store_message(
+        self, inbox_id, sender, to, subject, text, html, labels, thread_id, attachments
+    ) -> Dict[str, Any]:
+        """Create a message, and its thread unless thread_id is given."""
+        now = _now()
+        message_id = f"<{uuid.uuid4().hex}@{DEFAULT_DOMAIN}>"
+        with self._lock:
+            if thread_id is None:
+                thread_id = _new_id("thread")
+                self.threads[thread_id] = {
+                    "inbox_id": inbox_id, "thread_id": thread_id, "labels": [],
+                    "timestamp": now, "senders": [], "recipients": [], "subject": subject,
+                    "preview": None, "last_message_id": message_id, "message_count": 0,
+                    "size": 0, "attachments": [], "updated_at": now, "created_at": now
+                }
+                self._thread_messages[thread_id] = []
+            message = {
+                "inbox_id": inbox_id, "thread_id": thread_id, "message_id": message_id,
+                "labels": labels, "timestamp": now, "from": sender, "to": to,
+                "subject": subject, "preview": (text or "")[:100], "text": text, "html": html,
+                "attachments": attachments or [],
+                "size": len(text or "") + len(html or ""), "updated_at": now, "created_at": now
+            }
+            self.messages[message_id] = message
+            event_type = "message.sent" if "sent" in labels else "message.received"
+            self._events.setdefault((inbox_id, event_type), []).append(time.time())
+            self._thread_messages[thread_id].append(message_id)
+            thread = self.threads[thread_id]
+            thread.update({
+                "timestamp": now, "updated_at": now, "last_message_id": message_id,
+                "message_count": thread["message_count"] + 1,
+                "size": thread["size"] + message["size"], "preview": message["preview"],
+                "labels": sorted(set(thread["labels"]) | set(labels)),
+                "senders": sorted(set(thread["senders"]) | {sender}),
+                "recipients": sorted(set(thread["recipients"]) | set(to)),
+                "attachments": thread["attachments"] + (attachments or [])
+            })
+            # Keep the most recently active thread last
+            self.threads.move_to_end(thread_id)
+        return message
+
+    def _deliver(self, message: Dict[str, Any]) -> None:
+        """Copy a sent message into any recipient inbox hosted by the fake."""
+        for address in message["to"]:
+            if address in self.inboxes:
+                self._store_message(
+                    address, message["from"], message["to"], message["subject"],
+                    message["text"], message["html"], ["received", "unread"], None, None
+                )
+
+    def _drop_thread(self, thread_id: str) -> None:
+        """Delete a thread and its messages. Caller holds the lock."""
+        self.threads.pop(thread_id, None)
+        for message_id in self._thread_messages.pop(thread_id, []):
+            self.messages.pop(message_id, None)
+
+    # Real HTTP server
+
+    def serve(self, host: str = "127.0.0.1", port: int = 0) -> ThreadingHTTPServer:
+        """
+        Serve the fake over HTTP from a background thread.
+
+        Point other processes at it with AGENTMAIL_BASE_URL set to the
+        server's `url` attribute.
+
+        Args:
+            host: Interface to listen on
+            port: Port to listen on; 0 picks a free port
+
+        Returns:
+            The running server; call `shutdown()` on it to stop
+        """
+        fake = self
+
+        class Handler(BaseHTTPRequestHandler):
+            protocol_version = "HTTP/1.1"
+
+            def _handle(self):
+                url = httpx.URL(self.path)
+                length = int(self.headers.get("content-length") or 0)
+                body = self.rfile.read(length) if length else b""
+                status, headers, content, delay = fake.handle(
+                    self.command, url.path, _query(url), body
+                )
+                if delay:
+                    time.sleep(delay)
+                self.send_response(status)
+                for name, value in headers.items():
+                    self.send_header(name, value)
+                self.send_header("content-length", str(len(content)))
+                self.end_headers()
+                self.wfile.write(content)
+
+            do_GET = do_POST = do_PATCH = do_PUT = do_DELETE = _handle
+
+            def log_message(self, format, *args):
+                pass
+
+        server = ThreadingHTTPServer((host, port), Handler)
+        server.daemon_threads = True
+        server.url = f"http://{host}:{server.server_address[1]}"
+        thread = threading.Thread(target=server.serve_forever, name="agentmail-fake", daemon=True)
+        thread.start()
+        return server
+
+
+class FakeTransport(httpx.BaseTransport, httpx.AsyncBaseTransport):
+    """httpx transport (sync and async) answering from a FakeAgentMail."""
+
+    def __init__(self, fake: FakeAgentMail):
+        self.fake = fake
+
+    def handle_request(self, request: httpx.Request) -> httpx.Response:
+        status, headers, content, delay = self._answer(request, request.read())
+        if delay:
+            time.sleep(delay)
+        return _with_range(request, httpx.Response(status, headers=headers, content=content, request=request))
+
+    async def handle_async_request(self, request: httpx.Request) -> httpx.Response:
+        status, headers, content, delay = self._answer(request, await request.aread())
+        if delay:
+            await asyncio.sleep(delay)
+        return _with_range(request, httpx.Response(status, headers=headers, content=content, request=request))
+
+    def _answer(self, request: httpx.Request, body: bytes) -> Tuple[int, Dict[str, str], bytes, float]:
+        return self.fake.handle(request.method, request.url.path, _query(request.url), body)
+
+
+class _HTTPError(Exception):
+    """An error response raised by an endpoint handler."""
+
+    def __init__(self, status: int, message: str, headers: Optional[Dict[str, str]] = None, name: Optional[str] = None):
+        super().__init__(message)
+        self.status = status
+        self.message = message
+        self.headers = headers or {}
+        self.name = name
+
+
+def _build_routes(fake: FakeAgentMail) -> List[Tuple[str, "re.Pattern", str, Callable]]:
+    """Return (method, path pattern, endpoint name, handler) for every route."""
+    segment = r"(?P<{}>[^/]+)"
+    inbox = "/v0/inboxes/" + segment.format("inbox_id")
+    thread = segment.format("thread_id")
+    routes = [
+        ("GET", "/v0/inboxes", "inboxes.list", fake._list_inboxes),
+        ("POST", "/v0/inboxes", "inboxes.create", fake._create_inbox),
+        ("GET", inbox, "inboxes.get", fake._get_inbox),
+        ("PATCH", inbox, "inboxes.update", fake._update_inbox),
+        ("DELETE", inbox, "inboxes.delete", fake._delete_inbox),
+        ("POST", inbox + "/messages/send", "messages.send", fake._send_message),
+        ("POST", inbox + "/messages/" + segment.format("message_id") + "/reply", "messages.reply", fake._reply_message),
+        ("GET", inbox + "/messages", "messages.list", fake._list_messages),
+        ("GET", inbox + "/messages/" + segment.format("message_id"), "messages.get", fake._get_message),
+        ("GET", inbox + "/threads", "threads.list", fake._list_threads),
+        ("GET", inbox + "/threads/" + thread, "threads.get", fake._get_thread),
+        ("DELETE", inbox + "/threads/" + thread, "threads.delete", fake._delete_thread),
+        ("GET", "/v0/threads", "threads.list", fake._list_threads),
+        ("GET", "/v0/threads/" + thread, "threads.get", fake._get_thread),
+        ("DELETE", "/v0/threads/" + thread, "threads.delete", fake._delete_thread),
+        ("GET", "/v0/threads/" + thread + "/attachments/" + segment.format("attachment_id"),
+         "attachments.get", fake._get_attachment),
+        ("GET", "/_files/" + segment.format("attachment_id"), "files.get", fake._get_file),
+        ("GET", "/v0/metrics/events", "metrics.events", fake._query_events),
+        ("GET", inbox + "/metrics/events", "metrics.events", fake._query_events),
+        ("GET", "/v0/webhooks", "webhooks.list", fake._list_webhooks),
+        ("POST", "/v0/webhooks", "webhooks.create", fake._create_webhook),
+        ("GET", "/v0/webhooks/" + segment.format("webhook_id"), "webhooks.get", fake._get_webhook),
+        ("DELETE", "/v0/webhooks/" + segment.format("webhook_id"), "webhooks.delete", fake._delete_webhook),
+        ("GET", "/v0/domains", "domains.list", fake._list_domains),
+        ("POST", "/v0/domains", "domains.create", fake._create_domain),
+        ("GET", "/v0/domains/" + segment.format("domain_id"), "domains.get", fake._get_domain),
+        ("DELETE", "/v0/domains/" + segment.format("domain_id"), "domains.delete", fake._delete_domain),
+        ("POST", "/v0/domains/" + segment.format("domain_id") + "/verify", "domains.verify", fake._verify_domain),
+        ("GET", "/v0/domains/" + segment.format("domain_id") + "/zone-file", "domains.zone_file", fake._get_zone_file)
+    ]
+    return [(method, re.compile(pattern + "$"), endpoint, handler) for method, pattern, endpoint, handler in routes]
+
+
+def _error(status: int, message: str, headers: Optional[Dict[str, str]] = None) -> Tuple[int, Dict[str, str], bytes]:
+    """Build an error response in the API's envelope."""
+    names = {400: "ValidationError", 404: "NotFoundError", 409: "AlreadyExistsError", 429: "TooManyRequestsError"}
+    headers = {"content-type": "application/json", **(headers or {})}
+    if status in (429, 503) and "retry-after" not in headers:
+        headers["retry-after"] = "1"
+    body = json.dumps({"name": names.get(status, "ServerError"), "message": message}).encode()
+    return status, headers, body
+
+
+def _with_range(request: httpx.Request, response: httpx.Response) -> httpx.Response:
+    """Honour Range requests on file downloads."""
+    header = request.headers.get("range")
+    if not header or response.status_code != 200 or not request.url.path.startswith("/_files/"):
+        return response
+    start = int(header.split("=", 1)[1].split("-", 1)[0])
+    content = response.content
+    if start >= len(content):
+        return httpx.Response(416, request=request)
+    return httpx.Response(
+        206, content=content[start:], request=request,
+        headers={"content-range": f"bytes {start}-{len(content) - 1}/{len(content)}"}
+    )
+
+
+def _query(url: httpx.URL) -> Dict[str, List[str]]:
+    query: Dict[str, List[str]] = {}
+    for name, value in url.params.multi_items():
+        query.setdefault(name, []).append(value)
+    return query
+
+
+def _first(query: Dict[str, List[str]], name: str) -> Optional[str]:
+    values = query.get(name)
+    return values[0] if values else None
+
+
+def _message_item(message: Dict[str, Any]) -> Dict[str, Any]:
+    """Return a message without its bodies, as list endpoints do."""
+    return {k: v for k, v in message.items() if k not in ("text", "html")}
+
+
+def _new_id(prefix: str) -> str:
+    return f"{prefix}_{uuid.uuid4().hex[:16]}"
+
+
+def _now(offset: float = 0.0) -> str:
+    return _iso(time.time() + offset)
+
+
+def _iso(timestamp: float) -> str:
+    moment = datetime.fromtimestamp(timestamp, tz=timezone.utc)
+    return moment.isoformat(timespec="microseconds").replace("+00:00", "Z")
+
+
+def _int_param(query: Dict[str, List[str]], name: str, default: int, minimum: int = 0) -> int:
+    """Read an integer query parameter, answering 400 if it is not a valid one."""
+    value = _first(query, name)
+    if not value:
+        return default
+    try:
+        number = int(value)
+    except ValueError:
+        number = None
+    if number is None or number < minimum:
+        raise _HTTPError(400, f"Invalid {name}: {value!r}", name="ValidationError")
+    return number
+
+
+def _time_param(query: Dict[str, List[str]], name: str, default: float) -> float:
+    """Read a timestamp query parameter as Unix time, answering 400 if it is not one."""
+    value = _first(query, name)
+    if value is None:
+        return default
+    try:
+        return _parse_time(value)
+    except ValueError:
+        raise _HTTPError(400, f"{name} must be an ISO 8601 timestamp", name="ValidationError") from None
+
+
+def _parse_time(value: str) -> float:
+    moment = datetime.fromisoformat(value.replace("Z", "+00:00"))
+    if moment.tzinfo is None:
+        moment = moment.replace(tzinfo=timezone.utc)
+    return moment.timestamp()
+
+
+def _payload(size: int) -> bytes:
+    """Deterministic attachment content of the given size."""
+    block = bytes(range(256))
+    return (block * (size // 256 + 1))[:size]
@@ -0,0 +1,225 @@
+"""
+Idempotency store module.
+
+Provides a bounded store of already-processed webhook events so retried or
+duplicated deliveries are dropped before any handler runs. Recent keys live
+in an in-memory LRU; with a path, every key is also written to SQLite so
+duplicates are still recognised after the LRU evicts them or the process
+restarts.
+"""
+
+import sqlite3
+import threading
+import time
+from collections import OrderedDict
+from typing import Any, Dict, Iterable, List, Optional
+
+DEFAULT_MAXSIZE = 10000
+# Seconds a key is remembered on disk; webhook retries stop well before this
+DEFAULT_TTL = 7 * 24 * 3600
+# Number of additions between purges of expired keys on disk
+_PURGE_INTERVAL = 1000
+
+_SCHEMA = """
+CREATE TABLE IF NOT EXISTS processed (
+    key TEXT PRIMARY KEY,
+    seen_at REAL NOT NULL
+);
+CREATE INDEX IF NOT EXISTS processed_seen_at ON processed (seen_at);
+"""
+
+
+class IdempotencyStore:
+    """LRU of processed keys with an optional SQLite fallback."""
+
+    def __init__(
+        self,
+        path: Optional[str] = None,
+        maxsize: int = DEFAULT_MAXSIZE,
+        ttl: float = DEFAULT_TTL
+    ):
+        """
+        Open (or create) an idempotency store.
+
+        Args:
+            path: Optional path to a SQLite database. Without one, keys are
+                  only remembered in memory.
+            maxsize: Maximum number of keys kept in memory
+            ttl: Seconds a key is remembered on disk
+        """
+        self.path = path
+        self.maxsize = maxsize
+        self.ttl = ttl
+        self._lock = threading.Lock()
+        self._recent: "OrderedDict[str, None]" = OrderedDict()
+        self._conn: Optional[sqlite3.Connection] = None
+        if path is not None:
+            self._conn = sqlite3.connect(path, check_same_thread=False)
+            self._conn.execute("PRAGMA journal_mode=WAL")
+            self._conn.execute("PRAGMA synchronous=NORMAL")
+            self._conn.executescript(_SCHEMA)
+        self._added = 0
+        self._checks = 0
+        self._memory_hits = 0
+        self._disk_hits = 0
+
+    def close(self) -> None:
+        """Close the database connection."""
+        with self._lock:
+            if self._conn is not None:
+                self._conn.close()
+                self._conn = None
+
+    def __enter__(self) -> "IdempotencyStore":
+        return self
+
+    def __exit__(self, *exc_info) -> None:
+        self.close()
+
+    def seen(self, keys: Iterable[str]) -> bool:
+        """
+        Check whether any of the keys was already processed.
+
+        Args:
+            keys: Keys identifying one event
+
+        Returns:
+            True if the event is a duplicate
+        """
+        keys = [key for key in keys if key]
+        with self._lock:
+            return self._seen(keys)
+
+    def add(self, keys: Iterable[str]) -> None:
+        """
+        Mark keys as processed.
+
+        Args:
+            keys: Keys identifying one event
+        """
+        keys = [key for key in keys if key]
+        with self._lock:
+            self._add(keys)
+
+    def check_and_add(self, keys: Iterable[str]) -> bool:
+        """
+        Mark keys as processed, reporting whether they already were.
+
+        The check and the insert happen under one lock, so when the same
+        event is delivered concurrently exactly one caller gets False.
+
+        Args:
+            keys: Keys identifying one event
+
+        Returns:
+            True if the event is a duplicate and should be skipped
+        """
+        keys = [key for key in keys if key]
+        with self._lock:
+            if self._seen(keys):
+                return True
+            self._add(keys)
+            return False
+
+    def discard(self, keys: Iterable[str]) -> None:
+        """
+        Forget keys, so the event is processed again if redelivered.
+
+        Args:
+            keys: Keys identifying one event
+        """
+        keys = [key for key in keys if key]
+        with self._lock:
+            for key in keys:
+                self._recent.pop(key, None)
+            if self._conn is not None and keys:
+                self._conn.executemany("DELETE FROM processed WHERE key = ?", [(key,) for key in keys])
+                self._conn.commit()
+
+    def stats(self) -> Dict[str, Any]:
+        """
+        Return store counters.
+
+        Returns:
+            Dictionary with keys held in memory, checks, duplicates found in
+            memory and on disk, and the overall duplicate (dedup hit) rate
+        """
+        with self._lock:
+            duplicates = self._memory_hits + self._disk_hits
+            return {
+                "size": len(self._recent),
+                "maxsize": self.maxsize,
+                "checks": self._checks,
+                "duplicates": duplicates,
+                "memory_hits": self._memory_hits,
+                "disk_hits": self._disk_hits,
+                "hit_rate": duplicates / self._checks if self._checks else 0.0
+            }
+
+    def _seen(self, keys: List[str]) -> bool:
+        """Check for processed keys. Caller holds the lock."""
+        self._checks += 1
+        for key in keys:
+            if key in self._recent:
+                self._recent.move_to_end(key)
+                self._memory_hits += 1
+                return True
+        if self._conn is not None and keys:
+            placeholders = ", ".join("?" * len(keys))
+            row = self._conn.execute(
+                f"SELECT key FROM processed WHERE key IN ({placeholders}) AND seen_at > ? LIMIT 1",
+                (*keys, time.time() - self.ttl)
+            ).fetchone()
+            if row is not None:
+                self._remember(row[0])
+                self._disk_hits += 1
+                return True
+        return False
+
+    def _add(self, keys: List[str]) -> None:
+        """Mark keys as processed. Caller holds the lock."""
+        now = time.time()
+        for key in keys:
+            self._remember(key)
+        if self._conn is not None and keys:
+            self._conn.executemany(
+                "INSERT OR REPLACE INTO processed VALUES (?, ?)", [(key, now) for key in keys]
+            )
+            self._added += 1
+            if self._added % _PURGE_INTERVAL == 0:
+                self._conn.execute("DELETE FROM processed WHERE seen_at <= ?", (now - self.ttl,))
+            self._conn.commit()
+        else:
+            self._added += 1
+
+    def _remember(self, key: str) -> None:
+        """Insert a key into the LRU. Caller holds the lock."""
+        self._recent[key] = None
+        self._recent.move_to_end(key)
+        while len(self._recent) > self.maxsize:
+            self._recent.popitem(last=False)
+
+
+def event_keys(event: Dict[str, Any]) -> List[str]:
+    """
+    Return the idempotency keys of a webhook event.
+
+    An event is identified by its event ID (falling back to the delivery ID)
+    and by its event type and message ID, so the same message delivered to
+    two webhooks is also handled once.
+
+    Args:
+        event: Parsed webhook event dictionary
+
+    Returns:
+        List of keys
+    """
+    keys = []
+    event_id = event.get("event_id") or event.get("_delivery_id")
+    if event_id:
+        keys.append(f"event:{event_id}")
+    message = event.get("message")
+    if isinstance(message, dict) and message.get("message_id"):
+        event_type = event.get("event_type") or event.get("type")
+        keys.append(f"message:{event_type}:{message['message_id']}")
+    return keys
@@ -0,0 +1,274 @@
+"""
+Inbox pool module.
+
+Provides a warm pool of pre-provisioned inboxes with lease/return semantics.
+A background thread keeps the pool filled, so workers lease an inbox
+immediately instead of waiting on `create_inbox()` or hitting inbox limits
+mid-run.
+
+Only inboxes the pool created itself are ever deleted. Inboxes adopted from
+the account are not reserved on the server, so two pools (or processes)
+adopting the same account can lease the same inbox at the same time; use
+`reuse_existing=False` when leases must be exclusive.
+"""
+
+import threading
+import time
+from collections import deque
+from contextlib import contextmanager
+from typing import Any, Dict, Iterator, Optional
+
+from .inboxes import create_inbox, delete_inbox, iter_inboxes
+from .ratelimit import is_limit_error
+
+DEFAULT_POOL_SIZE = 4
+# Seconds to wait before retrying after inbox creation fails
+DEFAULT_RETRY_DELAY = 5.0
+
+
+class InboxPool:
+    """Thread-safe pool of warm inboxes."""
+
+    def __init__(
+        self,
+        size: int = DEFAULT_POOL_SIZE,
+        api_key: str = None,
+        reuse_existing: bool = True,
+        recycle: bool = False,
+        retry_delay: float = DEFAULT_RETRY_DELAY,
+        **create_kwargs
+    ):
+        """
+        Configure the pool. Call `start()` (or use it as a context manager)
+        to begin provisioning.
+
+        Args:
+            size: Number of inboxes the pool keeps available or leased
+            api_key: Optional API key. If not provided, will load from environment.
+            reuse_existing: Whether to adopt existing inboxes before creating new
+                            ones. Adopted inboxes may also be leased by other
+                            pools using the same account.
+            recycle: Whether returned inboxes are deleted and replaced with fresh
+                     ones by default, instead of going back into the pool.
+                     Adopted inboxes are never deleted.
+            retry_delay: Seconds to wait before retrying after a failed creation;
+                         doubled (up to 60s) while the inbox limit is reached
+            **create_kwargs: Additional parameters for `create_inbox()`
+        """
+        self.size = size
+        self.api_key = api_key
+        self.reuse_existing = reuse_existing
+        self.recycle = recycle
+        self.retry_delay = retry_delay
+        self.create_kwargs = create_kwargs
+        self._cond = threading.Condition()
+        self._available: deque = deque()
+        self._leased: Dict[str, Any] = {}
+        self._created: Dict[str, Any] = {}
+        self._provisioning = 0
+        self._closed = False
+        self._thread: Optional[threading.Thread] = None
+        self.last_error: Optional[BaseException] = None
+        self._stats = {"leases": 0, "waits": 0, "created": 0, "recycled": 0, "errors": 0}
+
+    def start(self) -> "InboxPool":
+        """
+        Start provisioning inboxes in the background.
+
+        Returns:
+            The pool itself
+        """
+        with self._cond:
+            if self._thread is None:
+                self._thread = threading.Thread(
+                    target=self._run, name="agentmail-inbox-pool", daemon=True
+                )
+                self._thread.start()
+        return self
+
+    def lease(self, timeout: Optional[float] = None) -> Any:
+        """
+        Lease an inbox, waiting for one to be provisioned if none is available.
+
+        Args:
+            timeout: Optional maximum number of seconds to wait
+
+        Returns:
+            Inbox object
+
+        Raises:
+            TimeoutError: If no inbox became available within timeout
+            RuntimeError: If the pool is closed
+        """
+        self.start()
+        deadline = None if timeout is None else time.monotonic() + timeout
+        with self._cond:
+            waited = False
+            while True:
+                if self._closed:
+                    raise RuntimeError("Inbox pool is closed")
+                if self._available:
+                    break
+                remaining = None if deadline is None else deadline - time.monotonic()
+                if remaining is not None and remaining <= 0:
+                    raise TimeoutError(
+                        f"No inbox available within {timeout}s"
+                        + (f" (last error: {self.last_error})" if self.last_error else "")
+                    )
+                waited = True
+                self._cond.wait(remaining)
+            inbox = self._available.popleft()
+            self._leased[_inbox_id(inbox)] = inbox
+            self._stats["leases"] += 1
+            self._stats["waits"] += waited
+            self._cond.notify_all()
+            return inbox
+
+    def release(self, inbox: Any, recycle: Optional[bool] = None) -> None:
+        """
+        Return a leased inbox to the pool.
+
+        Args:
+            inbox: Inbox previously returned by `lease()`
+            recycle: Whether to delete the inbox and provision a fresh one.
+                     Defaults to the pool's recycle setting. Inboxes the pool
+                     adopted rather than created always go back into the pool.
+        """
+        recycle = self.recycle if recycle is None else recycle
+        inbox_id = _inbox_id(inbox)
+        with self._cond:
+            if self._leased.pop(inbox_id, None) is None:
+                raise ValueError(f"Inbox {inbox_id} is not leased from this pool")
+            recycle = recycle and inbox_id in self._created
+            if not recycle and not self._closed:
+                self._available.append(inbox)
+                self._cond.notify_all()
+                return
+            self._created.pop(inbox_id, None)
+            self._stats["recycled"] += recycle
+            self._cond.notify_all()
+        if recycle:
+            delete_inbox(inbox_id, api_key=self.api_key)
+
+    @contextmanager
+    def leased(self, timeout: Optional[float] = None, recycle: Optional[bool] = None) -> Iterator[Any]:
+        """
+        Lease an inbox for the duration of a with-block.
+
+        Args:
+            timeout: Optional maximum number of seconds to wait for an inbox
+            recycle: Whether to delete and replace the inbox afterwards
+
+        Yields:
+            Inbox object
+        """
+        inbox = self.lease(timeout)
+        try:
+            yield inbox
+        finally:
+            self.release(inbox, recycle=recycle)
+
+    def close(self, delete_created: bool = False) -> None:
+        """
+        Stop provisioning.
+
+        Args:
+            delete_created: Whether to delete inboxes the pool created that
+                            are not currently leased
+        """
+        with self._cond:
+            self._closed = True
+            self._cond.notify_all()
+        if self._thread is not None:
+            self._thread.join()
+        # Snapshot after the join, so an inbox whose creation finished while
+        # closing is deleted too
+        with self._cond:
+            idle = [_inbox_id(inbox) for inbox in self._available]
+            created = set(self._created)
+            self._available.clear()
+        if delete_created:
+            for inbox_id in idle:
+                if inbox_id in created:
+                    delete_inbox(inbox_id, api_key=self.api_key)
+
+    def __enter__(self) -> "InboxPool":
+        return self.start()
+
+    def __exit__(self, *exc_info) -> None:
+        self.close()
+
+    def stats(self) -> Dict[str, Any]:
+        """
+        Return pool counters.
+
+        Returns:
+            Dictionary with available, leased and provisioning counts and
+            totals of leases, leases that had to wait, inboxes created,
+            inboxes recycled and creation errors
+        """
+        with self._cond:
+            return {
+                "available": len(self._available),
+                "leased": len(self._leased),
+                "provisioning": self._provisioning,
+                **self._stats
+            }
+
+    def _run(self) -> None:
+        """Background loop keeping the pool at its target size."""
+        if self.reuse_existing:
+            self._adopt_existing()
+        delay = self.retry_delay
+        while True:
+            with self._cond:
+                while not self._closed and self._deficit() <= 0:
+                    self._cond.wait()
+                if self._closed:
+                    return
+                self._provisioning += 1
+            try:
+                inbox = create_inbox(api_key=self.api_key, **self.create_kwargs)
+            except Exception as e:
+                with self._cond:
+                    self._provisioning -= 1
+                    self.last_error = e
+                    self._stats["errors"] += 1
+                    resume_at = time.monotonic() + delay
+                    while not self._closed and time.monotonic() < resume_at:
+                        self._cond.wait(resume_at - time.monotonic())
+                delay = min(delay * 2, 60.0) if is_limit_error(e) else self.retry_delay
+                continue
+            delay = self.retry_delay
+            with self._cond:
+                self._provisioning -= 1
+                self._created[_inbox_id(inbox)] = inbox
+                self._available.append(inbox)
+                self._stats["created"] += 1
+                self._cond.notify_all()
+
+    def _adopt_existing(self) -> None:
+        """Fill the pool from inboxes that already exist."""
+        try:
+            for inbox in iter_inboxes(api_key=self.api_key):
+                with self._cond:
+                    if self._closed or self._deficit() <= 0:
+                        return
+                    if _inbox_id(inbox) not in self._leased:
+                        self._available.append(inbox)
+                        self._cond.notify_all()
+        except Exception as e:
+            with self._cond:
+                self.last_error = e
+                self._stats["errors"] += 1
+
+    def _deficit(self) -> int:
+        """Number of inboxes missing from the target size. Caller holds the lock."""
+        return self.size - len(self._available) - len(self._leased) - self._provisioning
+
+
+def _inbox_id(inbox: Any) -> str:
+    """Return the ID of an inbox object or dictionary."""
+    if isinstance(inbox, dict):
+        return inbox.get("inbox_id") or inbox.get("id")
+    return getattr(inbox, "inbox_id", None) or getattr(inbox, "id", None)
@@ -4,10 +4,16 @@ Inbox management module.
 Provides functions to create and manage email inboxes.
 """
 
-from typing import List, Dict, Any, Optional
+from typing import List, Dict, Any, Optional, Iterator, Iterable
+from .cache import cached, invalidates
 from .client import get_client
+from .pagination import paginate
+from .records import projector
+from .singleflight import coalesced
+from .telemetry import instrumented
 
 
+@instrumented
 def list_inboxes(api_key: str = None) -> List[Dict[str, Any]]:
     """
     List all inboxes.
@@ -22,6 +28,41 @@ def list_inboxes(api_key: str = None) -> List[Dict[str, Any]]:
     return client.inboxes.list()
 
 
+@instrumented
+def iter_inboxes(
+    page_size: Optional[int] = None,
+    prefetch: bool = False,
+    fields: Optional[Iterable[str]] = None,
+    api_key: str = None
+) -> Iterator[Any]:
+    """
+    Iterate over all inboxes, following pagination automatically.
+    
+    Items are yielded one at a time, so memory use stays constant
+    regardless of how many inboxes exist.
+    
+    Args:
+        page_size: Optional number of inboxes to request per page
+        prefetch: Whether to fetch the next page in the background while
+                  the current page is being consumed
+        fields: Optional inbox fields to keep, e.g. ("inbox_id", "created_at").
+                If provided, compact tuple-backed records holding only these
+                fields are yielded instead of full models.
+        api_key: Optional API key. If not provided, will load from environment.
+    
+    Yields:
+        Inbox objects, or records with the selected fields
+    """
+    client = get_client(api_key)
+    return paginate(
+        client.inboxes.list, "inboxes", page_size=page_size, prefetch=prefetch,
+        transform=projector("inbox", fields)
+    )
+
+
+@instrumented
+@cached("inbox", "inbox_id")
+@coalesced
 def get_inbox(inbox_id: str, api_key: str = None) -> Dict[str, Any]:
     """
     Get a specific inbox by ID.
@@ -37,6 +78,7 @@ def get_inbox(inbox_id: str, api_key: str = None) -> Dict[str, Any]:
     return client.inboxes.get(inbox_id=inbox_id)
 
 
+@instrumented
 def create_inbox(domain: Optional[str] = None, api_key: str = None, **kwargs) -> Dict[str, Any]:
     """
     Create a new inbox.
@@ -55,6 +97,8 @@ def create_inbox(domain: Optional[str] = None, api_key: str = None, **kwargs) ->
     return client.inboxes.create(**kwargs)
 
 
+@instrumented
+@invalidates("inbox", "inbox_id")
 def update_inbox(inbox_id: str, api_key: str = None, **kwargs) -> Dict[str, Any]:
     """
     Update an inbox by ID.
@@ -71,6 +115,8 @@ def update_inbox(inbox_id: str, api_key: str = None, **kwargs) -> Dict[str, Any]
     return client.inboxes.update(inbox_id=inbox_id, **kwargs)
 
 
+@instrumented
+@invalidates("inbox", "inbox_id", owns=("thread", "inbox_id"))
 def delete_inbox(inbox_id: str, api_key: str = None) -> Dict[str, Any]:
     """
     Delete an inbox by ID.
@@ -0,0 +1,320 @@
+"""
+Mail-merge module.
+
+Provides a streaming mail-merge pipeline on top of `send_bulk()`.
+Recipients and their variables are read row by row from CSV or JSONL,
+subject/text/html templates are compiled once, and addresses are validated
+and de-duplicated in batches before sending, so campaigns of any size run
+in constant memory apart from the set of addresses already seen.
+"""
+
+import csv
+import hashlib
+import html as html_lib
+import json
+import os
+import re
+import string
+from dataclasses import dataclass, field
+from itertools import islice
+from typing import Any, Dict, Iterable, Iterator, List, Mapping, Optional, Tuple, Union
+
+from .bulk import DEFAULT_CONCURRENCY, BulkReport, send_bulk
+
+DEFAULT_BATCH_SIZE = 1000
+
+# Pragmatic address check: one "@", no whitespace, a dot in the domain
+_ADDRESS_RE = re.compile(r"^[^@\s<>]+@[^@\s<>]+\.[^@\s<>]+$")
+
+
+class MergeError(ValueError):
+    """Raised when a template is invalid or a row lacks a template variable."""
+
+
+class Template:
+    """A `{name}`-style template compiled once and rendered per row."""
+
+    def __init__(self, source: str, escape: bool = False):
+        """
+        Compile a template.
+
+        Placeholders use `str.format` field syntax, e.g. "Hi {first_name}";
+        literal braces are written as "{{" and "}}". Attribute and index
+        lookups and format specs are not supported.
+
+        Args:
+            source: Template text
+            escape: Whether substituted values are HTML-escaped
+
+        Raises:
+            MergeError: If the template syntax is invalid
+        """
+        self.source = source
+        self.escape = escape
+        parts: List[tuple] = []
+        try:
+            for literal, name, spec, conversion in string.Formatter().parse(source):
+                if name is not None and (spec or conversion or not name.isidentifier()):
+                    raise MergeError(f"Unsupported placeholder {{{name}}} in template")
+                parts.append((literal, name))
+        except ValueError as e:
+            raise MergeError(f"Invalid template: {e}") from e
+        self._parts = parts
+        self.fields = frozenset(name for _, name in parts if name is not None)
+
+    def render(self, variables: Dict[str, Any]) -> str:
+        """
+        Render the template with a row's variables.
+
+        Args:
+            variables: Mapping of placeholder names to values
+
+        Returns:
+            Rendered text
+
+        Raises:
+            MergeError: If a placeholder has no value in variables
+        """
+        out = []
+        for literal, name in self._parts:
+            out.append(literal)
+            if name is not None:
+                try:
+                    value = variables[name]
+                except KeyError:
+                    raise MergeError(f"Missing template variable: {name}") from None
+                value = "" if value is None else str(value)
+                out.append(html_lib.escape(value) if self.escape else value)
+        return "".join(out)
+
+
+@dataclass
+class MergeStats:
+    """Counts of rows read and skipped by a mail merge."""
+
+    rows: int = 0
+    queued: int = 0
+    invalid: int = 0
+    duplicates: int = 0
+    errors: List[str] = field(default_factory=list, repr=False)
+
+
+@dataclass(frozen=True)
+class InvalidLine:
+    """Marker yielded by `read_rows()` in place of a JSONL line that is not valid JSON."""
+
+    line: int
+    error: str
+
+
+class MailMerge:
+    """Turn rows of recipient variables into `send_message()` specs."""
+
+    def __init__(
+        self,
+        inbox_id: str,
+        subject: str,
+        text: Optional[str] = None,
+        html: Optional[str] = None,
+        to_field: str = "email",
+        labels: Optional[List[str]] = None,
+        batch_size: int = DEFAULT_BATCH_SIZE,
+        dedupe: bool = True,
+        max_errors: int = 100
+    ):
+        """
+        Compile the templates of a campaign.
+
+        Args:
+            inbox_id: The ID of the inbox to send from
+            subject: Subject template
+            text: Optional plain text body template
+            html: Optional HTML body template; substituted values are escaped
+            to_field: Name of the row column holding the recipient address
+            labels: Optional list of labels applied to every message
+            batch_size: Number of rows validated and de-duplicated at a time
+            dedupe: Whether to skip addresses already sent to in this merge
+            max_errors: Maximum number of skipped-row descriptions kept in stats
+
+        Raises:
+            MergeError: If a template is invalid
+        """
+        if text is None and html is None:
+            raise MergeError("At least one of text or html is required")
+        self.inbox_id = inbox_id
+        self.to_field = to_field
+        self.labels = labels
+        self.batch_size = batch_size
+        self.dedupe = dedupe
+        self.max_errors = max_errors
+        self.subject = Template(subject)
+        self.text = Template(text) if text is not None else None
+        self.html = Template(html, escape=True) if html is not None else None
+        self.stats = MergeStats()
+        # 8-byte digests of addresses already queued, rather than the strings
+        self._seen = set()
+
+    def specs(self, rows: Iterable[Dict[str, Any]]) -> Iterator[Dict[str, Any]]:
+        """
+        Lazily build one `send_message()` spec per valid, unseen row.
+
+        Args:
+            rows: Iterable of row dictionaries, e.g. from `read_rows()`
+
+        Yields:
+            Keyword-argument dicts for `send_message()`
+        """
+        rows = iter(rows)
+        while True:
+            batch = list(islice(rows, self.batch_size))
+            if not batch:
+                return
+            yield from self._process_batch(batch)
+
+    def send(
+        self,
+        rows: Iterable[Dict[str, Any]],
+        concurrency: int = DEFAULT_CONCURRENCY,
+        api_key: str = None,
+        **bulk_kwargs
+    ) -> BulkReport:
+        """
+        Merge and send a campaign.
+
+        Per-message results are not kept by default, so campaigns of any size
+        run in constant memory; pass keep_results=True for small campaigns or
+        use on_result to see each outcome.
+
+        Args:
+            rows: Iterable of row dictionaries, e.g. from `read_rows()`
+            concurrency: Maximum number of messages sent at the same time
+            api_key: Optional API key. If not provided, will load from environment.
+            **bulk_kwargs: Additional parameters for `send_bulk()`, e.g.
+                           keep_results or on_result
+
+        Returns:
+            BulkReport of the messages sent; rows skipped before sending are
+            counted in `self.stats`
+        """
+        bulk_kwargs.setdefault("keep_results", False)
+        return send_bulk(self.specs(rows), concurrency=concurrency, api_key=api_key, **bulk_kwargs)
+
+    def _process_batch(self, batch: List[Dict[str, Any]]) -> List[Dict[str, Any]]:
+        """Validate, de-duplicate and render one batch of rows."""
+        stats = self.stats
+        first = stats.rows + 1
+        stats.rows += len(batch)
+        specs = []
+        for number, row in enumerate(batch, first):
+            if isinstance(row, InvalidLine):
+                self._skip("invalid", f"Line {row.line} is not valid JSON: {row.error}")
+                continue
+            if not isinstance(row, Mapping):
+                self._skip("invalid", f"Row {number} is not an object: {type(row).__name__}")
+                continue
+            address = str(row.get(self.to_field) or "").strip()
+            if not _ADDRESS_RE.match(address):
+                self._skip("invalid", f"Invalid address {address!r}")
+                continue
+            digest = None
+            if self.dedupe:
+                digest = hashlib.blake2b(address.lower().encode(), digest_size=8).digest()
+                if digest in self._seen:
+                    stats.duplicates += 1
+                    continue
+            try:
+                spec = {
+                    "inbox_id": self.inbox_id,
+                    "to": address,
+                    "subject": self.subject.render(row)
+                }
+                if self.text is not None:
+                    spec["text"] = self.text.render(row)
+                if self.html is not None:
+                    spec["html"] = self.html.render(row)
+            except MergeError as e:
+                self._skip("invalid", f"{address}: {e}")
+                continue
+            if digest is not None:
+                self._seen.add(digest)
+            if self.labels:
+                spec["labels"] = self.labels
+            specs.append(spec)
+        stats.queued += len(specs)
+        return specs
+
+    def _skip(self, counter: str, reason: str) -> None:
+        setattr(self.stats, counter, getattr(self.stats, counter) + 1)
+        if len(self.stats.errors) < self.max_errors:
+            self.stats.errors.append(reason)
+
+
+def read_rows(source: Union[str, os.PathLike], format: Optional[str] = None) -> Iterator[Dict[str, Any]]:
+    """
+    Stream rows from a CSV (with header) or JSONL file.
+
+    Args:
+        source: Path to the file
+        format: "csv" or "jsonl". Defaults to the file extension, with
+                anything other than .jsonl/.ndjson treated as CSV.
+
+    Yields:
+        One dictionary per row; a JSONL line that is not valid JSON yields an
+        `InvalidLine`, which `MailMerge` counts as an invalid row
+    """
+    path = os.fspath(source)
+    if format is None:
+        format = "jsonl" if path.endswith((".jsonl", ".ndjson")) else "csv"
+    with open(path, newline="", encoding="utf-8") as f:
+        if format == "jsonl":
+            for number, line in enumerate(f, 1):
+                if line.strip():
+                    try:
+                        yield json.loads(line)
+                    except json.JSONDecodeError as e:
+                        yield InvalidLine(number, e.msg)
+        elif format == "csv":
+            yield from csv.DictReader(f)
+        else:
+            raise ValueError(f"Unsupported format: {format}")
+
+
+def mail_merge(
+    source: Union[str, os.PathLike, Iterable[Dict[str, Any]]],
+    inbox_id: str,
+    subject: str,
+    text: Optional[str] = None,
+    html: Optional[str] = None,
+    concurrency: int = DEFAULT_CONCURRENCY,
+    api_key: str = None,
+    **kwargs
+) -> Tuple[BulkReport, MergeStats]:
+    """
+    Send a templated campaign to every row of a CSV/JSONL file or iterable.
+
+    Args:
+        source: Path to a CSV or JSONL file, or an iterable of row dictionaries
+        inbox_id: The ID of the inbox to send from
+        subject: Subject template, e.g. "Hello {first_name}"
+        text: Optional plain text body template
+        html: Optional HTML body template
+        concurrency: Maximum number of messages sent at the same time
+        api_key: Optional API key. If not provided, will load from environment.
+        **kwargs: Additional `MailMerge` options (to_field, labels, batch_size,
+                  dedupe) and `send_bulk()` options (keep_results, on_result,
+                  progress, progress_interval). Per-message results are
+                  not kept unless keep_results=True.
+
+    Returns:
+        Tuple of (BulkReport of the messages sent, MergeStats of rows read
+        and skipped)
+    """
+    merge_options = {
+        name: kwargs.pop(name)
+        for name in ("to_field", "labels", "batch_size", "dedupe", "max_errors")
+        if name in kwargs
+    }
+    merge = MailMerge(inbox_id, subject, text=text, html=html, **merge_options)
+    rows = read_rows(source) if isinstance(source, (str, os.PathLike)) else source
+    report = merge.send(rows, concurrency=concurrency, api_key=api_key, **kwargs)
+    return report, merge.stats
@@ -1,13 +1,19 @@
 """
 Message management module.
 
-Provides functions to send and reply to email messages.
+Provides functions to send, reply to and list email messages.
 """
 
-from typing import List, Dict, Any, Optional, Union
+from typing import List, Dict, Any, Optional, Union, Iterator, Iterable
+from .cache import invalidates_thread
 from .client import get_client
+from .pagination import paginate
+from .records import projector
+from .telemetry import instrumented
 
 
+@instrumented
+@invalidates_thread()
 def send_message(
     inbox_id: str,
     to: Union[str, List[str]],
@@ -35,32 +41,14 @@ def send_message(
         Sent message object
     """
     client = get_client(api_key)
-    
-    # Ensure 'to' is a list
-    if isinstance(to, str):
-        to = [to]
-    
-    # Build request body parameters (inbox_id is a path parameter, not in body)
-    request_body = {
-        "to": to,
-        "subject": subject
-    }
-    
-    if text is not None:
-        request_body["text"] = text
-    
-    if html is not None:
-        request_body["html"] = html
-    
-    if labels is not None:
-        request_body["labels"] = labels
-    
-    request_body.update(kwargs)
+    request_body = _build_send_body(to, subject, text, html, labels, kwargs)
     
     # Pass inbox_id as path parameter and request_body as body
     return client.inboxes.messages.send(inbox_id=inbox_id, **request_body)
 
 
+@instrumented
+@invalidates_thread("message_id")
 def reply_message(
     inbox_id: str,
     message_id: str,
@@ -84,7 +72,86 @@ def reply_message(
         Reply message object
     """
     client = get_client(api_key)
+    params = _build_reply_params(inbox_id, message_id, text, html, kwargs)
+    return client.inboxes.messages.reply(**params)
+
+
+@instrumented
+def iter_messages(
+    inbox_id: str,
+    page_size: Optional[int] = None,
+    prefetch: bool = False,
+    fields: Optional[Iterable[str]] = None,
+    api_key: str = None,
+    **kwargs
+) -> Iterator[Any]:
+    """
+    Iterate over all messages of an inbox, following pagination automatically.
+    
+    Items are yielded one at a time, so memory use stays
+    constant regardless of how many messages exist.
+    
+    Args:
+        inbox_id: The ID of the inbox to list messages of
+        page_size: Optional number of messages to request per page
+        prefetch: Whether to fetch the next page in the background while
+                  the current page is being consumed
+        fields: Optional message fields to keep, e.g. ("message_id", "from", "subject").
+                If provided, compact tuple-backed records holding only these
+                fields are yielded instead of full models.
+        api_key: Optional API key. If not provided, will load from environment.
+        **kwargs: Additional parameters for filtering messages
+    
+    Yields:
+        Message objects (without bodies), or records with the selected fields
+    """
+    client = get_client(api_key)
+    return paginate(
+        client.inboxes.messages.list, "messages", page_size=page_size, prefetch=prefetch,
+        transform=projector("message", fields), inbox_id=inbox_id, **kwargs
+    )
+
+
+def _build_send_body(
+    to: Union[str, List[str]],
+    subject: str,
+    text: Optional[str],
+    html: Optional[str],
+    labels: Optional[List[str]],
+    extra: Dict[str, Any]
+) -> Dict[str, Any]:
+    """Build the request body for sending a message."""
+    # Ensure 'to' is a list
+    if isinstance(to, str):
+        to = [to]
+    
+    # Build request body parameters (inbox_id is a path parameter, not in body)
+    request_body = {
+        "to": to,
+        "subject": subject
+    }
     
+    if text is not None:
+        request_body["text"] = text
+    
+    if html is not None:
+        request_body["html"] = html
+    
+    if labels is not None:
+        request_body["labels"] = labels
+    
+    request_body.update(extra)
+    return request_body
+
+
+def _build_reply_params(
+    inbox_id: str,
+    message_id: str,
+    text: Optional[str],
+    html: Optional[str],
+    extra: Dict[str, Any]
+) -> Dict[str, Any]:
+    """Build the parameters for replying to a message."""
     params = {
         "inbox_id": inbox_id,
         "message_id": message_id
@@ -96,7 +163,6 @@ def reply_message(
     if html is not None:
         params["html"] = html
     
-    params.update(kwargs)
-    
-    return client.inboxes.messages.reply(**params)
+    params.update(extra)
+    return params
 
@@ -4,10 +4,13 @@ Metrics and analytics module.
 Provides functions to access usage and performance metrics.
 """
 
-from typing import List, Dict, Any
+from datetime import datetime
+from typing import List, Dict, Any, Optional
 from .client import get_client
+from .telemetry import instrumented
 
 
+@instrumented
 def list_metrics(api_key: str = None, **kwargs) -> List[Dict[str, Any]]:
     """
     List metrics.
@@ -22,3 +25,42 @@ def list_metrics(api_key: str = None, **kwargs) -> List[Dict[str, Any]]:
     client = get_client(api_key)
     return client.metrics.list(**kwargs)
 
+
+@instrumented
+def query_events(
+    event_types: Optional[List[str]] = None,
+    start: Optional[datetime] = None,
+    end: Optional[datetime] = None,
+    period: Optional[int] = None,
+    limit: Optional[int] = None,
+    descending: Optional[bool] = None,
+    inbox_id: Optional[str] = None,
+    api_key: str = None
+) -> Dict[str, List[Any]]:
+    """
+    Count email events (sent, delivered, bounced, ...) over time.
+    
+    Args:
+        event_types: Optional event types to count, e.g. ["message.sent"]
+        start: Optional start of the window; must be within the last 90 days.
+               Defaults to 24 hours ago.
+        end: Optional end of the window; a future end is clamped to now
+        period: Optional bucket length in seconds. If not provided, every
+                event is returned individually.
+        limit: Optional maximum number of buckets per event type
+        descending: Whether to return the newest buckets first
+        inbox_id: Optional inbox to count events for. If not provided,
+                  counts cover the whole organization.
+        api_key: Optional API key. If not provided, will load from environment.
+    
+    Returns:
+        Dictionary mapping each event type to its buckets (timestamp, count)
+    """
+    client = get_client(api_key)
+    params = dict(
+        event_types=event_types, start=start, end=end, period=period,
+        limit=limit, descending=descending
+    )
+    if inbox_id is not None:
+        return client.inboxes.metrics.query_events(inbox_id=inbox_id, **params)
+    return client.metrics.query_events(**params)
@@ -0,0 +1,402 @@
+"""
+Metrics time-series store module.
+
+Keeps event counts from the metrics endpoints (`metrics.query_events`) in
+memory as NumPy arrays, one time series per (inbox, event type), and only
+fetches the time range since the last refresh. The first refresh backfills
+the whole window the API allows (90 days); later refreshes re-fetch from the
+latest, possibly partial, bucket onwards. Rollups (sum, rate or percentile
+per bucket, per inbox and per event type) are vectorized over the stored
+arrays, so a dashboard refresh is one small request per tracked scope plus
+in-memory math:
+
+    store = MetricsStore("agentmail_metrics.npz", resolution=3600)
+    store.refresh()
+    daily = store.rollup("sum", bucket=86400, by="event_type")
+    print(daily.to_dict()["message.delivered"])
+
+NumPy is only needed by this module and is imported when a store is
+created; install it with `pip install numpy`.
+"""
+
+import json
+import math
+import os
+import threading
+import time
+import warnings
+from concurrent.futures import ThreadPoolExecutor
+from dataclasses import dataclass
+from datetime import datetime, timezone
+from typing import Any, Dict, Iterable, List, Optional, Tuple, Union
+
+from .metrics import query_events
+
+DEFAULT_RESOLUTION = 3600
+# The API only answers queries starting within this many seconds of now
+MAX_WINDOW = 90 * 86400
+# Backfills start this much later than the window edge, so the start is still
+# inside the window when the request arrives
+WINDOW_MARGIN = 300
+# Buckets requested per event type and call; longer ranges are split
+MAX_BUCKETS = 1000
+AGGREGATES = ("sum", "rate", "percentile")
+DIMENSIONS = ("inbox", "event_type")
+
+Moment = Union[datetime, int, float]
+
+
+@dataclass
+class Rollup:
+    """Aggregated metrics: one row of values per group, one column per bucket."""
+
+    aggregate: str
+    bucket: int
+    by: Tuple[str, ...]
+    groups: List[Any]
+    timestamps: Any
+    values: Any
+
+    def series(self, group: Any) -> Any:
+        """
+        Return the values of one group.
+
+        Args:
+            group: Group key, e.g. "message.sent" when grouped by event
+                   type or ("inbox_id", "message.sent") when grouped by both
+
+        Returns:
+            NumPy array with one value per bucket
+        """
+        return self.values[self.groups.index(group)]
+
+    def to_dict(self) -> Dict[Any, List[float]]:
+        """Return {group: [value per bucket]} with plain Python numbers."""
+        return {group: row.tolist() for group, row in zip(self.groups, self.values)}
+
+
+class MetricsStore:
+    """Incrementally refreshed in-memory store of event count time series."""
+
+    def __init__(
+        self,
+        path: Optional[str] = None,
+        resolution: int = DEFAULT_RESOLUTION,
+        inbox_ids: Optional[Iterable[str]] = None,
+        event_types: Optional[List[str]] = None,
+        retention_days: Optional[float] = None,
+        api_key: str = None
+    ):
+        """
+        Create a store, loading previously saved series from path if it exists.
+
+        Args:
+            path: Optional .npz file the series are saved to after every
+                  refresh and loaded from on creation
+            resolution: Bucket length in seconds the counts are fetched and
+                        stored at; rollup buckets are multiples of it
+            inbox_ids: Optional inboxes to track one by one. If not provided,
+                       counts cover the whole organization (inbox None).
+            event_types: Optional event types to fetch. If not provided,
+                         every type the API reports is stored.
+            retention_days: Optional age after which stored buckets are
+                            dropped. If not provided, history older than the
+                            API window is kept.
+            api_key: Optional API key. If not provided, will load from environment.
+        """
+        self._np = _numpy()
+        if resolution < 1:
+            raise ValueError("resolution must be at least 1 second")
+        self.path = path
+        self.resolution = int(resolution)
+        self.scopes: List[Optional[str]] = list(inbox_ids) if inbox_ids is not None else [None]
+        self.event_types = event_types
+        self.retention = int(retention_days * 86400) if retention_days is not None else None
+        self.api_key = api_key
+        self._series: Dict[Tuple[Optional[str], str], Tuple[Any, Any]] = {}
+        self._synced: Dict[Optional[str], int] = {}
+        self._lock = threading.Lock()
+        self._refresh_lock = threading.Lock()
+        self._stats = {"refreshes": 0, "requests": 0, "buckets_fetched": 0}
+        if path is not None and os.path.exists(path):
+            self._load()
+
+    def refresh(self, concurrency: int = 8) -> int:
+        """
+        Fetch the buckets added since the last refresh.
+
+        The latest stored bucket is re-fetched, since it may have been
+        partial. On error the store is left unchanged.
+
+        Args:
+            concurrency: Maximum number of requests made at the same time
+
+        Returns:
+            Number of buckets fetched
+        """
+        np = self._np
+        res = self.resolution
+        with self._refresh_lock:
+            now = int(time.time())
+            earliest = _ceil(now - MAX_WINDOW + WINDOW_MARGIN, res)
+            starts: Dict[Optional[str], int] = {}
+            jobs = []
+            with self._lock:
+                synced = dict(self._synced)
+            for scope in self.scopes:
+                since = synced.get(scope)
+                start = earliest if since is None else max(earliest, since - since % res)
+                starts[scope] = start
+                for low in range(start, now, res * MAX_BUCKETS):
+                    jobs.append((scope, low, min(low + res * MAX_BUCKETS, now)))
+
+            def fetch(job: Tuple[Optional[str], int, int]) -> Tuple[Optional[str], Dict[str, List[Any]]]:
+                scope, low, high = job
+                return scope, query_events(
+                    event_types=self.event_types, start=_datetime(low), end=_datetime(high),
+                    period=res, limit=MAX_BUCKETS, inbox_id=scope, api_key=self.api_key
+                )
+
+            if len(jobs) > 1 and concurrency > 1:
+                with ThreadPoolExecutor(max_workers=min(concurrency, len(jobs))) as executor:
+                    responses = list(executor.map(fetch, jobs))
+            else:
+                responses = [fetch(job) for job in jobs]
+
+            fetched: Dict[Tuple[Optional[str], str], List[Tuple[int, int]]] = {}
+            for scope, response in responses:
+                for event_type, buckets in response.items():
+                    points = fetched.setdefault((scope, event_type), [])
+                    for bucket in buckets:
+                        moment = _epoch(_field(bucket, "timestamp"))
+                        points.append((moment - moment % res, _field(bucket, "count")))
+            buckets_fetched = sum(len(points) for points in fetched.values())
+
+            with self._lock:
+                for key in set(self._series) | set(fetched):
+                    scope, _ = key
+                    if scope not in starts:
+                        continue
+                    times, counts = self._series.get(key, (_empty(np), _empty(np)))
+                    keep = times < starts[scope]
+                    new = np.array(sorted(fetched.get(key, ())), dtype=np.int64).reshape(-1, 2)
+                    times = np.concatenate([times[keep], new[:, 0]])
+                    counts = np.concatenate([counts[keep], new[:, 1]])
+                    if self.retention is not None:
+                        recent = times >= now - self.retention
+                        times, counts = times[recent], counts[recent]
+                    self._series[key] = (times, counts)
+                for scope in starts:
+                    self._synced[scope] = now
+                self._stats["refreshes"] += 1
+                self._stats["requests"] += len(jobs)
+                self._stats["buckets_fetched"] += buckets_fetched
+        if self.path is not None:
+            self.save()
+        return buckets_fetched
+
+    def rollup(
+        self,
+        aggregate: str = "sum",
+        bucket: Optional[int] = None,
+        by: Union[str, Iterable[str]] = "event_type",
+        start: Optional[Moment] = None,
+        end: Optional[Moment] = None,
+        event_types: Optional[Iterable[str]] = None,
+        inbox_ids: Optional[Iterable[Optional[str]]] = None,
+        q: float = 95.0
+    ) -> Rollup:
+        """
+        Aggregate stored counts into buckets per group.
+
+        Args:
+            aggregate: "sum" for event counts, "rate" for events per second,
+                       or "percentile" for the q-th percentile of the stored
+                       (resolution-sized) counts within each bucket
+            bucket: Bucket length in seconds, a multiple of the resolution;
+                    buckets are aligned to multiples of it since the Unix
+                    epoch, so 86400 gives UTC days. Defaults to the resolution.
+            by: Dimension(s) to group by: "inbox", "event_type", both, or ()
+                for one "total" group
+            start: Optional start of the window (datetime or Unix timestamp).
+                   Defaults to 90 days before end.
+            end: Optional end of the window (exclusive). Defaults to now.
+            event_types: Optional event types to include. If not provided,
+                         every stored type is included.
+            inbox_ids: Optional tracked inboxes to include. If not provided,
+                       every tracked scope is included.
+            q: Percentile to compute, between 0 and 100
+
+        Returns:
+            Rollup with bucket timestamps, group keys and a values matrix
+        """
+        np = self._np
+        if aggregate not in AGGREGATES:
+            raise ValueError(f"aggregate must be one of {', '.join(AGGREGATES)}")
+        by = (by,) if isinstance(by, str) else tuple(by)
+        unknown = [dimension for dimension in by if dimension not in DIMENSIONS]
+        if unknown:
+            raise ValueError(f"Cannot group by {', '.join(unknown)}; use {' and/or '.join(DIMENSIONS)}")
+        res = self.resolution
+        bucket = int(bucket or res)
+        if bucket % res:
+            raise ValueError(f"bucket must be a multiple of the resolution ({res}s)")
+
+        now = int(time.time())
+        end = _epoch(end) if end is not None else now
+        start = _epoch(start) if start is not None else end - MAX_WINDOW
+        start -= start % bucket
+        count = max(0, math.ceil((end - start) / bucket))
+        per_bucket = bucket // res
+        width = count * per_bucket
+
+        scopes = set(inbox_ids) if inbox_ids is not None else set(self.scopes)
+        types = set(event_types) if event_types is not None else None
+        with self._lock:
+            selected = sorted(
+                (key for key in self._series if key[0] in scopes and (types is None or key[1] in types)),
+                key=lambda key: (key[0] or "", key[1])
+            )
+            series = [self._series[key] for key in selected]
+
+        groups: List[Any] = []
+        index: Dict[Any, int] = {}
+        group_ids = []
+        for (scope, event_type), (times, _) in zip(selected, series):
+            group = _group_key(by, scope, event_type)
+            if group not in index:
+                index[group] = len(groups)
+                groups.append(group)
+            group_ids.append(np.full(len(times), index[group], dtype=np.int64))
+
+        if series:
+            times = np.concatenate([times for times, _ in series])
+            counts = np.concatenate([counts for _, counts in series])
+            slots = (times - start) // res
+            inside = (slots >= 0) & (slots < width)
+            flat = np.concatenate(group_ids)[inside] * width + slots[inside]
+            weights = counts[inside].astype(np.float64)
+            grid = np.bincount(flat, weights=weights, minlength=len(groups) * width)
+        else:
+            grid = np.zeros(0)
+        # Float even when nothing was selected, so future slots can hold NaN
+        grid = grid.astype(np.float64, copy=False).reshape(len(groups), count, per_bucket)
+
+        if aggregate == "percentile":
+            # Slots in the future have no counts yet rather than zero counts
+            future = start + np.arange(width) * res >= now
+            if future.any():
+                grid = grid.reshape(len(groups), width)
+                grid[:, future] = np.nan
+                grid = grid.reshape(len(groups), count, per_bucket)
+            with warnings.catch_warnings():
+                # Buckets entirely in the future are all-NaN and yield NaN
+                warnings.simplefilter("ignore", RuntimeWarning)
+                values = np.nanpercentile(grid, q, axis=2) if grid.size else grid.sum(axis=2)
+        else:
+            values = grid.sum(axis=2)
+            if aggregate == "rate":
+                values = values / bucket
+        timestamps = (start + np.arange(count, dtype=np.int64) * bucket).astype("datetime64[s]")
+        return Rollup(aggregate, bucket, by, groups, timestamps, values)
+
+    def save(self, path: Optional[str] = None) -> None:
+        """
+        Write every series to a compressed .npz file.
+
+        Args:
+            path: Optional file to write. Defaults to the store's path.
+        """
+        np = self._np
+        path = path or self.path
+        if path is None:
+            raise ValueError("No path to save the metrics store to")
+        arrays = {}
+        with self._lock:
+            keys = list(self._series)
+            for n, key in enumerate(keys):
+                arrays[f"times{n}"], arrays[f"counts{n}"] = self._series[key]
+            meta = {
+                "resolution": self.resolution,
+                "series": [list(key) for key in keys],
+                "synced": [[scope, moment] for scope, moment in self._synced.items()]
+            }
+        temporary = f"{path}.tmp"
+        with open(temporary, "wb") as f:
+            np.savez_compressed(f, meta=np.array(json.dumps(meta)), **arrays)
+        os.replace(temporary, path)
+
+    def stats(self) -> Dict[str, Any]:
+        """
+        Return store counters.
+
+        Returns:
+            Dictionary with the number of series, stored buckets, bytes held
+            by the arrays, refreshes, requests, fetched buckets and the time
+            of the oldest tracked scope's last refresh
+        """
+        with self._lock:
+            synced = [self._synced.get(scope) for scope in self.scopes]
+            return {
+                "series": len(self._series),
+                "buckets": sum(len(times) for times, _ in self._series.values()),
+                "bytes": sum(times.nbytes + counts.nbytes for times, counts in self._series.values()),
+                **self._stats,
+                "synced_until": None if None in synced or not synced else _datetime(min(synced)).isoformat()
+            }
+
+    def _load(self) -> None:
+        """Load series saved by `save()`."""
+        np = self._np
+        with np.load(self.path) as data:
+            meta = json.loads(str(data["meta"]))
+            if meta["resolution"] != self.resolution:
+                raise ValueError(
+                    f"{self.path} holds {meta['resolution']}s buckets, not {self.resolution}s"
+                )
+            for n, (scope, event_type) in enumerate(meta["series"]):
+                self._series[(scope, event_type)] = (data[f"times{n}"], data[f"counts{n}"])
+        self._synced = {scope: moment for scope, moment in meta["synced"]}
+
+
+def _numpy():
+    """Import NumPy, which this module needs but the rest of the package does not."""
+    try:
+        import numpy
+    except ImportError as e:
+        raise ImportError("MetricsStore requires NumPy; install it with `pip install numpy`") from e
+    return numpy
+
+
+def _empty(np) -> Any:
+    return np.zeros(0, dtype=np.int64)
+
+
+def _group_key(by: Tuple[str, ...], scope: Optional[str], event_type: str) -> Any:
+    """Return the rollup group a series belongs to."""
+    parts = tuple(scope if dimension == "inbox" else event_type for dimension in by)
+    if not parts:
+        return "total"
+    return parts[0] if len(parts) == 1 else parts
+
+
+def _field(bucket: Any, name: str) -> Any:
+    """Read a field of an SDK bucket model or a plain dictionary."""
+    return bucket[name] if isinstance(bucket, dict) else getattr(bucket, name)
+
+
+def _epoch(value: Moment) -> int:
+    """Convert a datetime (naive means UTC) or Unix timestamp to whole seconds."""
+    if isinstance(value, datetime):
+        if value.tzinfo is None:
+            value = value.replace(tzinfo=timezone.utc)
+        return int(value.timestamp())
+    return int(value)
+
+
+def _datetime(seconds: int) -> datetime:
+    return datetime.fromtimestamp(seconds, tz=timezone.utc)
+
+
+def _ceil(value: int, step: int) -> int:
+    return -(-value // step) * step
@@ -0,0 +1,431 @@
+"""
+Local mail mirror module.
+
+Provides a sync engine that keeps a local SQLite (WAL-mode) mirror of
+inboxes, threads and messages. The first sync backfills the whole account;
+later syncs only list threads with activity since the last cursor and only
+re-fetch threads whose `updated_at` changed, so reports and lookups can run
+against local disk instead of the API. A full sync also removes threads,
+messages and inboxes that no longer exist.
+
+The `timestamp` and `updated_at` columns hold UTC timestamps in one fixed
+format, so they compare and sort correctly as text; the `data` column keeps
+each record as the API returned it.
+"""
+
+import json
+import sqlite3
+import threading
+from concurrent.futures import ThreadPoolExecutor
+from dataclasses import dataclass
+from datetime import timedelta
+from typing import Any, Callable, Dict, Iterator, List, Optional
+
+from .client import get_client
+from .inboxes import iter_inboxes
+from .pagination import paginate
+from .serialization import parse_timestamp, to_dict, utc_timestamp
+from .threads import iter_threads
+
+DEFAULT_DB_PATH = "agentmail_mirror.db"
+# Threads listed with an `after` filter are re-checked this far back to
+# tolerate clock skew and late-arriving messages.
+CURSOR_OVERLAP = timedelta(minutes=5)
+
+_SCHEMA = """
+CREATE TABLE IF NOT EXISTS inboxes (
+    inbox_id TEXT PRIMARY KEY,
+    email TEXT,
+    display_name TEXT,
+    created_at TEXT,
+    updated_at TEXT,
+    data TEXT NOT NULL
+);
+CREATE TABLE IF NOT EXISTS threads (
+    thread_id TEXT PRIMARY KEY,
+    inbox_id TEXT NOT NULL,
+    subject TEXT,
+    preview TEXT,
+    labels TEXT,
+    senders TEXT,
+    recipients TEXT,
+    message_count INTEGER,
+    timestamp TEXT,
+    updated_at TEXT,
+    data TEXT NOT NULL
+);
+CREATE INDEX IF NOT EXISTS threads_inbox ON threads (inbox_id, timestamp);
+CREATE TABLE IF NOT EXISTS messages (
+    message_id TEXT PRIMARY KEY,
+    thread_id TEXT NOT NULL,
+    inbox_id TEXT NOT NULL,
+    subject TEXT,
+    sender TEXT,
+    recipients TEXT,
+    labels TEXT,
+    text TEXT,
+    html TEXT,
+    timestamp TEXT,
+    updated_at TEXT,
+    data TEXT NOT NULL
+);
+CREATE INDEX IF NOT EXISTS messages_thread ON messages (thread_id, timestamp);
+CREATE TABLE IF NOT EXISTS sync_state (
+    name TEXT PRIMARY KEY,
+    value TEXT
+);
+"""
+
+
+def fetch_thread(thread_id: str, api_key: str = None) -> Dict[str, Any]:
+    """
+    Fetch a thread with every page of its messages.
+
+    `get_thread()` returns only the first page of a long thread's messages;
+    this follows `next_page_token` until all of them are loaded.
+
+    Args:
+        thread_id: The ID of the thread
+        api_key: Optional API key. If not provided, will load from environment.
+
+    Returns:
+        Thread dictionary with a "messages" list holding every message
+    """
+    client = get_client(api_key)
+    thread = None
+
+    def fetch(limit=None, page_token=None):
+        nonlocal thread
+        page = client.threads.get(thread_id=thread_id, limit=limit, page_token=page_token)
+        if thread is None:
+            thread = page
+        return page
+
+    messages = [to_dict(m) for m in paginate(fetch, "messages", page_size=100)]
+    data = to_dict(thread)
+    for page_field in ("count", "limit", "next_page_token"):
+        data.pop(page_field, None)
+    data["messages"] = messages
+    return data
+
+
+@dataclass
+class SyncResult:
+    """Counts of records written by a sync."""
+
+    inboxes: int = 0
+    threads_listed: int = 0
+    threads_fetched: int = 0
+    messages: int = 0
+    threads_removed: int = 0
+    inboxes_removed: int = 0
+    cursor: Optional[str] = None
+
+
+class MailMirror:
+    """Local SQLite mirror of an AgentMail account."""
+
+    def __init__(self, path: str = DEFAULT_DB_PATH, api_key: str = None):
+        """
+        Open (or create) a mirror database.
+
+        Args:
+            path: Path to the SQLite database file
+            api_key: Optional API key. If not provided, will load from environment.
+        """
+        self.path = path
+        self.api_key = api_key
+        self._lock = threading.RLock()
+        self._conn = sqlite3.connect(path, check_same_thread=False)
+        self._conn.row_factory = sqlite3.Row
+        self._conn.execute("PRAGMA journal_mode=WAL")
+        self._conn.execute("PRAGMA synchronous=NORMAL")
+        self._conn.executescript(_SCHEMA)
+        self._thread_listeners: List[Callable[[Dict[str, Any], List[Dict[str, Any]]], None]] = []
+        self._removal_listeners: List[Callable[[str], None]] = []
+
+    def close(self) -> None:
+        """Close the database connection."""
+        with self._lock:
+            self._conn.close()
+
+    def __enter__(self) -> "MailMirror":
+        return self
+
+    def __exit__(self, *exc_info) -> None:
+        self.close()
+
+    def sync(self, full: bool = False, concurrency: int = 8, **filters) -> SyncResult:
+        """
+        Bring the mirror up to date.
+
+        Args:
+            full: Whether to list every thread instead of only those with
+                  activity since the last cursor. Only threads whose
+                  updated_at changed are re-fetched either way, so a full
+                  sync also catches label changes on older threads. Without
+                  filters, a full sync also deletes mirrored inboxes and
+                  threads (with their messages) that were not listed.
+            concurrency: Maximum number of threads fetched at the same time
+            **filters: Additional parameters for filtering listed threads
+
+        Returns:
+            SyncResult with counts of records written and removed, and the
+            new cursor
+        """
+        prune = full and not filters
+        result = SyncResult()
+        inbox_ids = set()
+        for inbox in iter_inboxes(page_size=100, api_key=self.api_key):
+            inbox = to_dict(inbox)
+            self._upsert_inbox(inbox)
+            inbox_ids.add(inbox["inbox_id"])
+            result.inboxes += 1
+        with self._lock:
+            if prune:
+                result.inboxes_removed = self._prune_inboxes(inbox_ids)
+            self._conn.commit()
+
+        cursor = None if full else self.cursor
+        if cursor is not None:
+            filters.setdefault("after", parse_timestamp(cursor) - CURSOR_OVERLAP)
+
+        latest = utc_timestamp(cursor)
+        if prune:
+            with self._lock:
+                self._conn.execute("CREATE TEMP TABLE IF NOT EXISTS listed (thread_id TEXT PRIMARY KEY)")
+                self._conn.execute("DELETE FROM listed")
+        with ThreadPoolExecutor(max_workers=concurrency) as executor:
+            pending = []
+            for item in iter_threads(page_size=100, prefetch=True, api_key=self.api_key, **filters):
+                thread = to_dict(item)
+                result.threads_listed += 1
+                if prune:
+                    with self._lock:
+                        self._conn.execute("INSERT OR IGNORE INTO listed VALUES (?)", (thread["thread_id"],))
+                timestamp = utc_timestamp(thread.get("timestamp"))
+                if latest is None or (timestamp or "") > latest:
+                    latest = timestamp
+                if self._is_current(thread):
+                    continue
+                pending.append(executor.submit(self._fetch_thread, thread["thread_id"]))
+                if len(pending) >= 4 * concurrency:
+                    result.messages += self._store_fetched(pending)
+                    result.threads_fetched += len(pending)
+                    pending = []
+            result.messages += self._store_fetched(pending)
+            result.threads_fetched += len(pending)
+
+        if prune:
+            result.threads_removed = self._prune_threads()
+        if latest is not None:
+            self._set_state("thread_cursor", latest)
+            with self._lock:
+                self._conn.commit()
+        result.cursor = latest
+        return result
+
+    @property
+    def cursor(self) -> Optional[str]:
+        """Timestamp of the most recent thread activity seen so far."""
+        return self._get_state("thread_cursor")
+
+    def add_thread_listener(
+        self, listener: Callable[[Dict[str, Any], List[Dict[str, Any]]], None]
+    ) -> None:
+        """
+        Register a callback invoked with every thread (and its messages)
+        written to the mirror.
+
+        Args:
+            listener: Callable taking the thread dict and its message dicts
+        """
+        self._thread_listeners.append(listener)
+
+    def add_removal_listener(self, listener: Callable[[str], None]) -> None:
+        """
+        Register a callback invoked with the ID of every thread a full sync
+        removes from the mirror.
+
+        Args:
+            listener: Callable taking the thread ID
+        """
+        self._removal_listeners.append(listener)
+
+    def get_thread(self, thread_id: str) -> Optional[Dict[str, Any]]:
+        """
+        Get a mirrored thread with its messages.
+
+        Args:
+            thread_id: The ID of the thread
+
+        Returns:
+            Thread dictionary with a "messages" list, or None if not mirrored
+        """
+        row = self.query("SELECT data FROM threads WHERE thread_id = ?", (thread_id,))
+        if not row:
+            return None
+        thread = json.loads(row[0]["data"])
+        thread["messages"] = list(self.iter_messages(thread_id))
+        return thread
+
+    def iter_threads(
+        self,
+        inbox_id: Optional[str] = None,
+        label: Optional[str] = None,
+        limit: Optional[int] = None
+    ) -> Iterator[Dict[str, Any]]:
+        """
+        Iterate over mirrored threads, most recent first.
+
+        Args:
+            inbox_id: Optional inbox ID to filter by
+            label: Optional label the thread must carry
+            limit: Optional maximum number of threads
+
+        Yields:
+            Thread dictionaries
+        """
+        sql = "SELECT data FROM threads"
+        clauses, params = [], []
+        if inbox_id is not None:
+            clauses.append("inbox_id = ?")
+            params.append(inbox_id)
+        if label is not None:
+            clauses.append("EXISTS (SELECT 1 FROM json_each(threads.labels) WHERE value = ?)")
+            params.append(label)
+        if clauses:
+            sql += " WHERE " + " AND ".join(clauses)
+        sql += " ORDER BY timestamp DESC"
+        if limit is not None:
+            sql += " LIMIT ?"
+            params.append(limit)
+        for row in self.query(sql, params):
+            yield json.loads(row["data"])
+
+    def iter_messages(self, thread_id: str) -> Iterator[Dict[str, Any]]:
+        """
+        Iterate over the mirrored messages of a thread, oldest first.
+
+        Args:
+            thread_id: The ID of the thread
+
+        Yields:
+            Message dictionaries
+        """
+        rows = self.query(
+            "SELECT data FROM messages WHERE thread_id = ? ORDER BY timestamp", (thread_id,)
+        )
+        for row in rows:
+            yield json.loads(row["data"])
+
+    def query(self, sql: str, params: Any = ()) -> List[sqlite3.Row]:
+        """
+        Run a read query against the mirror.
+
+        Args:
+            sql: SQL statement over the inboxes, threads and messages tables
+            params: Optional query parameters
+
+        Returns:
+            List of result rows
+        """
+        with self._lock:
+            return self._conn.execute(sql, params).fetchall()
+
+    def _fetch_thread(self, thread_id: str) -> Dict[str, Any]:
+        """Fetch a thread with every page of its messages."""
+        return fetch_thread(thread_id, api_key=self.api_key)
+
+    def _store_fetched(self, futures: list) -> int:
+        """Write fetched threads to the database and return the message count."""
+        count = 0
+        for future in futures:
+            thread = future.result()
+            messages = thread.pop("messages")
+            with self._lock:
+                self._upsert_thread(thread)
+                # Drop messages deleted since the thread was last fetched
+                self._conn.execute("DELETE FROM messages WHERE thread_id = ?", (thread["thread_id"],))
+                for message in messages:
+                    self._upsert_message(message)
+            count += len(messages)
+            for listener in self._thread_listeners:
+                listener(thread, messages)
+        with self._lock:
+            self._conn.commit()
+        return count
+
+    def _is_current(self, thread: Dict[str, Any]) -> bool:
+        """Whether the mirrored copy of a listed thread is up to date."""
+        row = self.query("SELECT updated_at FROM threads WHERE thread_id = ?", (thread["thread_id"],))
+        return bool(row) and row[0]["updated_at"] == utc_timestamp(thread.get("updated_at"))
+
+    def _prune_inboxes(self, inbox_ids: set) -> int:
+        """Delete mirrored inboxes not in inbox_ids. Caller holds the lock."""
+        stale = [
+            row["inbox_id"] for row in self._conn.execute("SELECT inbox_id FROM inboxes")
+            if row["inbox_id"] not in inbox_ids
+        ]
+        self._conn.executemany("DELETE FROM inboxes WHERE inbox_id = ?", [(i,) for i in stale])
+        return len(stale)
+
+    def _prune_threads(self) -> int:
+        """Delete mirrored threads missing from the listed table, with their messages."""
+        with self._lock:
+            stale = [
+                row["thread_id"] for row in self._conn.execute(
+                    "SELECT thread_id FROM threads WHERE thread_id NOT IN (SELECT thread_id FROM listed)"
+                )
+            ]
+            self._conn.execute("DELETE FROM threads WHERE thread_id NOT IN (SELECT thread_id FROM listed)")
+            self._conn.execute("DELETE FROM messages WHERE thread_id NOT IN (SELECT thread_id FROM listed)")
+            self._conn.execute("DELETE FROM listed")
+            self._conn.commit()
+        for thread_id in stale:
+            for listener in self._removal_listeners:
+                listener(thread_id)
+        return len(stale)
+
+    def _upsert_inbox(self, inbox: Dict[str, Any]) -> None:
+        with self._lock:
+            self._conn.execute(
+                "INSERT OR REPLACE INTO inboxes VALUES (?, ?, ?, ?, ?, ?)",
+                (
+                    inbox["inbox_id"], inbox.get("email"), inbox.get("display_name"),
+                    utc_timestamp(inbox.get("created_at")), utc_timestamp(inbox.get("updated_at")),
+                    json.dumps(inbox)
+                )
+            )
+
+    def _upsert_thread(self, thread: Dict[str, Any]) -> None:
+        self._conn.execute(
+            "INSERT OR REPLACE INTO threads VALUES (?, ?, ?, ?, ?, ?, ?, ?, ?, ?, ?)",
+            (
+                thread["thread_id"], thread["inbox_id"], thread.get("subject"),
+                thread.get("preview"), json.dumps(thread.get("labels") or []),
+                json.dumps(thread.get("senders") or []), json.dumps(thread.get("recipients") or []),
+                thread.get("message_count"), utc_timestamp(thread.get("timestamp")),
+                utc_timestamp(thread.get("updated_at")), json.dumps(thread)
+            )
+        )
+
+    def _upsert_message(self, message: Dict[str, Any]) -> None:
+        self._conn.execute(
+            "INSERT OR REPLACE INTO messages VALUES (?, ?, ?, ?, ?, ?, ?, ?, ?, ?, ?, ?)",
+            (
+                message["message_id"], message["thread_id"], message["inbox_id"],
+                message.get("subject"), message.get("from"),
+                json.dumps(message.get("to") or []), json.dumps(message.get("labels") or []),
+                message.get("text"), message.get("html"), utc_timestamp(message.get("timestamp")),
+                utc_timestamp(message.get("updated_at")), json.dumps(message)
+            )
+        )
+
+    def _get_state(self, name: str) -> Optional[str]:
+        row = self.query("SELECT value FROM sync_state WHERE name = ?", (name,))
+        return row[0]["value"] if row else None
+
+    def _set_state(self, name: str, value: str) -> None:
+        with self._lock:
+            self._conn.execute("INSERT OR REPLACE INTO sync_state VALUES (?, ?)", (name, value))
@@ -0,0 +1,391 @@
+"""
+Durable outbox module.
+
+Provides a local SQLite (WAL-mode) queue of `send_message()` jobs. Every
+item's state is persisted as it moves from pending to sending to sent or
+failed, so a bulk run that dies part-way resumes exactly where it stopped
+when drained again. Items that were mid-send when the process died, or
+whose send failed without a response saying it was rejected, are marked
+uncertain and are not resent unless asked, so a crash never causes a
+silent double send.
+"""
+
+import json
+import os
+import sqlite3
+import threading
+import time
+from typing import Any, Callable, Dict, Iterable, Iterator, List, Optional
+
+from .bulk import DEFAULT_CONCURRENCY, BulkReport, SendResult, send_bulk
+
+DEFAULT_DB_PATH = "agentmail_outbox.db"
+# Seconds after which an item claimed by a live process is considered abandoned
+DEFAULT_LEASE_TIMEOUT = 600.0
+
+PENDING = "pending"
+SENDING = "sending"
+SENT = "sent"
+FAILED = "failed"
+# Was being sent when the process stopped; the send may or may not have happened
+UNCERTAIN = "uncertain"
+STATES = (PENDING, SENDING, SENT, FAILED, UNCERTAIN)
+
+_SCHEMA = """
+CREATE TABLE IF NOT EXISTS items (
+    item_id INTEGER PRIMARY KEY,
+    key TEXT UNIQUE,
+    spec TEXT NOT NULL,
+    state TEXT NOT NULL,
+    attempts INTEGER NOT NULL DEFAULT 0,
+    message_id TEXT,
+    error TEXT,
+    created_at REAL NOT NULL,
+    updated_at REAL NOT NULL,
+    owner_pid INTEGER,
+    claimed_at REAL
+);
+CREATE INDEX IF NOT EXISTS items_state ON items (state, item_id);
+"""
+
+# Columns added after the first schema, created on databases that lack them
+_ADDED_COLUMNS = {"owner_pid": "INTEGER", "claimed_at": "REAL"}
+
+
+class Outbox:
+    """Persistent queue of messages to send."""
+
+    def __init__(
+        self,
+        path: str = DEFAULT_DB_PATH,
+        api_key: str = None,
+        lease_timeout: float = DEFAULT_LEASE_TIMEOUT
+    ):
+        """
+        Open (or create) an outbox.
+
+        Items left in the sending state by a process that is no longer
+        running, or claimed longer than lease_timeout ago, are marked
+        uncertain. Items being sent by another live drain are left alone.
+
+        Args:
+            path: Path to the SQLite database file
+            api_key: Optional API key. If not provided, will load from environment.
+            lease_timeout: Seconds after which a claimed item is considered
+                           abandoned even if its process is still running
+        """
+        self.path = path
+        self.api_key = api_key
+        self.lease_timeout = lease_timeout
+        self._lock = threading.Lock()
+        self._conn = sqlite3.connect(path, check_same_thread=False)
+        self._conn.execute("PRAGMA journal_mode=WAL")
+        self._conn.execute("PRAGMA synchronous=NORMAL")
+        self._conn.executescript(_SCHEMA)
+        with self._lock:
+            columns = {row[1] for row in self._conn.execute("PRAGMA table_info(items)")}
+            for name, kind in _ADDED_COLUMNS.items():
+                if name not in columns:
+                    self._conn.execute(f"ALTER TABLE items ADD COLUMN {name} {kind}")
+            self._conn.commit()
+        self._reclaim_stale()
+
+    def close(self) -> None:
+        """Close the database connection."""
+        with self._lock:
+            self._conn.close()
+
+    def __enter__(self) -> "Outbox":
+        return self
+
+    def __exit__(self, *exc_info) -> None:
+        self.close()
+
+    def enqueue(self, spec: Dict[str, Any], key: Optional[str] = None) -> Optional[int]:
+        """
+        Add a message to the outbox.
+
+        Args:
+            spec: Keyword-argument dict for `send_message()`
+            key: Optional unique key. An item with an existing key is not
+                 added again, which makes re-enqueueing a campaign safe.
+
+        Returns:
+            ID of the new item, or None if the key already existed
+        """
+        now = time.time()
+        with self._lock:
+            cursor = self._conn.execute(
+                "INSERT OR IGNORE INTO items (key, spec, state, created_at, updated_at) "
+                "VALUES (?, ?, ?, ?, ?)",
+                (key, json.dumps(spec), PENDING, now, now)
+            )
+            self._conn.commit()
+            return cursor.lastrowid if cursor.rowcount else None
+
+    def enqueue_many(
+        self,
+        specs: Iterable[Dict[str, Any]],
+        key: Optional[Callable[[Dict[str, Any]], str]] = None,
+        batch_size: int = 1000
+    ) -> int:
+        """
+        Add many messages, committing in batches.
+
+        Args:
+            specs: Iterable of keyword-argument dicts for `send_message()`
+            key: Optional function returning the unique key of a spec
+            batch_size: Number of items written per transaction
+
+        Returns:
+            Number of items added
+        """
+        added = 0
+        batch = []
+        for spec in specs:
+            batch.append(spec)
+            if len(batch) >= batch_size:
+                added += self._insert(batch, key)
+                batch = []
+        if batch:
+            added += self._insert(batch, key)
+        return added
+
+    def drain(
+        self,
+        concurrency: int = DEFAULT_CONCURRENCY,
+        retry_failed: bool = False,
+        resend_uncertain: bool = False,
+        on_result: Optional[Callable[[SendResult], None]] = None,
+        **bulk_kwargs
+    ) -> BulkReport:
+        """
+        Send every pending item concurrently, persisting each outcome.
+
+        Items are claimed (marked sending and committed) by the worker
+        thread just before it sends them, and recorded as they complete:
+        sent, failed if the API rejected them with a 4xx response, or
+        uncertain if the send failed without one (e.g. a timeout or a 5xx),
+        since it may still have gone out. After a crash only the items
+        actually being sent come back as uncertain. Items claimed meanwhile
+        by another drain are skipped.
+
+        Args:
+            concurrency: Maximum number of messages sent at the same time
+            retry_failed: Whether to send items that failed in earlier drains
+            resend_uncertain: Whether to send items whose earlier send was
+                              interrupted, accepting possible duplicates
+            on_result: Optional callback invoked with each SendResult
+            **bulk_kwargs: Additional parameters for `send_bulk()`, e.g.
+                           keep_results or progress_interval
+
+        Returns:
+            BulkReport of the items sent by this drain
+        """
+        states = [PENDING]
+        if retry_failed:
+            states.append(FAILED)
+        if resend_uncertain:
+            states.append(UNCERTAIN)
+        # item_id of each spec handed to send_bulk, by its send index
+        in_flight: Dict[int, int] = {}
+
+        def specs() -> Iterator[Dict[str, Any]]:
+            index = 0
+            last_id = 0
+            while True:
+                batch = self._next_items(states, last_id, concurrency)
+                if not batch:
+                    return
+                for item_id, spec in batch:
+                    in_flight[index] = item_id
+                    index += 1
+                    yield spec
+                last_id = batch[-1][0]
+
+        def claim(index: int, spec: Dict[str, Any]) -> bool:
+            if self._claim(in_flight[index], states):
+                return True
+            in_flight.pop(index)
+            return False
+
+        def persist(result: SendResult) -> None:
+            item_id = in_flight.pop(result.index)
+            now = time.time()
+            with self._lock:
+                if result.ok:
+                    message_id = getattr(result.message, "message_id", None)
+                    self._conn.execute(
+                        "UPDATE items SET state = ?, message_id = ?, error = NULL, updated_at = ? "
+                        "WHERE item_id = ?",
+                        (SENT, message_id, now, item_id)
+                    )
+                else:
+                    # Only a rejection by the API proves nothing was sent
+                    state = FAILED if _rejected(result.error) else UNCERTAIN
+                    self._conn.execute(
+                        "UPDATE items SET state = ?, error = ?, updated_at = ? WHERE item_id = ?",
+                        (state, f"{type(result.error).__name__}: {result.error}", now, item_id)
+                    )
+                # Commit every outcome: an unrecorded send would come back uncertain
+                self._conn.commit()
+
+        try:
+            return send_bulk(
+                specs(), concurrency=concurrency, api_key=self.api_key, on_result=on_result,
+                before_send=claim, after_send=persist, **bulk_kwargs
+            )
+        finally:
+            with self._lock:
+                self._conn.commit()
+
+    def requeue(self, states: Iterable[str] = (FAILED, UNCERTAIN)) -> int:
+        """
+        Move items back to pending.
+
+        Args:
+            states: States whose items should be sent again
+
+        Returns:
+            Number of items requeued
+        """
+        states = list(states)
+        placeholders = ", ".join("?" * len(states))
+        with self._lock:
+            cursor = self._conn.execute(
+                f"UPDATE items SET state = ?, updated_at = ? WHERE state IN ({placeholders})",
+                (PENDING, time.time(), *states)
+            )
+            self._conn.commit()
+            return cursor.rowcount
+
+    def counts(self) -> Dict[str, int]:
+        """
+        Return the number of items in each state.
+
+        Returns:
+            Dictionary mapping every state to its item count
+        """
+        with self._lock:
+            rows = self._conn.execute("SELECT state, COUNT(*) FROM items GROUP BY state").fetchall()
+        counts = {state: 0 for state in STATES}
+        counts.update(rows)
+        return counts
+
+    def items(self, state: Optional[str] = None, limit: Optional[int] = None) -> List[Dict[str, Any]]:
+        """
+        Return outbox items.
+
+        Args:
+            state: Optional state to filter by
+            limit: Optional maximum number of items
+
+        Returns:
+            List of item dictionaries with item_id, key, spec, state,
+            attempts, message_id and error
+        """
+        sql = "SELECT item_id, key, spec, state, attempts, message_id, error FROM items"
+        params: List[Any] = []
+        if state is not None:
+            sql += " WHERE state = ?"
+            params.append(state)
+        sql += " ORDER BY item_id"
+        if limit is not None:
+            sql += " LIMIT ?"
+            params.append(limit)
+        with self._lock:
+            rows = self._conn.execute(sql, params).fetchall()
+        return [
+            {
+                "item_id": item_id, "key": key, "spec": json.loads(spec), "state": state,
+                "attempts": attempts, "message_id": message_id, "error": error
+            }
+            for item_id, key, spec, state, attempts, message_id, error in rows
+        ]
+
+    def _insert(self, specs: List[Dict[str, Any]], key: Optional[Callable[[Dict[str, Any]], str]]) -> int:
+        """Insert a batch of specs in one transaction."""
+        now = time.time()
+        rows = [
+            (key(spec) if key is not None else None, json.dumps(spec), PENDING, now, now)
+            for spec in specs
+        ]
+        with self._lock:
+            before = self._conn.total_changes
+            self._conn.executemany(
+                "INSERT OR IGNORE INTO items (key, spec, state, created_at, updated_at) "
+                "VALUES (?, ?, ?, ?, ?)",
+                rows
+            )
+            self._conn.commit()
+            return self._conn.total_changes - before
+
+    def _next_items(self, states: List[str], after_id: int, limit: int) -> List[tuple]:
+        """Return the next (item_id, spec) pairs in the given states, unclaimed."""
+        placeholders = ", ".join("?" * len(states))
+        with self._lock:
+            rows = self._conn.execute(
+                f"SELECT item_id, spec FROM items WHERE state IN ({placeholders}) AND item_id > ? "
+                "ORDER BY item_id LIMIT ?",
+                (*states, after_id, limit)
+            ).fetchall()
+        return [(item_id, json.loads(spec)) for item_id, spec in rows]
+
+    def _claim(self, item_id: int, states: List[str]) -> bool:
+        """Mark one item as sending by this process and commit, unless it left the given states."""
+        placeholders = ", ".join("?" * len(states))
+        now = time.time()
+        with self._lock:
+            cursor = self._conn.execute(
+                "UPDATE items SET state = ?, attempts = attempts + 1, owner_pid = ?, claimed_at = ?, "
+                f"updated_at = ? WHERE item_id = ? AND state IN ({placeholders})",
+                (SENDING, os.getpid(), now, now, item_id, *states)
+            )
+            self._conn.commit()
+        return cursor.rowcount == 1
+
+    def _reclaim_stale(self) -> None:
+        """Mark items abandoned in the sending state as uncertain."""
+        now = time.time()
+        with self._lock:
+            rows = self._conn.execute(
+                "SELECT item_id, owner_pid, claimed_at FROM items WHERE state = ?", (SENDING,)
+            ).fetchall()
+            stale = [
+                (UNCERTAIN, now, item_id, SENDING, claimed_at)
+                for item_id, owner_pid, claimed_at in rows
+                if claimed_at is None or now - claimed_at > self.lease_timeout
+                or not _pid_alive(owner_pid)
+            ]
+            # Skip items re-claimed since they were read
+            self._conn.executemany(
+                "UPDATE items SET state = ?, updated_at = ? "
+                "WHERE item_id = ? AND state = ? AND claimed_at IS ?",
+                stale
+            )
+            self._conn.commit()
+
+
+def _rejected(error: BaseException) -> bool:
+    """Whether a send failed with a response proving the message was not sent."""
+    status = getattr(error, "status_code", None)
+    # 408 and 499 report a request cut off in transit, which may have been processed
+    return status is not None and 400 <= status < 500 and status not in (408, 499)
+
+
+def _pid_alive(pid: Optional[int]) -> bool:
+    """Whether a process with the given ID is running on this host."""
+    if pid is None:
+        return False
+    if pid == os.getpid():
+        return True
+    if os.name == "nt":
+        # os.kill() terminates processes on Windows; rely on the lease timeout there
+        return True
+    try:
+        os.kill(pid, 0)
+    except ProcessLookupError:
+        return False
+    except PermissionError:
+        return True
+    return True
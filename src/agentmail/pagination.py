@@ -0,0 +1,126 @@
+"""
+Pagination module.
+
+Provides helpers that follow `next_page_token` across list endpoints and
+yield items one at a time, optionally prefetching the next page while the
+caller works through the current one, and optionally converting each item
+(e.g. to a compact record) as soon as its page arrives.
+"""
+
+from typing import Any, AsyncIterator, Awaitable, Callable, Iterator, List, Optional, Tuple
+
+
+def paginate(
+    fetch: Callable[..., Any],
+    items_field: str,
+    page_size: Optional[int] = None,
+    prefetch: bool = False,
+    transform: Optional[Callable[[Any], Any]] = None,
+    **params
+) -> Iterator[Any]:
+    """
+    Yield every item of a paginated list endpoint.
+
+    Only the current page (and, with prefetch, the next one) is held in
+    memory at any time.
+
+    Args:
+        fetch: SDK list method accepting `limit` and `page_token` keywords
+        items_field: Name of the response field holding the page items
+        page_size: Optional number of items to request per page
+        prefetch: Whether to fetch the next page in a background thread
+                  while the current page is being consumed
+        transform: Optional function applied to every item when its page
+                   arrives, so the page's response models can be released
+                   before the items are consumed
+        **params: Additional parameters passed to every fetch call
+
+    Yields:
+        Items (or transformed items) from every page, in order
+    """
+    def fetch_page(page_token: Optional[str]) -> Tuple[List[Any], Optional[str]]:
+        return _split_page(fetch(limit=page_size, page_token=page_token, **params), items_field, transform)
+
+    items, page_token = fetch_page(None)
+    if not prefetch:
+        while True:
+            yield from items
+            if not page_token:
+                return
+            items, page_token = fetch_page(page_token)
+
+    from concurrent.futures import ThreadPoolExecutor
+
+    executor = ThreadPoolExecutor(max_workers=1, thread_name_prefix="agentmail-prefetch")
+    try:
+        while True:
+            future = executor.submit(fetch_page, page_token) if page_token else None
+            yield from items
+            if future is None:
+                return
+            items, page_token = future.result()
+    finally:
+        executor.shutdown(wait=False, cancel_futures=True)
+
+
+async def apaginate(
+    fetch: Callable[..., Awaitable[Any]],
+    items_field: str,
+    page_size: Optional[int] = None,
+    prefetch: bool = False,
+    transform: Optional[Callable[[Any], Any]] = None,
+    **params
+) -> AsyncIterator[Any]:
+    """
+    Asynchronously yield every item of a paginated list endpoint.
+
+    Args:
+        fetch: Async SDK list method accepting `limit` and `page_token` keywords
+        items_field: Name of the response field holding the page items
+        page_size: Optional number of items to request per page
+        prefetch: Whether to fetch the next page in a background task
+                  while the current page is being consumed
+        transform: Optional function applied to every item when its page arrives
+        **params: Additional parameters passed to every fetch call
+
+    Yields:
+        Items (or transformed items) from every page, in order
+    """
+    import asyncio
+
+    async def fetch_page(page_token: Optional[str]) -> Tuple[List[Any], Optional[str]]:
+        return _split_page(await fetch(limit=page_size, page_token=page_token, **params), items_field, transform)
+
+    items, page_token = await fetch_page(None)
+    task = None
+    try:
+        while True:
+            if prefetch and page_token:
+                task = asyncio.ensure_future(fetch_page(page_token))
+            for item in items:
+                yield item
+            if not page_token:
+                return
+            if task is not None:
+                items, page_token = await task
+                task = None
+            else:
+                items, page_token = await fetch_page(page_token)
+    finally:
+        if task is not None:
+            task.cancel()
+
+
+def _split_page(
+    response: Any,
+    items_field: str,
+    transform: Optional[Callable[[Any], Any]] = None
+) -> Tuple[List[Any], Optional[str]]:
+    """Return the (transformed) items and next page token of a list response."""
+    if isinstance(response, dict):
+        items, page_token = response.get(items_field) or [], response.get("next_page_token")
+    else:
+        items, page_token = getattr(response, items_field, None) or [], getattr(response, "next_page_token", None)
+    if transform is not None:
+        items = [transform(item) for item in items]
+    return items, page_token
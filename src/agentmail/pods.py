@@ -4,10 +4,14 @@ Pod management module.
 Provides functions to manage pods (containerized email processing units).
 """
 
-from typing import List, Dict, Any
+from typing import List, Dict, Any, Iterator, Optional
 from .client import get_client
+from .pagination import paginate
+from .singleflight import coalesced
+from .telemetry import instrumented
 
 
+@instrumented
 def list_pods(api_key: str = None) -> List[Dict[str, Any]]:
     """
     List all pods.
@@ -22,6 +26,35 @@ def list_pods(api_key: str = None) -> List[Dict[str, Any]]:
     return client.pods.list()
 
 
+@instrumented
+def iter_pods(
+    page_size: Optional[int] = None,
+    prefetch: bool = False,
+    api_key: str = None
+) -> Iterator[Any]:
+    """
+    Iterate over all pods, following pagination automatically.
+    
+    Items are yielded one at a time, so memory use stays constant
+    regardless of how many pods exist.
+    
+    Args:
+        page_size: Optional number of pods to request per page
+        prefetch: Whether to fetch the next page in the background while
+                  the current page is being consumed
+        api_key: Optional API key. If not provided, will load from environment.
+    
+    Yields:
+        Pod objects
+    """
+    client = get_client(api_key)
+    return paginate(
+        client.pods.list, "pods", page_size=page_size, prefetch=prefetch
+    )
+
+
+@instrumented
+@coalesced
 def get_pod(pod_id: str, api_key: str = None) -> Dict[str, Any]:
     """
     Get a specific pod by ID.
@@ -37,6 +70,7 @@ def get_pod(pod_id: str, api_key: str = None) -> Dict[str, Any]:
     return client.pods.get(pod_id=pod_id)
 
 
+@instrumented
 def create_pod(api_key: str = None, **kwargs) -> Dict[str, Any]:
     """
     Create a new pod.
@@ -52,6 +86,7 @@ def create_pod(api_key: str = None, **kwargs) -> Dict[str, Any]:
     return client.pods.create(**kwargs)
 
 
+@instrumented
 def delete_pod(pod_id: str, api_key: str = None) -> Dict[str, Any]:
     """
     Delete a pod by ID.
@@ -0,0 +1,336 @@
+"""
+Rate limiting module.
+
+Provides a shared, adaptive token-bucket rate limiter that every request made
+through a pooled client passes through, for both threads and asyncio tasks.
+
+The limiter adapts to the API ceiling AIMD-style: each successful response
+additively increases the request rate and the concurrency limit, while a 429
+(or a 503 carrying Retry-After) multiplicatively decreases both and pauses all
+requests for the duration given by the Retry-After header. The default
+limiter starts at its maximum rate and concurrency, so it does not throttle
+anything until the API first pushes back.
+"""
+
+import asyncio
+import email.utils
+import threading
+import time
+from typing import Any, Dict, Optional, Set, Tuple
+
+import httpx
+
+# Default limiter bounds; the limiter starts at the maximums
+DEFAULT_MAX_RATE = 1000.0
+DEFAULT_MAX_CONCURRENCY = 256
+
+
+class RateLimiter:
+    """
+    Adaptive token-bucket rate limiter with an AIMD concurrency limit.
+
+    Safe to share between threads and asyncio tasks on any event loop.
+    """
+
+    def __init__(
+        self,
+        rate: Optional[float] = None,
+        burst: Optional[float] = None,
+        min_rate: float = 1.0,
+        max_rate: float = DEFAULT_MAX_RATE,
+        concurrency: Optional[int] = None,
+        min_concurrency: int = 1,
+        max_concurrency: int = DEFAULT_MAX_CONCURRENCY,
+        increase: float = 1.0,
+        decrease: float = 0.5
+    ):
+        """
+        Initialize the limiter.
+
+        Args:
+            rate: Optional initial number of requests allowed per second.
+                  Defaults to max_rate.
+            burst: Optional bucket capacity. Defaults to one second of the
+                   current rate.
+            min_rate: Lower bound for the adapted rate
+            max_rate: Upper bound for the adapted rate
+            concurrency: Optional initial number of requests allowed in
+                         flight. Defaults to max_concurrency.
+            min_concurrency: Lower bound for the adapted concurrency limit
+            max_concurrency: Upper bound for the adapted concurrency limit
+            increase: Requests per second added to the rate for every second
+                      of successful responses
+            decrease: Factor applied to the rate and concurrency limit when
+                      the API signals throttling
+        """
+        if not 0 < decrease < 1:
+            raise ValueError("decrease must be between 0 and 1")
+        self._cond = threading.Condition()
+        self._rate = float(rate if rate is not None else max_rate)
+        self._burst = burst
+        self._min_rate = min_rate
+        self._max_rate = max_rate
+        self._limit = float(concurrency if concurrency is not None else max_concurrency)
+        self._min_limit = min_concurrency
+        self._max_limit = max_concurrency
+        self._increase = increase
+        self._decrease = decrease
+        self._tokens = self._capacity()
+        self._updated = time.monotonic()
+        self._in_flight = 0
+        # Async callers waiting for a concurrency slot, as (loop, future)
+        self._async_waiters: Set[Tuple[asyncio.AbstractEventLoop, asyncio.Future]] = set()
+        self._paused_until = 0.0
+        self._last_decrease = 0.0
+        self._requests = 0
+        self._throttled = 0
+
+    def acquire(self) -> None:
+        """Block until a request may be sent."""
+        with self._cond:
+            while True:
+                delay = self._try_acquire(time.monotonic())
+                if delay == 0:
+                    return
+                self._cond.wait(delay)
+
+    async def acquire_async(self) -> None:
+        """Wait without blocking the event loop until a request may be sent."""
+        loop = asyncio.get_running_loop()
+        while True:
+            waiter = None
+            with self._cond:
+                delay = self._try_acquire(time.monotonic())
+                if delay == 0:
+                    return
+                if delay is None:
+                    # Every concurrency slot is taken; release() resolves the future
+                    waiter = (loop, loop.create_future())
+                    self._async_waiters.add(waiter)
+            if waiter is None:
+                await asyncio.sleep(delay)
+                continue
+            try:
+                await waiter[1]
+            finally:
+                with self._cond:
+                    self._async_waiters.discard(waiter)
+
+    def release(self, status_code: Optional[int] = None, retry_after: Optional[float] = None) -> None:
+        """
+        Release a request slot and adapt to the response.
+
+        Args:
+            status_code: Optional HTTP status of the response. None when the
+                         request failed without a response.
+            retry_after: Optional number of seconds from a Retry-After header
+        """
+        with self._cond:
+            self._in_flight -= 1
+            throttled = status_code == 429 or (status_code == 503 and retry_after is not None)
+            if throttled:
+                self._on_throttled(time.monotonic(), retry_after)
+            elif status_code is not None and status_code < 500:
+                self._on_success()
+            self._cond.notify_all()
+            waiters, self._async_waiters = self._async_waiters, set()
+        for loop, future in waiters:
+            try:
+                loop.call_soon_threadsafe(_wake, future)
+            except RuntimeError:
+                # The waiter's event loop is closed
+                pass
+
+    def stats(self) -> Dict[str, Any]:
+        """
+        Return the current limiter state.
+
+        Returns:
+            Dictionary with the adapted rate and concurrency limit, requests
+            in flight, total requests and throttled responses seen
+        """
+        with self._cond:
+            return {
+                "rate": self._rate,
+                "concurrency": int(self._limit),
+                "in_flight": self._in_flight,
+                "requests": self._requests,
+                "throttled": self._throttled,
+                "paused_for": max(0.0, self._paused_until - time.monotonic())
+            }
+
+    def _capacity(self) -> float:
+        """Return the current bucket capacity."""
+        return self._burst if self._burst is not None else max(1.0, self._rate)
+
+    def _try_acquire(self, now: float) -> Optional[float]:
+        """
+        Try to take a token and a concurrency slot.
+
+        Returns 0 on success, the number of seconds to wait for the next
+        token, or None when waiting for a concurrency slot to be released.
+        """
+        if now < self._paused_until:
+            return self._paused_until - now
+        if self._in_flight >= int(self._limit):
+            return None
+        capacity = self._capacity()
+        self._tokens = min(capacity, self._tokens + (now - self._updated) * self._rate)
+        self._updated = now
+        if self._tokens < 1:
+            return (1 - self._tokens) / self._rate
+        self._tokens -= 1
+        self._in_flight += 1
+        self._requests += 1
+        return 0
+
+    def _on_success(self) -> None:
+        """Additively increase the rate and concurrency limit."""
+        self._rate = min(self._max_rate, self._rate + self._increase / self._rate)
+        self._limit = min(self._max_limit, self._limit + 1 / self._limit)
+
+    def _on_throttled(self, now: float, retry_after: Optional[float]) -> None:
+        """Multiplicatively decrease the rate and concurrency limit."""
+        self._throttled += 1
+        if retry_after:
+            self._paused_until = max(self._paused_until, now + retry_after)
+        # Responses to requests that were already in flight report the same
+        # overload, so only back off once per cooldown window.
+        cooldown = max(retry_after or 0.0, 1.0 / self._rate)
+        if now - self._last_decrease < cooldown:
+            return
+        self._last_decrease = now
+        self._rate = max(self._min_rate, self._rate * self._decrease)
+        self._limit = max(self._min_limit, self._limit * self._decrease)
+        self._tokens = min(self._tokens, 0.0)
+
+
+def _wake(future: asyncio.Future) -> None:
+    """Resolve an async waiter, unless it was cancelled."""
+    if not future.done():
+        future.set_result(None)
+
+
+class RateLimitedTransport(httpx.BaseTransport):
+    """HTTP transport that routes every request through the shared limiter."""
+
+    def __init__(self, transport: httpx.BaseTransport):
+        self._transport = transport
+
+    def handle_request(self, request: httpx.Request) -> httpx.Response:
+        limiter = get_rate_limiter()
+        if limiter is None:
+            return self._transport.handle_request(request)
+
+        limiter.acquire()
+        status_code = retry_after = None
+        try:
+            response = self._transport.handle_request(request)
+            status_code = response.status_code
+            retry_after = parse_retry_after(response.headers)
+            return response
+        finally:
+            limiter.release(status_code, retry_after)
+
+    def close(self) -> None:
+        self._transport.close()
+
+
+class AsyncRateLimitedTransport(httpx.AsyncBaseTransport):
+    """Async HTTP transport that routes every request through the shared limiter."""
+
+    def __init__(self, transport: httpx.AsyncBaseTransport):
+        self._transport = transport
+
+    async def handle_async_request(self, request: httpx.Request) -> httpx.Response:
+        limiter = get_rate_limiter()
+        if limiter is None:
+            return await self._transport.handle_async_request(request)
+
+        await limiter.acquire_async()
+        status_code = retry_after = None
+        try:
+            response = await self._transport.handle_async_request(request)
+            status_code = response.status_code
+            retry_after = parse_retry_after(response.headers)
+            return response
+        finally:
+            limiter.release(status_code, retry_after)
+
+    async def aclose(self) -> None:
+        await self._transport.aclose()
+
+
+_limiter: Optional[RateLimiter] = RateLimiter()
+
+
+def get_rate_limiter() -> Optional[RateLimiter]:
+    """
+    Return the process-wide rate limiter.
+
+    Returns:
+        The shared RateLimiter, or None if rate limiting is disabled
+    """
+    return _limiter
+
+
+def set_rate_limiter(limiter: Optional[RateLimiter]) -> None:
+    """
+    Replace the process-wide rate limiter.
+
+    Takes effect immediately for all pooled clients, sync and async.
+
+    Args:
+        limiter: The new RateLimiter, or None to disable rate limiting
+    """
+    global _limiter
+    _limiter = limiter
+
+
+def parse_retry_after(headers: httpx.Headers) -> Optional[float]:
+    """
+    Parse the number of seconds to wait from response headers.
+
+    Args:
+        headers: Response headers
+
+    Returns:
+        Seconds from retry-after-ms or Retry-After (delta or HTTP date),
+        or None if absent or invalid
+    """
+    retry_after_ms = headers.get("retry-after-ms")
+    if retry_after_ms is not None:
+        try:
+            return max(0.0, float(retry_after_ms) / 1000)
+        except ValueError:
+            pass
+
+    retry_after = headers.get("retry-after")
+    if retry_after is None:
+        return None
+    try:
+        return max(0.0, float(retry_after))
+    except ValueError:
+        pass
+    parsed = email.utils.parsedate_tz(retry_after)
+    if parsed is None:
+        return None
+    return max(0.0, email.utils.mktime_tz(parsed) - time.time())
+
+
+def is_limit_error(error: BaseException) -> bool:
+    """
+    Return whether an exception was caused by an API rate or quota limit.
+
+    Args:
+        error: Exception raised by a wrapper function
+
+    Returns:
+        True for 429 responses and LimitExceeded/LimitError API errors
+    """
+    if getattr(error, "status_code", None) == 429:
+        return True
+    body = getattr(error, "body", None)
+    body_name = body.get("name") if isinstance(body, dict) else getattr(body, "name", None)
+    names = (type(error).__name__, str(body_name or ""))
+    return any("LimitExceeded" in name or "LimitError" in name for name in names)
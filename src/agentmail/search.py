@@ -0,0 +1,306 @@
+"""
+Full-text search module.
+
+Provides a local SQLite FTS5 index over message subjects, bodies and
+participants, built from threads fetched with every page of their messages
+or written by a `MailMirror`, with ranked queries filtered by inbox, label and date.
+Messages without a plain text body are indexed from their HTML with the
+markup stripped, and timestamps are stored in UTC so date filters compare
+correctly whatever offset the API used.
+"""
+
+import json
+import sqlite3
+import threading
+from concurrent.futures import ThreadPoolExecutor
+from dataclasses import dataclass
+from datetime import datetime
+from html.parser import HTMLParser
+from typing import Any, Dict, Iterable, List, Optional, Union
+
+from .mirror import MailMirror, fetch_thread
+from .serialization import to_dict, utc_timestamp
+
+DEFAULT_DB_PATH = "agentmail_search.db"
+
+_SCHEMA = """
+CREATE TABLE IF NOT EXISTS documents (
+    doc_id INTEGER PRIMARY KEY,
+    message_id TEXT NOT NULL UNIQUE,
+    thread_id TEXT NOT NULL,
+    inbox_id TEXT NOT NULL,
+    subject TEXT,
+    timestamp TEXT,
+    labels TEXT
+);
+CREATE INDEX IF NOT EXISTS documents_thread ON documents (thread_id);
+CREATE INDEX IF NOT EXISTS documents_inbox ON documents (inbox_id, timestamp);
+CREATE VIRTUAL TABLE IF NOT EXISTS search USING fts5 (
+    subject, body, sender, recipients, tokenize = 'porter unicode61'
+);
+"""
+
+# bm25 column weights for subject, body, sender and recipients
+_WEIGHTS = (5.0, 1.0, 2.0, 1.0)
+# Elements whose content is not message text
+_SKIPPED_TAGS = {"script", "style", "head", "title", "template"}
+
+
+@dataclass
+class SearchHit:
+    """A ranked search result."""
+
+    message_id: str
+    thread_id: str
+    inbox_id: str
+    subject: Optional[str]
+    timestamp: Optional[str]
+    score: float
+    snippet: str
+
+
+class SearchIndex:
+    """Local full-text index over messages."""
+
+    def __init__(self, path: str = DEFAULT_DB_PATH):
+        """
+        Open (or create) a search index.
+
+        Args:
+            path: Path to the SQLite database file
+
+        Raises:
+            RuntimeError: If the SQLite build lacks the FTS5 extension
+        """
+        self.path = path
+        self._lock = threading.Lock()
+        self._conn = sqlite3.connect(path, check_same_thread=False)
+        self._conn.execute("PRAGMA journal_mode=WAL")
+        self._conn.execute("PRAGMA synchronous=NORMAL")
+        try:
+            self._conn.executescript(_SCHEMA)
+        except sqlite3.OperationalError as e:
+            raise RuntimeError(f"SQLite FTS5 support is required for search: {e}") from e
+
+    def close(self) -> None:
+        """Close the database connection."""
+        with self._lock:
+            self._conn.close()
+
+    def __enter__(self) -> "SearchIndex":
+        return self
+
+    def __exit__(self, *exc_info) -> None:
+        self.close()
+
+    def attach(self, mirror: MailMirror) -> None:
+        """
+        Keep the index up to date with a mirror.
+
+        Every thread the mirror writes during `sync()` is re-indexed as well,
+        and threads a full sync removes are removed from the index.
+
+        Args:
+            mirror: The MailMirror to follow
+        """
+        def reindex(thread: Dict[str, Any], messages: List[Dict[str, Any]]) -> None:
+            self.remove_thread(thread["thread_id"])
+            self.index_thread(thread, messages)
+
+        mirror.add_thread_listener(reindex)
+        mirror.add_removal_listener(self.remove_thread)
+
+    def index_thread(self, thread: Any, messages: Optional[Iterable[Any]] = None) -> int:
+        """
+        Index (or re-index) every message of a thread.
+
+        Args:
+            thread: Thread object or dictionary, as returned by `get_thread()`
+            messages: Optional messages of the thread. Defaults to the
+                      thread's own "messages" field.
+
+        Returns:
+            Number of messages indexed
+        """
+        thread = to_dict(thread)
+        if messages is None:
+            messages = thread.get("messages") or []
+        thread_labels = thread.get("labels") or []
+
+        count = 0
+        with self._lock:
+            for message in messages:
+                message = to_dict(message)
+                labels = sorted(set(thread_labels) | set(message.get("labels") or []))
+                self._index_message(thread, message, labels)
+                count += 1
+            self._conn.commit()
+        return count
+
+    def index_threads(self, thread_ids: Iterable[str], concurrency: int = 8, api_key: str = None) -> int:
+        """
+        Fetch threads, with every page of their messages, and index them.
+
+        Args:
+            thread_ids: IDs of the threads to index
+            concurrency: Maximum number of threads fetched at the same time
+            api_key: Optional API key. If not provided, will load from environment.
+
+        Returns:
+            Number of messages indexed
+        """
+        with ThreadPoolExecutor(max_workers=concurrency) as executor:
+            threads = executor.map(lambda thread_id: fetch_thread(thread_id, api_key=api_key), thread_ids)
+            return sum(self.index_thread(thread) for thread in threads)
+
+    def remove_thread(self, thread_id: str) -> None:
+        """
+        Remove every message of a thread from the index.
+
+        Args:
+            thread_id: The ID of the thread
+        """
+        with self._lock:
+            rows = self._conn.execute(
+                "SELECT doc_id FROM documents WHERE thread_id = ?", (thread_id,)
+            ).fetchall()
+            for (doc_id,) in rows:
+                self._conn.execute("DELETE FROM search WHERE rowid = ?", (doc_id,))
+            self._conn.execute("DELETE FROM documents WHERE thread_id = ?", (thread_id,))
+            self._conn.commit()
+
+    def search(
+        self,
+        query: str,
+        inbox_id: Optional[str] = None,
+        label: Optional[str] = None,
+        after: Optional[Union[datetime, str]] = None,
+        before: Optional[Union[datetime, str]] = None,
+        limit: int = 20,
+        raw: bool = False
+    ) -> List[SearchHit]:
+        """
+        Run a ranked full-text query.
+
+        Args:
+            query: Words to search for. Every word must match.
+            inbox_id: Optional inbox ID to restrict results to
+            label: Optional label the message or its thread must carry
+            after: Optional earliest message timestamp (inclusive)
+            before: Optional latest message timestamp (exclusive)
+            limit: Maximum number of hits
+            raw: Whether query is FTS5 query syntax (phrases, OR, NEAR, column
+                 filters) rather than plain words
+
+        Returns:
+            Hits ordered by relevance, best first
+        """
+        match = query if raw else _plain_query(query)
+        if not match:
+            return []
+
+        sql = (
+            "SELECT d.message_id, d.thread_id, d.inbox_id, d.subject, d.timestamp, "
+            "bm25(search, ?, ?, ?, ?) AS score, "
+            "snippet(search, 1, '[', ']', '...', 12) AS snippet "
+            "FROM search JOIN documents d ON d.doc_id = search.rowid "
+            "WHERE search MATCH ?"
+        )
+        params: List[Any] = [*_WEIGHTS, match]
+        if inbox_id is not None:
+            sql += " AND d.inbox_id = ?"
+            params.append(inbox_id)
+        if label is not None:
+            sql += " AND EXISTS (SELECT 1 FROM json_each(d.labels) WHERE value = ?)"
+            params.append(label)
+        if after is not None:
+            sql += " AND d.timestamp >= ?"
+            params.append(_timestamp(after))
+        if before is not None:
+            sql += " AND d.timestamp < ?"
+            params.append(_timestamp(before))
+        sql += " ORDER BY score LIMIT ?"
+        params.append(limit)
+
+        with self._lock:
+            rows = self._conn.execute(sql, params).fetchall()
+        # bm25() scores are negative, lower is better; flip for readability
+        return [
+            SearchHit(message_id, thread_id, inbox, subject, timestamp, -score, snippet)
+            for message_id, thread_id, inbox, subject, timestamp, score, snippet in rows
+        ]
+
+    def _index_message(self, thread: Dict[str, Any], message: Dict[str, Any], labels: List[str]) -> None:
+        """Replace the index entry of one message. Caller holds the lock."""
+        row = self._conn.execute(
+            "SELECT doc_id FROM documents WHERE message_id = ?", (message["message_id"],)
+        ).fetchone()
+        if row is not None:
+            self._conn.execute("DELETE FROM search WHERE rowid = ?", (row[0],))
+            self._conn.execute("DELETE FROM documents WHERE doc_id = ?", (row[0],))
+
+        subject = message.get("subject") or thread.get("subject")
+        cursor = self._conn.execute(
+            "INSERT INTO documents (message_id, thread_id, inbox_id, subject, timestamp, labels) "
+            "VALUES (?, ?, ?, ?, ?, ?)",
+            (
+                message["message_id"], message.get("thread_id") or thread["thread_id"],
+                message.get("inbox_id") or thread["inbox_id"], subject,
+                utc_timestamp(message.get("timestamp")), json.dumps(labels)
+            )
+        )
+        body = (
+            message.get("text") or message.get("extracted_text")
+            or _html_text(message.get("html") or message.get("extracted_html"))
+            or message.get("preview") or ""
+        )
+        recipients = " ".join((message.get("to") or []) + (message.get("cc") or []))
+        self._conn.execute(
+            "INSERT INTO search (rowid, subject, body, sender, recipients) VALUES (?, ?, ?, ?, ?)",
+            (cursor.lastrowid, subject or "", body, message.get("from") or "", recipients)
+        )
+
+
+def _plain_query(query: str) -> str:
+    """Turn plain words into an FTS5 query matching all of them."""
+    terms = query.split()
+    return " ".join('"' + term.replace('"', '""') + '"' for term in terms)
+
+
+def _timestamp(value: Union[datetime, str]) -> str:
+    """Normalize a date filter to the stored UTC format."""
+    return utc_timestamp(value)
+
+
+class _TextExtractor(HTMLParser):
+    """Collects the text content of an HTML document."""
+
+    def __init__(self):
+        super().__init__(convert_charrefs=True)
+        self.parts: List[str] = []
+        self._skipping = 0
+
+    def handle_starttag(self, tag: str, attrs: list) -> None:
+        if tag in _SKIPPED_TAGS:
+            self._skipping += 1
+        # Keep words in adjacent elements apart
+        self.parts.append(" ")
+
+    def handle_endtag(self, tag: str) -> None:
+        if tag in _SKIPPED_TAGS and self._skipping:
+            self._skipping -= 1
+        self.parts.append(" ")
+
+    def handle_data(self, data: str) -> None:
+        if not self._skipping:
+            self.parts.append(data)
+
+
+def _html_text(html: Optional[str]) -> str:
+    """Return the text of an HTML body with markup removed."""
+    if not html:
+        return ""
+    parser = _TextExtractor()
+    parser.feed(html)
+    parser.close()
+    return " ".join("".join(parser.parts).split())
@@ -0,0 +1,78 @@
+"""
+Serialization helpers module.
+
+Provides conversion of SDK response models (and compact records) to plain
+JSON-compatible dictionaries for local storage and transport.
+"""
+
+from datetime import datetime, timezone
+from typing import Any, Dict, Optional, Union
+
+
+def to_dict(obj: Any) -> Dict[str, Any]:
+    """
+    Convert an SDK model (or dictionary) to a JSON-compatible dictionary.
+    
+    Args:
+        obj: Pydantic model returned by the SDK, a compact record from
+             `iter_*(fields=...)`, or a dictionary
+    
+    Returns:
+        Dictionary using API field names (e.g. "from" rather than "from_")
+    """
+    if isinstance(obj, dict):
+        return dict(obj)
+    if hasattr(obj, "_asdict"):
+        from pydantic_core import to_jsonable_python
+
+        return {
+            name[:-1] if name.endswith("_") else name: to_jsonable_python(value, by_alias=True)
+            for name, value in obj._asdict().items()
+        }
+    return obj.model_dump(mode="json", by_alias=True)
+
+
+def parse_timestamp(value: Union[datetime, str]) -> datetime:
+    """
+    Parse an ISO 8601 timestamp as an aware UTC datetime.
+
+    Args:
+        value: Datetime or ISO string, e.g. "2024-01-01T10:00:00Z" or
+               "2024-01-01T12:00:00+02:00". Naive values are taken as UTC.
+
+    Returns:
+        Datetime in UTC
+
+    Raises:
+        ValueError: If a string is not an ISO 8601 timestamp
+    """
+    if isinstance(value, str):
+        text = value.strip()
+        # fromisoformat() only accepts a trailing "Z" from Python 3.11
+        value = datetime.fromisoformat(text[:-1] + "+00:00" if text.endswith(("Z", "z")) else text)
+    if value.tzinfo is None:
+        return value.replace(tzinfo=timezone.utc)
+    return value.astimezone(timezone.utc)
+
+
+def utc_timestamp(value: Optional[Union[datetime, str]]) -> Optional[str]:
+    """
+    Normalize a timestamp for local storage.
+
+    Timestamps are stored as fixed-width UTC strings
+    ("2024-01-01T10:00:00.000000Z"), so comparing them as text orders them
+    in time regardless of the offset or precision the API used.
+
+    Args:
+        value: Datetime or ISO string, or None
+
+    Returns:
+        Normalized string; None for None. Strings that are not timestamps
+        are returned unchanged.
+    """
+    if value is None:
+        return None
+    try:
+        return parse_timestamp(value).strftime("%Y-%m-%dT%H:%M:%S.%fZ")
+    except ValueError:
+        return value
@@ -0,0 +1,196 @@
+"""
+Request coalescing module.
+
+Provides singleflight coalescing for read calls: while a call such as
+`get_thread("t1")` is in flight, identical concurrent calls wait for it and
+share its result (or exception) instead of issuing their own request. Works
+across threads for sync functions and across tasks on one event loop for
+async functions.
+
+Writes made through this package call `expire_in_flight()` when they
+complete, so a read issued after a write returns never joins a request that
+started before it.
+
+Coalescing is enabled by default; call `disable_coalescing()` to turn it off.
+"""
+
+import functools
+import inspect
+import threading
+import weakref
+from typing import TYPE_CHECKING, Any, Callable, Dict, Hashable, Optional, Tuple
+
+if TYPE_CHECKING:
+    import asyncio
+
+_enabled = True
+_lock = threading.Lock()
+# In-flight sync calls by key
+_calls: Dict[Hashable, "_Call"] = {}
+# In-flight async calls by key as (generation, task), per event loop
+_tasks: "weakref.WeakKeyDictionary[asyncio.AbstractEventLoop, Dict[Hashable, Tuple[int, asyncio.Future]]]" = (
+    weakref.WeakKeyDictionary()
+)
+# Bumped by every write; calls only join in-flight calls of the same generation
+_generation = 0
+_stats = {"calls": 0, "executions": 0, "coalesced": 0}
+
+
+class _Call:
+    """An in-flight sync call shared by every identical caller."""
+
+    __slots__ = ("generation", "done", "result", "error")
+
+    def __init__(self, generation: int):
+        self.generation = generation
+        self.done = threading.Event()
+        self.result: Any = None
+        self.error: Optional[BaseException] = None
+
+
+def enable_coalescing() -> None:
+    """Turn request coalescing on."""
+    global _enabled
+    _enabled = True
+
+
+def disable_coalescing() -> None:
+    """Turn request coalescing off. Calls already in flight are unaffected."""
+    global _enabled
+    _enabled = False
+
+
+def expire_in_flight() -> None:
+    """
+    Stop later calls from joining calls already in flight.
+
+    Called when a write completes: a read in flight may have fetched the
+    resource before the write, so calls made from now on start their own
+    request. The calls already in flight still finish and share their result
+    with the callers that joined them before the write.
+    """
+    global _generation
+    with _lock:
+        _generation += 1
+
+
+def coalescing_stats() -> Dict[str, Any]:
+    """
+    Return coalescing counters.
+
+    Returns:
+        Dictionary with calls made, requests actually executed, calls that
+        were collapsed into another in-flight call, the collapsed fraction
+        and the number of calls currently in flight
+    """
+    with _lock:
+        calls = _stats["calls"]
+        in_flight = len(_calls) + sum(len(tasks) for tasks in _tasks.values())
+        return {
+            **_stats,
+            "coalesced_rate": _stats["coalesced"] / calls if calls else 0.0,
+            "in_flight": in_flight
+        }
+
+
+def reset_coalescing_stats() -> None:
+    """Zero the coalescing counters."""
+    with _lock:
+        for name in _stats:
+            _stats[name] = 0
+
+
+def coalesced(func: Callable) -> Callable:
+    """
+    Decorate a read so identical concurrent calls share one request.
+
+    Calls are identical when the function and every bound argument
+    (including the API key) are equal. Calls with unhashable arguments are
+    never coalesced. Works for both sync and async functions.
+
+    Args:
+        func: The read function to wrap
+    """
+    signature = inspect.signature(func)
+    name = (func.__module__, func.__qualname__)
+
+    def key_of(args: tuple, kwargs: dict) -> Optional[Hashable]:
+        bound = signature.bind(*args, **kwargs)
+        bound.apply_defaults()
+        key = (name, tuple(bound.arguments.items()))
+        try:
+            hash(key)
+        except TypeError:
+            return None
+        return key
+
+    if inspect.iscoroutinefunction(func):
+        import asyncio
+
+        @functools.wraps(func)
+        async def async_wrapper(*args, **kwargs):
+            key = key_of(args, kwargs) if _enabled else None
+            if key is None:
+                return await func(*args, **kwargs)
+            loop = asyncio.get_running_loop()
+            with _lock:
+                _stats["calls"] += 1
+                tasks = _tasks.setdefault(loop, {})
+                generation, task = tasks.get(key, (None, None))
+                if task is None or generation != _generation:
+                    _stats["executions"] += 1
+                    # A shared task, so cancelling one caller does not cancel the others
+                    task = loop.create_task(func(*args, **kwargs))
+                    tasks[key] = (_generation, task)
+                    task.add_done_callback(functools.partial(_forget_task, tasks, key))
+                else:
+                    _stats["coalesced"] += 1
+            return await asyncio.shield(task)
+        return async_wrapper
+
+    @functools.wraps(func)
+    def wrapper(*args, **kwargs):
+        key = key_of(args, kwargs) if _enabled else None
+        if key is None:
+            return func(*args, **kwargs)
+        with _lock:
+            _stats["calls"] += 1
+            call = _calls.get(key)
+            leader = call is None or call.generation != _generation
+            if leader:
+                _stats["executions"] += 1
+                call = _calls[key] = _Call(_generation)
+            else:
+                _stats["coalesced"] += 1
+
+        if not leader:
+            call.done.wait()
+            if call.error is not None:
+                raise call.error
+            return call.result
+
+        try:
+            call.result = func(*args, **kwargs)
+        except BaseException as e:
+            call.error = e
+            raise
+        finally:
+            with _lock:
+                # A call started after a write may have replaced this one
+                if _calls.get(key) is call:
+                    del _calls[key]
+            call.done.set()
+        return call.result
+    return wrapper
+
+
+def _forget_task(
+    tasks: Dict[Hashable, Tuple[int, "asyncio.Future"]], key: Hashable, task: "asyncio.Future"
+) -> None:
+    """Remove a finished async call so later calls start a new request."""
+    with _lock:
+        if tasks.get(key, (None, None))[1] is task:
+            del tasks[key]
+    if not task.cancelled():
+        # Mark the exception retrieved when every caller was cancelled
+        task.exception()
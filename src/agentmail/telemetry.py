@@ -0,0 +1,389 @@
+"""
+Client-side telemetry module.
+
+Records, for every wrapper function, call counts, errors by exception type,
+in-flight gauges and latency histograms. Paginating `iter_*` functions are
+recorded once per iteration, with the number of items yielded and the time
+to the first item. Results are available as an in-process snapshot or in
+Prometheus text exposition format. Recording is a counter update and a
+bisect per call, cheap enough to leave on for bulk sends.
+
+Telemetry is enabled by default; call `disable_telemetry()` to turn it off.
+(Server-side analytics are in `metrics.py`.)
+"""
+
+import bisect
+import functools
+import inspect
+import threading
+import time
+from typing import TYPE_CHECKING, Any, AsyncIterator, Callable, Dict, Iterator, List, Optional, Sequence, Tuple
+
+if TYPE_CHECKING:
+    from http.server import ThreadingHTTPServer
+
+# Upper bounds of the latency histogram buckets, in seconds
+DEFAULT_BUCKETS = (0.005, 0.01, 0.025, 0.05, 0.1, 0.25, 0.5, 1.0, 2.5, 5.0, 10.0, 30.0)
+
+_enabled = True
+_lock = threading.Lock()
+_operations: Dict[Tuple[str, str], "_Operation"] = {}
+_buckets: Tuple[float, ...] = DEFAULT_BUCKETS
+
+
+class _Operation:
+    """Counters of one (operation, mode) pair."""
+
+    __slots__ = ("lock", "calls", "errors", "in_flight", "counts", "total", "items", "first_items", "first_item_total")
+
+    def __init__(self):
+        self.lock = threading.Lock()
+        self.calls = 0
+        self.errors: Dict[str, int] = {}
+        self.in_flight = 0
+        # One count per bucket plus the +Inf bucket; not cumulative
+        self.counts = [0] * (len(_buckets) + 1)
+        self.total = 0.0
+        # Iterations only: items yielded, and time to the first item
+        self.items = 0
+        self.first_items = 0
+        self.first_item_total = 0.0
+
+    def start(self) -> None:
+        with self.lock:
+            self.in_flight += 1
+
+    def cancel(self) -> None:
+        """Undo start() for a call recorded under another mode."""
+        with self.lock:
+            self.in_flight -= 1
+
+    def first_item(self, elapsed: float) -> None:
+        with self.lock:
+            self.first_items += 1
+            self.first_item_total += elapsed
+
+    def finish(self, elapsed: float, error: Optional[BaseException], items: int = 0) -> None:
+        index = min(bisect.bisect_left(_buckets, elapsed), len(self.counts) - 1)
+        with self.lock:
+            self.in_flight -= 1
+            self.calls += 1
+            self.total += elapsed
+            self.counts[index] += 1
+            self.items += items
+            if error is not None:
+                name = type(error).__name__
+                self.errors[name] = self.errors.get(name, 0) + 1
+
+
+def enable_telemetry(buckets: Optional[Sequence[float]] = None) -> None:
+    """
+    Turn telemetry on.
+
+    Args:
+        buckets: Optional histogram bucket upper bounds in seconds. Changing
+                 the buckets resets every recorded histogram.
+    """
+    global _enabled, _buckets
+    with _lock:
+        if buckets is not None and tuple(sorted(buckets)) != _buckets:
+            _buckets = tuple(sorted(buckets))
+            _operations.clear()
+        _enabled = True
+
+
+def disable_telemetry() -> None:
+    """Turn telemetry off. Recorded values are kept."""
+    global _enabled
+    _enabled = False
+
+
+def reset_telemetry() -> None:
+    """Drop every recorded value."""
+    with _lock:
+        _operations.clear()
+
+
+def instrumented(func: Callable) -> Callable:
+    """
+    Decorate a wrapper function so its calls are recorded.
+
+    The operation is named "<module>.<function>", e.g. "inboxes.get_inbox",
+    and labelled with mode "sync" or "async". Works for both sync and async
+    functions.
+
+    A function returning a generator (the `iter_*` functions) is recorded
+    when iteration ends, is abandoned or fails: its latency is the time spent
+    producing items (excluding the caller's work between items), along with
+    the number of items yielded and the time from the call to the first item.
+    Async generators are recorded with mode "async".
+
+    Args:
+        func: The function to wrap
+    """
+    operation = f"{func.__module__.rsplit('.', 1)[-1]}.{func.__name__}"
+
+    if inspect.iscoroutinefunction(func):
+        @functools.wraps(func)
+        async def async_wrapper(*args, **kwargs):
+            if not _enabled:
+                return await func(*args, **kwargs)
+            stats = _operation(operation, "async")
+            stats.start()
+            started = time.perf_counter()
+            error = None
+            try:
+                return await func(*args, **kwargs)
+            except BaseException as e:
+                error = e
+                raise
+            finally:
+                stats.finish(time.perf_counter() - started, error)
+        return async_wrapper
+
+    @functools.wraps(func)
+    def wrapper(*args, **kwargs):
+        if not _enabled:
+            return func(*args, **kwargs)
+        stats = _operation(operation, "sync")
+        stats.start()
+        started = time.perf_counter()
+        try:
+            result = func(*args, **kwargs)
+        except BaseException as e:
+            stats.finish(time.perf_counter() - started, e)
+            raise
+        if inspect.isgenerator(result):
+            return _iterate(result, stats, started)
+        if inspect.isasyncgen(result):
+            stats.cancel()
+            stats = _operation(operation, "async")
+            stats.start()
+            return _aiterate(result, stats, started)
+        stats.finish(time.perf_counter() - started, None)
+        return result
+    return wrapper
+
+
+def _iterate(iterator: Iterator[Any], stats: _Operation, started: float) -> Iterator[Any]:
+    """Yield from an instrumented generator, recording the iteration when it ends."""
+    busy = time.perf_counter() - started
+    items = 0
+    error = None
+    try:
+        while True:
+            resumed = time.perf_counter()
+            try:
+                item = next(iterator)
+            except StopIteration:
+                busy += time.perf_counter() - resumed
+                return
+            now = time.perf_counter()
+            busy += now - resumed
+            if not items:
+                stats.first_item(now - started)
+            items += 1
+            yield item
+    except GeneratorExit:
+        # Abandoned by the caller; record what was consumed
+        raise
+    except BaseException as e:
+        error = e
+        raise
+    finally:
+        iterator.close()
+        stats.finish(busy, error, items)
+
+
+async def _aiterate(iterator: AsyncIterator[Any], stats: _Operation, started: float) -> AsyncIterator[Any]:
+    """Yield from an instrumented async generator, recording the iteration when it ends."""
+    busy = time.perf_counter() - started
+    items = 0
+    error = None
+    try:
+        while True:
+            resumed = time.perf_counter()
+            try:
+                item = await iterator.__anext__()
+            except StopAsyncIteration:
+                busy += time.perf_counter() - resumed
+                return
+            now = time.perf_counter()
+            busy += now - resumed
+            if not items:
+                stats.first_item(now - started)
+            items += 1
+            yield item
+    except GeneratorExit:
+        raise
+    except BaseException as e:
+        error = e
+        raise
+    finally:
+        await iterator.aclose()
+        stats.finish(busy, error, items)
+
+
+def snapshot() -> Dict[str, Dict[str, Any]]:
+    """
+    Return the recorded values.
+
+    Returns:
+        Dictionary keyed by "<operation>" (sync) or "<operation>[async]",
+        each with calls, errors (by exception type), error_count, in_flight,
+        latency_sum, latency_avg, p50/p95/p99 latency estimates in seconds,
+        cumulative histogram buckets, and for iterations the items yielded
+        and average time to the first item
+    """
+    with _lock:
+        items = list(_operations.items())
+    result = {}
+    for (operation, mode), stats in sorted(items):
+        with stats.lock:
+            calls, total, in_flight = stats.calls, stats.total, stats.in_flight
+            counts, errors = list(stats.counts), dict(stats.errors)
+            items, first_items, first_item_total = stats.items, stats.first_items, stats.first_item_total
+        cumulative = _cumulative(counts)
+        result[operation if mode == "sync" else f"{operation}[async]"] = {
+            "operation": operation,
+            "mode": mode,
+            "calls": calls,
+            "errors": errors,
+            "error_count": sum(errors.values()),
+            "in_flight": in_flight,
+            "latency_sum": total,
+            "latency_avg": total / calls if calls else 0.0,
+            "p50": _quantile(cumulative, 0.50),
+            "p95": _quantile(cumulative, 0.95),
+            "p99": _quantile(cumulative, 0.99),
+            "buckets": dict(zip([*map(str, _buckets), "+Inf"], cumulative)),
+            "items": items,
+            "first_items": first_items,
+            "first_item_sum": first_item_total,
+            "first_item_avg": first_item_total / first_items if first_items else 0.0
+        }
+    return result
+
+
+def prometheus_text() -> str:
+    """
+    Render the recorded values in Prometheus text exposition format.
+
+    Returns:
+        Text with the agentmail_client_calls_total, _errors_total, _in_flight,
+        _latency_seconds (histogram), _items_total and _first_item_seconds
+        metric families
+    """
+    data = snapshot()
+    calls: List[str] = []
+    errors: List[str] = []
+    in_flight: List[str] = []
+    latency: List[str] = []
+    items: List[str] = []
+    first_item: List[str] = []
+    for entry in data.values():
+        labels = f'operation="{entry["operation"]}",mode="{entry["mode"]}"'
+        calls.append(f"agentmail_client_calls_total{{{labels}}} {entry['calls']}")
+        for error, count in sorted(entry["errors"].items()):
+            errors.append(f'agentmail_client_errors_total{{{labels},error="{error}"}} {count}')
+        in_flight.append(f"agentmail_client_in_flight{{{labels}}} {entry['in_flight']}")
+        for bound, count in entry["buckets"].items():
+            latency.append(f'agentmail_client_latency_seconds_bucket{{{labels},le="{bound}"}} {count}')
+        latency.append(f"agentmail_client_latency_seconds_sum{{{labels}}} {entry['latency_sum']}")
+        latency.append(f"agentmail_client_latency_seconds_count{{{labels}}} {entry['calls']}")
+        if entry["items"] or entry["first_items"]:
+            items.append(f"agentmail_client_items_total{{{labels}}} {entry['items']}")
+            first_item.append(f"agentmail_client_first_item_seconds_sum{{{labels}}} {entry['first_item_sum']}")
+            first_item.append(f"agentmail_client_first_item_seconds_count{{{labels}}} {entry['first_items']}")
+
+    lines = [
+        "# HELP agentmail_client_calls_total Completed AgentMail wrapper calls.",
+        "# TYPE agentmail_client_calls_total counter",
+        *calls,
+        "# HELP agentmail_client_errors_total Failed AgentMail wrapper calls by exception type.",
+        "# TYPE agentmail_client_errors_total counter",
+        *errors,
+        "# HELP agentmail_client_in_flight AgentMail wrapper calls in progress.",
+        "# TYPE agentmail_client_in_flight gauge",
+        *in_flight,
+        "# HELP agentmail_client_latency_seconds Latency of AgentMail wrapper calls.",
+        "# TYPE agentmail_client_latency_seconds histogram",
+        *latency,
+        "# HELP agentmail_client_items_total Items yielded by AgentMail iterations.",
+        "# TYPE agentmail_client_items_total counter",
+        *items,
+        "# HELP agentmail_client_first_item_seconds Time from an iteration's call to its first item.",
+        "# TYPE agentmail_client_first_item_seconds summary",
+        *first_item
+    ]
+    return "\n".join(lines) + "\n"
+
+
+def start_metrics_server(port: int = 9464, host: str = "127.0.0.1") -> "ThreadingHTTPServer":
+    """
+    Serve `prometheus_text()` at /metrics from a background thread.
+
+    Args:
+        port: Port to listen on; 0 picks a free port
+        host: Interface to listen on
+
+    Returns:
+        The running server; call `shutdown()` on it to stop
+    """
+    from http.server import BaseHTTPRequestHandler, ThreadingHTTPServer
+
+    class Handler(BaseHTTPRequestHandler):
+        def do_GET(self):
+            if self.path.split("?", 1)[0] != "/metrics":
+                self.send_error(404)
+                return
+            body = prometheus_text().encode()
+            self.send_response(200)
+            self.send_header("Content-Type", "text/plain; version=0.0.4; charset=utf-8")
+            self.send_header("Content-Length", str(len(body)))
+            self.end_headers()
+            self.wfile.write(body)
+
+        def log_message(self, format, *args):
+            pass
+
+    server = ThreadingHTTPServer((host, port), Handler)
+    thread = threading.Thread(target=server.serve_forever, name="agentmail-metrics", daemon=True)
+    thread.start()
+    return server
+
+
+def _operation(operation: str, mode: str) -> _Operation:
+    """Return the counters of an operation, creating them on first use."""
+    key = (operation, mode)
+    stats = _operations.get(key)
+    if stats is None:
+        with _lock:
+            stats = _operations.setdefault(key, _Operation())
+    return stats
+
+
+def _cumulative(counts: List[int]) -> List[int]:
+    """Turn per-bucket counts into cumulative counts."""
+    total = 0
+    cumulative = []
+    for count in counts:
+        total += count
+        cumulative.append(total)
+    return cumulative
+
+
+def _quantile(cumulative: List[int], q: float) -> float:
+    """Estimate a quantile from cumulative bucket counts by linear interpolation."""
+    total = cumulative[-1] if cumulative else 0
+    if not total:
+        return 0.0
+    rank = q * total
+    index = bisect.bisect_left(cumulative, rank)
+    if index >= len(_buckets):
+        # Beyond the last finite bucket; report its bound
+        return _buckets[-1]
+    lower = _buckets[index - 1] if index else 0.0
+    below = cumulative[index - 1] if index else 0
+    in_bucket = cumulative[index] - below
+    return lower + (_buckets[index] - lower) * ((rank - below) / in_bucket if in_bucket else 0.0)
@@ -4,10 +4,16 @@ Email thread management module.
 Provides functions to access and manage email threads and conversations.
 """
 
-from typing import List, Dict, Any
+from typing import List, Dict, Any, Iterator, Optional, Iterable
+from .cache import cached, invalidates
 from .client import get_client
+from .pagination import paginate
+from .records import projector
+from .singleflight import coalesced
+from .telemetry import instrumented
 
 
+@instrumented
 def list_threads(api_key: str = None, **kwargs) -> List[Dict[str, Any]]:
     """
     List all threads.
@@ -23,6 +29,43 @@ def list_threads(api_key: str = None, **kwargs) -> List[Dict[str, Any]]:
     return client.threads.list(**kwargs)
 
 
+@instrumented
+def iter_threads(
+    page_size: Optional[int] = None,
+    prefetch: bool = False,
+    fields: Optional[Iterable[str]] = None,
+    api_key: str = None,
+    **kwargs
+) -> Iterator[Any]:
+    """
+    Iterate over all threads, following pagination automatically.
+    
+    Items are yielded one at a time, so memory use stays constant
+    regardless of how many threads exist.
+    
+    Args:
+        page_size: Optional number of threads to request per page
+        prefetch: Whether to fetch the next page in the background while
+                  the current page is being consumed
+        fields: Optional thread fields to keep, e.g. ("thread_id", "created_at").
+                If provided, compact tuple-backed records holding only these
+                fields are yielded instead of full models.
+        api_key: Optional API key. If not provided, will load from environment.
+        **kwargs: Additional parameters for filtering threads
+    
+    Yields:
+        Thread objects, or records with the selected fields
+    """
+    client = get_client(api_key)
+    return paginate(
+        client.threads.list, "threads", page_size=page_size, prefetch=prefetch,
+        transform=projector("thread", fields), **kwargs
+    )
+
+
+@instrumented
+@cached("thread", "thread_id")
+@coalesced
 def get_thread(thread_id: str, api_key: str = None) -> Dict[str, Any]:
     """
     Get a specific thread by ID.
@@ -38,6 +81,8 @@ def get_thread(thread_id: str, api_key: str = None) -> Dict[str, Any]:
     return client.threads.get(thread_id=thread_id)
 
 
+@instrumented
+@coalesced
 def get_attachment(thread_id: str, attachment_id: str, api_key: str = None) -> bytes:
     """
     Get an attachment from a thread.
@@ -54,6 +99,8 @@ def get_attachment(thread_id: str, attachment_id: str, api_key: str = None) -> b
     return client.threads.get_attachment(thread_id=thread_id, attachment_id=attachment_id)
 
 
+@instrumented
+@invalidates("thread", "thread_id")
 def delete_thread(thread_id: str, inbox_id: str, api_key: str = None) -> Dict[str, Any]:
     """
     Delete a thread by ID.
@@ -0,0 +1,444 @@
+"""
+Webhook receiver module.
+
+Provides an embeddable asyncio HTTP server that receives AgentMail webhook
+deliveries (`message.received` and the other `EventType` values), verifies
+their signatures with the webhook secret returned by `create_webhook()`,
+acknowledges immediately and dispatches events to registered handlers
+through a bounded queue and worker pool. When the queue is full, deliveries
+are refused with 503 so the sender retries later instead of piling up work.
+
+Signatures follow the Svix / Standard Webhooks scheme used by AgentMail:
+an HMAC-SHA256 over "<id>.<timestamp>.<body>" keyed with the base64 part of
+the `whsec_...` secret.
+"""
+
+import asyncio
+import base64
+import binascii
+import hashlib
+import hmac
+import inspect
+import json
+import logging
+import time
+from typing import Any, Callable, Dict, List, Mapping, Optional, Tuple, Union
+
+from .idempotency import IdempotencyStore, event_keys
+from .webhooks import EventType
+
+logger = logging.getLogger(__name__)
+
+DEFAULT_PATH = "/webhooks"
+DEFAULT_WORKERS = 4
+DEFAULT_QUEUE_SIZE = 1000
+DEFAULT_MAX_BODY = 1024 * 1024
+# Maximum age, in seconds, of a signed delivery before it is rejected
+DEFAULT_TOLERANCE = 300
+
+_REASONS = {
+    200: "OK", 204: "No Content", 400: "Bad Request", 401: "Unauthorized",
+    404: "Not Found", 405: "Method Not Allowed", 413: "Payload Too Large",
+    503: "Service Unavailable"
+}
+
+
+class WebhookVerificationError(ValueError):
+    """Raised when a webhook delivery has a missing or invalid signature."""
+
+
+def verify_signature(
+    secret: str,
+    headers: Mapping[str, str],
+    body: bytes,
+    tolerance: Optional[float] = DEFAULT_TOLERANCE
+) -> None:
+    """
+    Verify the signature of a webhook delivery.
+
+    Args:
+        secret: Webhook secret, as returned by `create_webhook()`
+        headers: Request headers, with lower-case names
+        body: Raw request body
+        tolerance: Optional maximum age of the delivery in seconds
+
+    Raises:
+        WebhookVerificationError: If the signature is missing, stale or invalid
+        ValueError: If the secret is not a valid webhook secret
+    """
+    _verify(_secret_key(secret), headers, body, tolerance)
+
+
+def _secret_key(secret: str) -> bytes:
+    """Decode the HMAC key of a `whsec_...` webhook secret."""
+    encoded = secret.split("_", 1)[1] if secret.startswith("whsec_") else secret
+    try:
+        key = base64.b64decode(encoded, validate=True)
+    except (binascii.Error, ValueError):
+        key = b""
+    if not key:
+        raise ValueError("Invalid webhook secret; expected whsec_ followed by base64")
+    return key
+
+
+def _verify(key: bytes, headers: Mapping[str, str], body: bytes, tolerance: Optional[float]) -> None:
+    """Verify a delivery's signature with a decoded secret key."""
+    msg_id = headers.get("svix-id") or headers.get("webhook-id")
+    timestamp = headers.get("svix-timestamp") or headers.get("webhook-timestamp")
+    signatures = headers.get("svix-signature") or headers.get("webhook-signature")
+    if not msg_id or not timestamp or not signatures:
+        raise WebhookVerificationError("Missing webhook signature headers")
+
+    try:
+        sent_at = int(timestamp)
+    except ValueError:
+        raise WebhookVerificationError("Invalid webhook timestamp") from None
+    if tolerance is not None and abs(time.time() - sent_at) > tolerance:
+        raise WebhookVerificationError("Webhook timestamp outside tolerance")
+
+    signed = f"{msg_id}.{timestamp}.".encode() + body
+    expected = base64.b64encode(hmac.new(key, signed, hashlib.sha256).digest()).decode()
+    for signature in signatures.split():
+        version, _, value = signature.partition(",")
+        if version == "v1" and hmac.compare_digest(value, expected):
+            return
+    raise WebhookVerificationError("Invalid webhook signature")
+
+
+class WebhookReceiver:
+    """Asyncio webhook server with signature checks and worker-pool dispatch."""
+
+    def __init__(
+        self,
+        secret: Optional[str] = None,
+        host: str = "127.0.0.1",
+        port: int = 8080,
+        path: str = DEFAULT_PATH,
+        workers: int = DEFAULT_WORKERS,
+        queue_size: int = DEFAULT_QUEUE_SIZE,
+        max_body: int = DEFAULT_MAX_BODY,
+        tolerance: Optional[float] = DEFAULT_TOLERANCE,
+        idempotency: Optional[IdempotencyStore] = None
+    ):
+        """
+        Configure the receiver.
+
+        Args:
+            secret: Optional webhook secret. Signatures are not checked
+                    without one, which is only suitable for local testing.
+            host: Interface to listen on
+            port: Port to listen on; 0 picks a free port
+            path: URL path deliveries are posted to
+            workers: Number of handler workers
+            queue_size: Maximum number of events waiting for a worker
+            max_body: Maximum accepted request body size in bytes
+            tolerance: Optional maximum age of a signed delivery in seconds
+            idempotency: Optional IdempotencyStore; events it has already
+                         seen are acknowledged without being dispatched
+
+        Raises:
+            ValueError: If the secret is not a valid webhook secret
+        """
+        self.secret = secret
+        self._key = _secret_key(secret) if secret is not None else None
+        self.host = host
+        self.port = port
+        self.path = path
+        self.workers = workers
+        self.queue_size = queue_size
+        self.max_body = max_body
+        self.tolerance = tolerance
+        self.idempotency = idempotency
+        self._handlers: Dict[str, List[Callable]] = {}
+        self._queue: Optional[asyncio.Queue] = None
+        self._loop: Optional[asyncio.AbstractEventLoop] = None
+        self._server: Optional[asyncio.base_events.Server] = None
+        self._tasks: List[asyncio.Task] = []
+        self._stats = {
+            "received": 0, "accepted": 0, "rejected": 0, "dropped": 0, "duplicates": 0,
+            "handled": 0, "handler_errors": 0
+        }
+
+    def on(self, event_type: Union[EventType, str] = "*") -> Callable:
+        """
+        Decorate a handler for an event type.
+
+        Handlers receive the parsed event dictionary and may be sync or
+        async; sync handlers run in the default thread pool.
+
+        Args:
+            event_type: EventType value such as "message.received", or "*"
+                        for every event
+        """
+        def decorator(handler: Callable) -> Callable:
+            self.add_handler(event_type, handler)
+            return handler
+        return decorator
+
+    def add_handler(self, event_type: Union[EventType, str], handler: Callable) -> None:
+        """
+        Register a handler for an event type.
+
+        Args:
+            event_type: EventType value, or "*" for every event
+            handler: Callable taking the event dictionary
+        """
+        self._handlers.setdefault(event_type, []).append(handler)
+
+    @property
+    def url(self) -> str:
+        """URL deliveries should be posted to."""
+        return f"http://{self.host}:{self.port}{self.path}"
+
+    async def start(self) -> None:
+        """Start listening and start the worker pool."""
+        self._loop = asyncio.get_running_loop()
+        self._queue = asyncio.Queue(maxsize=self.queue_size)
+        self._server = await asyncio.start_server(self._handle_connection, self.host, self.port)
+        self.port = self._server.sockets[0].getsockname()[1]
+        self._tasks = [asyncio.create_task(self._worker()) for _ in range(self.workers)]
+
+    async def stop(self, drain: bool = True) -> None:
+        """
+        Stop listening and shut down the workers.
+
+        Args:
+            drain: Whether to finish queued events before stopping
+        """
+        if self._server is not None:
+            self._server.close()
+            await self._server.wait_closed()
+            self._server = None
+        if drain and self._queue is not None:
+            await self._queue.join()
+        for task in self._tasks:
+            task.cancel()
+        await asyncio.gather(*self._tasks, return_exceptions=True)
+        self._tasks = []
+        self._loop = None
+
+    async def serve_forever(self) -> None:
+        """Start the receiver and run until cancelled."""
+        await self.start()
+        try:
+            await asyncio.Event().wait()
+        finally:
+            await self.stop()
+
+    async def __aenter__(self) -> "WebhookReceiver":
+        await self.start()
+        return self
+
+    async def __aexit__(self, *exc_info) -> None:
+        await self.stop()
+
+    def stats(self) -> Dict[str, Any]:
+        """
+        Return receiver counters.
+
+        Returns:
+            Dictionary with deliveries received, accepted, rejected (bad
+            signature or payload), dropped (queue full) and duplicates
+            (already seen by the idempotency store), events handled,
+            handler errors and current queue depth
+        """
+        return {**self._stats, "queued": self._queue.qsize() if self._queue else 0}
+
+    def accept(self, headers: Mapping[str, str], body: bytes) -> int:
+        """
+        Verify and enqueue a delivery.
+
+        Exposed so the receiver can be mounted behind another HTTP server,
+        and safe to call from that server's threads: the event is handed to
+        the receiver's event loop, and the call blocks until it is queued.
+        With a disk-backed idempotency store it also blocks on SQLite; from
+        the receiver's own event loop use `accept_async()` instead.
+
+        Args:
+            headers: Request headers, with lower-case names
+            body: Raw request body
+
+        Returns:
+            HTTP status code to answer the delivery with
+
+        Raises:
+            RuntimeError: If the receiver is not started
+        """
+        if self._loop is None:
+            raise RuntimeError("Webhook receiver is not started")
+        event, status = self._parse(headers, body)
+        if event is None:
+            return status
+        keys = event_keys(event) if self.idempotency is not None else None
+        if keys and self.idempotency.check_and_add(keys):
+            self._stats["duplicates"] += 1
+            return 204
+        if self._enqueue_threadsafe(event):
+            return 204
+        # Forget refused events, so they are processed when retried
+        if keys:
+            self.idempotency.discard(keys)
+        return 503
+
+    async def accept_async(self, headers: Mapping[str, str], body: bytes) -> int:
+        """
+        Verify and enqueue a delivery without blocking the event loop.
+
+        Same as `accept()`, but idempotency store lookups and writes run in
+        the default thread pool.
+
+        Args:
+            headers: Request headers, with lower-case names
+            body: Raw request body
+
+        Returns:
+            HTTP status code to answer the delivery with
+        """
+        event, status = self._parse(headers, body)
+        if event is None:
+            return status
+        keys = event_keys(event) if self.idempotency is not None else None
+        if not keys:
+            return 204 if self._enqueue(event) else 503
+        if self._queue.full():
+            # Refuse before touching the store, as for a delivery without keys
+            self._stats["dropped"] += 1
+            return 503
+        loop = asyncio.get_running_loop()
+        if await loop.run_in_executor(None, self.idempotency.check_and_add, keys):
+            self._stats["duplicates"] += 1
+            return 204
+        if self._enqueue(event):
+            return 204
+        await loop.run_in_executor(None, self.idempotency.discard, keys)
+        return 503
+
+    def _parse(self, headers: Mapping[str, str], body: bytes) -> Tuple[Optional[Dict[str, Any]], int]:
+        """Verify and parse a delivery, returning (event, 0) or (None, status)."""
+        self._stats["received"] += 1
+        if self._key is not None:
+            try:
+                _verify(self._key, headers, body, self.tolerance)
+            except WebhookVerificationError as e:
+                logger.warning("Rejected webhook delivery: %s", e)
+                self._stats["rejected"] += 1
+                return None, 401
+        try:
+            event = json.loads(body)
+        except ValueError:
+            self._stats["rejected"] += 1
+            return None, 400
+        if not isinstance(event, dict):
+            self._stats["rejected"] += 1
+            return None, 400
+        event.setdefault("_delivery_id", headers.get("svix-id") or headers.get("webhook-id"))
+        if not self.filter(event):
+            return None, 204
+        return event, 0
+
+    def _enqueue_threadsafe(self, event: Dict[str, Any]) -> bool:
+        """Queue an event from any thread, via the receiver's event loop."""
+        try:
+            running = asyncio.get_running_loop()
+        except RuntimeError:
+            running = None
+        if running is self._loop:
+            return self._enqueue(event)
+
+        async def enqueue() -> bool:
+            return self._enqueue(event)
+
+        # asyncio.Queue is not thread-safe; only the loop may touch it
+        return asyncio.run_coroutine_threadsafe(enqueue(), self._loop).result()
+
+    def _enqueue(self, event: Dict[str, Any]) -> bool:
+        """Queue an event for the workers, returning False if the queue is full. Runs on the loop."""
+        try:
+            self._queue.put_nowait(event)
+        except asyncio.QueueFull:
+            self._stats["dropped"] += 1
+            return False
+        self._stats["accepted"] += 1
+        return True
+
+    def filter(self, event: Dict[str, Any]) -> bool:
+        """
+        Decide whether an event should be dispatched.
+
+        Override to drop events before they reach the queue.
+
+        Args:
+            event: Parsed event dictionary
+
+        Returns:
+            True to dispatch the event
+        """
+        return True
+
+    async def _handle_connection(self, reader: asyncio.StreamReader, writer: asyncio.StreamWriter) -> None:
+        """Serve HTTP/1.1 requests on one connection."""
+        try:
+            while True:
+                request_line = await reader.readline()
+                if not request_line:
+                    break
+                method, target, _ = request_line.decode("latin-1").split(" ", 2)
+                headers = {}
+                while True:
+                    line = await reader.readline()
+                    if line in (b"\r\n", b"\n", b""):
+                        break
+                    name, _, value = line.decode("latin-1").partition(":")
+                    headers[name.strip().lower()] = value.strip()
+
+                length = int(headers.get("content-length") or 0)
+                if length > self.max_body:
+                    await self._respond(writer, 413, close=True)
+                    break
+                body = await reader.readexactly(length) if length else b""
+
+                if target.split("?", 1)[0] != self.path:
+                    status = 404
+                elif method != "POST":
+                    status = 405
+                else:
+                    status = await self.accept_async(headers, body)
+                close = headers.get("connection", "").lower() == "close"
+                await self._respond(writer, status, close=close)
+                if close:
+                    break
+        except (asyncio.IncompleteReadError, ConnectionError, ValueError):
+            pass
+        finally:
+            writer.close()
+
+    async def _respond(self, writer: asyncio.StreamWriter, status: int, close: bool = False) -> None:
+        """Write an empty-bodied HTTP response."""
+        lines = [f"HTTP/1.1 {status} {_REASONS.get(status, '')}", "Content-Length: 0"]
+        if status == 503:
+            lines.append("Retry-After: 1")
+        if close:
+            lines.append("Connection: close")
+        writer.write(("\r\n".join(lines) + "\r\n\r\n").encode("latin-1"))
+        await writer.drain()
+
+    async def _worker(self) -> None:
+        """Dispatch queued events to handlers."""
+        loop = asyncio.get_running_loop()
+        while True:
+            event = await self._queue.get()
+            try:
+                event_type = event.get("event_type") or event.get("type")
+                handlers = self._handlers.get(event_type, []) + self._handlers.get("*", [])
+                for handler in handlers:
+                    try:
+                        if inspect.iscoroutinefunction(handler):
+                            await handler(event)
+                        else:
+                            await loop.run_in_executor(None, handler, event)
+                        self._stats["handled"] += 1
+                    except Exception:
+                        self._stats["handler_errors"] += 1
+                        logger.exception("Webhook handler failed for %s event", event_type)
+            finally:
+                self._queue.task_done()
@@ -18,8 +18,13 @@ Reference: https://docs.agentmail.to/api-reference/webhooks/list
 Reference: https://docs.agentmail.to/overview
 """
 
-from typing import List, Dict, Any, Optional, Literal, Union
+from typing import List, Dict, Any, Optional, Literal, Union, Iterator, Iterable
+from .cache import cached, invalidates
 from .client import get_client
+from .pagination import paginate
+from .records import projector
+from .singleflight import coalesced
+from .telemetry import instrumented
 
 # Event type literals matching the API specification
 EventType = Literal[
@@ -32,6 +37,7 @@ EventType = Literal[
 ]
 
 
+@instrumented
 def list_webhooks(
     limit: Optional[int] = None,
     page_token: Optional[str] = None,
@@ -58,6 +64,41 @@ def list_webhooks(
     return client.webhooks.list(limit=limit, page_token=page_token)
 
 
+@instrumented
+def iter_webhooks(
+    page_size: Optional[int] = None,
+    prefetch: bool = False,
+    fields: Optional[Iterable[str]] = None,
+    api_key: str = None
+) -> Iterator[Any]:
+    """
+    Iterate over all webhooks, following pagination automatically.
+    
+    Items are yielded one at a time, so memory use stays constant
+    regardless of how many webhooks exist.
+    
+    Args:
+        page_size: Optional number of webhooks to request per page
+        prefetch: Whether to fetch the next page in the background while
+                  the current page is being consumed
+        fields: Optional webhook fields to keep, e.g. ("webhook_id", "created_at").
+                If provided, compact tuple-backed records holding only these
+                fields are yielded instead of full models.
+        api_key: Optional API key. If not provided, will load from environment.
+    
+    Yields:
+        Webhook objects, or records with the selected fields
+    """
+    client = get_client(api_key)
+    return paginate(
+        client.webhooks.list, "webhooks", page_size=page_size, prefetch=prefetch,
+        transform=projector("webhook", fields)
+    )
+
+
+@instrumented
+@cached("webhook", "webhook_id")
+@coalesced
 def get_webhook(webhook_id: str, api_key: str = None) -> Dict[str, Any]:
     """
     Get a specific webhook by ID.
@@ -82,6 +123,7 @@ def get_webhook(webhook_id: str, api_key: str = None) -> Dict[str, Any]:
     return client.webhooks.get(webhook_id=webhook_id)
 
 
+@instrumented
 def create_webhook(
     url: str,
     event_types: Optional[List[Union[EventType, str]]] = None,
@@ -119,25 +161,12 @@ def create_webhook(
     Reference: https://docs.agentmail.to/overview
     """
     client = get_client(api_key)
-    
-    # Build parameters
-    params = {
-        "url": url
-    }
-    
-    # Only include event_types if provided
-    if event_types is not None:
-        params["event_types"] = event_types
-    
-    if inbox_ids is not None:
-        params["inbox_ids"] = inbox_ids
-    
-    if client_id is not None:
-        params["client_id"] = client_id
-    
+    params = _build_webhook_params(url, event_types, inbox_ids, client_id)
     return client.webhooks.create(**params)
 
 
+@instrumented
+@invalidates("webhook", "webhook_id")
 def delete_webhook(webhook_id: str, api_key: str = None) -> Dict[str, Any]:
     """
     Delete a webhook by ID.
@@ -152,3 +181,26 @@ def delete_webhook(webhook_id: str, api_key: str = None) -> Dict[str, Any]:
     client = get_client(api_key)
     return client.webhooks.delete(webhook_id=webhook_id)
 
+
+def _build_webhook_params(
+    url: str,
+    event_types: Optional[List[Union[EventType, str]]],
+    inbox_ids: Optional[List[str]],
+    client_id: Optional[str]
+) -> Dict[str, Any]:
+    """Build the parameters for creating a webhook."""
+    params = {
+        "url": url
+    }
+    
+    # Only include event_types if provided
+    if event_types is not None:
+        params["event_types"] = event_types
+    
+    if inbox_ids is not None:
+        params["inbox_ids"] = inbox_ids
+    
+    if client_id is not None:
+        params["client_id"] = client_id
+    
+    return params
@@ -0,0 +1,21 @@
+"""Shared fixtures: every test talks to an in-memory fake AgentMail backend."""
+
+import pytest
+
+from src.agentmail.cache import disable_cache
+from src.agentmail.fake_server import FakeAgentMail
+from src.agentmail.ratelimit import get_rate_limiter, set_rate_limiter
+
+
+@pytest.fixture
+def fake():
+    """Install a fresh fake backend with client-side rate limiting off."""
+    limiter = get_rate_limiter()
+    set_rate_limiter(None)
+    backend = FakeAgentMail().install()
+    try:
+        yield backend
+    finally:
+        backend.uninstall()
+        disable_cache()
+        set_rate_limiter(limiter)
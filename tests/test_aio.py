@@ -0,0 +1,65 @@
+"""Tests for the asyncio wrapper API."""
+
+import asyncio
+
+import httpx
+
+from src.agentmail.aio.client import get_async_client
+from src.agentmail.aio.inboxes import create_inbox, get_inbox, list_inboxes
+from src.agentmail.aio.messages import send_message
+from src.agentmail.aio.threads import get_thread, iter_threads
+
+
+def test_wrappers_round_trip(fake):
+    inbox_id = fake.seed(inboxes=1, threads_per_inbox=0)[0]
+
+    async def main():
+        created = await create_inbox()
+        sent = await send_message(inbox_id, created.email, "Hello", text="Hi")
+        thread = await get_thread(sent.thread_id)
+        return created, thread, await list_inboxes()
+
+    created, thread, inboxes = asyncio.run(main())
+
+    assert thread.subject == "Hello"
+    assert {inbox.inbox_id for inbox in inboxes.inboxes} == {inbox_id, created.inbox_id}
+
+
+def test_iter_threads_follows_pages(fake):
+    fake.seed(inboxes=1, threads_per_inbox=25)
+
+    async def main():
+        return [thread.thread_id async for thread in iter_threads(page_size=10, prefetch=True)]
+
+    thread_ids = asyncio.run(main())
+
+    assert sorted(thread_ids) == sorted(fake.threads)
+
+
+def test_concurrent_calls_share_one_client(fake):
+    inbox_id = fake.seed(inboxes=1, threads_per_inbox=0)[0]
+
+    async def main():
+        inboxes = await asyncio.gather(*(get_inbox(inbox_id) for _ in range(20)))
+        return inboxes, get_async_client(), get_async_client()
+
+    inboxes, first, second = asyncio.run(main())
+
+    assert {inbox.inbox_id for inbox in inboxes} == {inbox_id}
+    assert first is second
+
+
+def test_clients_are_closed_with_their_loop(fake, monkeypatch):
+    fake.seed(inboxes=1, threads_per_inbox=0)
+    closed = []
+    aclose = httpx.AsyncClient.aclose
+
+    async def record_aclose(self):
+        closed.append(self)
+        await aclose(self)
+
+    monkeypatch.setattr(httpx.AsyncClient, "aclose", record_aclose)
+
+    asyncio.run(list_inboxes())
+
+    assert len(closed) == 1 and closed[0].is_closed
@@ -0,0 +1,80 @@
+"""Tests for the content-addressed attachment store."""
+
+import pytest
+
+from src.agentmail.attachment_store import AttachmentStore
+from src.agentmail.threads import iter_threads
+
+
+@pytest.fixture
+def store(tmp_path):
+    with AttachmentStore(str(tmp_path / "store")) as store:
+        yield store
+
+
+def _attachments():
+    return [(t.thread_id, t.attachments[0].attachment_id) for t in iter_threads()]
+
+
+def test_second_read_is_served_from_disk(fake, store):
+    fake.seed(inboxes=1, threads_per_inbox=1, attachment_size=5000)
+    [(thread_id, attachment_id)] = _attachments()
+
+    first = store.get_attachment(thread_id, attachment_id)
+    second = store.get_attachment(thread_id, attachment_id)
+
+    assert first == second == fake.files[attachment_id]
+    assert fake.stats()["endpoints"]["files.get"] == 1
+    assert (store.stats()["hits"], store.stats()["misses"]) == (1, 1)
+
+
+def test_identical_content_is_stored_once(fake, store):
+    # Seeded attachments of one size have identical content
+    fake.seed(inboxes=1, threads_per_inbox=3, attachment_size=5000)
+
+    paths = {store.path(thread_id, attachment_id) for thread_id, attachment_id in _attachments()}
+
+    stats = store.stats()
+    assert len(paths) == 1
+    assert (stats["objects"], stats["refs"], stats["dedup_hits"], stats["bytes"]) == (1, 3, 2, 5000)
+
+
+def test_least_recently_used_content_is_evicted(fake, tmp_path):
+    for size in (3000, 4000, 5000):
+        fake.seed(inboxes=1, threads_per_inbox=1, attachment_size=size)
+    items = sorted(_attachments(), key=lambda item: len(fake.files[item[1]]))
+
+    with AttachmentStore(str(tmp_path / "store"), max_bytes=9000) as store:
+        store.path(*items[0])
+        store.path(*items[1])
+        store.path(*items[0])
+        store.path(*items[2])
+
+        stats = store.stats()
+        assert (stats["evictions"], stats["bytes"]) == (1, 8000)
+        store.path(*items[0])
+        assert store.stats()["hits"] == 2
+
+
+def test_open_content_survives_eviction(fake, tmp_path):
+    for size in (3000, 4000):
+        fake.seed(inboxes=1, threads_per_inbox=1, attachment_size=size)
+    items = sorted(_attachments(), key=lambda item: len(fake.files[item[1]]))
+
+    with AttachmentStore(str(tmp_path / "store"), max_bytes=5000) as store:
+        mapped = store.open_mmap(*items[0])
+        store.path(*items[1])
+        try:
+            assert store.stats()["evictions"] == 1
+            assert mapped[:] == fake.files[items[0][1]]
+        finally:
+            mapped.close()
+
+
+def test_thread_attachments(fake, store):
+    fake.seed(inboxes=1, threads_per_inbox=1, attachment_size=2000)
+    [thread_id] = fake.threads
+
+    [(attachment, path)] = list(store.thread_attachments(thread_id))
+
+    assert open(path, "rb").read() == fake.files[attachment["attachment_id"]]
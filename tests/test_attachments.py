@@ -0,0 +1,118 @@
+"""Tests for streaming attachment downloads."""
+
+import io
+import os
+
+import pytest
+
+from src.agentmail.attachments import DownloadError, _partial_path, download_attachment, download_attachments
+from src.agentmail.threads import iter_threads
+
+
+def _attachments(filename=None):
+    return [(t.thread_id, t.attachments[0].attachment_id, filename) for t in iter_threads()]
+
+
+def test_download_to_path(fake, tmp_path):
+    fake.seed(inboxes=1, threads_per_inbox=1, attachment_size=300_000)
+    [(thread_id, attachment_id, _)] = _attachments()
+    path = str(tmp_path / "a.bin")
+
+    result = download_attachment(thread_id, attachment_id, path, chunk_size=4096)
+
+    assert result.ok and not result.resumed and result.size == 300_000
+    assert open(path, "rb").read() == fake.files[attachment_id]
+    assert os.listdir(tmp_path) == ["a.bin"]
+
+
+def test_download_to_file_object(fake):
+    fake.seed(inboxes=1, threads_per_inbox=1, attachment_size=10_000)
+    [(thread_id, attachment_id, _)] = _attachments()
+    buffer = io.BytesIO()
+
+    download_attachment(thread_id, attachment_id, buffer)
+
+    assert buffer.getvalue() == fake.files[attachment_id]
+
+
+def test_partial_download_is_resumed(fake, tmp_path):
+    fake.seed(inboxes=1, threads_per_inbox=1, attachment_size=100_000)
+    [(thread_id, attachment_id, _)] = _attachments()
+    path = str(tmp_path / "a.bin")
+    content = fake.files[attachment_id]
+    with open(_partial_path(path, thread_id, attachment_id), "wb") as f:
+        f.write(content[:40_000])
+
+    result = download_attachment(thread_id, attachment_id, path)
+
+    assert result.resumed
+    assert open(path, "rb").read() == content
+
+
+def test_oversized_partial_is_restarted(fake, tmp_path):
+    fake.seed(inboxes=1, threads_per_inbox=1, attachment_size=1000)
+    [(thread_id, attachment_id, _)] = _attachments()
+    path = str(tmp_path / "a.bin")
+    with open(_partial_path(path, thread_id, attachment_id), "wb") as f:
+        f.write(b"x" * 5000)
+
+    result = download_attachment(thread_id, attachment_id, path)
+
+    assert not result.resumed
+    assert open(path, "rb").read() == fake.files[attachment_id]
+
+
+def test_failed_download_raises(fake, tmp_path):
+    fake.seed(inboxes=1, threads_per_inbox=1, attachment_size=1000)
+    [(thread_id, attachment_id, _)] = _attachments()
+    fake.fail_next(1, status=404, endpoint="files.get")
+
+    with pytest.raises(DownloadError):
+        download_attachment(thread_id, attachment_id, str(tmp_path / "a.bin"))
+    assert not (tmp_path / "a.bin").exists()
+
+
+def test_shared_filenames_get_unique_paths(fake, tmp_path):
+    fake.seed(inboxes=1, threads_per_inbox=3, attachment_size=200_000)
+    items = _attachments("report.pdf")
+    # A leftover partial under the shared name must not be resumed into any of them
+    (tmp_path / "report.pdf.part").write_bytes(b"x" * 1000)
+
+    results = download_attachments(items, tmp_path)
+
+    assert all(result.ok for result in results)
+    assert sorted(os.path.basename(result.path) for result in results) == sorted(
+        f"report-{attachment_id}.pdf" for _, attachment_id, _ in items
+    )
+    for (_, attachment_id, _), result in zip(items, results):
+        assert not result.resumed
+        with open(result.path, "rb") as f:
+            assert f.read() == fake.files[attachment_id]
+
+
+def test_distinct_filenames_are_kept(fake, tmp_path):
+    fake.seed(inboxes=1, threads_per_inbox=2, attachment_size=1000)
+    items = [item[:2] + (f"file{i}.bin",) for i, item in enumerate(_attachments())]
+
+    results = download_attachments(items, tmp_path)
+
+    assert [os.path.basename(result.path) for result in results] == ["file0.bin", "file1.bin"]
+
+
+def test_batch_failures_are_reported_per_item(fake, tmp_path):
+    fake.seed(inboxes=1, threads_per_inbox=2, attachment_size=1000)
+    items = _attachments()
+    items[1] = (items[1][0], "att_missing", None)
+
+    results = download_attachments(items, tmp_path)
+
+    assert [result.ok for result in results] == [True, False]
+
+
+def test_duplicate_attachment_is_rejected(fake, tmp_path):
+    fake.seed(inboxes=1, threads_per_inbox=2, attachment_size=1000)
+    items = _attachments("report.pdf")
+
+    with pytest.raises(ValueError, match="listed more than once"):
+        download_attachments(items + items[:1], tmp_path)
+    assert os.listdir(tmp_path) == []
@@ -0,0 +1,82 @@
+"""Tests for the concurrent bulk send engine."""
+
+import itertools
+import threading
+
+import pytest
+
+from src.agentmail.bulk import LATENCY_SAMPLES, BulkStats, send_bulk
+
+
+def _specs(inbox_id, count):
+    return (
+        {"inbox_id": inbox_id, "to": ["x@example.com"], "subject": f"s{i:03}", "text": "t"}
+        for i in range(count)
+    )
+
+
+def test_sends_every_spec(fake):
+    inbox_id = fake.seed(inboxes=1, threads_per_inbox=0)[0]
+
+    report = send_bulk(_specs(inbox_id, 50), concurrency=8)
+
+    assert (report.stats.sent, report.stats.failed) == (50, 0)
+    assert [result.index for result in report.results] == list(range(50))
+    assert len(fake.messages) == 50
+
+
+def test_failures_are_reported_per_message(fake):
+    inbox_id = fake.seed(inboxes=1, threads_per_inbox=0)[0]
+    fake.fail_next(2, status=400, endpoint="messages.send")
+
+    report = send_bulk(_specs(inbox_id, 10), concurrency=1)
+
+    assert (report.stats.sent, report.stats.failed) == (8, 2)
+    assert [result.ok for result in report.results[:3]] == [False, False, True]
+    assert sum(report.stats.errors.values()) == 2
+
+
+def test_consumes_specs_lazily(fake):
+    inbox_id = fake.seed(inboxes=1, threads_per_inbox=0)[0]
+    consumed = itertools.count()
+    max_ahead = []
+    lock = threading.Lock()
+    sent = [0]
+
+    def specs():
+        for spec in _specs(inbox_id, 40):
+            with lock:
+                max_ahead.append(next(consumed) - sent[0])
+            yield spec
+
+    def on_result(result):
+        with lock:
+            sent[0] += 1
+
+    send_bulk(specs(), concurrency=2, keep_results=False, on_result=on_result)
+
+    assert max(max_ahead) <= 2 * 2
+
+
+def test_before_send_skips(fake):
+    inbox_id = fake.seed(inboxes=1, threads_per_inbox=0)[0]
+
+    report = send_bulk(_specs(inbox_id, 10), before_send=lambda index, spec: index % 2 == 0)
+
+    assert (report.stats.sent, report.stats.skipped) == (5, 5)
+    assert len(fake.messages) == 5
+
+
+def test_rejects_bad_concurrency(fake):
+    with pytest.raises(ValueError):
+        send_bulk([], concurrency=0)
+
+
+def test_latency_sample_is_bounded():
+    stats = BulkStats()
+    for n in range(3 * LATENCY_SAMPLES):
+        stats.add_latency(float(n))
+
+    assert len(stats.latencies) == LATENCY_SAMPLES
+    # A uniform sample of 0..3N has its median near 1.5N
+    assert LATENCY_SAMPLES < stats.p50 < 2 * LATENCY_SAMPLES
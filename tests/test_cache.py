@@ -0,0 +1,116 @@
+"""Tests for the read-through cache."""
+
+import threading
+import time
+
+import pytest
+
+from src.agentmail.cache import cache_stats, enable_cache
+from src.agentmail.inboxes import delete_inbox, get_inbox, update_inbox
+from src.agentmail.messages import reply_message
+from src.agentmail.threads import get_thread
+
+
+def _slow_read(fake, read, seconds=0.3):
+    """Start a read whose response, computed now, arrives after a delay."""
+    delays = [seconds]
+    fake.latency["*"] = lambda: delays.pop() if delays else 0.0
+    results = []
+    reader = threading.Thread(target=lambda: results.append(read()))
+    reader.start()
+    deadline = time.monotonic() + 5
+    while delays and time.monotonic() < deadline:
+        time.sleep(0.005)
+    # Let the fake answer with the current state before the caller writes
+    time.sleep(0.05)
+    return reader, results
+
+
+def test_repeated_reads_hit(fake):
+    inbox_id = fake.seed(inboxes=1, threads_per_inbox=0)[0]
+    enable_cache()
+
+    for _ in range(3):
+        get_inbox(inbox_id)
+
+    assert fake.stats()["endpoints"]["inboxes.get"] == 1
+    assert (cache_stats()["hits"], cache_stats()["misses"]) == (2, 1)
+
+
+def test_entries_expire(fake):
+    inbox_id = fake.seed(inboxes=1, threads_per_inbox=0)[0]
+    enable_cache(ttls={"inbox": 0.05})
+
+    get_inbox(inbox_id)
+    time.sleep(0.1)
+    get_inbox(inbox_id)
+
+    assert fake.stats()["endpoints"]["inboxes.get"] == 2
+
+
+def test_least_recently_used_is_evicted(fake):
+    inbox_ids = fake.seed(inboxes=3, threads_per_inbox=0)
+    enable_cache(maxsize=2)
+
+    for inbox_id in inbox_ids:
+        get_inbox(inbox_id)
+
+    assert cache_stats()["size"] == 2 and cache_stats()["evictions"] == 1
+
+
+def test_read_after_write_sees_the_write(fake):
+    inbox_id = fake.seed(inboxes=1, threads_per_inbox=0)[0]
+    enable_cache()
+    assert get_inbox(inbox_id).display_name != "Renamed"
+
+    update_inbox(inbox_id, display_name="Renamed")
+
+    assert get_inbox(inbox_id).display_name == "Renamed"
+
+
+def test_read_in_flight_during_write_is_not_cached(fake):
+    inbox_id = fake.seed(inboxes=1, threads_per_inbox=0)[0]
+    enable_cache()
+    reader, results = _slow_read(fake, lambda: get_inbox(inbox_id))
+
+    update_inbox(inbox_id, display_name="Renamed")
+    reader.join()
+
+    assert results[0].display_name != "Renamed"
+    assert cache_stats()["size"] == 0
+    assert get_inbox(inbox_id).display_name == "Renamed"
+
+
+def test_deleting_inbox_drops_its_threads(fake):
+    inbox_id = fake.seed(inboxes=1, threads_per_inbox=2)[0]
+    enable_cache()
+    for thread_id in list(fake.threads):
+        get_thread(thread_id)
+
+    delete_inbox(inbox_id)
+
+    assert cache_stats()["size"] == 0
+
+
+def test_reply_drops_cached_thread(fake):
+    fake.seed(inboxes=1, threads_per_inbox=1)
+    enable_cache()
+    [thread_id] = fake.threads
+    thread = get_thread(thread_id)
+
+    reply_message(thread.inbox_id, thread.messages[0].message_id, text="Thanks")
+
+    assert get_thread(thread_id).message_count == 2
+
+
+def test_failed_reply_drops_cached_thread(fake):
+    fake.seed(inboxes=1, threads_per_inbox=1)
+    enable_cache()
+    [thread_id] = fake.threads
+    thread = get_thread(thread_id)
+    fake.fail_next(1, status=400, endpoint="messages.reply")
+
+    with pytest.raises(Exception):
+        reply_message(thread.inbox_id, thread.messages[0].message_id, text="Thanks")
+
+    assert cache_stats()["size"] == 0
@@ -0,0 +1,112 @@
+"""Tests for HTTP record/replay."""
+
+import asyncio
+import json
+
+import httpx
+import pytest
+
+from src.agentmail.aio import inboxes as aio_inboxes
+from src.agentmail.cassette import Cassette, CassetteMissError, ReplayTransport, jitter
+from src.agentmail.client import use_cassette
+from src.agentmail.inboxes import get_inbox, list_inboxes
+
+
+@pytest.fixture
+def served(fake, monkeypatch):
+    """Serve the fake over HTTP, since cassettes wrap the network transport."""
+    server = fake.serve()
+    fake.uninstall()
+    monkeypatch.setenv("AGENTMAIL_BASE_URL", server.url)
+    monkeypatch.setenv("AGENTMAIL_API_KEY", "test")
+    try:
+        yield fake
+    finally:
+        use_cassette(None)
+        server.shutdown()
+        server.server_close()
+
+
+def _record(fake, path):
+    inbox_id = fake.seed(inboxes=2, threads_per_inbox=0)[0]
+    use_cassette(path, mode="record")
+    recorded = (get_inbox(inbox_id), list_inboxes())
+    use_cassette(path, mode="replay")
+    return inbox_id, recorded
+
+
+def _write(path, *entries):
+    with open(path, "w") as f:
+        for entry in entries:
+            f.write(json.dumps({"body": "", "headers": {}, "elapsed": 0.25, **entry}) + "\n")
+
+
+def test_replay_serves_recorded_responses_offline(served, tmp_path):
+    inbox_id, (inbox, inboxes) = _record(served, str(tmp_path / "cassette.jsonl.gz"))
+    requests = served.stats()["requests"]
+
+    assert get_inbox(inbox_id) == inbox
+    assert list_inboxes() == inboxes
+    assert asyncio.run(aio_inboxes.get_inbox(inbox_id)) == inbox
+    assert served.stats()["requests"] == requests
+
+
+def test_unrecorded_request_misses(served, tmp_path):
+    _record(served, str(tmp_path / "cassette.jsonl"))
+
+    with pytest.raises(CassetteMissError):
+        get_inbox("unrecorded@example.com")
+
+
+def test_api_keys_are_not_recorded(served, tmp_path):
+    path = tmp_path / "cassette.jsonl"
+    use_cassette(str(path), mode="record")
+
+    list_inboxes(api_key="secret-key-123")
+
+    assert "secret-key-123" not in path.read_text()
+
+
+def test_identical_requests_replay_in_order_then_repeat(tmp_path):
+    path = str(tmp_path / "cassette.jsonl")
+    _write(
+        path,
+        {"method": "GET", "path": "/v0/x", "status": 200, "text": "first"},
+        {"method": "GET", "path": "/v0/x", "status": 200, "text": "second"}
+    )
+    client = httpx.Client(transport=ReplayTransport(Cassette(path)))
+
+    bodies = [client.get("http://api.test/v0/x").text for _ in range(3)]
+
+    assert bodies == ["first", "second", "second"]
+
+
+def test_unmatched_body_falls_back_to_method_and_path(tmp_path):
+    path = str(tmp_path / "cassette.jsonl")
+    _write(path, {"method": "POST", "path": "/v0/x?a=1", "status": 201, "text": "created"})
+    cassette = Cassette(path)
+    client = httpx.Client(transport=ReplayTransport(cassette))
+
+    response = client.post("http://api.test/v0/x?a=2", json={"other": True})
+
+    assert (response.status_code, response.text) == (201, "created")
+    assert cassette.stats()["fallbacks"] == 1
+
+
+def test_replay_latency(tmp_path):
+    path = str(tmp_path / "cassette.jsonl")
+    _write(path, {"method": "GET", "path": "/v0/x", "status": 200, "text": ""})
+    entry = {"elapsed": 0.25}
+
+    assert Cassette(path).delay(entry) == 0.0
+    assert Cassette(path, latency="recorded").delay(entry) == 0.25
+    assert Cassette(path, latency=0.1).delay(entry) == 0.1
+    cassette = Cassette(path, latency=jitter(1.0, spread=0.5, seed=1))
+    assert all(0.5 <= cassette.delay(entry) <= 1.5 for _ in range(100))
+
+
+def test_unknown_mode_and_missing_file_raise(tmp_path):
+    with pytest.raises(ValueError):
+        Cassette(str(tmp_path / "c.jsonl"), mode="rewind")
+    with pytest.raises(FileNotFoundError):
+        Cassette(str(tmp_path / "missing.jsonl"))
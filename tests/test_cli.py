@@ -0,0 +1,99 @@
+"""Tests for the batch command line."""
+
+import io
+import json
+
+import pytest
+
+from src.agentmail.cli import main, run_batch
+
+
+def _run(lines, **kwargs):
+    output = io.StringIO()
+    lines = (json.dumps(line) if isinstance(line, dict) else line for line in lines)
+    counts = run_batch(lines, output, **kwargs)
+    return counts, [json.loads(line) for line in output.getvalue().splitlines()]
+
+
+def test_operations_write_one_result_each(fake):
+    inbox_id = fake.seed(inboxes=1, threads_per_inbox=0)[0]
+
+    counts, results = _run([
+        {"id": "a", "op": "inboxes.get_inbox", "args": {"inbox_id": inbox_id}},
+        "",
+        {"op": "send_message", "args": {"inbox_id": inbox_id, "to": "x@example.com", "subject": "Hi", "text": "t"}}
+    ])
+
+    assert counts == {"ok": 2, "failed": 0}
+    by_id = {result["id"]: result for result in results}
+    assert by_id["a"]["result"]["inbox_id"] == inbox_id
+    # The id defaults to the input line number
+    assert by_id[3]["op"] == "messages.send_message"
+    assert by_id[3]["result"]["thread_id"] in fake.threads
+
+
+def test_iterators_write_one_line_per_item(fake):
+    fake.seed(inboxes=1, threads_per_inbox=5)
+
+    _, results = _run([{"op": "iter_threads", "args": {"page_size": 2}}])
+
+    assert [result.get("item") for result in results] == [0, 1, 2, 3, 4, None]
+    assert results[-1]["count"] == 5
+
+
+def test_failures_are_reported_per_line(fake):
+    fake.seed(inboxes=1, threads_per_inbox=0)
+
+    counts, results = _run([
+        "not json",
+        {"op": "no_such_op"},
+        {"op": "get_inbox", "args": {"inbox_id": "missing@example.com"}}
+    ])
+
+    assert counts == {"ok": 0, "failed": 3}
+    by_id = {result["id"]: result for result in results}
+    assert by_id[1]["error"]["type"] == "JSONDecodeError"
+    assert by_id[2]["error"]["message"] == "Unknown operation: no_such_op"
+    assert by_id[3]["error"]["status"] == 404
+
+
+def test_fail_fast_stops_reading_input(fake):
+    fake.seed(inboxes=1, threads_per_inbox=0)
+    read = []
+
+    def lines():
+        for n in range(100):
+            read.append(n)
+            yield json.dumps({"op": "no_such_op"})
+
+    counts, _ = _run(lines(), concurrency=1, fail_fast=True)
+
+    assert counts["failed"] < 100
+    assert len(read) < 100
+
+
+def test_bad_concurrency_raises():
+    with pytest.raises(ValueError):
+        run_batch([], io.StringIO(), concurrency=0)
+
+
+def test_main_reads_stdin_and_sets_exit_status(fake, monkeypatch, capsys):
+    inbox_id = fake.seed(inboxes=1, threads_per_inbox=0)[0]
+    line = json.dumps({"op": "get_inbox", "args": {"inbox_id": inbox_id}})
+    monkeypatch.setattr("sys.stdin", io.StringIO(line + "\n"))
+
+    assert main([]) == 0
+    out, err = capsys.readouterr()
+    assert json.loads(out)["ok"] is True
+    assert err.strip() == "1 succeeded, 0 failed"
+
+    monkeypatch.setattr("sys.stdin", io.StringIO('{"op": "no_such_op"}\n'))
+    assert main([]) == 1
+
+
+def test_list_prints_qualified_operations(capsys):
+    assert main(["--list"]) == 0
+
+    listed = capsys.readouterr().out.splitlines()
+    assert any(line.startswith("inboxes.get_inbox(") for line in listed)
+    assert not any(line.startswith("get_inbox(") for line in listed)
@@ -0,0 +1,106 @@
+"""Tests for the local daemon."""
+
+import os
+import socket
+import threading
+import time
+from concurrent.futures import ThreadPoolExecutor
+
+import pytest
+
+from src.agentmail.daemon import AgentMailDaemon, DaemonClient, DaemonError
+from src.agentmail.inboxes import create_inbox
+
+
+@pytest.fixture
+def socket_path(tmp_path):
+    return str(tmp_path / "daemon.sock")
+
+
+def test_calls_round_trip(fake, socket_path):
+    inbox_id = fake.seed(inboxes=1, threads_per_inbox=3)[0]
+
+    with AgentMailDaemon(socket_path), DaemonClient(socket_path) as client:
+        assert client.ping()
+        assert client.call("get_inbox", inbox_id=inbox_id)["inbox_id"] == inbox_id
+        assert len(client.call("iter_threads", {"page_size": 2})) == 3
+        with pytest.raises(DaemonError) as error:
+            client.call("get_inbox", inbox_id="missing@example.com")
+        assert error.value.status == 404
+        stats = client.call("daemon.stats")
+
+    assert (stats["requests"], stats["failed"]) == (4, 1)
+
+
+def test_resolve_inbox_by_name(fake, socket_path):
+    daemon = AgentMailDaemon(socket_path)
+    inbox = create_inbox(request={"username": "support", "display_name": "Help Desk"})
+
+    assert daemon.resolve_inbox("SUPPORT").inbox_id == inbox.inbox_id
+    assert daemon.resolve_inbox("help desk").inbox_id == inbox.inbox_id
+    with pytest.raises(LookupError):
+        daemon.resolve_inbox("nobody")
+    # A name that matched nothing does not refresh the directory again
+    with pytest.raises(LookupError):
+        daemon.resolve_inbox("nobody")
+    assert fake.stats()["endpoints"]["inboxes.list"] == 2
+
+
+def test_concurrent_misses_share_one_refresh(fake, socket_path):
+    inbox_id = fake.seed(inboxes=1, threads_per_inbox=0)[0]
+    # Every lookup finds the directory stale
+    daemon = AgentMailDaemon(socket_path, inbox_ttl=0.0)
+    fake.latency["inboxes.list"] = 0.2
+    barrier = threading.Barrier(8)
+
+    def resolve(name):
+        barrier.wait()
+        return daemon.resolve_inbox(name)
+
+    with ThreadPoolExecutor(max_workers=8) as executor:
+        results = list(executor.map(resolve, [inbox_id] * 8))
+
+    assert {result.inbox_id for result in results} == {inbox_id}
+    assert fake.stats()["endpoints"]["inboxes.list"] == 1
+
+
+def test_inbox_writes_refresh_the_directory(fake, socket_path):
+    fake.seed(inboxes=1, threads_per_inbox=0)
+
+    with AgentMailDaemon(socket_path), DaemonClient(socket_path) as client:
+        with pytest.raises(DaemonError):
+            client.call("daemon.resolve_inbox", name="later")
+        client.call("create_inbox", request={"username": "later"})
+        assert client.call("daemon.resolve_inbox", name="later")["email"].startswith("later@")
+
+
+def test_shutdown_request_stops_the_daemon(fake, socket_path):
+    AgentMailDaemon(socket_path).start()
+    with DaemonClient(socket_path) as client:
+        assert client.call("daemon.shutdown") == "shutting down"
+
+    deadline = time.monotonic() + 5
+    while DaemonClient(socket_path).ping() and time.monotonic() < deadline:
+        time.sleep(0.01)
+    assert not os.path.exists(socket_path)
+
+
+def test_stale_socket_is_replaced(fake, socket_path):
+    stale = socket.socket(socket.AF_UNIX, socket.SOCK_STREAM)
+    stale.bind(socket_path)
+    stale.close()
+
+    with AgentMailDaemon(socket_path), DaemonClient(socket_path) as client:
+        assert client.ping()
+
+
+def test_live_daemon_and_regular_files_are_not_replaced(fake, socket_path, tmp_path):
+    with AgentMailDaemon(socket_path):
+        with pytest.raises(RuntimeError, match="already serving"):
+            AgentMailDaemon(socket_path).start()
+
+    regular = tmp_path / "not-a-socket"
+    regular.write_text("keep me")
+    with pytest.raises(RuntimeError, match="not a socket"):
+        AgentMailDaemon(str(regular)).start()
+    assert regular.read_text() == "keep me"
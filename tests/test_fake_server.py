@@ -0,0 +1,131 @@
+"""Tests for the in-process fake AgentMail server."""
+
+import json
+import time
+from concurrent.futures import ThreadPoolExecutor
+
+import httpx
+import pytest
+
+from src.agentmail.fake_server import FakeAgentMail
+from src.agentmail.inboxes import create_inbox, list_inboxes
+from src.agentmail.messages import send_message
+from src.agentmail.threads import get_thread
+
+
+def _get(fake, path, **query):
+    status, _, body, _ = fake.handle("GET", path, {k: [v] for k, v in query.items()}, b"")
+    return status, json.loads(body) if body else None
+
+
+@pytest.mark.parametrize("path, query", [
+    ("/v0/inboxes", {"limit": "abc"}),
+    ("/v0/inboxes", {"limit": "0"}),
+    ("/v0/inboxes", {"page_token": "next"}),
+    ("/v0/metrics/events", {"start": "yesterday"}),
+    ("/v0/metrics/events", {"period": "1h"}),
+])
+def test_bad_query_values_answer_400(path, query):
+    fake = FakeAgentMail()
+    fake.seed(inboxes=1, threads_per_inbox=0)
+
+    status, body = _get(fake, path, **query)
+
+    assert status == 400 and body["name"] == "ValidationError"
+
+
+def test_invalid_json_body_answers_400():
+    fake = FakeAgentMail()
+
+    status, _, body, _ = fake.handle("POST", "/v0/inboxes", {}, b"{not json")
+
+    assert status == 400 and json.loads(body)["name"] == "ValidationError"
+
+
+def test_list_pages_follow_page_tokens():
+    fake = FakeAgentMail(page_size=4)
+    fake.seed(inboxes=10, threads_per_inbox=0)
+
+    seen, token = [], None
+    while True:
+        query = {"page_token": token} if token else {}
+        _, page = _get(fake, "/v0/inboxes", **query)
+        seen += [inbox["inbox_id"] for inbox in page["inboxes"]]
+        token = page.get("next_page_token")
+        if not token:
+            break
+
+    assert sorted(seen) == sorted(fake.inboxes)
+
+
+def test_thread_messages_are_paged(fake):
+    fake.page_size = 2
+    fake.seed(inboxes=1, threads_per_inbox=1, messages_per_thread=5)
+    [thread_id] = fake.threads
+
+    thread = get_thread(thread_id)
+
+    assert len(thread.messages) == 2 and thread.next_page_token
+
+
+def test_concurrent_deletes_succeed_once():
+    fake = FakeAgentMail()
+    [inbox_id] = fake.seed(inboxes=1, threads_per_inbox=3)
+
+    with ThreadPoolExecutor(max_workers=8) as executor:
+        statuses = list(executor.map(
+            lambda _: fake.handle("DELETE", f"/v0/inboxes/{inbox_id}", {}, b"")[0], range(8)
+        ))
+
+    assert sorted(statuses) == [204] + [404] * 7
+    assert not fake.threads
+
+
+def test_injected_failures_and_latency(fake):
+    fake.seed(inboxes=1, threads_per_inbox=0)
+    fake.fail_next(1, status=400, endpoint="inboxes.list")
+    fake.latency["inboxes.list"] = 0.1
+
+    with pytest.raises(Exception):
+        list_inboxes()
+    started = time.monotonic()
+    list_inboxes()
+
+    assert time.monotonic() - started >= 0.1
+    assert fake.stats()["injected_errors"] == 1
+
+
+def test_send_quota_answers_429_with_retry_after():
+    fake = FakeAgentMail(send_quota=2, quota_window=60)
+    [inbox_id] = fake.seed(inboxes=1, threads_per_inbox=0)
+    body = json.dumps({"to": ["x@example.com"], "subject": "s", "text": "t"}).encode()
+
+    statuses = [fake.handle("POST", f"/v0/inboxes/{inbox_id}/messages/send", {}, body)[:2] for _ in range(3)]
+
+    assert [status for status, _ in statuses] == [200, 200, 429]
+    assert int(statuses[2][1]["retry-after"]) > 0
+
+
+def test_wrappers_round_trip_through_installed_fake(fake):
+    [inbox_id] = fake.seed(inboxes=1, threads_per_inbox=0)
+    created = create_inbox()
+
+    sent = send_message(inbox_id, created.email, "Hello", text="Hi")
+
+    assert get_thread(sent.thread_id).subject == "Hello"
+    # Delivered to the recipient inbox as well as the sender's sent thread
+    assert {thread["inbox_id"] for thread in fake.threads.values()} == {inbox_id, created.inbox_id}
+
+
+def test_serve_over_http():
+    fake = FakeAgentMail()
+    fake.seed(inboxes=2, threads_per_inbox=0)
+    server = fake.serve()
+    try:
+        response = httpx.get(f"{server.url}/v0/inboxes", headers={"authorization": "Bearer x"})
+    finally:
+        server.shutdown()
+        server.server_close()
+
+    assert response.status_code == 200
+    assert len(response.json()["inboxes"]) == 2
@@ -0,0 +1,71 @@
+"""Tests for the webhook idempotency store."""
+
+import threading
+import time
+from concurrent.futures import ThreadPoolExecutor
+
+from src.agentmail.idempotency import IdempotencyStore, event_keys
+
+
+def test_check_and_add_reports_duplicates():
+    store = IdempotencyStore()
+
+    assert store.check_and_add(["event:1"]) is False
+    assert store.check_and_add(["event:1"]) is True
+    assert store.check_and_add(["event:2", "message:x"]) is False
+    # Any shared key makes the event a duplicate
+    assert store.check_and_add(["event:3", "message:x"]) is True
+    assert store.stats()["duplicates"] == 2
+
+
+def test_concurrent_copies_are_accepted_once():
+    store = IdempotencyStore()
+    barrier = threading.Barrier(8)
+
+    def deliver(_):
+        barrier.wait()
+        return store.check_and_add(["event:1"])
+
+    with ThreadPoolExecutor(max_workers=8) as executor:
+        results = list(executor.map(deliver, range(8)))
+
+    assert results.count(False) == 1
+
+
+def test_disk_store_survives_eviction_and_restart(tmp_path):
+    path = str(tmp_path / "events.db")
+    with IdempotencyStore(path, maxsize=2) as store:
+        for n in range(5):
+            store.add([f"event:{n}"])
+        assert store.stats()["size"] == 2
+        assert store.seen(["event:0"])
+        assert store.stats()["disk_hits"] == 1
+
+    with IdempotencyStore(path) as store:
+        assert store.seen(["event:4"])
+        assert not store.seen(["event:5"])
+
+
+def test_expired_keys_are_forgotten_on_disk(tmp_path):
+    with IdempotencyStore(str(tmp_path / "events.db"), maxsize=1, ttl=0.05) as store:
+        store.add(["event:1"])
+        store.add(["event:2"])
+        time.sleep(0.1)
+
+        assert not store.seen(["event:1"])
+
+
+def test_discard_allows_redelivery(tmp_path):
+    with IdempotencyStore(str(tmp_path / "events.db")) as store:
+        store.add(["event:1"])
+        store.discard(["event:1"])
+
+        assert store.check_and_add(["event:1"]) is False
+
+
+def test_event_keys():
+    event = {"event_id": "evt_1", "event_type": "message.received", "message": {"message_id": "m1"}}
+
+    assert event_keys(event) == ["event:evt_1", "message:message.received:m1"]
+    assert event_keys({"_delivery_id": "msg_1"}) == ["event:msg_1"]
+    assert event_keys({}) == []
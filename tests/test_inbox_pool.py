@@ -0,0 +1,88 @@
+"""Tests for the inbox pool."""
+
+import time
+
+import pytest
+
+from src.agentmail.inbox_pool import InboxPool
+
+
+def _lease_all(pool, count):
+    return {inbox.inbox_id: inbox for inbox in (pool.lease(timeout=5) for _ in range(count))}
+
+
+def test_recycling_never_deletes_adopted_inboxes(fake):
+    adopted = fake.seed(inboxes=1, threads_per_inbox=0)[0]
+
+    with InboxPool(size=2, recycle=True) as pool:
+        leased = _lease_all(pool, 2)
+        assert adopted in leased
+        for inbox in leased.values():
+            pool.release(inbox)
+        assert pool.stats()["recycled"] == 1
+
+        # The created inbox was replaced; the adopted one went back into the pool
+        leased = _lease_all(pool, 2)
+        assert adopted in leased
+        for inbox in leased.values():
+            pool.release(inbox, recycle=False)
+
+    assert adopted in fake.inboxes
+    assert len(fake.inboxes) == 2
+
+
+def test_close_deletes_only_created_inboxes(fake):
+    adopted = fake.seed(inboxes=1, threads_per_inbox=0)[0]
+
+    pool = InboxPool(size=3).start()
+    leased = _lease_all(pool, 3)
+    for inbox in leased.values():
+        pool.release(inbox)
+    pool.close(delete_created=True)
+
+    assert list(fake.inboxes) == [adopted]
+
+
+def test_close_deletes_inbox_created_while_closing(fake):
+    fake.latency["inboxes.create"] = 0.3
+
+    pool = InboxPool(size=1, reuse_existing=False).start()
+    deadline = time.monotonic() + 5
+    while not fake.stats()["endpoints"].get("inboxes.create") and time.monotonic() < deadline:
+        time.sleep(0.005)
+    pool.close(delete_created=True)
+
+    assert pool.stats()["created"] == 1
+    assert not fake.inboxes
+
+
+def test_lease_waits_for_provisioning(fake):
+    fake.latency["inboxes.create"] = 0.1
+
+    with InboxPool(size=1, reuse_existing=False) as pool:
+        inbox = pool.lease(timeout=5)
+
+        assert inbox.inbox_id in fake.inboxes
+        assert pool.stats()["waits"] == 1
+        with pytest.raises(TimeoutError):
+            pool.lease(timeout=0.05)
+        pool.release(inbox)
+        assert pool.lease(timeout=0).inbox_id == inbox.inbox_id
+
+
+def test_closed_pool_refuses_leases(fake):
+    fake.seed(inboxes=1, threads_per_inbox=0)
+    pool = InboxPool(size=1)
+    pool.lease(timeout=5)
+    pool.close()
+
+    with pytest.raises(RuntimeError):
+        pool.lease(timeout=1)
+
+
+def test_releasing_foreign_inbox_fails(fake):
+    fake.seed(inboxes=2, threads_per_inbox=0)
+
+    with InboxPool(size=1) as pool:
+        with pytest.raises(ValueError):
+            pool.release({"inbox_id": "not-leased"})
@@ -0,0 +1,93 @@
+"""Tests for the streaming mail merge."""
+
+import json
+
+import pytest
+
+from src.agentmail.mailmerge import InvalidLine, MailMerge, MergeError, Template, mail_merge, read_rows
+
+
+def _sent(fake):
+    return sorted((m["to"][0], m["subject"], m["text"]) for m in fake.messages.values())
+
+
+def test_template_renders_and_escapes():
+    assert Template("Hi {name}, {{literal}}").render({"name": "Ann"}) == "Hi Ann, {literal}"
+    assert Template("<b>{name}</b>", escape=True).render({"name": "<Ann>"}) == "<b>&lt;Ann&gt;</b>"
+    with pytest.raises(MergeError):
+        Template("{name.attr}")
+    with pytest.raises(MergeError):
+        Template("Hi {name}").render({})
+
+
+def test_csv_campaign_is_sent(fake, tmp_path):
+    inbox_id = fake.seed(inboxes=1, threads_per_inbox=0)[0]
+    path = tmp_path / "recipients.csv"
+    path.write_text("email,name\na@example.com,Ann\nb@example.com,Bob\n")
+
+    report, stats = mail_merge(str(path), inbox_id, subject="Hello {name}", text="Hi {name}")
+
+    assert (report.stats.sent, stats.rows, stats.queued) == (2, 2, 2)
+    assert _sent(fake) == [
+        ("a@example.com", "Hello Ann", "Hi Ann"),
+        ("b@example.com", "Hello Bob", "Hi Bob")
+    ]
+
+
+def test_invalid_and_duplicate_rows_are_skipped(fake):
+    inbox_id = fake.seed(inboxes=1, threads_per_inbox=0)[0]
+    rows = [
+        {"email": "a@example.com", "name": "Ann"},
+        {"email": "A@example.com", "name": "Ann again"},
+        {"email": "not-an-address", "name": "X"},
+        {"email": "c@example.com"},
+        ["not", "an", "object"]
+    ]
+
+    report, stats = mail_merge(rows, inbox_id, subject="Hello {name}", text="Hi", batch_size=2)
+
+    assert report.stats.sent == 1
+    assert (stats.rows, stats.queued, stats.invalid, stats.duplicates) == (5, 1, 3, 1)
+    assert any("Row 5" in error for error in stats.errors)
+
+
+def test_malformed_jsonl_line_counts_as_invalid(fake, tmp_path):
+    inbox_id = fake.seed(inboxes=1, threads_per_inbox=0)[0]
+    path = tmp_path / "recipients.jsonl"
+    path.write_text("\n".join([
+        json.dumps({"email": "a@example.com"}),
+        "{not json",
+        "",
+        json.dumps({"email": "b@example.com"})
+    ]) + "\n")
+
+    assert isinstance(list(read_rows(str(path)))[1], InvalidLine)
+
+    report, stats = mail_merge(str(path), inbox_id, subject="Hello", text="Hi")
+
+    assert report.stats.sent == 2
+    assert (stats.rows, stats.queued, stats.invalid) == (3, 2, 1)
+    assert stats.errors[0].startswith("Line 2 ")
+
+
+def test_specs_are_built_lazily():
+    merge = MailMerge("inbox", subject="s", text="t", batch_size=2)
+    consumed = []
+
+    def rows():
+        for n in range(10):
+            consumed.append(n)
+            yield {"email": f"r{n}@example.com"}
+
+    specs = merge.specs(rows())
+    next(specs)
+
+    assert consumed == [0, 1]
+
+
+def test_unsupported_format_raises(tmp_path):
+    path = tmp_path / "rows.txt"
+    path.write_text("")
+
+    with pytest.raises(ValueError):
+        list(read_rows(str(path), format="xml"))
@@ -0,0 +1,93 @@
+"""Tests for the metrics time-series store."""
+
+import time
+
+import pytest
+
+np = pytest.importorskip("numpy")
+
+from src.agentmail.metrics_store import MetricsStore  # noqa: E402
+
+DAY = 86400
+
+
+@pytest.fixture
+def store(fake):
+    inbox_id = fake.seed(inboxes=1, threads_per_inbox=0)[0]
+    now = time.time()
+    # Past the retention, so the bounced series is stored but empty
+    fake.add_events(inbox_id, "message.bounced", [now - 10 * DAY])
+    fake.add_events(inbox_id, "message.delivered", [now - 3600 * hours for hours in range(1, 30)])
+    store = MetricsStore(resolution=3600, retention_days=1)
+    store.refresh()
+    return store
+
+
+def test_percentile_of_empty_series(store):
+    now = time.time()
+    rollup = store.rollup(
+        "percentile", bucket=DAY, by=(), event_types=["message.bounced"],
+        start=now - 3 * DAY, end=now + 2 * DAY
+    )
+
+    assert rollup.groups == ["total"]
+    assert rollup.values.dtype.kind == "f"
+    past = rollup.timestamps.astype("int64") + DAY <= now
+    future = rollup.timestamps.astype("int64") > now
+    assert (rollup.values[0][past] == 0).all()
+    assert future.any() and np.isnan(rollup.values[0][future]).all()
+
+
+def test_percentile_groups_include_empty_series(store):
+    rollup = store.rollup("percentile", bucket=DAY, by="event_type", start=time.time() - 3 * DAY)
+
+    assert rollup.groups == ["message.bounced", "message.delivered"]
+    assert not rollup.values[0].any()
+    assert rollup.values[1].any()
+
+
+def test_percentile_without_series(fake):
+    rollup = MetricsStore().rollup("percentile", bucket=DAY, by=())
+
+    assert rollup.groups == []
+    assert rollup.values.shape == (0, len(rollup.timestamps))
+
+
+def test_sum_and_rate_by_event_type(store):
+    now = time.time()
+    daily = store.rollup("sum", bucket=DAY, by="event_type", start=now - 2 * DAY)
+    rate = store.rollup("rate", bucket=DAY, by="event_type", start=now - 2 * DAY)
+
+    # Only the last day of hourly events is retained
+    assert daily.series("message.delivered").sum() == 23
+    assert rate.series("message.delivered").sum() == pytest.approx(23 / DAY)
+
+
+def test_refresh_only_fetches_new_buckets(fake, store):
+    first = store.stats()
+    store.refresh()
+    second = store.stats()
+
+    assert second["refreshes"] == first["refreshes"] + 1
+    assert second["requests"] - first["requests"] == 1
+    assert second["buckets_fetched"] - first["buckets_fetched"] <= 2
+
+
+def test_saved_series_are_loaded(store, tmp_path):
+    path = str(tmp_path / "metrics.npz")
+    store.save(path)
+
+    loaded = MetricsStore(path, resolution=3600)
+
+    assert loaded.rollup(bucket=DAY).to_dict() == store.rollup(bucket=DAY).to_dict()
+    with pytest.raises(ValueError):
+        MetricsStore(path, resolution=60)
+
+
+def test_invalid_rollups_raise(store):
+    with pytest.raises(ValueError):
+        store.rollup("median")
+    with pytest.raises(ValueError):
+        store.rollup(by="domain")
+    with pytest.raises(ValueError):
+        store.rollup(bucket=5400)
@@ -0,0 +1,83 @@
+"""Tests for the local SQLite mirror."""
+
+import pytest
+
+from src.agentmail.inboxes import delete_inbox
+from src.agentmail.messages import reply_message
+from src.agentmail.mirror import MailMirror
+from src.agentmail.threads import delete_thread
+
+
+@pytest.fixture
+def mirror(tmp_path):
+    with MailMirror(str(tmp_path / "mirror.db")) as mirror:
+        yield mirror
+
+
+def _count(mirror, table):
+    return mirror.query(f"SELECT COUNT(*) FROM {table}")[0][0]
+
+
+def test_first_sync_backfills_every_page(fake, mirror):
+    fake.page_size = 3
+    fake.seed(inboxes=2, threads_per_inbox=4, messages_per_thread=5)
+
+    result = mirror.sync()
+
+    assert (result.inboxes, result.threads_listed, result.threads_fetched) == (2, 8, 8)
+    assert result.messages == 40
+    assert (_count(mirror, "threads"), _count(mirror, "messages")) == (8, 40)
+    thread_id = next(iter(fake.threads))
+    assert len(mirror.get_thread(thread_id)["messages"]) == 5
+
+
+def test_incremental_sync_fetches_only_changed_threads(fake, mirror):
+    fake.seed(inboxes=1, threads_per_inbox=5)
+    mirror.sync()
+    thread = next(iter(fake.threads.values()))
+    message_id = mirror.get_thread(thread["thread_id"])["messages"][0]["message_id"]
+
+    reply_message(thread["inbox_id"], message_id, text="Thanks")
+    result = mirror.sync()
+
+    assert result.threads_fetched == 1
+    assert len(mirror.get_thread(thread["thread_id"])["messages"]) == 2
+
+
+def test_full_sync_prunes_deleted_records(fake, mirror):
+    inbox_ids = fake.seed(inboxes=2, threads_per_inbox=3)
+    mirror.sync()
+    removed = []
+    mirror.add_removal_listener(removed.append)
+    thread = next(t for t in fake.threads.values() if t["inbox_id"] == inbox_ids[0])
+
+    delete_thread(thread["thread_id"], thread["inbox_id"])
+    delete_inbox(inbox_ids[1])
+    assert mirror.sync().threads_removed == 0
+    result = mirror.sync(full=True)
+
+    assert (result.threads_removed, result.inboxes_removed) == (4, 1)
+    assert thread["thread_id"] in removed
+    assert _count(mirror, "threads") == 2 and _count(mirror, "inboxes") == 1
+    assert _count(mirror, "messages") == 2
+
+
+def test_timestamps_are_normalized_to_utc(fake, mirror):
+    fake.seed(inboxes=1, threads_per_inbox=2)
+
+    result = mirror.sync()
+
+    assert result.cursor.endswith("Z")
+    rows = mirror.query("SELECT timestamp, updated_at FROM threads")
+    assert all(value.endswith("Z") and len(value) == len(result.cursor) for row in rows for value in row)
+
+
+def test_local_queries(fake, mirror):
+    inbox_ids = fake.seed(inboxes=2, threads_per_inbox=3)
+    mirror.sync()
+
+    threads = list(mirror.iter_threads(inbox_id=inbox_ids[0]))
+
+    assert len(threads) == 3
+    assert [t["timestamp"] for t in threads] == sorted((t["timestamp"] for t in threads), reverse=True)
+    assert len(list(mirror.iter_threads(limit=2))) == 2
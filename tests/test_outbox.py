@@ -0,0 +1,131 @@
+"""Tests for the durable outbox."""
+
+import json
+import os
+import subprocess
+import sys
+import textwrap
+import threading
+
+import httpx
+
+import src.agentmail.bulk as bulk
+from src.agentmail.outbox import Outbox
+
+ROOT = os.path.dirname(os.path.dirname(os.path.abspath(__file__)))
+
+# Enqueues the specs into a fresh outbox and drains it, killing the process
+# without any cleanup when the given send starts
+CRASHING_DRAIN = textwrap.dedent("""
+    import json, os, sys
+    import src.agentmail.bulk as bulk
+    from src.agentmail.outbox import Outbox
+
+    path, crash_at, specs = sys.argv[1], int(sys.argv[2]), json.loads(sys.argv[3])
+    send_message, calls = bulk.send_message, []
+
+    def send(**kwargs):
+        calls.append(kwargs)
+        if len(calls) == crash_at:
+            os._exit(3)
+        return send_message(**kwargs)
+
+    bulk.send_message = send
+    outbox = Outbox(path)
+    outbox.enqueue_many(specs)
+    outbox.drain(concurrency=1)
+""")
+
+
+def _sent(fake):
+    return sorted(m["subject"] for m in fake.messages.values() if "sent" in m["labels"])
+
+
+def test_drain_resumes_after_crash_without_double_sending(fake, tmp_path):
+    inbox_id = fake.seed(inboxes=1, threads_per_inbox=0)[0]
+    specs = [
+        {"inbox_id": inbox_id, "to": ["x@example.com"], "subject": f"s{i:02}", "text": "t"}
+        for i in range(20)
+    ]
+    path = str(tmp_path / "outbox.db")
+    server = fake.serve()
+    try:
+        env = dict(os.environ, PYTHONPATH=ROOT, AGENTMAIL_BASE_URL=server.url,
+                   AGENTMAIL_API_KEY="test")
+        process = subprocess.run(
+            [sys.executable, "-c", CRASHING_DRAIN, path, "8", json.dumps(specs)],
+            cwd=ROOT, env=env, capture_output=True, timeout=60
+        )
+    finally:
+        server.shutdown()
+        server.server_close()
+    assert process.returncode == 3, process.stderr.decode()
+    assert _sent(fake) == [f"s{i:02}" for i in range(7)]
+
+    with Outbox(path) as outbox:
+        # The send in flight at the crash may or may not have happened
+        assert outbox.counts() == {"pending": 12, "sending": 0, "sent": 7, "failed": 0, "uncertain": 1}
+        [item] = outbox.items("uncertain")
+        assert item["spec"]["subject"] == "s07"
+
+        report = outbox.drain(concurrency=4)
+        assert report.stats.sent == 12
+        assert outbox.counts()["uncertain"] == 1
+        assert _sent(fake) == [f"s{i:02}" for i in range(20) if i != 7]
+
+        outbox.drain(resend_uncertain=True)
+        assert outbox.counts()["sent"] == 20
+        assert _sent(fake) == [f"s{i:02}" for i in range(20)]
+
+
+def _spec(inbox_id, subject):
+    return {"inbox_id": inbox_id, "to": ["x@example.com"], "subject": subject, "text": "t"}
+
+
+def test_rejected_sends_fail_and_unanswered_sends_are_uncertain(fake, tmp_path, monkeypatch):
+    inbox_id = fake.seed(inboxes=1, threads_per_inbox=0)[0]
+    with Outbox(str(tmp_path / "outbox.db")) as outbox:
+        outbox.enqueue(_spec(inbox_id, "rejected"))
+        fake.fail_next(1, status=400, endpoint="messages.send")
+        outbox.drain(concurrency=1)
+        assert outbox.counts()["failed"] == 1
+
+        def reset(**kwargs):
+            raise httpx.ConnectError("Connection reset")
+
+        monkeypatch.setattr(bulk, "send_message", reset)
+        outbox.enqueue(_spec(inbox_id, "unanswered"))
+        outbox.drain(concurrency=1)
+
+        [item] = outbox.items("uncertain")
+        assert item["spec"]["subject"] == "unanswered"
+        assert item["error"].startswith("ConnectError")
+
+
+def test_opening_an_outbox_leaves_live_claims_alone(fake, tmp_path):
+    inbox_id = fake.seed(inboxes=1, threads_per_inbox=0)[0]
+    path = str(tmp_path / "outbox.db")
+    sending, release = threading.Event(), threading.Event()
+
+    def slow_send():
+        sending.set()
+        release.wait(10)
+        return 0.0
+
+    fake.latency["messages.send"] = slow_send
+    with Outbox(path) as outbox:
+        outbox.enqueue(_spec(inbox_id, "s00"))
+        drain = threading.Thread(target=outbox.drain, kwargs={"concurrency": 1})
+        drain.start()
+        try:
+            assert sending.wait(10)
+            with Outbox(path) as other:
+                assert other.counts()["sending"] == 1
+            # A claim held past the lease is reclaimed
+            with Outbox(path, lease_timeout=0.0) as other:
+                assert other.counts()["uncertain"] == 1
+        finally:
+            release.set()
+            drain.join(10)
+        # The drain still records the outcome it saw
+        assert outbox.counts()["sent"] == 1
@@ -0,0 +1,75 @@
+"""Tests for the auto-paginating iterators."""
+
+import asyncio
+
+import pytest
+
+from src.agentmail.pagination import apaginate, paginate
+from src.agentmail.threads import iter_threads
+
+
+def _pages(count, page_size):
+    """Return an in-memory list endpoint over count items and its call log."""
+    calls = []
+
+    def fetch(limit=None, page_token=None, **params):
+        calls.append((limit, page_token, params))
+        start = int(page_token or 0)
+        end = min(count, start + limit)
+        return {"items": list(range(start, end)), "next_page_token": str(end) if end < count else None}
+
+    return fetch, calls
+
+
+@pytest.mark.parametrize("prefetch", [False, True])
+def test_paginate_follows_every_page(prefetch):
+    fetch, calls = _pages(25, 10)
+
+    items = list(paginate(fetch, "items", page_size=10, prefetch=prefetch, transform=str, labels=["a"]))
+
+    assert items == [str(n) for n in range(25)]
+    assert [page_token for _, page_token, _ in calls] == [None, "10", "20"]
+    assert all(params == {"labels": ["a"]} for _, _, params in calls)
+
+
+def test_paginate_is_lazy():
+    fetch, calls = _pages(100, 10)
+
+    items = paginate(fetch, "items", page_size=10)
+    assert [next(items) for _ in range(10)] == list(range(10))
+
+    assert len(calls) == 1
+
+
+def test_closed_prefetching_iterator_stops_fetching():
+    fetch, calls = _pages(30, 10)
+
+    items = paginate(fetch, "items", page_size=10, prefetch=True)
+    next(items)
+    items.close()
+
+    assert len(calls) <= 2
+
+
+@pytest.mark.parametrize("prefetch", [False, True])
+def test_apaginate_follows_every_page(prefetch):
+    fetch, calls = _pages(25, 10)
+
+    async def afetch(**kwargs):
+        return fetch(**kwargs)
+
+    async def main():
+        return [item async for item in apaginate(afetch, "items", page_size=10, prefetch=prefetch)]
+
+    assert asyncio.run(main()) == list(range(25))
+    assert len(calls) == 3
+
+
+def test_iter_threads_against_fake(fake):
+    fake.page_size = 7
+    fake.seed(inboxes=2, threads_per_inbox=12)
+
+    threads = list(iter_threads(prefetch=True))
+
+    assert sorted(thread.thread_id for thread in threads) == sorted(fake.threads)
+    assert fake.stats()["endpoints"]["threads.list"] == 4
@@ -0,0 +1,102 @@
+"""Tests for the shared adaptive rate limiter."""
+
+import asyncio
+import threading
+import time
+
+import httpx
+import pytest
+
+from src.agentmail.inboxes import list_inboxes
+from src.agentmail.ratelimit import RateLimiter, is_limit_error, parse_retry_after, set_rate_limiter
+
+
+def test_throttled_response_backs_off_and_pauses(fake):
+    fake.seed(inboxes=1, threads_per_inbox=0)
+    limiter = RateLimiter(rate=100.0, concurrency=8)
+    set_rate_limiter(limiter)
+    fake.fail_next(1, status=429, endpoint="inboxes.list")
+
+    started = time.monotonic()
+    list_inboxes()
+
+    stats = limiter.stats()
+    assert stats["throttled"] == 1
+    # Halved, then nudged up again by the successful retry
+    assert 50.0 <= stats["rate"] < 51.0 and stats["concurrency"] == 4
+    assert stats["in_flight"] == 0
+    # The retry waited out the Retry-After pause
+    assert time.monotonic() - started >= 1.0
+
+
+def test_successes_increase_rate_up_to_max():
+    limiter = RateLimiter(rate=10.0, burst=100, max_rate=10.5, concurrency=1, max_concurrency=2)
+    for _ in range(50):
+        limiter.acquire()
+        limiter.release(200)
+
+    stats = limiter.stats()
+    assert stats["rate"] == 10.5 and stats["concurrency"] == 2
+    assert stats["requests"] == 50
+
+
+def test_concurrency_limit_blocks_threads():
+    limiter = RateLimiter(concurrency=1, max_concurrency=1)
+    limiter.acquire()
+    acquired = threading.Event()
+
+    def acquire():
+        limiter.acquire()
+        acquired.set()
+
+    waiter = threading.Thread(target=acquire)
+    waiter.start()
+    assert not acquired.wait(0.1)
+    limiter.release(200)
+    assert acquired.wait(5)
+    waiter.join()
+
+
+def test_release_from_thread_wakes_async_waiter():
+    limiter = RateLimiter(concurrency=1, max_concurrency=1)
+    limiter.acquire()
+
+    async def main():
+        threading.Timer(0.05, limiter.release, args=(200,)).start()
+        await asyncio.wait_for(limiter.acquire_async(), timeout=5)
+
+    asyncio.run(main())
+    assert limiter.stats()["in_flight"] == 1
+
+
+def test_throttling_backs_off_once_per_cooldown():
+    limiter = RateLimiter(rate=8.0, concurrency=8)
+    for _ in range(4):
+        limiter.acquire()
+    for _ in range(4):
+        limiter.release(429)
+
+    stats = limiter.stats()
+    assert stats["throttled"] == 4
+    assert stats["rate"] == 4.0 and stats["concurrency"] == 4
+
+
+@pytest.mark.parametrize("headers, expected", [
+    ({"retry-after": "3"}, 3.0),
+    ({"retry-after-ms": "1500", "retry-after": "9"}, 1.5),
+    ({"retry-after": "soon"}, None),
+    ({}, None),
+])
+def test_parse_retry_after(headers, expected):
+    assert parse_retry_after(httpx.Headers(headers)) == expected
+
+
+def test_is_limit_error():
+    class LimitExceededError(Exception):
+        pass
+
+    error = Exception()
+    error.status_code = 429
+    assert is_limit_error(error)
+    assert is_limit_error(LimitExceededError())
+    assert not is_limit_error(ValueError())
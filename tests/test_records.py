@@ -0,0 +1,64 @@
+"""Tests for compact records of listed items."""
+
+import asyncio
+
+import pytest
+
+from src.agentmail.aio import threads as aio_threads
+from src.agentmail.inboxes import iter_inboxes
+from src.agentmail.messages import iter_messages
+from src.agentmail.records import available_fields, projector, record_type
+from src.agentmail.threads import iter_threads
+
+
+def test_iterators_yield_records_with_selected_fields(fake):
+    inbox_id = fake.seed(inboxes=1, threads_per_inbox=5)[0]
+
+    threads = list(iter_threads(page_size=2, fields=("thread_id", "subject")))
+
+    assert sorted(thread.thread_id for thread in threads) == sorted(fake.threads)
+    assert all(thread._fields == ("thread_id", "subject") for thread in threads)
+    assert [inbox.inbox_id for inbox in iter_inboxes(fields="inbox_id")] == [inbox_id]
+
+
+def test_aliased_fields_use_python_names(fake):
+    inbox_id = fake.seed(inboxes=1, threads_per_inbox=2)[0]
+
+    messages = list(iter_messages(inbox_id, fields="message_id, from"))
+
+    assert messages[0]._fields == ("message_id", "from_")
+    assert {message.from_ for message in messages} == {m["from"] for m in fake.messages.values()}
+
+
+def test_async_iterators_yield_records(fake):
+    fake.seed(inboxes=1, threads_per_inbox=3)
+
+    async def main():
+        return [thread async for thread in aio_threads.iter_threads(fields=("thread_id",))]
+
+    threads = asyncio.run(main())
+
+    assert sorted(thread.thread_id for thread in threads) == sorted(fake.threads)
+
+
+def test_projector_reads_api_dictionaries():
+    project = projector("message", ("message_id", "from_"))
+
+    assert project({"message_id": "m1", "from": "a@example.com"}) == ("m1", "a@example.com")
+    assert projector("thread", None) is None
+
+
+def test_record_types_are_cached():
+    assert record_type("thread", "thread_id,subject") is record_type("thread", ["thread_id", "subject"])
+    assert "thread_id" in available_fields("thread")
+
+
+@pytest.mark.parametrize("kind, fields", [
+    ("thread", ()),
+    ("thread", ("no_such_field",)),
+    ("thread", ("thread_id", "thread_id")),
+    ("draft", ("draft_id",))
+])
+def test_invalid_fields_raise(kind, fields):
+    with pytest.raises(ValueError):
+        record_type(kind, fields)
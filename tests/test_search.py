@@ -0,0 +1,75 @@
+"""Tests for the full-text search index."""
+
+from datetime import datetime, timedelta, timezone
+
+import pytest
+
+from src.agentmail.messages import send_message
+from src.agentmail.mirror import MailMirror
+from src.agentmail.search import SearchIndex
+from src.agentmail.threads import delete_thread
+
+
+@pytest.fixture
+def index(tmp_path):
+    with SearchIndex(str(tmp_path / "search.db")) as index:
+        yield index
+
+
+def test_index_threads_pages_long_threads(fake, index):
+    fake.page_size = 2
+    fake.seed(inboxes=1, threads_per_inbox=2, messages_per_thread=5)
+
+    assert index.index_threads(list(fake.threads)) == 10
+    hits = index.search("seeded message 4")
+    assert len(hits) == 2
+
+
+def test_html_only_messages_are_indexed_as_text(fake, index):
+    [inbox_id] = fake.seed(inboxes=1, threads_per_inbox=0)
+    sent = send_message(
+        inbox_id, "x@example.com", "Report",
+        html="<style>.q{color:red}</style><p>Quarterly <b>invoice</b> attached</p>"
+    )
+    index.index_threads([sent.thread_id])
+
+    [hit] = index.search("quarterly invoice")
+
+    assert hit.thread_id == sent.thread_id
+    assert "<b>" not in hit.snippet
+    assert index.search("color") == []
+
+
+def test_filters(fake, index):
+    inbox_ids = fake.seed(inboxes=2, threads_per_inbox=2)
+    index.index_threads(list(fake.threads))
+    now = datetime.now(timezone.utc)
+
+    assert {hit.inbox_id for hit in index.search("seeded", inbox_id=inbox_ids[0])} == {inbox_ids[0]}
+    assert len(index.search("seeded", label="received")) == 4
+    assert index.search("seeded", label="sent") == []
+    assert len(index.search("seeded", after=now - timedelta(hours=1))) == 4
+    assert index.search("seeded", before=now - timedelta(hours=1)) == []
+
+
+def test_attached_mirror_keeps_index_current(fake, index, tmp_path):
+    fake.seed(inboxes=1, threads_per_inbox=3)
+    with MailMirror(str(tmp_path / "mirror.db")) as mirror:
+        index.attach(mirror)
+        mirror.sync()
+        assert len(index.search("seeded")) == 3
+
+        thread = next(iter(fake.threads.values()))
+        delete_thread(thread["thread_id"], thread["inbox_id"])
+        mirror.sync(full=True)
+
+    assert {hit.thread_id for hit in index.search("seeded")} == set(fake.threads)
+
+
+def test_plain_queries_ignore_fts_syntax(fake, index):
+    fake.seed(inboxes=1, threads_per_inbox=1)
+    index.index_threads(list(fake.threads))
+
+    assert index.search('seeded" OR "x') == []
+    assert len(index.search("seeded OR", raw=False)) == 0
+    assert len(index.search("seeded OR nothing", raw=True)) == 1
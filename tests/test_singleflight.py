@@ -0,0 +1,108 @@
+"""Tests for request coalescing."""
+
+import asyncio
+import threading
+import time
+from concurrent.futures import ThreadPoolExecutor
+
+from src.agentmail.aio import inboxes as aio_inboxes
+from src.agentmail.inboxes import get_inbox, update_inbox
+from src.agentmail.singleflight import (
+    coalesced, coalescing_stats, disable_coalescing, enable_coalescing, reset_coalescing_stats
+)
+
+
+def _concurrently(call, count=8):
+    barrier = threading.Barrier(count)
+
+    def run(_):
+        barrier.wait()
+        return call()
+
+    with ThreadPoolExecutor(max_workers=count) as executor:
+        return [executor.submit(run, n) for n in range(count)]
+
+
+def test_concurrent_reads_share_one_request(fake):
+    inbox_id = fake.seed(inboxes=1, threads_per_inbox=0)[0]
+    fake.latency["inboxes.get"] = 0.2
+    reset_coalescing_stats()
+
+    results = [future.result() for future in _concurrently(lambda: get_inbox(inbox_id))]
+
+    assert {inbox.inbox_id for inbox in results} == {inbox_id}
+    assert fake.stats()["endpoints"]["inboxes.get"] == 1
+    stats = coalescing_stats()
+    assert (stats["executions"], stats["coalesced"], stats["in_flight"]) == (1, 7, 0)
+
+
+def test_errors_are_shared(fake):
+    inbox_id = fake.seed(inboxes=1, threads_per_inbox=0)[0]
+    fake.latency["inboxes.get"] = 0.2
+    fake.fail_next(1, status=400, endpoint="inboxes.get")
+
+    futures = _concurrently(lambda: get_inbox(inbox_id))
+
+    assert all(future.exception() is not None for future in futures)
+    assert fake.stats()["endpoints"]["inboxes.get"] == 1
+
+
+def test_disabled_coalescing_sends_every_call(fake):
+    inbox_id = fake.seed(inboxes=1, threads_per_inbox=0)[0]
+    fake.latency["inboxes.get"] = 0.1
+    disable_coalescing()
+    try:
+        for future in _concurrently(lambda: get_inbox(inbox_id), count=4):
+            future.result()
+    finally:
+        enable_coalescing()
+
+    assert fake.stats()["endpoints"]["inboxes.get"] == 4
+
+
+def test_async_reads_share_one_request(fake):
+    inbox_id = fake.seed(inboxes=1, threads_per_inbox=0)[0]
+    fake.latency["inboxes.get"] = 0.1
+
+    async def main():
+        return await asyncio.gather(*(aio_inboxes.get_inbox(inbox_id) for _ in range(5)))
+
+    results = asyncio.run(main())
+
+    assert {inbox.inbox_id for inbox in results} == {inbox_id}
+    assert fake.stats()["endpoints"]["inboxes.get"] == 1
+
+
+def test_read_after_write_does_not_join_earlier_read(fake):
+    inbox_id = fake.seed(inboxes=1, threads_per_inbox=0)[0]
+    delays = [0.3]
+    fake.latency["*"] = lambda: delays.pop() if delays else 0.0
+    results = []
+    reader = threading.Thread(target=lambda: results.append(get_inbox(inbox_id)))
+    reader.start()
+    while delays:
+        time.sleep(0.005)
+    # Let the fake answer with the pre-write state before writing
+    time.sleep(0.05)
+
+    update_inbox(inbox_id, display_name="Renamed")
+    fresh = get_inbox(inbox_id)
+    reader.join()
+
+    assert results[0].display_name != "Renamed"
+    assert fresh.display_name == "Renamed"
+
+
+def test_unhashable_arguments_are_not_coalesced():
+    calls = []
+
+    @coalesced
+    def read(value, api_key=None):
+        calls.append(value)
+        time.sleep(0.05)
+        return len(value)
+
+    futures = _concurrently(lambda: read(["a", "b"]), count=3)
+
+    assert [future.result() for future in futures] == [2, 2, 2]
+    assert len(calls) == 3
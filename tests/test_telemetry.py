@@ -0,0 +1,104 @@
+"""Tests for client-side telemetry."""
+
+import asyncio
+import urllib.error
+import urllib.request
+
+import pytest
+from agentmail.core.api_error import ApiError
+
+from src.agentmail.aio import inboxes as aio_inboxes
+from src.agentmail.inboxes import get_inbox
+from src.agentmail.telemetry import (
+    DEFAULT_BUCKETS, disable_telemetry, enable_telemetry, prometheus_text, reset_telemetry, snapshot,
+    start_metrics_server
+)
+from src.agentmail.threads import iter_threads
+
+
+@pytest.fixture(autouse=True)
+def fresh_telemetry():
+    reset_telemetry()
+    yield
+    enable_telemetry(buckets=DEFAULT_BUCKETS)
+    reset_telemetry()
+
+
+def test_calls_and_errors_are_recorded(fake):
+    inbox_id = fake.seed(inboxes=1, threads_per_inbox=0)[0]
+    get_inbox(inbox_id)
+    fake.fail_next(1, status=400, endpoint="inboxes.get")
+    with pytest.raises(ApiError):
+        get_inbox(inbox_id)
+
+    entry = snapshot()["inboxes.get_inbox"]
+
+    assert (entry["calls"], entry["error_count"], entry["in_flight"]) == (2, 1, 0)
+    assert entry["buckets"]["+Inf"] == 2
+    assert entry["latency_sum"] > 0
+
+
+def test_iterations_record_items_and_first_item(fake):
+    fake.seed(inboxes=1, threads_per_inbox=12)
+
+    assert len(list(iter_threads(page_size=5))) == 12
+    # An abandoned iteration is recorded with the items it yielded
+    iterator = iter_threads(page_size=5)
+    next(iterator)
+    iterator.close()
+
+    entry = snapshot()["threads.iter_threads"]
+
+    assert (entry["calls"], entry["items"], entry["first_items"]) == (2, 13, 2)
+    assert entry["first_item_avg"] > 0
+
+
+def test_async_calls_are_recorded_separately(fake):
+    inbox_id = fake.seed(inboxes=1, threads_per_inbox=0)[0]
+
+    asyncio.run(aio_inboxes.get_inbox(inbox_id))
+
+    data = snapshot()
+    assert data["inboxes.get_inbox[async]"]["mode"] == "async"
+    assert "inboxes.get_inbox" not in data
+
+
+def test_disabled_telemetry_records_nothing(fake):
+    inbox_id = fake.seed(inboxes=1, threads_per_inbox=0)[0]
+    disable_telemetry()
+
+    get_inbox(inbox_id)
+
+    assert snapshot() == {}
+
+
+def test_quantiles_follow_buckets(fake):
+    inbox_id = fake.seed(inboxes=1, threads_per_inbox=0)[0]
+    enable_telemetry(buckets=[0.05, 1.0])
+    fake.latency["inboxes.get"] = 0.1
+
+    for _ in range(4):
+        get_inbox(inbox_id)
+
+    entry = snapshot()["inboxes.get_inbox"]
+    assert entry["buckets"] == {"0.05": 0, "1.0": 4, "+Inf": 4}
+    assert 0.05 < entry["p50"] < 1.0
+
+
+def test_metrics_server_serves_prometheus_text(fake):
+    inbox_id = fake.seed(inboxes=1, threads_per_inbox=0)[0]
+    get_inbox(inbox_id)
+    server = start_metrics_server(port=0)
+    try:
+        url = f"http://127.0.0.1:{server.server_address[1]}"
+        with urllib.request.urlopen(f"{url}/metrics", timeout=5) as response:
+            body = response.read().decode()
+        with pytest.raises(urllib.error.HTTPError):
+            urllib.request.urlopen(f"{url}/other", timeout=5)
+    finally:
+        server.shutdown()
+        server.server_close()
+
+    assert body == prometheus_text()
+    assert 'agentmail_client_calls_total{operation="inboxes.get_inbox",mode="sync"} 1' in body
+    assert "# TYPE agentmail_client_latency_seconds histogram" in body
@@ -0,0 +1,175 @@
+"""Tests for the asyncio webhook receiver."""
+
+import asyncio
+import base64
+import hashlib
+import hmac
+import json
+import threading
+import time
+from concurrent.futures import ThreadPoolExecutor
+
+import httpx
+import pytest
+
+from src.agentmail.idempotency import IdempotencyStore
+from src.agentmail.webhook_receiver import WebhookReceiver, WebhookVerificationError, verify_signature
+
+SECRET = "whsec_" + base64.b64encode(b"test-signing-key").decode()
+
+
+def _signed(event, msg_id="msg_1", timestamp=None, secret=SECRET):
+    """Return (headers, body) of a delivery signed like AgentMail does."""
+    body = json.dumps(event).encode()
+    timestamp = str(int(time.time()) if timestamp is None else timestamp)
+    key = base64.b64decode(secret[len("whsec_"):])
+    signature = base64.b64encode(
+        hmac.new(key, f"{msg_id}.{timestamp}.".encode() + body, hashlib.sha256).digest()
+    ).decode()
+    headers = {"svix-id": msg_id, "svix-timestamp": timestamp, "svix-signature": f"v1,{signature}"}
+    return headers, body
+
+
+def _event(n=0, event_type="message.received"):
+    return {"event_id": f"evt_{n}", "event_type": event_type, "message": {"message_id": f"m{n}"}}
+
+
+def _run(receiver, scenario):
+    """Run a scenario coroutine against a started receiver, then stop it."""
+    async def main():
+        async with receiver:
+            async with httpx.AsyncClient() as client:
+                return await scenario(client)
+    return asyncio.run(main())
+
+
+def test_signed_deliveries_are_dispatched():
+    receiver = WebhookReceiver(secret=SECRET, port=0)
+    received, handled_sync = [], []
+
+    @receiver.on("message.received")
+    async def on_message(event):
+        received.append(event["event_id"])
+
+    receiver.add_handler("*", lambda event: handled_sync.append(event["event_id"]))
+
+    async def scenario(client):
+        return [(await client.post(receiver.url, headers=h, content=b)).status_code
+                for h, b in (_signed(_event(n), msg_id=f"msg_{n}") for n in range(3))]
+
+    assert _run(receiver, scenario) == [204] * 3
+    assert sorted(received) == sorted(handled_sync) == ["evt_0", "evt_1", "evt_2"]
+    assert receiver.stats()["handled"] == 6
+
+
+def test_bad_deliveries_are_rejected():
+    receiver = WebhookReceiver(secret=SECRET, port=0)
+    headers, body = _signed(_event())
+    stale_headers, stale_body = _signed(_event(), timestamp=time.time() - 3600)
+    other = "whsec_" + base64.b64encode(b"another-key").decode()
+    forged_headers, forged_body = _signed(_event(), secret=other)
+    invalid_headers, invalid_body = _signed("not an object")
+
+    async def scenario(client):
+        requests = [
+            ("POST", receiver.url, headers, body + b" "),
+            ("POST", receiver.url, stale_headers, stale_body),
+            ("POST", receiver.url, forged_headers, forged_body),
+            ("POST", receiver.url, {}, body),
+            ("POST", receiver.url, invalid_headers, invalid_body),
+            ("POST", receiver.url + "/other", headers, body),
+            ("GET", receiver.url, headers, b""),
+        ]
+        return [
+            (await client.request(method, url, headers=h, content=b)).status_code
+            for method, url, h, b in requests
+        ]
+
+    assert _run(receiver, scenario) == [401, 401, 401, 401, 400, 404, 405]
+    assert receiver.stats()["accepted"] == 0
+
+
+def test_full_queue_answers_503():
+    receiver = WebhookReceiver(port=0, workers=0, queue_size=2)
+
+    async def scenario(client):
+        statuses = []
+        for n in range(3):
+            headers, body = _signed(_event(n))
+            statuses.append((await client.post(receiver.url, headers=headers, content=body)).status_code)
+        return statuses, receiver.stats()
+
+    async def main():
+        await receiver.start()
+        try:
+            async with httpx.AsyncClient() as client:
+                return await scenario(client)
+        finally:
+            await receiver.stop(drain=False)
+
+    statuses, stats = asyncio.run(main())
+    assert statuses == [204, 204, 503]
+    assert (stats["accepted"], stats["dropped"], stats["queued"]) == (2, 1, 2)
+
+
+def test_accept_from_other_threads():
+    receiver = WebhookReceiver(secret=SECRET, port=0)
+    received = []
+    done = threading.Event()
+
+    @receiver.on("*")
+    async def on_event(event):
+        received.append(event["event_id"])
+        if len(received) == 20:
+            done.set()
+
+    async def main():
+        await receiver.start()
+        loop = asyncio.get_running_loop()
+        try:
+            with ThreadPoolExecutor(max_workers=4) as executor:
+                deliveries = [_signed(_event(n), msg_id=f"msg_{n}") for n in range(20)]
+                statuses = await asyncio.gather(*(
+                    loop.run_in_executor(executor, receiver.accept, headers, body)
+                    for headers, body in deliveries
+                ))
+            await loop.run_in_executor(None, done.wait, 5)
+            return statuses
+        finally:
+            await receiver.stop()
+
+    assert asyncio.run(main()) == [204] * 20
+    assert sorted(received) == sorted(f"evt_{n}" for n in range(20))
+
+
+def test_accept_before_start_fails():
+    receiver = WebhookReceiver(port=0)
+
+    with pytest.raises(RuntimeError):
+        receiver.accept(*_signed(_event()))
+
+
+def test_duplicate_deliveries_are_dispatched_once():
+    receiver = WebhookReceiver(secret=SECRET, port=0, idempotency=IdempotencyStore())
+    received = []
+    receiver.add_handler("*", lambda event: received.append(event["event_id"]))
+
+    async def scenario(client):
+        # A retry carries the same event under a new delivery ID
+        first = _signed(_event(1), msg_id="msg_1")
+        retry = _signed(_event(1), msg_id="msg_2")
+        return [(await client.post(receiver.url, headers=h, content=b)).status_code for h, b in (first, retry)]
+
+    assert _run(receiver, scenario) == [204, 204]
+    assert received == ["evt_1"]
+    assert receiver.stats()["duplicates"] == 1
+
+
+@pytest.mark.parametrize("secret", ["whsec_not base64!", "whsec_", ""])
+def test_malformed_secret_is_rejected_up_front(secret):
+    with pytest.raises(ValueError, match="Invalid webhook secret"):
+        WebhookReceiver(secret=secret)
+    headers, body = _signed(_event())
+    with pytest.raises(ValueError) as error:
+        verify_signature(secret, headers, body)
+    assert not isinstance(error.value, WebhookVerificationError)